@@ -0,0 +1,48 @@
+"""enrollment grade rollups
+
+Revision ID: 3b7c1d9e4f21
+Revises: a9ca5a97281e
+Create Date: 2026-10-17 09:12:41.204318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7c1d9e4f21'
+down_revision: Union[str, Sequence[str], None] = 'a9ca5a97281e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('enrollment_grade_rollups',
+    sa.Column('enrollment_id', sa.Uuid(), nullable=False),
+    sa.Column('score_count', sa.Integer(), nullable=False),
+    sa.Column('weighted_score_sum', sa.Float(), nullable=False),
+    sa.Column('weight_sum', sa.Float(), nullable=False),
+    sa.Column('weighted_average', sa.Float(), nullable=True),
+    sa.Column('grade', sa.String(length=5), nullable=True),
+    sa.Column('completed_assessments', sa.Integer(), nullable=False),
+    sa.Column('total_assessments', sa.Integer(), nullable=False),
+    sa.Column('completed_lessons', sa.Integer(), nullable=False),
+    sa.Column('total_lessons', sa.Integer(), nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['enrollment_id'], ['enrollments.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('id')
+    )
+    op.create_index(op.f('ix_enrollment_grade_rollups_enrollment_id'), 'enrollment_grade_rollups', ['enrollment_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_enrollment_grade_rollups_enrollment_id'), table_name='enrollment_grade_rollups')
+    op.drop_table('enrollment_grade_rollups')
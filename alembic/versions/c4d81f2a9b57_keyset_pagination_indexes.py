@@ -0,0 +1,54 @@
+"""keyset pagination indexes
+
+Revision ID: c4d81f2a9b57
+Revises: 7e2a4c6b8d13
+Create Date: 2026-10-17 15:42:08.203417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d81f2a9b57'
+down_revision: Union[str, Sequence[str], None] = '7e2a4c6b8d13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, table, columns): composite (sort key, id) indexes backing
+# cursor pagination on the list endpoints
+INDEXES = [
+    ('ix_users_created_at_id', 'users', ['created_at', 'id']),
+    ('ix_courses_created_at_id', 'courses', ['created_at', 'id']),
+    ('ix_courses_title_id', 'courses', ['title', 'id']),
+    ('ix_enrollments_enrolled_at_id', 'enrollments', ['enrolled_at', 'id']),
+    ('ix_enrollments_created_at_id', 'enrollments', ['created_at', 'id']),
+    ('ix_parent_children_created_at_id', 'parent_children', ['created_at', 'id']),
+    ('ix_parent_children_updated_at_id', 'parent_children', ['updated_at', 'id']),
+    ('ix_course_tutors_created_at_id', 'course_tutors', ['created_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built concurrently (outside the migration transaction) so existing
+    # tables stay writable while the indexes are created
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name, table, columns, unique=False,
+                postgresql_concurrently=True, if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name=table,
+                postgresql_concurrently=True, if_exists=True
+            )
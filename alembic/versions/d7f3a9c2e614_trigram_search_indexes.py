@@ -0,0 +1,76 @@
+"""trigram search indexes
+
+Revision ID: d7f3a9c2e614
+Revises: c4d81f2a9b57
+Create Date: 2026-10-17 17:05:31.518224
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7f3a9c2e614'
+down_revision: Union[str, Sequence[str], None] = 'c4d81f2a9b57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, column): GIN trigram indexes serving the ILIKE '%term%' and
+# similarity searches of app/utils/search.py
+SEARCH_COLUMNS = [
+    ('users', 'names'),
+    ('users', 'email'),
+    ('users', 'username'),
+    ('users', 'phone'),
+    ('courses', 'title'),
+    ('courses', 'code'),
+    ('courses', 'description'),
+]
+
+
+def _index_name(table: str, column: str) -> str:
+    return f'ix_{table}_{column}_trgm'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    available = bind.execute(
+        sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    ).first()
+    if available is None:
+        # Failing keeps the revision unapplied, so it runs again once the
+        # extension can be created; a skipped revision would never be rerun
+        raise RuntimeError(
+            "The pg_trgm extension is not available on this PostgreSQL server. "
+            "Install the server's contrib package, run "
+            "'CREATE EXTENSION IF NOT EXISTS pg_trgm;' as a superuser, then "
+            "rerun 'alembic upgrade head'."
+        )
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    # Built concurrently (outside the migration transaction) so the tables
+    # stay writable while the indexes are created
+    with op.get_context().autocommit_block():
+        for table, column in SEARCH_COLUMNS:
+            op.create_index(
+                _index_name(table, column), table, [column], unique=False,
+                postgresql_using='gin',
+                postgresql_ops={column: 'gin_trgm_ops'},
+                postgresql_concurrently=True, if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The pg_trgm extension is left installed; other objects may use it
+    with op.get_context().autocommit_block():
+        for table, column in reversed(SEARCH_COLUMNS):
+            op.drop_index(
+                _index_name(table, column), table_name=table,
+                postgresql_concurrently=True, if_exists=True
+            )
@@ -0,0 +1,46 @@
+"""unique score per column
+
+Revision ID: e5a2c7d94b18
+Revises: d7f3a9c2e614
+Create Date: 2026-10-17 18:24:51.730162
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a2c7d94b18'
+down_revision: Union[str, Sequence[str], None] = 'd7f3a9c2e614'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep the most recently updated score of any duplicated
+    # (enrollment, column) pair before enforcing uniqueness
+    op.execute("""
+        DELETE FROM scores older
+        USING scores newer
+        WHERE older.enrollment_id = newer.enrollment_id
+          AND older.column_id = newer.column_id
+          AND (older.updated_at, older.id) < (newer.updated_at, newer.id)
+    """)
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uq_scores_enrollment_column', 'scores', ['enrollment_id', 'column_id'],
+            unique=True, postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'uq_scores_enrollment_column', table_name='scores',
+            postgresql_concurrently=True, if_exists=True
+        )
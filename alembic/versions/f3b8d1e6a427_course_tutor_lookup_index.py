@@ -0,0 +1,36 @@
+"""course tutor lookup index
+
+Revision ID: f3b8d1e6a427
+Revises: e5a2c7d94b18
+Create Date: 2026-10-17 19:06:12.481930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b8d1e6a427'
+down_revision: Union[str, Sequence[str], None] = 'e5a2c7d94b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_course_tutors_tutor_id_course_id', 'course_tutors', ['tutor_id', 'course_id'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_course_tutors_tutor_id_course_id', table_name='course_tutors',
+            postgresql_concurrently=True, if_exists=True
+        )
@@ -26,13 +26,18 @@ def get_redis_instance() -> Optional[RedisService]:
     if _redis_instance is None:
         try:
             config = get_app_config()
-            redis_url = config.redis_config.redis_connection_string
+            redis_config = config.redis_config
+            redis_url = redis_config.redis_connection_string
             
             if not redis_url:
                 logger.warning("Redis connection string not configured")
                 return None
             
-            _redis_instance = RedisService(redis_url)
+            _redis_instance = RedisService(
+                redis_url,
+                memory_max_entries=redis_config.memory_fallback_max_entries,
+                memory_shards=redis_config.memory_fallback_shards
+            )
             logger.info("Redis instance initialized")
             
         except Exception as e:
@@ -117,13 +122,11 @@ def get_redis_instance() -> Optional[RedisService]:
 #             logger.error(f"Redis cleanup error (ignored): {cleanup_error}")
 #             pass
 
-# v3
+# v4 - no per-request PING: the pool health-checks idle connections and
+# RedisService retries/falls back on connection errors itself
 def get_redis_service() -> Optional[RedisService]:
     try:
-        redis = get_redis_instance()
-        if redis and redis.ping():
-            return redis
-        return None
+        return get_redis_instance()
     except Exception:
         return None
 
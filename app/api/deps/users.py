@@ -7,25 +7,46 @@ from typing import Optional
 from fastapi import Depends, HTTPException, status, Cookie
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy import text
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, lazyload
 
-from app.db.session import SessionLocal
+from app.db.session import SessionLocal, get_async_sessionmaker
 from app.core.security.auth import decode_token
 from app.models.user import User
+from app.services.principal_service import Principal, get_principal
 
 # Security scheme for Swagger UI
 security = HTTPBearer(auto_error=False)
 
 logger = logging.getLogger(__name__)
 
-async def get_db():
-    """Database session dependency."""
+# selectin-loaded profile data that authentication itself never needs
+_USER_LAZY_PROFILE = (
+    lazyload(User.addresses),
+    lazyload(User.avatar),
+    lazyload(User.contact_info),
+    lazyload(User.location_info),
+)
+
+def get_db():
+    """
+    Database session dependency.
+
+    A plain (sync) generator so FastAPI runs it in the threadpool: closing
+    the session returns its connection to the pool without blocking the
+    event loop.
+    """
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
 
+
+async def get_async_db():
+    """AsyncSession dependency for async route handlers."""
+    async with get_async_sessionmaker()() as db:
+        yield db
+
 # v2
 # def get_db():
 #     """
@@ -316,8 +337,8 @@ def get_current_user(
                 detail="Invalid token",
             )
         
-        # Fetch user from database
-        user = db.query(User).filter(User.id == user_id).first()
+        # Fetch user from database; profile relationships load only if used
+        user = db.query(User).options(*_USER_LAZY_PROFILE).filter(User.id == user_id).first()
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -336,6 +357,61 @@ def get_current_user(
         )
 
 
+def get_current_principal(
+    db: Session = Depends(get_db),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    access_token: Optional[str] = Cookie(None),
+) -> Principal:
+    """
+    Get the authenticated user's cached identity/roles snapshot.
+    For endpoints that only need id, roles or permissions: no ORM user is
+    loaded and, on a cache hit, the database is not touched.
+    """
+    token = None
+    
+    # Try Authorization header first
+    if credentials:
+        token = credentials.credentials
+    # Then try cookie
+    elif access_token:
+        token = access_token
+    
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    try:
+        payload = decode_token(token, token_type="access")
+        
+        user_id = payload.get("user_id") or payload.get("sub")
+        if not user_id:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid token",
+            )
+        
+        principal = get_principal(db, user_id)
+        if not principal:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found",
+            )
+        
+        return principal
+        
+    except HTTPException:
+        raise
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
 # ===== ROLE CHECKERS =====
 # def admin_required(user: User = Depends(get_current_user)):
 #     if user.role != UserRole.admin:
@@ -6,7 +6,7 @@
 # from fastapi import APIRouter, Depends, Request
 # from uuid import UUID
 # from sqlalchemy.orm import Session
-# from app.services import admin_service, user_service, course_service, enrollment_service
+# from app.services import admin_service, user_service, course_service, enrollment_service, grade_rollup_service
 # from app.schemas.admin import AdminStatsOut, RecentActivityOut
 # from app.schemas.user import UserCreate, UserUpdateSchema
 # from app.schemas.enrollment import EnrollmentCreate, EnrollmentOut
@@ -174,16 +174,24 @@
 # Admin-specific endpoints
 # ============================================================================
 
-from fastapi import APIRouter, Depends, Request, Query, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, Request, Query, HTTPException, status
 from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
-from app.services import admin_service, user_service, course_service, enrollment_service
+from app.services import admin_service, user_service, course_service, enrollment_service, grade_rollup_service, attendance_stats_service
 from app.schemas.admin import AdminStatsOut, RecentActivityOut
-from app.schemas.user import UserCreate, UserUpdateSchema, UserRead
+from app.schemas.user import UserCreate, UserUpdateSchema, UserRead, UserFilters
+from app.schemas.course import CourseFilters
 from app.schemas.enrollment import EnrollmentCreate, EnrollmentOut
-from app.api.deps.users import admin_required, get_db
+from app.api.deps.users import admin_required, get_async_db, get_db
+from app.api.deps.storage import get_redis_instance
+from app.core.profiling import route_metrics
+from app.core.security.hashing import password_hasher
+from app.services.mail import queue as mail_queue
+from app.services.mail.breaker import breaker_states
+from app.services.mail.worker import mail_worker
 from app.utils.responses import PageSerializer, api_response
 
 router = APIRouter()
@@ -195,11 +203,12 @@ router = APIRouter()
 @router.get("/dashboard")
 def get_admin_dashboard_endpoint(
     request: Request,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user = Depends(admin_required)
 ):
     """Get complete dashboard data (stats + recent activities)"""
-    dashboard_data = admin_service.get_dashboard_overview(db)
+    dashboard_data = admin_service.get_dashboard_overview(db, background_tasks)
     return api_response(
         success=True,
         message="Dashboard data fetched successfully",
@@ -210,11 +219,12 @@ def get_admin_dashboard_endpoint(
 @router.get("/stats", response_model=AdminStatsOut)
 def get_admin_stats_endpoint(
     request: Request,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user = Depends(admin_required)
 ):
     """Get admin statistics"""
-    stats = admin_service.get_statistics(db)
+    stats = admin_service.get_statistics(db, background_tasks)
     return api_response(
         success=True,
         message="Statistics fetched successfully",
@@ -238,6 +248,143 @@ def get_recent_activities_endpoint(
         path=str(request.url.path)
     )
 
+@router.post("/grade-rollups/rebuild")
+def rebuild_grade_rollups_endpoint(
+    request: Request,
+    course_id: Optional[UUID] = Query(None, description="Limit the rebuild to one course"),
+    db: Session = Depends(get_db),
+    current_user = Depends(admin_required)
+):
+    """Backfill the per-enrollment grade rollups (all courses or one course)"""
+    processed = grade_rollup_service.rebuild_rollups(db, course_id=course_id)
+    return api_response(
+        success=True,
+        message="Grade rollups rebuilt successfully",
+        data={"enrollments_processed": processed},
+        path=str(request.url.path)
+    )
+
+@router.post("/attendance-counters/rebuild")
+def rebuild_attendance_counters_endpoint(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user = Depends(admin_required)
+):
+    """Backfill the per-enrollment attendance counters"""
+    processed = attendance_stats_service.rebuild_counters(db)
+    return api_response(
+        success=True,
+        message="Attendance counters rebuilt successfully",
+        data={"enrollments_processed": processed},
+        path=str(request.url.path)
+    )
+
+
+@router.get("/cache/redis")
+def get_redis_cache_stats(
+    request: Request,
+    current_user = Depends(admin_required)
+):
+    """Redis mode and in-memory fallback counters (hits, misses, evictions)"""
+    redis = get_redis_instance()
+    return api_response(
+        success=True,
+        message="Cache statistics retrieved successfully",
+        data=redis.memory_stats() if redis else {"configured": False},
+        path=str(request.url.path)
+    )
+
+@router.get("/metrics/database")
+def get_database_metrics_endpoint(
+    request: Request,
+    top: int = Query(20, ge=1, le=200, description="Slow statement fingerprints to list"),
+    reset: bool = Query(False, description="Reset the counters after reading them"),
+    db: Session = Depends(get_db),
+    current_user = Depends(admin_required)
+):
+    """Connection pool usage, checkout waits and slow queries of this worker, with the server's max_connections"""
+    metrics = admin_service.get_database_metrics(db, top=top)
+    if reset:
+        admin_service.reset_database_metrics()
+    return api_response(
+        success=True,
+        message="Database metrics retrieved successfully",
+        data=metrics,
+        path=str(request.url.path)
+    )
+
+@router.get("/metrics/routes")
+def get_route_metrics_endpoint(
+    request: Request,
+    sort: str = Query("total_ms", description="total_ms, count, errors, over_budget, p50, p90, p99, max, avg or statements"),
+    top: int = Query(50, ge=1, le=500),
+    reset: bool = Query(False, description="Reset the metrics after reading them"),
+    current_user = Depends(admin_required)
+):
+    """Per-route wall time, SQL statements, database and serialization time percentiles of this worker"""
+    metrics = route_metrics.snapshot(sort=sort, top=top)
+    if reset:
+        route_metrics.reset()
+    return api_response(
+        success=True,
+        message="Route metrics retrieved successfully",
+        data=metrics,
+        path=str(request.url.path)
+    )
+
+@router.get("/metrics/password-hashing")
+def get_password_hashing_metrics_endpoint(
+    request: Request,
+    reset: bool = Query(False, description="Reset the counters after reading them"),
+    current_user = Depends(admin_required)
+):
+    """Password hashing pool of this worker: running, queued, rejected, wait and hash times"""
+    metrics = password_hasher.stats()
+    if reset:
+        password_hasher.reset_stats()
+    return api_response(
+        success=True,
+        message="Password hashing metrics retrieved successfully",
+        data=metrics,
+        path=str(request.url.path)
+    )
+
+@router.get("/metrics/mail")
+async def get_mail_metrics_endpoint(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(admin_required)
+):
+    """Outbound mail queue by status, and this worker's mail worker and provider circuit breakers"""
+    data = {
+        "queue": await mail_queue.queue_stats(db),
+        "worker_running": mail_worker.running,
+        "providers": breaker_states(),
+    }
+    return api_response(
+        success=True,
+        message="Mail metrics retrieved successfully",
+        data=data,
+        path=str(request.url.path)
+    )
+
+@router.post("/mail/retry-failed")
+async def retry_failed_mail_endpoint(
+    request: Request,
+    ids: Optional[List[UUID]] = Query(None, description="Only these messages (default: all failed)"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(admin_required)
+):
+    """Queue failed outbound emails for delivery again"""
+    requeued = await mail_queue.retry_failed(db, ids)
+    mail_worker.wake()
+    return api_response(
+        success=True,
+        message=f"{requeued} email(s) queued for retry",
+        data={"requeued": requeued},
+        path=str(request.url.path)
+    )
+
 # ============================================================================
 # USER MANAGEMENT ENDPOINTS
 # ============================================================================
@@ -276,32 +423,34 @@ def list_users_endpoint(
     request: Request,
     role: Optional[str] = Query(None, description="Filter by role: student, tutor, parent, admin"),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
-    search: Optional[str] = Query(None, description="Search by name or email"),
+    search: Optional[str] = Query(None, description="Search by name, email, username or phone"),
+    sort_by: str = Query("created_at", pattern="^(created_at|relevance)$", description="relevance ranks search matches"),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor/prev_cursor of a previous page"),
+    include_total: bool = Query(False, description="Also count all matching users on cursor pages (numbered pages are always counted)"),
     db: Session = Depends(get_db),
     current_user = Depends(admin_required)
 ):
     """
     List all users with optional filters (Admin only)
     """
-    # Build filters
-    filters = {}
-    if role:
-        filters["role"] = role
-    if is_active is not None:
-        filters["is_active"] = is_active
-    if search:
-        filters["search"] = search
+    filters = UserFilters(role=role, is_active=is_active, search=search, sort_by=sort_by)
     
-    users = user_service.list_users(db, filters=filters)
+    users = user_service.list_users(
+        db,
+        filters=filters,
+        page=page,
+        page_size=page_size,
+        cursor=cursor,
+        include_total=include_total
+    )
     
     serializer = PageSerializer(
         request=request,
         obj=users,
         resource_name="users",
-        page=page,
-        page_size=page_size
+        summary_func=lambda u: UserRead.model_validate(u).model_dump()
     )
     return serializer.get_response("Users fetched successfully")
 
@@ -625,24 +774,27 @@ def list_courses_admin_endpoint(
     tutor_id: Optional[UUID] = Query(None, description="Filter by tutor ID"),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor/prev_cursor of a previous page"),
+    include_total: bool = Query(False, description="Also count all matching courses on cursor pages (numbered pages are always counted)"),
     db: Session = Depends(get_db),
     current_user = Depends(admin_required)
 ):
     """List all courses with admin privileges"""
-    filters = {}
-    if is_active is not None:
-        filters["is_active"] = is_active
-    if tutor_id:
-        filters["tutor_id"] = tutor_id
+    filters = CourseFilters(
+        status=None if is_active is None else ("active" if is_active else "inactive"),
+        tutor_id=tutor_id,
+        page=page,
+        page_size=page_size,
+        cursor=cursor,
+        include_total=include_total
+    )
     
     courses = course_service.list_courses(db, filters=filters)
     
     serializer = PageSerializer(
         request=request,
         obj=courses,
-        resource_name="courses",
-        page=page,
-        page_size=page_size
+        resource_name="courses"
     )
     return serializer.get_response("Courses fetched successfully")
 
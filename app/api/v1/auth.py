@@ -14,14 +14,17 @@ from fastapi import (
     Header, HTTPException, Request, Response, status
 )
 from sqlalchemy import select, or_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.api.deps.storage import get_redis_instance, get_redis_service
-from app.api.deps.users import get_current_user, get_db
+from app.api.deps.users import get_async_db, get_current_user, get_db
 from app.core.config import get_app_config
+from app.core.ratelimit import enforce_rate_limit, queue_rate_limit, rate_limit
 from app.core.security.auth import (
     create_access_token, create_refresh_token, decode_token
 )
+from app.core.security.hashing import password_hasher
 from app.models.user import User
 from app.schemas.auth import (
     ForgotPasswordSchema, ResendVerificationSchema, ResetPasswordSchema,
@@ -42,11 +45,16 @@ router = APIRouter()
 config = get_app_config()
 
 
-@router.post("/signup")
+@router.post(
+    "/signup",
+    dependencies=[Depends(rate_limit(
+        "signup_initiate", "Too many signup attempts. Please try again later."
+    ))],
+)
 async def signup(
     data: SignupSchema,
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     redis: Optional[RedisService] = Depends(get_redis_service),  # Use dependency
 ) -> dict:
     """
@@ -55,24 +63,8 @@ async def signup(
     try:
         client_ip = get_client_ip(request)
         
-        # Rate limiting (skip if Redis unavailable)
-        if redis:
-            _, allowed = redis.increment_rate_limit(
-                f"signup_initiate:{client_ip}",
-                window=3600,
-                limit=50
-            )
-            
-            if not allowed:
-                raise HTTPException(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    detail="Too many signup attempts. Please try again later."
-                )
-        else:
-            logger.warning(f"Rate limiting skipped (Redis unavailable) for signup from {client_ip, redis}")
-        
         # Check for existing credentials
-        existing_user = db.scalar(
+        existing_user = await db.scalar(
             select(User).where(
                 or_(
                     User.username == data.username,
@@ -187,15 +179,13 @@ async def verify_signup(
     data: VerifySignupSchema,
     request: Request,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     redis: Optional[RedisService] = Depends(get_redis_service),  # Use dependency
 ) -> dict:
     """
     Step 2: Verify codes and create user account
     """
     try:
-        client_ip = get_client_ip(request)
-        
         # Check if Redis is available (required for verification)
         if not redis:
             raise HTTPException(
@@ -203,18 +193,16 @@ async def verify_signup(
                 detail="Service temporarily unavailable. Please try again."
             )
         
-        # Rate limiting
-        _, allowed = redis.increment_rate_limit(
-            f"verify_signup:{client_ip}",
-            window=300,
-            limit=10
-        )
+        # Rate limiting and signup data lookup in one round trip
+        redis_key = f"signup_pending:{data.token}"
+        with redis.pipeline() as batch:
+            queue_rate_limit(batch, request, "verify_signup")
+            batch.get(redis_key, as_json=True)
+        limited, signup_data = batch.results
         
-        if not allowed:
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail="Too many verification attempts. Please try again later."
-            )
+        enforce_rate_limit(
+            request, limited, "Too many verification attempts. Please try again later."
+        )
         
         if not data.email_code and not data.phone_code:
             raise HTTPException(
@@ -222,10 +210,6 @@ async def verify_signup(
                 detail="At least one verification code is required"
             )
         
-        # Retrieve signup data from Redis
-        redis_key = f"signup_pending:{data.token}"
-        signup_data = redis.get(redis_key, as_json=True)
-        
         if not signup_data:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -253,7 +237,7 @@ async def verify_signup(
             phone_verified = True
         
         # Final check for existing user (race condition protection)
-        existing_user = db.scalar(
+        existing_user = await db.scalar(
             select(User).where(
                 or_(
                     User.username == signup_data['username'],
@@ -283,11 +267,11 @@ async def verify_signup(
                 is_active=True
             )
             
-            user.set_password(signup_data['password'])
+            user.set_password_hash(await password_hasher.hash(signup_data['password']))
             
             db.add(user)
-            db.commit()
-            db.refresh(user)
+            await db.commit()
+            await db.refresh(user)
             
             redis.delete(redis_key)
             
@@ -318,7 +302,7 @@ async def verify_signup(
             )
         
         except Exception as db_err:
-            db.rollback()
+            await db.rollback()
             redis.delete(redis_key)
             logger.error(f"Database error during user creation: {db_err}", exc_info=True)
             raise HTTPException(
@@ -343,8 +327,6 @@ async def resend_verification(
 ) -> dict:
     """Resend verification code for email or phone"""
     try:
-        client_ip = get_client_ip(request)
-        
         # Check if Redis is available (required)
         if not redis:
             raise HTTPException(
@@ -352,21 +334,16 @@ async def resend_verification(
                 detail="Service temporarily unavailable. Please try again."
             )
         
-        # Rate limiting
-        _, allowed = redis.increment_rate_limit(
-            f"resend_verification:{client_ip}",
-            window=3600,
-            limit=100
-        )
-        
-        if not allowed:
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail="Too many resend attempts. Please try again later."
-            )
-        
+        # Rate limiting and signup data lookup in one round trip
         redis_key = f"signup_pending:{data.token}"
-        signup_data = redis.get(redis_key, as_json=True)
+        with redis.pipeline() as batch:
+            queue_rate_limit(batch, request, "resend_verification")
+            batch.get(redis_key, as_json=True)
+        limited, signup_data = batch.results
+        
+        enforce_rate_limit(
+            request, limited, "Too many resend attempts. Please try again later."
+        )
         
         if not signup_data:
             raise HTTPException(
@@ -422,14 +399,14 @@ async def resend_verification(
         )
 
 @router.post("/signin")
-def signin(
+async def signin(
     request: Request,
     response: Response,
     data: UserSignin,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> dict:
     """Authenticate user and issue access/refresh tokens"""
-    user = authenticate_user(db, data)
+    user = await authenticate_user(db, data)
 
     access_token = create_access_token(
         subject={"username": user.username, "user_id": str(user.id)}
@@ -478,26 +455,19 @@ def signin(
     )
 
  
-@router.post("/forgot-password")
-async def forgot_password(
+@router.post(
+    "/forgot-password",
+    dependencies=[Depends(rate_limit(
+        "forgot_password", "Too many password reset requests. Please try again later."
+    ))],
+)
+def forgot_password(
     data: ForgotPasswordSchema,
     request: Request,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     redis: Optional[RedisService] = Depends(get_redis_service),  # Use dependency
 ) -> dict:
-    
-    client_ip = get_client_ip(request)
-    
-    # Rate limiting (skip if Redis unavailable)
-    if redis:
-        redis.increment_rate_limit(
-            f"forgot_password:{client_ip}",
-            window=3600,
-            limit=5
-        )
-    else:
-        logger.warning(f"Rate limiting skipped for forgot-password from {client_ip}")
 
     user = db.scalar(select(User).where(User.email == data.email.lower()))
 
@@ -544,14 +514,13 @@ async def forgot_password(
 
 
 @router.post("/reset-password")
-async def reset_password(
+def reset_password(
     data: ResetPasswordSchema,
     request: Request,
     db: Session = Depends(get_db),
     redis: Optional[RedisService] = Depends(get_redis_service),  # Use dependency
 ) -> dict:
     logger.info(f"Reset password data: {data}")
-    client_ip = get_client_ip(request)
     
     # Check if Redis is available (required)
     if not redis:
@@ -560,15 +529,16 @@ async def reset_password(
             detail="Service temporarily unavailable. Please try again."
         )
     
-    # Rate limiting
-    redis.increment_rate_limit(
-        f"reset_password:{client_ip}",
-        window=300,
-        limit=5
-    )
-
+    # Rate limiting and reset code lookup in one round trip
     redis_key = f"password_reset_code:{data.reset_code.upper()}"
-    reset_data = redis.get(redis_key, as_json=True)
+    with redis.pipeline() as batch:
+        queue_rate_limit(batch, request, "reset_password")
+        batch.get(redis_key, as_json=True)
+    limited, reset_data = batch.results
+
+    enforce_rate_limit(
+        request, limited, "Too many password reset attempts. Please try again later."
+    )
 
     if not reset_data:
         raise HTTPException(
@@ -525,8 +525,8 @@ def list_courses_endpoint(
     ),
     sort_by: str = Query(
         default="created_at",
-        pattern="^(created_at|title|code)$",
-        description="Sort by field",
+        pattern="^(created_at|title|code|relevance)$",
+        description="Sort by field (relevance ranks search matches)",
     ),
     order: str = Query(
         default="desc",
@@ -544,13 +544,21 @@ def list_courses_endpoint(
         le=100,
         description="Number of items per page",
     ),
+    cursor: Optional[str] = Query(
+        default=None,
+        description="next_cursor/prev_cursor of a previous page",
+    ),
+    include_total: bool = Query(
+        default=False,
+        description="Also count all matching items on cursor pages (extra query; numbered pages are always counted)",
+    ),
     include_relations: bool = Query(
         default=False,
         description="Include related tutors, modules, and lessons"
     ),
     db: Session = Depends(get_db),
 ):
-    """Get paginated list of courses with filters."""
+    """Get keyset-paginated list of courses with filters."""
     filters = CourseFilters(
         search=search,
         status=status,
@@ -559,17 +567,18 @@ def list_courses_endpoint(
         order=order,
         page=page,
         page_size=page_size,
+        cursor=cursor,
+        include_total=include_total,
     )
 
-    courses, total = course_service.list_courses(db, filters=filters)
+    courses = course_service.list_courses(
+        db, filters=filters, include_relations=include_relations
+    )
 
     serializer = PageSerializer(
         request=request,
         obj=courses,
         resource_name="courses",
-        page=page,
-        page_size=page_size,
-        summary_func=lambda c: c.get_summary(include_relations=include_relations),
     )
     
     return serializer.get_response(message="Courses fetched successfully")
@@ -722,17 +731,21 @@ def get_course_enrollments(
     course_id: UUID,
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    include_total: bool = Query(False),
     db: Session = Depends(get_db),
     current_user: User = Depends(tutor_required),
 ):
-    """Get all enrollments for a course."""
+    """Get all enrollments for a course (keyset-paginated)."""
     filters = EnrollmentFilters(
         course_id=course_id,
         page=page,
         page_size=page_size,
+        cursor=cursor,
+        include_total=include_total,
     )
 
-    enrollments, total = enrollment_service.list_enrollments(
+    enrollments = enrollment_service.list_enrollments(
         db=db,
         filters=filters,
     )
@@ -741,8 +754,6 @@ def get_course_enrollments(
         request=request,
         obj=enrollments,
         resource_name="enrollments",
-        page=page,
-        page_size=page_size,
         summary_func=lambda e: e.get_summary(include_relations=True),
     )
 
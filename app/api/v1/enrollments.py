@@ -323,7 +323,7 @@ def list_enrollments_endpoint(
     current_user: User = Depends(tutor_required),
     include_relations: bool = Query(default=False),  # ← Optional control
 ):
-    enrollments, total = enrollment_service.list_enrollments(
+    enrollments = enrollment_service.list_enrollments(
         db=db,
         filters=filters
     )
@@ -354,8 +354,6 @@ def list_enrollments_endpoint(
         obj=enrollments,
         resource_name="enrollments",
         summary_func=enrollment_serializer,
-        page=filters.page,
-        page_size=filters.page_size
     )
 
     return serializer.get_response("Enrollments fetched successfully")
@@ -261,7 +261,7 @@ def list_module_lessons_endpoint(
     
     serializer = PageSerializer(
         request=request,
-        items=lessons,
+        obj=lessons,
         resource_name="lessons",
         page=page,
         page_size=page_size,
@@ -49,7 +49,7 @@ def list_course_modules_endpoint(
     db: Session = Depends(get_db),
 ):
     """List all modules for a course"""
-    modules = module_service.list_course_modules(db, course_id)
+    modules = module_service.list_course_module_summaries(db, course_id)
 
     serializer = PageSerializer(
         request=request,
@@ -57,7 +57,6 @@ def list_course_modules_endpoint(
         resource_name="modules",
         page=page,
         page_size=page_size,
-        summary_func=lambda m: m.get_summary(include_relations=True),
     )
     return serializer.get_response("Modules fetched successfully")
 
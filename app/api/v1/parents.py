@@ -435,9 +435,11 @@ def list_links_endpoint(
     include_relations: bool = Query(default=True),
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=10, ge=1, le=100),
+    cursor: Optional[str] = Query(default=None),
+    include_total: bool = Query(default=False),
     db: Session = Depends(get_db),
 ):
-    """List all parent-student links with filtering and pagination"""
+    """List parent-student links with filtering and keyset pagination"""
     filters = ParentChildFilters(
         search=search,
         status=status,
@@ -448,17 +450,22 @@ def list_links_endpoint(
         order=order,
     )
     
-    query = parent_service.list_links(db, filters)
+    links = parent_service.list_links(
+        db,
+        filters,
+        page=page,
+        page_size=page_size,
+        cursor=cursor,
+        include_total=include_total,
+    )
     
     def link_serializer(links):
         return links.get_summary(include_relations=include_relations)
 
     serializer = PageSerializer(
         request=request,
-        obj=query,
+        obj=links,
         resource_name="links",
-        page=page,
-        page_size=page_size,
         summary_func=link_serializer,
     )
     
@@ -135,24 +135,22 @@
 """
 Performance API router - Endpoints for student performance and exports
 """
-import re
-from datetime import date
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Literal
+from typing import Literal, Optional
 from uuid import UUID
-from io import BytesIO
 
-from app.services import performance_service
-from app.api.deps.users import get_current_user, get_db
+from app.services import performance_service, report_export_service
+from app.api.deps.users import get_current_principal, get_db
 from app.models.user import User
+from app.services.principal_service import Principal
 
 router = APIRouter()
 
 
 def can_view_student_performance(
-    current_user: User,
+    current_user: Principal,
     student_id: UUID
 ) -> bool:
     """
@@ -165,20 +163,20 @@ def can_view_student_performance(
         return True
 
     # Elevated roles
-    return any(
-        role.name in ["admin", "tutor"]
-        for role in current_user.roles
-    )
+    return current_user.has_role("admin", "tutor")
 
 
 @router.get("/students/{student_id}")
 def get_student_performance(
     student_id: UUID,
+    attendance_limit: Optional[int] = Query(50, ge=0, le=500, description="Attendance records per page"),
+    attendance_offset: int = Query(0, ge=0, description="Attendance records to skip"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     Get comprehensive performance data for a student.
+    Attendance details are paginated; see attendance_pagination in the response.
 
     Access:
     - Students: own performance only
@@ -193,7 +191,9 @@ def get_student_performance(
     try:
         return performance_service.get_student_performance(
             db=db,
-            student_id=student_id
+            student_id=student_id,
+            attendance_limit=attendance_limit,
+            attendance_offset=attendance_offset
         )
     except Exception as e:
         
@@ -263,7 +263,7 @@ def export_performance_report(
     student_id: UUID,
     format: Literal["pdf", "excel"],
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     Export student performance report (PDF or Excel).
@@ -281,7 +281,7 @@ def export_performance_report(
     try:
         #  Fetch student
         student = (
-            db.query(User)
+            db.query(User.id)
             .filter(User.id == student_id)
             .first()
         )
@@ -292,45 +292,142 @@ def export_performance_report(
                 detail="Student not found"
             )
 
-        #  Build safe student name
-        full_name = f"{student.names}"
-        safe_name = re.sub(r"[^A-Za-z0-9_]", "", full_name)
+        # Served from the export cache when the student's data is unchanged
+        path = report_export_service.get_or_render_report(db, student_id, format)
 
-        today = date.today().isoformat()
+        return FileResponse(
+            path,
+            media_type=report_export_service.EXPORT_FORMATS[format]["media_type"],
+            filename=report_export_service.get_report_filename(db, student_id, format)
+        )
 
-        if format == "pdf":
-            report_data = performance_service.export_performance_pdf(
-                db, student_id
-            )
-            media_type = "application/pdf"
-            extension = "pdf"
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error generating report: {str(e)}"
+        )
 
-        else:  # excel
-            report_data = performance_service.export_performance_excel(
-                db, student_id
-            )
-            media_type = (
-                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+@router.get("/courses/{course_id}/export/{format}")
+def export_course_performance_reports(
+    course_id: UUID,
+    format: Literal["pdf", "excel"],
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Export the performance report of every student in a course as a ZIP
+    archive, streamed while the reports are rendered.
+
+    Access:
+    - Admins: any course
+    - Tutors: courses they are assigned to
+    """
+    if not current_user.is_admin:
+        is_assigned = current_user.is_tutor and course_id in current_user.assigned_course_ids
+
+        if not is_assigned:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to export this course's performance"
             )
-            extension = "xlsx"
 
-        filename = (
-            f"Performance_Report_{safe_name}_{today}.{extension}"
+    # All cohort data is loaded here, before the response starts streaming
+    reports = performance_service.build_course_performance_reports(
+        db, course_id, include_attendance_details=(format == "excel")
+    )
+    if not reports:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No enrollments found for this course"
         )
 
-        return StreamingResponse(
-            BytesIO(report_data),
-            media_type=media_type,
-            headers={
-                "Content-Disposition": f'attachment; filename="{filename}"'
-            }
+    filename = report_export_service.get_course_export_filename(db, course_id, format)
+    return StreamingResponse(
+        report_export_service.stream_course_reports(reports, format),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"'
+        }
+    )
+
+
+# ============================================================================
+# BACKGROUND EXPORT JOBS
+# ============================================================================
+
+def _get_authorized_job(job_id: str, current_user: Principal) -> dict:
+    job = report_export_service.get_export_job(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Export job not found"
         )
 
-    except HTTPException:
-        raise
-    except Exception as e:
+    if not can_view_student_performance(current_user, UUID(job["student_id"])):
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error generating report: {str(e)}"
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access this export"
+        )
+    return job
+
+
+@router.post(
+    "/students/{student_id}/export/{format}/jobs",
+    status_code=status.HTTP_202_ACCEPTED
+)
+def submit_performance_export(
+    student_id: UUID,
+    format: Literal["pdf", "excel"],
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Queue a performance report export and return its job.
+    Poll /performance/exports/{job_id}, then download once completed.
+    """
+    if not can_view_student_performance(current_user, student_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to export this student's performance"
         )
 
+    job = report_export_service.submit_export_job(
+        db, student_id, format, requested_by=current_user.id
+    )
+    return report_export_service.serialize_job(job)
+
+
+@router.get("/exports/{job_id}")
+def get_performance_export(
+    job_id: str,
+    current_user: Principal = Depends(get_current_principal)
+):
+    """Get the status of a performance report export job."""
+    job = _get_authorized_job(job_id, current_user)
+    return report_export_service.serialize_job(job)
+
+
+@router.get("/exports/{job_id}/download")
+def download_performance_export(
+    job_id: str,
+    current_user: Principal = Depends(get_current_principal)
+):
+    """Download the document of a completed export job."""
+    job = _get_authorized_job(job_id, current_user)
+
+    path = report_export_service.get_job_result_path(job)
+    if not path:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Export is not available (status: {job['status']})"
+        )
+
+    return FileResponse(
+        path,
+        media_type=report_export_service.EXPORT_FORMATS[job["format"]]["media_type"],
+        filename=job["filename"]
+    )
+
@@ -220,14 +220,21 @@ Student ID Card generation endpoints - Complete implementation
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from uuid import UUID
 import base64
 from io import BytesIO
 from PIL import Image
 
+from app.api.deps.users import get_async_db
+from app.models.course import Course
 from app.models.user import User
 from app.models.enrollment import Enrollment
+from app.utils.files.helpers import ALLOWED_IMAGE_TYPES
+from app.utils.files.upload import receive_upload
 
 # router = APIRouter()
 
@@ -301,6 +308,32 @@ from app.models.enrollment import Enrollment
 #         )
 
 
+def _process_id_photo(photo: UploadFile) -> str:
+    """Validate and resize an ID card photo; returns it as a JPEG data URI."""
+    # Validate type (sniffed) and size (max 2MB) in one chunked pass
+    received = receive_upload(photo, ALLOWED_IMAGE_TYPES, max_size_mb=2)
+    
+    # Process image, straight from the upload's spool
+    image = Image.open(received.file)
+    
+    # Resize to standard size (passport photo dimensions)
+    max_size = (600, 600)
+    image.thumbnail(max_size, Image.Resampling.LANCZOS)
+    
+    # Convert to RGB if necessary
+    if image.mode in ('RGBA', 'P'):
+        image = image.convert('RGB')
+    
+    # Save to BytesIO
+    output = BytesIO()
+    image.save(output, format='JPEG', quality=85, optimize=True)
+    output.seek(0)
+    
+    # Convert to base64
+    photo_base64 = base64.b64encode(output.read()).decode('utf-8')
+    return f"data:image/jpeg;base64,{photo_base64}"
+
+
 @router.post("/{student_id}/upload-photo")
 async def upload_id_photo(
     student_id: UUID,
@@ -320,36 +353,8 @@ async def upload_id_photo(
         )
     
     try:
-        # Validate file type
-        if not photo.content_type or not photo.content_type.startswith('image/'):
-            raise HTTPException(400, "File must be an image")
-        
-        # Read file contents
-        contents = await photo.read()
-        
-        # Validate file size (max 2MB)
-        if len(contents) > 2 * 1024 * 1024:
-            raise HTTPException(400, "Photo must be less than 2MB")
-        
-        # Process image
-        image = Image.open(BytesIO(contents))
-        
-        # Resize to standard size (passport photo dimensions)
-        max_size = (600, 600)
-        image.thumbnail(max_size, Image.Resampling.LANCZOS)
-        
-        # Convert to RGB if necessary
-        if image.mode in ('RGBA', 'P'):
-            image = image.convert('RGB')
-        
-        # Save to BytesIO
-        output = BytesIO()
-        image.save(output, format='JPEG', quality=85, optimize=True)
-        output.seek(0)
-        
-        # Convert to base64
-        photo_base64 = base64.b64encode(output.read()).decode('utf-8')
-        photo_data = f"data:image/jpeg;base64,{photo_base64}"
+        # Blocking file I/O and image processing
+        photo_data = await run_in_threadpool(_process_id_photo, photo)
         
         # Optionally update student record
         # student = db.query(User).filter(User.id == student_id).first()
@@ -377,7 +382,7 @@ async def upload_id_photo(
 async def generate_id_card_pdf(
     student_id: UUID,
     course_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -393,29 +398,34 @@ async def generate_id_card_pdf(
     
     try:
         # Get student
-        student = db.query(User).filter(User.id == student_id).first()
+        student = (await db.execute(
+            select(User.id, User.names, User.username, User.email, User.phone)
+            .where(User.id == student_id)
+        )).first()
         if not student:
             raise HTTPException(404, "Student not found")
         
-        # Get enrollment
-        enrollment = db.query(Enrollment).filter(
-            Enrollment.student_id == student_id,
-            Enrollment.course_id == course_id
-        ).first()
+        # Get enrollment with its course
+        enrollment = (await db.execute(
+            select(Enrollment.created_at, Course.title, Course.code)
+            .join(Course, Course.id == Enrollment.course_id)
+            .where(
+                Enrollment.student_id == student_id,
+                Enrollment.course_id == course_id
+            )
+        )).first()
         
         if not enrollment:
             raise HTTPException(404, "Enrollment not found")
         
-        course = enrollment.course
-        
         return {
             "student_name": student.names if student.names else student.username,
             "student_id": student.username if student.username else str(student.id)[:8].upper(),
             "email": student.email,
-            "course_name": course.title,
-            "course_code": course.code,
+            "course_name": enrollment.title,
+            "course_code": enrollment.code,
             "enrolled_date": enrollment.created_at.isoformat() if enrollment.created_at else None,
-            "phone": student.phone if hasattr(student, 'phone') else None
+            "phone": student.phone
         }
     
     except HTTPException:
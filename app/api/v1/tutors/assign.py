@@ -42,7 +42,7 @@ def list_assignments_endpoint(
     """
     Get all tutor assignments with filtering, sorting, and pagination.
     """
-    assignments, total = list_assignments(
+    assignments = list_assignments(
         db=db,
         filters=filters
     )
@@ -55,8 +55,6 @@ def list_assignments_endpoint(
         obj=assignments,
         resource_name="assignments",
         summary_func=assignment_serializer,
-        page=filters.page,
-        page_size=filters.page_size
     )
 
     return serializer.get_response("Assignments fetched successfully")
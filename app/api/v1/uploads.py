@@ -1,8 +1,9 @@
 from fastapi import APIRouter, UploadFile, File, Depends
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 # from app.database import get_db
-from app.services.file_service import upload_file
+from app.services import file_service
 from app.utils.responses import api_response
 # from app.utils.api_response import api_response
 
@@ -14,7 +15,9 @@ async def upload_image(
     file: UploadFile = File(...)
 ):
 
-    result = upload_file(
+    # Blocking file I/O and image processing
+    result = await run_in_threadpool(
+        file_service.upload_file,
         file=file,
         upload_subdir="images",
         dimensions=(600, 600)
@@ -263,13 +263,13 @@ Handles CRUD, avatar upload, role management, and parent-student linking.
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, File, Query, UploadFile, status
+from fastapi import APIRouter, Depends, File, Query, Request, UploadFile, status
 from sqlalchemy.orm import Session
 
 from app.api.deps.users import admin_required, get_current_user, get_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdateSchema, UserResponse, PasswordUpdate, UserFilters
-from app.utils.responses import api_response
+from app.utils.responses import PageSerializer, api_response
 
 from app.services.user_service import (
     list_users,
@@ -295,21 +295,34 @@ router = APIRouter()
 
 @router.get("")
 def get_users(
+    request: Request,
     search: str | None = Query(None),
     is_active: bool | None = Query(None),
     role: str | None = Query(None),
+    sort_by: str = Query("created_at", pattern="^(created_at|relevance)$"),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None),
+    include_total: bool = Query(False),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    filters = UserFilters(search=search, is_active=is_active, role=role)
-    users = list_users(db, filters=filters, page=page, page_size=page_size)
-    return api_response(
-        success=True,
-        message="Users retrieved",
-        data={"users": [UserResponse.model_validate(u) for u in users]},
+    filters = UserFilters(search=search, is_active=is_active, role=role, sort_by=sort_by)
+    users = list_users(
+        db,
+        filters=filters,
+        page=page,
+        page_size=page_size,
+        cursor=cursor,
+        include_total=include_total,
+    )
+    serializer = PageSerializer(
+        request=request,
+        obj=users,
+        resource_name="users",
+        summary_func=lambda u: UserResponse.model_validate(u).model_dump(),
     )
+    return serializer.get_response("Users retrieved")
 
 
 @router.get("/{user_id}")
@@ -1,5 +1,7 @@
+import logging
 import os
-from typing import Optional
+import threading
+from typing import Dict, List, Optional
 from .models import AppConfig
 from .loader import ConfigLoader
 
@@ -22,8 +24,65 @@ def reload_config() -> AppConfig:
 
 app_config = get_app_config() # called for direct and easy usage/access
 
+logger = logging.getLogger(__name__)
+
+# Sections read at call time (app_config.<section>.<field>) and safe to swap
+# while the process runs; everything else is read once at startup (engines,
+# middleware, CORS, JWT keys) and only changes on restart.
+RELOADABLE_SECTIONS = ("mail_config", "rate_limit_config")
+RELOADABLE_CONTENT_DELIVERY_FIELDS = ("max_file_size_mb", "allowed_file_types")
+
+_refresh_lock = threading.Lock()
+
+
+def refresh_config() -> Dict[str, List[str]]:
+    """
+    Re-read .env and config.yaml and apply the reloadable settings in place.
+
+    Modules hold the ``AppConfig`` object itself (``app_config``), so the
+    root object is kept and only its reloadable sections are replaced; a
+    reader that took a section (``mail = app_config.mail_config``) keeps a
+    consistent one. Changes to other sections are logged by name as needing
+    a restart. Values are never logged. If the new configuration does not
+    load, the current one stays in use.
+    """
+    with _refresh_lock:
+        current = get_app_config()
+        try:
+            fresh = ConfigLoader().load_config()
+        except Exception as e:
+            logger.error(f"Configuration reload failed, keeping the current configuration: {e}")
+            return {"applied": [], "restart_required": []}
+
+        applied: List[str] = []
+        for name in RELOADABLE_SECTIONS:
+            if getattr(fresh, name) != getattr(current, name):
+                setattr(current, name, getattr(fresh, name))
+                applied.append(name)
+
+        delivery = current.hosting_config.content_delivery
+        fresh_delivery = fresh.hosting_config.content_delivery
+        for name in RELOADABLE_CONTENT_DELIVERY_FIELDS:
+            if getattr(fresh_delivery, name) != getattr(delivery, name):
+                setattr(delivery, name, getattr(fresh_delivery, name))
+                applied.append(f"hosting_config.content_delivery.{name}")
+
+        restart_required = [
+            name for name in type(current).model_fields
+            if name not in RELOADABLE_SECTIONS and getattr(fresh, name) != getattr(current, name)
+        ]
+
+    if applied:
+        logger.info(f"Configuration reloaded: {', '.join(applied)}")
+    else:
+        logger.info("Configuration reloaded: no reloadable changes")
+    if restart_required:
+        logger.warning(f"Configuration changed but needs a restart to apply: {', '.join(restart_required)}")
+    return {"applied": applied, "restart_required": restart_required}
+
+
 # Export main model
-__all__ = ['AppConfig', 'get_app_config', 'reload_config', 'app_config']
+__all__ = ['AppConfig', 'get_app_config', 'reload_config', 'refresh_config', 'app_config']
 
 
 """ 
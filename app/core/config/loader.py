@@ -1,5 +1,6 @@
 # v2 - direct import - explicit is better than implicit - python-zen
 
+import logging
 import os
 from pathlib import Path
 import yaml
@@ -25,8 +26,12 @@ from .models import (
     MonitoringConfig,
     LoggingConfig,
     BackgroundTasksConfig,
+    RateLimitConfig,
+    RateLimitRule,
 )
 
+logger = logging.getLogger(__name__)
+
 
 class ConfigLoader:
     """Loads application configuration from environment variables and YAML files."""
@@ -67,9 +72,7 @@ class ConfigLoader:
         project_root = current_file.parent.parent.parent.parent
         dotenv_path = project_root / '.env'
         
-        # Debug: print the path (remove after confirming it works)
-        print(f"Loading .env from: {dotenv_path}")
-        print(f".env exists: {dotenv_path.exists()}")
+        logger.debug(f"Loading .env from: {dotenv_path} (exists: {dotenv_path.exists()})")
         
         # Load with explicit path
         load_dotenv(dotenv_path, override=True)
@@ -149,6 +152,33 @@ class ConfigLoader:
             return [item.strip() for item in value.split(",") if item.strip()]
         return []
     
+    def _to_rate_limit(self, value: Any) -> RateLimitRule:
+        """
+        Convert "limit/window_seconds[/algorithm[/key]]" (e.g. "5/300" or
+        "100/60/token_bucket/principal") or a YAML mapping to a rule.
+        """
+        if isinstance(value, RateLimitRule):
+            return value
+        if isinstance(value, dict):
+            return RateLimitRule(**value)
+        limit, window, *rest = [part.strip() for part in str(value).split("/")]
+        options = dict(zip(("algorithm", "key"), rest))
+        return RateLimitRule(limit=int(limit), window=int(window), **options)
+    
+    def _to_rate_limit_routes(self, value: Any) -> Dict[str, RateLimitRule]:
+        """
+        Convert a YAML mapping of route template -> rule, or
+        "POST /api/v1/auth/signin=10/60; GET /api/v1/search=30/60/token_bucket".
+        """
+        if isinstance(value, dict):
+            return {route: self._to_rate_limit(rule) for route, rule in value.items()}
+        routes = {}
+        for item in str(value).split(";"):
+            if item.strip():
+                route, rule = item.rsplit("=", 1)
+                routes[" ".join(route.split())] = self._to_rate_limit(rule)
+        return routes
+    
     def _to_dict_list(self, value: Any) -> List[Dict]:
         """Convert string representation of list of dicts."""
         if isinstance(value, list):
@@ -511,16 +541,32 @@ class ConfigLoader:
                     "APP_SQL_CONNECTION_STRING", 
                     ["database_config", "sql_connection_string"]
                 ),
+                async_sql_connection_string=self._get_value(
+                    "APP_ASYNC_SQL_CONNECTION_STRING",
+                    ["database_config", "async_sql_connection_string"]
+                ),
                 pool_size=self._get_value(
                     "APP_DB_POOL_SIZE",
                     ["database_config", "pool_size"],
-                    20,
+                    5,
                     self._to_int
                 ),
                 max_overflow=self._get_value(
                     "APP_DB_MAX_OVERFLOW",
                     ["database_config", "max_overflow"],
-                    40,
+                    10,
+                    self._to_int
+                ),
+                async_pool_size=self._get_value(
+                    "APP_DB_ASYNC_POOL_SIZE",
+                    ["database_config", "async_pool_size"],
+                    5,
+                    self._to_int
+                ),
+                async_max_overflow=self._get_value(
+                    "APP_DB_ASYNC_MAX_OVERFLOW",
+                    ["database_config", "async_max_overflow"],
+                    10,
                     self._to_int
                 ),
                 pool_recycle=self._get_value(
@@ -535,6 +581,24 @@ class ConfigLoader:
                     30,
                     self._to_int
                 ),
+                pool_pre_ping=self._get_value(
+                    "APP_DB_POOL_PRE_PING",
+                    ["database_config", "pool_pre_ping"],
+                    True,
+                    self._to_bool
+                ),
+                statement_timeout_ms=self._get_value(
+                    "APP_DB_STATEMENT_TIMEOUT_MS",
+                    ["database_config", "statement_timeout_ms"],
+                    0,
+                    self._to_int
+                ),
+                slow_query_ms=self._get_value(
+                    "APP_DB_SLOW_QUERY_MS",
+                    ["database_config", "slow_query_ms"],
+                    500,
+                    self._to_int
+                ),
                 echo=self._get_value(
                     "APP_DB_ECHO",
                     ["database_config", "echo"],
@@ -651,6 +715,18 @@ class ConfigLoader:
                 sentinel_password=self._get_value(
                     "APP_REDIS_SENTINEL_PASSWORD",
                     ["redis_config", "sentinel_password"]
+                ),
+                memory_fallback_max_entries=self._get_value(
+                    "APP_REDIS_MEMORY_FALLBACK_MAX_ENTRIES",
+                    ["redis_config", "memory_fallback_max_entries"],
+                    10000,
+                    self._to_int
+                ),
+                memory_fallback_shards=self._get_value(
+                    "APP_REDIS_MEMORY_FALLBACK_SHARDS",
+                    ["redis_config", "memory_fallback_shards"],
+                    16,
+                    self._to_int
                 )
             ),
             
@@ -696,6 +772,24 @@ class ConfigLoader:
                     12,
                     self._to_int
                 ),
+                scrypt_rounds=self._get_value(
+                    "APP_SCRYPT_ROUNDS",
+                    ["security_config", "scrypt_rounds"],
+                    16,
+                    self._to_int
+                ),
+                password_hash_workers=self._get_value(
+                    "APP_PASSWORD_HASH_WORKERS",
+                    ["security_config", "password_hash_workers"],
+                    2,
+                    self._to_int
+                ),
+                password_hash_max_queue=self._get_value(
+                    "APP_PASSWORD_HASH_MAX_QUEUE",
+                    ["security_config", "password_hash_max_queue"],
+                    64,
+                    self._to_int
+                ),
                 cors_allowed_origins=self._get_value(
                     "APP_CORS_ALLOWED_ORIGINS",
                     ["security_config", "cors_allowed_origins"],
@@ -704,6 +798,42 @@ class ConfigLoader:
                 )
             ),
             
+            rate_limit_config=RateLimitConfig(
+                enabled=self._get_value(
+                    "APP_RATE_LIMIT_ENABLED",
+                    ["rate_limit_config", "enabled"],
+                    True,
+                    self._to_bool
+                ),
+                routes=self._get_value(
+                    "APP_RATE_LIMIT_ROUTES",
+                    ["rate_limit_config", "routes"],
+                    {},
+                    self._to_rate_limit_routes
+                ),
+                default=self._get_value(
+                    "APP_RATE_LIMIT_DEFAULT",
+                    ["rate_limit_config", "default"],
+                    None,
+                    self._to_rate_limit
+                ),
+                **{
+                    name: self._get_value(
+                        f"APP_RATE_LIMIT_{name.upper()}",
+                        ["rate_limit_config", name],
+                        RateLimitConfig.model_fields[name].default,
+                        self._to_rate_limit
+                    )
+                    for name in (
+                        "signup_initiate",
+                        "verify_signup",
+                        "resend_verification",
+                        "forgot_password",
+                        "reset_password",
+                    )
+                }
+            ),
+            
             oauth_config=OAuthConfig(
                 google_client_id=self._get_value(
                     "APP_GOOGLE_CLIENT_ID",
@@ -875,6 +1005,11 @@ class ConfigLoader:
                     ["mail_config", "templates_dir"],
                     "./email_templates"
                 ),
+                template_cache_path=self._get_value(
+                    "APP_EMAIL_TEMPLATE_CACHE_PATH",
+                    ["mail_config", "template_cache_path"],
+                    "./.cache/jinja"
+                ),
                 emails_per_hour=self._get_value(
                     "APP_EMAILS_PER_HOUR",
                     ["mail_config", "emails_per_hour"],
@@ -886,6 +1021,72 @@ class ConfigLoader:
                     ["mail_config", "retry_attempts"],
                     3,
                     self._to_int
+                ),
+                queue_enabled=self._get_value(
+                    "APP_MAIL_QUEUE_ENABLED",
+                    ["mail_config", "queue_enabled"],
+                    True,
+                    self._to_bool
+                ),
+                queue_poll_interval_seconds=self._get_value(
+                    "APP_MAIL_QUEUE_POLL_INTERVAL_SECONDS",
+                    ["mail_config", "queue_poll_interval_seconds"],
+                    5.0,
+                    self._to_float
+                ),
+                queue_batch_size=self._get_value(
+                    "APP_MAIL_QUEUE_BATCH_SIZE",
+                    ["mail_config", "queue_batch_size"],
+                    20,
+                    self._to_int
+                ),
+                queue_lease_seconds=self._get_value(
+                    "APP_MAIL_QUEUE_LEASE_SECONDS",
+                    ["mail_config", "queue_lease_seconds"],
+                    120,
+                    self._to_int
+                ),
+                retry_backoff_seconds=self._get_value(
+                    "APP_EMAIL_RETRY_BACKOFF_SECONDS",
+                    ["mail_config", "retry_backoff_seconds"],
+                    60,
+                    self._to_int
+                ),
+                retry_backoff_max_seconds=self._get_value(
+                    "APP_EMAIL_RETRY_BACKOFF_MAX_SECONDS",
+                    ["mail_config", "retry_backoff_max_seconds"],
+                    3600,
+                    self._to_int
+                ),
+                breaker_failure_threshold=self._get_value(
+                    "APP_MAIL_BREAKER_FAILURE_THRESHOLD",
+                    ["mail_config", "breaker_failure_threshold"],
+                    3,
+                    self._to_int
+                ),
+                breaker_reset_seconds=self._get_value(
+                    "APP_MAIL_BREAKER_RESET_SECONDS",
+                    ["mail_config", "breaker_reset_seconds"],
+                    60,
+                    self._to_int
+                ),
+                smtp_pool_size=self._get_value(
+                    "APP_SMTP_POOL_SIZE",
+                    ["mail_config", "smtp_pool_size"],
+                    2,
+                    self._to_int
+                ),
+                smtp_session_max_messages=self._get_value(
+                    "APP_SMTP_SESSION_MAX_MESSAGES",
+                    ["mail_config", "smtp_session_max_messages"],
+                    100,
+                    self._to_int
+                ),
+                smtp_session_idle_seconds=self._get_value(
+                    "APP_SMTP_SESSION_IDLE_SECONDS",
+                    ["mail_config", "smtp_session_idle_seconds"],
+                    60,
+                    self._to_int
                 )
             ),
             
@@ -1005,6 +1206,30 @@ class ConfigLoader:
                     ["monitoring_config", "metrics_port"],
                     9090,
                     self._to_int
+                ),
+                request_metrics_enabled=self._get_value(
+                    "APP_REQUEST_METRICS_ENABLED",
+                    ["monitoring_config", "request_metrics_enabled"],
+                    True,
+                    self._to_bool
+                ),
+                request_query_budget=self._get_value(
+                    "APP_REQUEST_QUERY_BUDGET",
+                    ["monitoring_config", "request_query_budget"],
+                    30,
+                    self._to_int
+                ),
+                request_profiling_enabled=self._get_value(
+                    "APP_REQUEST_PROFILING_ENABLED",
+                    ["monitoring_config", "request_profiling_enabled"],
+                    True,
+                    self._to_bool
+                ),
+                profiler_interval_ms=self._get_value(
+                    "APP_PROFILER_INTERVAL_MS",
+                    ["monitoring_config", "profiler_interval_ms"],
+                    1.0,
+                    self._to_float
                 )
             ),
             
@@ -1080,6 +1305,29 @@ class ConfigLoader:
                     ["background_tasks_config", "retry_delay_seconds"],
                     5,
                     self._to_int
+                ),
+                export_cache_path=self._get_value(
+                    "APP_BACKGROUND_TASKS_EXPORT_CACHE_PATH",
+                    ["background_tasks_config", "export_cache_path"],
+                    "./.cache/exports"
+                ),
+                export_cache_ttl_hours=self._get_value(
+                    "APP_BACKGROUND_TASKS_EXPORT_CACHE_TTL_HOURS",
+                    ["background_tasks_config", "export_cache_ttl_hours"],
+                    48,
+                    self._to_int
+                ),
+                export_cache_max_mb=self._get_value(
+                    "APP_BACKGROUND_TASKS_EXPORT_CACHE_MAX_MB",
+                    ["background_tasks_config", "export_cache_max_mb"],
+                    1024,
+                    self._to_int
+                ),
+                export_job_timeout_minutes=self._get_value(
+                    "APP_BACKGROUND_TASKS_EXPORT_JOB_TIMEOUT_MINUTES",
+                    ["background_tasks_config", "export_job_timeout_minutes"],
+                    30,
+                    self._to_int
                 )
             )
         )
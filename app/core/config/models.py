@@ -520,7 +520,7 @@
 # v2
 # app/core/config/models.py
 
-from typing import Literal, Optional
+from typing import Dict, Literal, Optional
 from pydantic import BaseModel, EmailStr, computed_field, field_validator, model_validator
 from urllib.parse import urlparse
 
@@ -650,9 +650,42 @@ class SecurityConfig(BaseModel):
     password_reset_token_expire_minutes: int = 15
     email_verification_token_expire_minutes: int = 60 * 24
     bcrypt_rounds: int = 12
+    scrypt_rounds: int = 16              # log2 of scrypt's N; passlib's default
+    # Hashing process pool (app.core.security.hashing): hashes running at
+    # once, and requests allowed to wait for one before answering 503
+    password_hash_workers: int = 2
+    password_hash_max_queue: int = 64
     cors_allowed_origins: list[str] = ["http://localhost:3000", "http://localhost:8001"]
 
 
+# ============================================================
+# RATE LIMITS
+# Reloadable without a restart (SIGHUP, see app.core.config.refresh_config)
+# ============================================================
+
+class RateLimitRule(BaseModel):
+    limit: int
+    window: int  # seconds
+    # sliding_window: at most `limit` in any trailing `window`
+    # token_bucket: bursts of up to `limit`, refilled at `limit` per `window`
+    algorithm: Literal["sliding_window", "token_bucket"] = "sliding_window"
+    # Counted per client IP, or per signed-in user (IP for anonymous requests)
+    key: Literal["ip", "principal"] = "ip"
+
+
+class RateLimitConfig(BaseModel):
+    enabled: bool = True
+    signup_initiate: RateLimitRule = RateLimitRule(limit=50, window=3600)
+    verify_signup: RateLimitRule = RateLimitRule(limit=10, window=300)
+    resend_verification: RateLimitRule = RateLimitRule(limit=100, window=3600)
+    forgot_password: RateLimitRule = RateLimitRule(limit=5, window=3600)
+    reset_password: RateLimitRule = RateLimitRule(limit=5, window=300)
+    # Per route template ("POST /api/v1/auth/signin"), and one rule applied
+    # to every route on top; see app.core.ratelimit
+    routes: Dict[str, RateLimitRule] = {}
+    default: Optional[RateLimitRule] = None
+
+
 # ============================================================
 # OAUTH
 # ============================================================
@@ -714,9 +747,28 @@ class MailConfig(BaseModel):
     mailgun_domain: Optional[str] = None
 
     templates_dir: str = "./app/templates"
+    template_cache_path: str = "./.cache/jinja"  # compiled email template bytecode; empty disables
     emails_per_hour: int = 100
     retry_attempts: int = 3
 
+    # Outbound queue (outbound_emails table) and its worker
+    queue_enabled: bool = True
+    queue_poll_interval_seconds: float = 5.0
+    queue_batch_size: int = 20
+    queue_lease_seconds: int = 120       # per message, renewed before each send; must outlast one delivery
+    retry_backoff_seconds: int = 60      # doubled per attempt, capped at retry_backoff_max_seconds
+    retry_backoff_max_seconds: int = 3600
+
+    # Provider circuit breaker: skip a provider for breaker_reset_seconds
+    # after breaker_failure_threshold consecutive failures
+    breaker_failure_threshold: int = 3
+    breaker_reset_seconds: int = 60
+
+    # Reused authenticated SMTP sessions, per server
+    smtp_pool_size: int = 2
+    smtp_session_max_messages: int = 100
+    smtp_session_idle_seconds: int = 60
+
     @field_validator("smtp_port")
     @classmethod
     def validate_smtp_port(cls, v: int) -> int:
@@ -747,10 +799,27 @@ class MailConfig(BaseModel):
 
 class DatabaseConfig(BaseModel):
     sql_connection_string: Optional[str] = None
-    pool_size: int = 20
-    max_overflow: int = 40
+    # asyncpg URL for the AsyncSession engine; derived from
+    # sql_connection_string when not set
+    async_sql_connection_string: Optional[str] = None
+    # Connections are per engine and per process: each worker process has a
+    # sync engine (pool_size + max_overflow) and, once an async handler has
+    # run, an async one (async_pool_size + async_max_overflow). Peak use is
+    # workers x (both sums); with 4 workers and these defaults, 120. Keep it
+    # under the server's max_connections (PostgreSQL default 100) minus
+    # other clients, or put PgBouncer in front.
+    pool_size: int = 5
+    max_overflow: int = 10
+    async_pool_size: int = 5
+    async_max_overflow: int = 10
     pool_recycle: int = 3600
     pool_timeout: int = 30
+    pool_pre_ping: bool = True
+    # Server-side statement timeout in milliseconds (PostgreSQL); 0 disables it
+    statement_timeout_ms: int = 0
+    # Statements at least this slow are logged and listed by fingerprint on
+    # the admin database metrics endpoint
+    slow_query_ms: int = 500
     echo: bool = False
 
 
@@ -779,6 +848,9 @@ class RedisConfig(BaseModel):
     sentinel_nodes: list[dict] = []
     sentinel_service_name: str = "mymaster"
     sentinel_password: Optional[str] = None
+    # In-memory fallback used while Redis is unreachable
+    memory_fallback_max_entries: int = 10000
+    memory_fallback_shards: int = 16
 
     @model_validator(mode="before")
     @classmethod
@@ -870,6 +942,13 @@ class MonitoringConfig(BaseModel):
     enable_health_checks: bool = True
     enable_metrics: bool = False
     metrics_port: int = 9090
+    # Per-route request metrics (admin /metrics/routes)
+    request_metrics_enabled: bool = True
+    # Requests running more SQL statements than this are logged; 0 disables it
+    request_query_budget: int = 30
+    # Admin X-Profile / ?_profile=1 sampling profiler
+    request_profiling_enabled: bool = True
+    profiler_interval_ms: float = 1.0
 
 
 class LoggingConfig(BaseModel):
@@ -888,6 +967,10 @@ class BackgroundTasksConfig(BaseModel):
     queue_max_size: int = 100
     retry_attempts: int = 3
     retry_delay_seconds: int = 5
+    export_cache_path: str = "./.cache/exports"  # rendered reports; keep out of uploads (publicly served)
+    export_cache_ttl_hours: int = 48  # rendered reports and job records untouched this long are deleted
+    export_cache_max_mb: int = 1024  # past this, least recently used reports are deleted first
+    export_job_timeout_minutes: int = 30  # pending jobs older than this are reported as failed
 
 
 # ============================================================
@@ -900,6 +983,7 @@ class AppConfig(BaseModel):
     database_config: DatabaseConfig = DatabaseConfig()
     redis_config: RedisConfig = RedisConfig()
     security_config: SecurityConfig
+    rate_limit_config: RateLimitConfig = RateLimitConfig()
     oauth_config: OAuthConfig = OAuthConfig()
     ai_config: AIConfig = AIConfig()
     mail_config: MailConfig
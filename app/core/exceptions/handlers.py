@@ -53,13 +53,17 @@ class ExceptionHandler:
             f"HTTPException {exc.status_code} at {request.url.path}: {exc.detail}"
         )
                 
-        return api_response(
+        response = api_response(
             success=False,
             message=str(exc.detail),
             errors={"status_code": exc.status_code},
             status_code=exc.status_code,
             path=str(request.url.path)
         )
+        # Retry-After, WWW-Authenticate, ...
+        if exc.headers:
+            response.headers.update(exc.headers)
+        return response
     
     async def validation_exception_handler_0(
         self,
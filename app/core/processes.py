@@ -0,0 +1,24 @@
+# app/core/processes.py
+"""
+Process pools for CPU-bound work (report rendering, password hashing).
+
+The pools start lazily inside a running server process, which already has
+threads: the anyio threadpool, the database and Redis connection pools and
+logging handlers. Forking such a process copies into the child any lock
+another thread holds at that moment, and nothing will ever release it.
+Workers are therefore started with "spawn", as a fresh interpreter that
+imports only the modules of the functions submitted to it.
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+START_METHOD = "spawn"
+
+
+def process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """A ProcessPoolExecutor whose workers are spawned, never forked."""
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context(START_METHOD),
+    )
@@ -0,0 +1,26 @@
+"""
+Request profiling: per-route timings, SQL statement budget and an
+admin-only sampling profiler for single requests.
+"""
+
+from fastapi import FastAPI
+
+from .stats import current_request, route_metrics, serialization_timer
+
+
+def setup_request_profiling(app: FastAPI, config) -> None:
+    monitoring = config.monitoring_config
+    if not monitoring.request_metrics_enabled:
+        return
+
+    from .middleware import RequestProfilingMiddleware
+
+    app.add_middleware(
+        RequestProfilingMiddleware,
+        query_budget=monitoring.request_query_budget,
+        profiling_enabled=monitoring.request_profiling_enabled,
+        profiler_interval_ms=monitoring.profiler_interval_ms,
+    )
+
+
+__all__ = ['setup_request_profiling', 'route_metrics', 'current_request', 'serialization_timer']
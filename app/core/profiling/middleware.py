@@ -0,0 +1,169 @@
+# app/core/profiling/middleware.py
+import json
+import logging
+import time
+from http.cookies import SimpleCookie
+from typing import Optional
+from urllib.parse import parse_qs
+
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.profiling.sampler import SamplingProfiler
+from app.core.profiling.stats import begin_request, route_metrics
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_QUERY_PARAM = "_profile"
+
+
+def _route_template(scope: Scope) -> Optional[str]:
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if path is None:
+        return None
+    return f"{scope['method']} {path}"
+
+
+def _access_token(scope: Scope) -> Optional[str]:
+    headers = dict(scope.get("headers") or [])
+    authorization = headers.get(b"authorization", b"").decode("latin-1")
+    if authorization.lower().startswith("bearer "):
+        return authorization[7:].strip()
+    cookie = headers.get(b"cookie")
+    if cookie:
+        morsel = SimpleCookie(cookie.decode("latin-1")).get("access_token")
+        if morsel is not None:
+            return morsel.value
+    return None
+
+
+def _is_admin_token(token: str) -> bool:
+    from app.core.security.auth import decode_token
+    from app.db.session import SessionLocal
+    from app.services.principal_service import get_principal
+
+    try:
+        payload = decode_token(token, token_type="access")
+    except Exception:
+        return False
+    user_id = payload.get("user_id") or payload.get("sub")
+    if not user_id:
+        return False
+    with SessionLocal() as db:
+        principal = get_principal(db, user_id)
+    return principal is not None and principal.is_admin
+
+
+class RequestProfilingMiddleware:
+    """
+    Per route template metrics: wall time, statement count, database time
+    and serialization time, kept in ``route_metrics``. Requests running more
+    statements than ``query_budget`` are logged as warnings.
+
+    An admin can profile a single request by sending ``X-Profile: 1`` or
+    ``?_profile=1``: the response body is then replaced by the sampling
+    profiler's report, along with the original status code and timings.
+    """
+
+    def __init__(self, app: ASGIApp, query_budget: int = 0,
+                 profiling_enabled: bool = True, profiler_interval_ms: float = 1.0):
+        self.app = app
+        self.query_budget = query_budget
+        self.profiling_enabled = profiling_enabled
+        self.profiler_interval = profiler_interval_ms / 1000
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if self.profiling_enabled and await self._profile_requested(scope):
+            await self._profile(scope, receive, send)
+            return
+
+        stats = begin_request()
+        started = time.perf_counter()
+        status_code = 500
+        finished = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, finished
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                # Background tasks run after the body is sent; not part of the request
+                finished = time.perf_counter()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self._record(scope, (finished or time.perf_counter()) - started, stats, status_code)
+
+    def _record(self, scope: Scope, wall: float, stats, status_code: int) -> bool:
+        route = _route_template(scope)
+        if route is None:
+            return False
+        over_budget = bool(self.query_budget) and stats.statements > self.query_budget
+        if over_budget:
+            logger.warning(
+                f"{route} ran {stats.statements} statements (budget {self.query_budget}) "
+                f"in {wall * 1000:.1f} ms, {stats.db_time * 1000:.1f} ms in the database"
+            )
+        route_metrics.record(route, wall, stats, status_code, over_budget)
+        return over_budget
+
+    async def _profile_requested(self, scope: Scope) -> bool:
+        flagged = any(
+            name == PROFILE_HEADER and value not in (b"", b"0", b"false")
+            for name, value in scope.get("headers") or []
+        )
+        if not flagged:
+            query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+            flagged = query.get(PROFILE_QUERY_PARAM, ["0"])[-1] not in ("", "0", "false")
+        if not flagged:
+            return False
+        token = _access_token(scope)
+        # Not admin: the flag is ignored and the request runs normally
+        return bool(token) and await run_in_threadpool(_is_admin_token, token)
+
+    async def _profile(self, scope: Scope, receive: Receive, send: Send) -> None:
+        stats = begin_request()
+        profiler = SamplingProfiler(self.profiler_interval, lambda: stats.threads)
+        response_start = {"status": 500, "headers": []}
+
+        async def capture(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response_start.update(message)
+
+        started = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, capture)
+        finally:
+            profiler.stop()
+            wall = time.perf_counter() - started
+        over_budget = self._record(scope, wall, stats, response_start["status"])
+
+        body = json.dumps({
+            "route": _route_template(scope),
+            "status_code": response_start["status"],
+            "wall_ms": round(wall * 1000, 3),
+            "statements": stats.statements,
+            "query_budget": self.query_budget,
+            "over_budget": over_budget,
+            "db_ms": round(stats.db_time * 1000, 3),
+            "serialize_ms": round(stats.serialize_time * 1000, 3),
+            "profile": profiler.report(),
+        }).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
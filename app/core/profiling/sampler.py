@@ -0,0 +1,160 @@
+# app/core/profiling/sampler.py
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# (filename, function, first line) of one frame
+FrameKey = Tuple[str, str, int]
+
+_MAX_DEPTH = 128
+_TREE_MIN_FRACTION = 0.02
+_TOP_FUNCTIONS = 30
+
+# Leaf frames of an event loop waiting for I/O: not time spent on the request
+_IDLE_LEAVES = {("selectors.py", "select"), ("selectors.py", "poll")}
+
+
+def _short_path(filename: str) -> str:
+    marker = "site-packages" + os.sep
+    if marker in filename:
+        return filename.split(marker, 1)[1]
+    cwd = os.getcwd() + os.sep
+    if filename.startswith(cwd):
+        return filename[len(cwd):]
+    return filename
+
+
+def _label(key: FrameKey) -> str:
+    filename, function, line = key
+    return f"{function} ({_short_path(filename)}:{line})"
+
+
+class _Node:
+    __slots__ = ("samples", "children")
+
+    def __init__(self):
+        self.samples = 0
+        self.children: Dict[FrameKey, "_Node"] = {}
+
+
+class SamplingProfiler:
+    """
+    Samples the stacks of a request's threads every ``interval`` seconds.
+
+    Sync endpoints run in the threadpool, so a profiler hooked into the
+    event loop thread (cProfile, pyinstrument's async mode) would not see
+    them. Instead every thread is sampled through sys._current_frames(), and
+    only the threads that ``thread_ids()`` reports as having done work for
+    the request are kept when the report is built. Samples of other
+    requests running concurrently on the event loop thread may be mixed in,
+    so profile against a quiet worker.
+    """
+
+    def __init__(self, interval: float, thread_ids: Callable[[], Iterable[int]]):
+        self.interval = interval
+        self.thread_ids = thread_ids
+        self.samples: Dict[int, Counter] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.ticks = 0
+        self.started = 0.0
+        self.elapsed = 0.0
+
+    def start(self) -> None:
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.elapsed = time.perf_counter() - self.started
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.ticks += 1
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < _MAX_DEPTH:
+                    code = frame.f_code
+                    stack.append((code.co_filename, code.co_name, code.co_firstlineno))
+                    frame = frame.f_back
+                stack.reverse()
+                self.samples.setdefault(thread_id, Counter())[tuple(stack)] += 1
+
+    def _request_stacks(self) -> Counter:
+        stacks: Counter = Counter()
+        for thread_id in set(self.thread_ids()):
+            for stack, count in self.samples.get(thread_id, {}).items():
+                leaf = stack[-1] if stack else None
+                if leaf is None or (os.path.basename(leaf[0]), leaf[1]) in _IDLE_LEAVES:
+                    continue
+                # Idle threadpool workers wait on their queue between tasks
+                if leaf[1] == "wait" and leaf[0].endswith("threading.py"):
+                    continue
+                stacks[stack] += count
+        return stacks
+
+    def report(self) -> Dict[str, Any]:
+        """Per-function self/total time and a call tree, in milliseconds."""
+        stacks = self._request_stacks()
+        total = sum(stacks.values())
+        # Walking the stacks stretches the interval; spread the measured
+        # duration over the samples actually taken
+        ms = self.elapsed * 1000 / self.ticks if self.ticks else self.interval * 1000
+
+        self_counts: Counter = Counter()
+        total_counts: Counter = Counter()
+        root = _Node()
+        for stack, count in stacks.items():
+            self_counts[stack[-1]] += count
+            for key in set(stack):
+                total_counts[key] += count
+            node = root
+            node.samples += count
+            for key in stack:
+                node = node.children.setdefault(key, _Node())
+                node.samples += count
+
+        functions = [
+            {
+                "function": _label(key),
+                "self_ms": round(self_counts[key] * ms, 3),
+                "total_ms": round(count * ms, 3),
+                "total_pct": round(count / total * 100, 1),
+            }
+            for key, count in total_counts.most_common()
+            if self_counts[key]
+        ]
+        functions.sort(key=lambda f: f["self_ms"], reverse=True)
+
+        return {
+            "interval_ms": round(ms, 3),
+            "duration_ms": round(self.elapsed * 1000, 3),
+            "samples": total,
+            "functions": functions[:_TOP_FUNCTIONS],
+            "call_tree": self._render(root, total, ms),
+        }
+
+    @staticmethod
+    def _render(root: _Node, total: int, ms: float) -> List[str]:
+        lines: List[str] = []
+        minimum = max(1, int(total * _TREE_MIN_FRACTION))
+
+        def walk(node: _Node, depth: int) -> None:
+            children = sorted(node.children.items(), key=lambda item: item[1].samples, reverse=True)
+            for key, child in children:
+                if child.samples < minimum:
+                    break
+                lines.append(f"{'  ' * depth}{child.samples * ms:.1f}ms {_label(key)}")
+                walk(child, depth + 1)
+
+        walk(root, 0)
+        return lines
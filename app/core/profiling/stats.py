@@ -0,0 +1,162 @@
+# app/core/profiling/stats.py
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, List, Optional, Set
+
+# Requests kept per route for the percentiles
+WINDOW_SIZE = 1000
+
+_current_request: ContextVar[Optional["RequestStats"]] = ContextVar("current_request", default=None)
+
+
+class RequestStats:
+    """
+    Counters for the request being handled.
+
+    Set in a ContextVar by the middleware. The context is copied into the
+    threadpool that runs sync dependencies and endpoints, so database events
+    and serializers running there add to the same object.
+    """
+
+    __slots__ = ("statements", "db_time", "serialize_time", "threads", "_serialize_depth")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        # Threads that did work for this request (for the sampling profiler)
+        self.threads: Set[int] = set()
+        self._serialize_depth = 0
+
+    def add_statement(self, elapsed: float) -> None:
+        self.statements += 1
+        self.db_time += elapsed
+        self.threads.add(threading.get_ident())
+
+
+def current_request() -> Optional[RequestStats]:
+    return _current_request.get()
+
+
+def begin_request() -> RequestStats:
+    stats = RequestStats()
+    stats.threads.add(threading.get_ident())
+    _current_request.set(stats)
+    return stats
+
+
+@contextmanager
+def serialization_timer():
+    """Add the enclosed time to the current request's serialization time."""
+    stats = _current_request.get()
+    if stats is None:
+        yield
+        return
+    stats.threads.add(threading.get_ident())
+    stats._serialize_depth += 1
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats._serialize_depth -= 1
+        # Nested timers (api_response inside PageSerializer) count once
+        if stats._serialize_depth == 0:
+            stats.serialize_time += time.perf_counter() - started
+
+
+def _summary(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {"p50": 0.0, "p90": 0.0, "p99": 0.0, "max": 0.0, "avg": 0.0}
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+
+    def pick(fraction: float) -> float:
+        return round(ordered[min(last, int(len(ordered) * fraction))], 3)
+
+    return {
+        "p50": pick(0.50),
+        "p90": pick(0.90),
+        "p99": pick(0.99),
+        "max": round(ordered[last], 3),
+        "avg": round(sum(ordered) / len(ordered), 3),
+    }
+
+
+class RouteStats:
+    """Totals and a rolling window of the last WINDOW_SIZE requests of a route."""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.over_budget = 0
+        self.wall_total = 0.0
+        self.wall_ms: Deque[float] = deque(maxlen=WINDOW_SIZE)
+        self.db_ms: Deque[float] = deque(maxlen=WINDOW_SIZE)
+        self.statements: Deque[float] = deque(maxlen=WINDOW_SIZE)
+        self.serialize_ms: Deque[float] = deque(maxlen=WINDOW_SIZE)
+
+    def snapshot(self, route: str) -> Dict[str, Any]:
+        return {
+            "route": route,
+            "count": self.count,
+            "errors": self.errors,
+            "over_budget": self.over_budget,
+            "total_ms": round(self.wall_total * 1000, 3),
+            "window": len(self.wall_ms),
+            "wall_ms": _summary(list(self.wall_ms)),
+            "db_ms": _summary(list(self.db_ms)),
+            "statements": _summary(list(self.statements)),
+            "serialize_ms": _summary(list(self.serialize_ms)),
+        }
+
+
+class RouteMetrics:
+    """Per route template (``GET /api/v1/courses/{course_id}``) request metrics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[str, RouteStats] = {}
+        self.started_at = time.time()
+
+    def record(self, route: str, wall: float, stats: RequestStats,
+               status_code: int, over_budget: bool) -> None:
+        with self._lock:
+            entry = self._routes.get(route)
+            if entry is None:
+                entry = self._routes[route] = RouteStats()
+            entry.count += 1
+            if status_code >= 500:
+                entry.errors += 1
+            if over_budget:
+                entry.over_budget += 1
+            entry.wall_total += wall
+            entry.wall_ms.append(wall * 1000)
+            entry.db_ms.append(stats.db_time * 1000)
+            entry.statements.append(stats.statements)
+            entry.serialize_ms.append(stats.serialize_time * 1000)
+
+    def snapshot(self, sort: str = "total_ms", top: int = 50) -> Dict[str, Any]:
+        with self._lock:
+            routes = [entry.snapshot(route) for route, entry in self._routes.items()]
+            started_at = self.started_at
+
+        def sort_key(route: Dict[str, Any]) -> float:
+            if sort in ("p50", "p90", "p99", "max", "avg"):
+                return route["wall_ms"][sort]
+            if sort == "statements":
+                return route["statements"]["p90"]
+            return route.get(sort, route["total_ms"])
+
+        routes.sort(key=sort_key, reverse=True)
+        return {"since": started_at, "window_size": WINDOW_SIZE, "routes": routes[:top]}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+            self.started_at = time.time()
+
+
+route_metrics = RouteMetrics()
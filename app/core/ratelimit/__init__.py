@@ -0,0 +1,38 @@
+"""
+Rate limiting: sliding-window and token-bucket limits checked in one
+atomic Redis script call (in-memory when Redis is unavailable), applied
+
+- per named rule, as a route dependency:
+  ``dependencies=[Depends(rate_limit("forgot_password"))]``
+- per route template and globally, from rate_limit_config.routes and
+  rate_limit_config.default, to every route
+- in a Redis pipeline next to other reads, via ``queue_rate_limit`` and
+  ``enforce_rate_limit``
+
+and reported in RateLimit-* response headers.
+"""
+
+from fastapi import Depends, FastAPI
+
+from .policy import (
+    check_rate_limit,
+    enforce_rate_limit,
+    queue_rate_limit,
+    rate_limit,
+    route_rate_limit,
+)
+
+
+def setup_rate_limiting(app: FastAPI) -> None:
+    """Install the route policies and response headers; call before including routers."""
+    from .middleware import RateLimitHeadersMiddleware
+
+    # Router-level dependencies are copied into routes as they are included
+    app.router.dependencies.append(Depends(route_rate_limit))
+    app.add_middleware(RateLimitHeadersMiddleware)
+
+
+__all__ = [
+    'setup_rate_limiting', 'rate_limit', 'check_rate_limit',
+    'queue_rate_limit', 'enforce_rate_limit',
+]
@@ -0,0 +1,33 @@
+# app/core/ratelimit/middleware.py
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.ratelimit.policy import STATE_KEY, rate_limit_headers
+
+
+class RateLimitHeadersMiddleware:
+    """
+    Adds RateLimit-Limit, RateLimit-Remaining, RateLimit-Reset and
+    RateLimit-Policy (and Retry-After on 429) to responses of requests that
+    were checked against a rate limit, whatever kind of response the
+    endpoint or exception handler returned.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                result = scope.get("state", {}).get(STATE_KEY)
+                if result is not None:
+                    headers = MutableHeaders(scope=message)
+                    for name, value in rate_limit_headers(result).items():
+                        headers[name] = value
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -0,0 +1,149 @@
+# app/core/ratelimit/policy.py
+import math
+from typing import Dict, Optional
+
+from fastapi import HTTPException, Request, status
+from starlette.concurrency import run_in_threadpool
+
+from app.api.deps.storage import get_redis_service
+from app.core.config import get_app_config
+from app.services.memory_store import MemoryStore
+from app.services.rate_limit import RateLimitResult, memory_hit
+from app.utils.helpers import get_client_ip
+
+config = get_app_config()
+
+# request.state attribute holding the result reported in RateLimit-* headers
+STATE_KEY = "rate_limit"
+
+DEFAULT_MESSAGE = "Too many requests. Please try again later."
+
+# Counters when no RedisService could be created at all; with one, its own
+# in-memory fallback takes over when Redis goes away
+_local_store = MemoryStore(
+    max_entries=config.redis_config.memory_fallback_max_entries,
+    shards=config.redis_config.memory_fallback_shards,
+)
+
+
+def _principal(request: Request) -> Optional[str]:
+    """User id from the access token (header or cookie), without a database lookup."""
+    from app.core.security.auth import decode_token
+
+    authorization = request.headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        token = authorization[7:].strip()
+    else:
+        token = request.cookies.get("access_token")
+    if not token:
+        return None
+    try:
+        payload = decode_token(token, token_type="access")
+    except Exception:
+        return None
+    user_id = payload.get("user_id") or payload.get("sub")
+    return str(user_id) if user_id else None
+
+
+def identity(request: Request, rule) -> str:
+    """Who a rule counts: "user:<id>" for principal rules when signed in, else "ip:<address>"."""
+    if rule.key == "principal":
+        user_id = _principal(request)
+        if user_id:
+            return f"user:{user_id}"
+    return f"ip:{get_client_ip(request)}"
+
+
+def rate_limit_headers(result: RateLimitResult) -> Dict[str, str]:
+    headers = {
+        "RateLimit-Limit": str(result.limit),
+        "RateLimit-Remaining": str(result.remaining),
+        "RateLimit-Reset": str(math.ceil(result.reset_after)),
+        "RateLimit-Policy": f"{result.limit};w={result.window}",
+    }
+    if not result.allowed:
+        headers["Retry-After"] = str(max(1, math.ceil(result.retry_after)))
+    return headers
+
+
+def enforce_rate_limit(
+    request: Request,
+    result: RateLimitResult,
+    message: str = DEFAULT_MESSAGE
+) -> None:
+    """
+    Report ``result`` in the response's RateLimit-* headers (the most
+    restrictive one when a request is checked against several rules) and
+    answer 429 when it was denied.
+    """
+    current = getattr(request.state, STATE_KEY, None)
+    if current is None or not result.allowed or (current.allowed and result.remaining < current.remaining):
+        setattr(request.state, STATE_KEY, result)
+    if not result.allowed and config.rate_limit_config.enabled:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=message,
+            headers=rate_limit_headers(result),
+        )
+
+
+def queue_rate_limit(batch, request: Request, name: str):
+    """
+    Queue a hit on the named rule in a RedisService.pipeline() batch, to
+    share the round trip with the reads it guards; pass its result to
+    enforce_rate_limit.
+    """
+    rule = getattr(config.rate_limit_config, name)
+    return batch.hit_rate_limit(f"rl:{name}:{identity(request, rule)}", rule)
+
+
+async def check_rate_limit(
+    request: Request,
+    name: str,
+    rule,
+    cost: int = 1,
+    message: str = DEFAULT_MESSAGE
+) -> RateLimitResult:
+    """Count the request against ``rule`` under ``name`` and enforce the result."""
+    key = f"rl:{name}:{identity(request, rule)}"
+    redis = get_redis_service()
+    if redis is None:
+        result = memory_hit(_local_store, key, rule, cost)
+    elif redis.memory_mode:
+        result = redis.hit_rate_limit(key, rule, cost)
+    else:
+        # Network round trip: keep it off the event loop
+        result = await run_in_threadpool(redis.hit_rate_limit, key, rule, cost)
+    enforce_rate_limit(request, result, message)
+    return result
+
+
+def rate_limit(name: str, message: str = DEFAULT_MESSAGE, cost: int = 1):
+    """
+    Dependency enforcing the named rule of rate_limit_config:
+
+        @router.post("/signup", dependencies=[Depends(rate_limit("signup_initiate"))])
+    """
+    async def dependency(request: Request) -> None:
+        limits = config.rate_limit_config
+        if limits.enabled:
+            await check_rate_limit(request, name, getattr(limits, name), cost, message)
+
+    return dependency
+
+
+async def route_rate_limit(request: Request) -> None:
+    """
+    Applied to every route (see setup_rate_limiting): the rule configured
+    for the route template in rate_limit_config.routes, then the default rule.
+    """
+    limits = config.rate_limit_config
+    if not limits.enabled or not (limits.routes or limits.default):
+        return
+    route = request.scope.get("route")
+    template = f"{request.method} {getattr(route, 'path', request.url.path)}"
+    rule = limits.routes.get(template)
+    if rule is not None:
+        await check_rate_limit(request, f"route:{template}", rule)
+    if limits.default is not None:
+        await check_rate_limit(request, "default", limits.default)
@@ -0,0 +1,193 @@
+# app/core/security/hashing.py
+"""
+Password hashing in a dedicated process pool.
+
+A scrypt hash or verify costs tens of milliseconds of CPU. Done inline, a
+burst of sign-ins holds every threadpool thread (sync endpoints) or blocks
+the event loop (async ones), and the GIL serialises them anyway.
+``password_hasher`` runs them in a pool of ``password_hash_workers``
+processes. Requests beyond that wait on a semaphore in the event loop,
+holding no thread; once ``password_hash_max_queue`` are waiting, further
+ones are answered with 503 instead of piling up.
+
+    password_hash = await password_hasher.hash(password)
+    valid, new_hash = await password_hasher.verify_and_update(password, user.password)
+
+Sync endpoints (run in the threadpool) use the ``*_from_thread`` variants,
+which hand the call to the event loop so the same limits apply.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import anyio.from_thread
+from fastapi import HTTPException, status
+
+from app.core.config import get_app_config
+from app.core.processes import process_pool
+from app.core.security.password import hash_password, needs_rehash, verify_password
+
+logger = logging.getLogger(__name__)
+
+
+# Run in the pool's processes; module-level so they can be pickled
+
+def _verify_and_rehash(password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    if not verify_password(password, hashed):
+        return False, None
+    if needs_rehash(hashed):
+        return True, hash_password(password)
+    return True, None
+
+
+class PasswordHasher:
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = max(1, workers)
+        self.max_queue = max_queue
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.started_at = time.time()
+            self.waiting = 0
+            self.running = 0
+            self.waiting_peak = 0
+            self.completed = 0
+            self.rejected = 0
+            self.rehashed = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+            self.run_total = 0.0
+
+    # ------------------------------------------------------------------
+
+    async def hash(self, password: str) -> str:
+        if not password:
+            raise ValueError("Password cannot be empty")
+        return await self._run(hash_password, password)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        if not password or not hashed:
+            return False
+        return await self._run(verify_password, password, hashed)
+
+    async def verify_and_update(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verify, and when the hash uses an outdated scheme or cost
+        (``needs_rehash``) also return a new hash of the password to store.
+        Both happen in one trip to the pool.
+        """
+        if not password or not hashed:
+            return False, None
+        valid, new_hash = await self._run(_verify_and_rehash, password, hashed)
+        if new_hash is not None:
+            with self._lock:
+                self.rehashed += 1
+        return valid, new_hash
+
+    def hash_from_thread(self, password: str) -> str:
+        """hash() for sync code running in the threadpool."""
+        return anyio.from_thread.run(self.hash, password)
+
+    def verify_from_thread(self, password: str, hashed: str) -> bool:
+        """verify() for sync code running in the threadpool."""
+        return anyio.from_thread.run(self.verify, password, hashed)
+
+    # ------------------------------------------------------------------
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._slots = asyncio.Semaphore(self.workers)
+            self._loop = loop
+        return self._slots
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = process_pool(self.workers)
+                logger.info(f"Password hashing pool started with {self.workers} workers")
+            return self._executor
+
+    async def _run(self, fn: Callable, *args) -> Any:
+        slots = self._semaphore()
+        with self._lock:
+            if slots.locked() and self.waiting >= self.max_queue:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many sign-in requests right now. Please try again shortly.",
+                    headers={"Retry-After": "1"},
+                )
+            self.waiting += 1
+            self.waiting_peak = max(self.waiting_peak, self.waiting)
+
+        queued = time.perf_counter()
+        try:
+            await slots.acquire()
+        finally:
+            with self._lock:
+                self.waiting -= 1
+        started = time.perf_counter()
+        with self._lock:
+            self.running += 1
+            self.wait_total += started - queued
+            self.wait_max = max(self.wait_max, started - queued)
+        try:
+            loop = asyncio.get_running_loop()
+            try:
+                return await loop.run_in_executor(self._get_executor(), fn, *args)
+            except BrokenProcessPool:
+                # A worker died (OOM kill); start a new pool and try once more
+                logger.error("Password hashing pool broke, restarting it")
+                self.shutdown()
+                return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            slots.release()
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+                self.run_total += time.perf_counter() - started
+
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "since": self.started_at,
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "running": self.running,
+                "waiting": self.waiting,
+                "waiting_peak": self.waiting_peak,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "rehashed": self.rehashed,
+                "wait_avg_ms": round(self.wait_total / self.completed * 1000, 3) if self.completed else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+                "hash_avg_ms": round(self.run_total / self.completed * 1000, 3) if self.completed else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the pool (application shutdown); it restarts on next use."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+_security_config = get_app_config().security_config
+password_hasher = PasswordHasher(
+    workers=_security_config.password_hash_workers,
+    max_queue=_security_config.password_hash_max_queue,
+)
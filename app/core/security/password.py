@@ -2,10 +2,18 @@
 
 from passlib.context import CryptContext
 
+from app.core.config import get_app_config
+
+security_config = get_app_config().security_config
+
+# Changing a cost here makes needs_rehash() true for older hashes; they are
+# upgraded on the user's next successful sign-in
 pwd_context = CryptContext(
     schemes=["scrypt", "bcrypt"],  # Try scrypt first, fallback to bcrypt
     default="scrypt",
     deprecated="auto",
+    scrypt__rounds=security_config.scrypt_rounds,
+    bcrypt__rounds=security_config.bcrypt_rounds,
 )
 
 def hash_password(password: str) -> str:
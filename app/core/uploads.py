@@ -0,0 +1,71 @@
+# app/core/uploads.py
+"""
+Upload size limit enforced while the request body is being received.
+
+Multipart bodies larger than hosting_config.content_delivery.max_file_size_mb
+(plus room for boundaries and small form fields) are refused with 413:
+up front when Content-Length announces it, otherwise as soon as the bytes
+received pass the limit. Without this the whole body would first be
+spooled to disk by the multipart parser. The per-file checks (type, size,
+hash) are in app.utils.files.upload.
+"""
+
+from fastapi import HTTPException, status
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import get_app_config
+from app.utils.responses import api_response
+
+settings = get_app_config()
+
+# Multipart boundaries, part headers and small form fields
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class UploadSizeLimitMiddleware:
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        if not headers.get(b"content-type", b"").startswith(b"multipart/form-data"):
+            await self.app(scope, receive, send)
+            return
+
+        max_size_mb = settings.hosting_config.content_delivery.max_file_size_mb
+        limit = max_size_mb * 1024 * 1024 + MULTIPART_OVERHEAD
+        detail = f"File exceeds {max_size_mb}MB limit"
+
+        content_length = headers.get(b"content-length", b"")
+        if content_length.isdigit() and int(content_length) > limit:
+            response = api_response(
+                success=False,
+                message=detail,
+                errors={"status_code": status.HTTP_413_REQUEST_ENTITY_TOO_LARGE},
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                path=scope.get("path")
+            )
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Raised inside the form parser; it closes its spool files
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=detail
+                    )
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -0,0 +1,283 @@
+# app/db/metrics.py
+"""
+Connection pool and query metrics for the SQLAlchemy engines.
+
+``instrument_engine`` hooks an engine's pool and cursor events and keeps,
+per process:
+
+- checkout wait: time spent in ``pool.connect()``, which covers waiting for a
+  free connection, opening new ones and the pre-ping round trip
+- checkouts that timed out after ``pool_timeout``
+- connections in use (now and peak) and the current overflow
+- statement count and time, and statements slower than ``slow_query_ms``
+  grouped by fingerprint (the statement with literals and bind parameters
+  replaced by ``?``)
+
+Checkout timing needs the engine's pool to be one of the ``Timed*`` pool
+classes below (``session.py`` passes them as ``poolclass``). Each worker
+process has its own pools, so the numbers are per worker.
+"""
+
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.profiling.stats import current_request
+
+logger = logging.getLogger(__name__)
+
+# Checkout waits kept for the percentiles
+_WAIT_SAMPLES = 1024
+# Distinct slow statement fingerprints kept; the one with the least total time
+# makes room for a new one
+_MAX_FINGERPRINTS = 200
+_STATEMENT_PREVIEW = 500
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\([^)]+\)s|%s|\$\d+|:\w+|\?")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    """Statement text with literals and parameters as ``?``, lists collapsed."""
+    text = _STRING_LITERAL.sub("?", statement)
+    text = _PLACEHOLDER.sub("?", text)
+    text = _NUMBER.sub("?", text)
+    # IN lists and multi-row VALUES differ only by their length
+    text = _VALUE_LIST.sub("(?)", text)
+    text = _VALUE_LIST.sub("(?)", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def fingerprint(normalized: str) -> str:
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+def _percentile(samples: List[float], fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class EngineMetrics:
+    """Counters for one engine; updated from pool and cursor events."""
+
+    def __init__(self, name: str, slow_query_ms: float):
+        self.name = name
+        self.slow_query_ms = slow_query_ms
+        self.lock = threading.Lock()
+        self.pool = None
+        self.reset()
+
+    def reset(self) -> None:
+        with self.lock:
+            self.started_at = time.time()
+            self.checkouts = 0
+            self.checkout_timeouts = 0
+            self.checkout_waits = 0
+            self.checkout_wait_total = 0.0
+            self.checkout_wait_max = 0.0
+            self.wait_samples: Deque[float] = deque(maxlen=_WAIT_SAMPLES)
+            self.in_use = 0
+            self.in_use_peak = 0
+            self.connections_opened = 0
+            self.connections_invalidated = 0
+            self.statements = 0
+            self.statement_time_total = 0.0
+            self.slow_statements = 0
+            self.slow: Dict[str, Dict[str, Any]] = {}
+
+    # Pool side
+
+    def record_checkout_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self.lock:
+            if timed_out:
+                self.checkout_timeouts += 1
+            self.checkout_waits += 1
+            self.checkout_wait_total += seconds
+            self.checkout_wait_max = max(self.checkout_wait_max, seconds)
+            self.wait_samples.append(seconds)
+
+    def on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        with self.lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.in_use_peak = max(self.in_use_peak, self.in_use)
+
+    def on_checkin(self, dbapi_connection, connection_record) -> None:
+        with self.lock:
+            self.in_use = max(0, self.in_use - 1)
+
+    def on_connect(self, dbapi_connection, connection_record) -> None:
+        with self.lock:
+            self.connections_opened += 1
+
+    def on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        with self.lock:
+            self.connections_invalidated += 1
+
+    # Cursor side
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("query_started")
+        if not started:
+            return
+        elapsed = time.perf_counter() - started.pop()
+        with self.lock:
+            self.statements += 1
+            self.statement_time_total += elapsed
+        request = current_request()
+        if request is not None:
+            request.add_statement(elapsed)
+        if elapsed * 1000 >= self.slow_query_ms:
+            self.record_slow(statement, elapsed)
+
+    def on_handle_error(self, exception_context) -> None:
+        # A failed statement never reaches after_cursor_execute
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started"):
+            conn.info["query_started"].pop()
+
+    def record_slow(self, statement: str, elapsed: float) -> None:
+        normalized = normalize_statement(statement)
+        key = fingerprint(normalized)
+        elapsed_ms = elapsed * 1000
+        with self.lock:
+            self.slow_statements += 1
+            entry = self.slow.get(key)
+            if entry is None:
+                if len(self.slow) >= _MAX_FINGERPRINTS:
+                    del self.slow[min(self.slow, key=lambda k: self.slow[k]["total_ms"])]
+                entry = self.slow[key] = {
+                    "fingerprint": key,
+                    "statement": normalized[:_STATEMENT_PREVIEW],
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                }
+            entry["count"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+            entry["last_seen"] = time.time()
+        logger.warning(f"Slow query ({elapsed_ms:.1f} ms) [{key}]: {normalized[:200]}")
+
+    def snapshot(self, top: int = 20) -> Dict[str, Any]:
+        pool = self.pool
+        with self.lock:
+            waits = list(self.wait_samples)
+            checkouts = self.checkouts
+            slow = sorted(self.slow.values(), key=lambda e: e["total_ms"], reverse=True)[:top]
+            data = {
+                "name": self.name,
+                "since": self.started_at,
+                "pool": {
+                    "class": type(pool).__name__ if pool is not None else None,
+                    "size": pool.size() if hasattr(pool, "size") else None,
+                    "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else self.in_use,
+                    "checked_in": pool.checkedin() if hasattr(pool, "checkedin") else None,
+                    "overflow": max(pool.overflow(), 0) if hasattr(pool, "overflow") else None,
+                    "in_use_peak": self.in_use_peak,
+                    "connections_opened": self.connections_opened,
+                    "connections_invalidated": self.connections_invalidated,
+                },
+                "checkout": {
+                    "count": checkouts,
+                    "timeouts": self.checkout_timeouts,
+                    "wait_avg_ms": round(self.checkout_wait_total / self.checkout_waits * 1000, 3) if self.checkout_waits else 0.0,
+                    "wait_p95_ms": round(_percentile(waits, 0.95) * 1000, 3),
+                    "wait_max_ms": round(self.checkout_wait_max * 1000, 3),
+                },
+                "queries": {
+                    "count": self.statements,
+                    "total_ms": round(self.statement_time_total * 1000, 3),
+                    "avg_ms": round(self.statement_time_total / self.statements * 1000, 3) if self.statements else 0.0,
+                    "slow_threshold_ms": self.slow_query_ms,
+                    "slow_count": self.slow_statements,
+                    "slow": [
+                        {**entry, "total_ms": round(entry["total_ms"], 3), "max_ms": round(entry["max_ms"], 3),
+                         "avg_ms": round(entry["total_ms"] / entry["count"], 3)}
+                        for entry in slow
+                    ],
+                },
+            }
+        return data
+
+
+class _TimedCheckout:
+    """Pool mixin timing ``connect()``, the one place a checkout can wait."""
+
+    metrics: Optional[EngineMetrics] = None
+
+    def connect(self):
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            timed_out = True
+            raise
+        finally:
+            if self.metrics is not None:
+                self.metrics.record_checkout_wait(time.perf_counter() - started, timed_out)
+
+    def recreate(self):
+        # engine.dispose() replaces the pool; keep reporting to the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        if self.metrics is not None:
+            self.metrics.pool = pool
+        return pool
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+_registry: Dict[str, EngineMetrics] = {}
+
+
+def instrument_engine(engine: Engine, name: str, slow_query_ms: float) -> EngineMetrics:
+    """Attach metrics to a (sync) engine; pass ``async_engine.sync_engine`` for async ones."""
+    metrics = EngineMetrics(name, slow_query_ms)
+    metrics.pool = engine.pool
+    if isinstance(engine.pool, _TimedCheckout):
+        engine.pool.metrics = metrics
+
+    event.listen(engine, "checkout", metrics.on_checkout)
+    event.listen(engine, "checkin", metrics.on_checkin)
+    event.listen(engine, "connect", metrics.on_connect)
+    event.listen(engine, "invalidate", metrics.on_invalidate)
+    event.listen(engine, "before_cursor_execute", metrics.before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", metrics.after_cursor_execute)
+    event.listen(engine, "handle_error", metrics.on_handle_error)
+
+    _registry[name] = metrics
+    return metrics
+
+
+def engine_metrics() -> Dict[str, EngineMetrics]:
+    """Instrumented engines by name."""
+    return dict(_registry)
+
+
+def forget_engine(name: str) -> None:
+    _registry.pop(name, None)
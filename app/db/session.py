@@ -1,10 +1,86 @@
+"""
+Database engines and session factories.
+
+The synchronous engine (``engine`` / ``SessionLocal``) serves the existing
+services through ``get_db``. Async route handlers use ``get_async_db``
+instead, backed by an asyncpg engine created on first use, so their queries
+do not block the event loop. Sync services can be moved over one at a time:
+an async handler can still call one unchanged through
+``await db.run_sync(service_fn, *args)``, which runs it on the
+AsyncSession's connection.
+
+Pool size, overflow, recycle, timeout, pre-ping, the statement timeout and
+the slow query threshold come from ``database_config``. Each engine has its
+own pool (pool_size/max_overflow for the sync engine,
+async_pool_size/async_max_overflow for the async one) in every worker
+process, so the connections a deployment can open are workers x both. Both engines are
+instrumented by ``app.db.metrics`` (checkout waits, pool usage, slow queries).
+"""
+
+from typing import Any, Dict, Optional
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+
 from app.core.config import get_app_config
+from app.core.config.models import DatabaseConfig
+from app.db.metrics import (
+    TimedAsyncAdaptedQueuePool,
+    TimedQueuePool,
+    forget_engine,
+    instrument_engine,
+)
 
 app_config = get_app_config()
+db_config = app_config.database_config
+
+
+def _engine_options(config: DatabaseConfig, url: URL, is_async: bool = False) -> Dict[str, Any]:
+    options: Dict[str, Any] = {
+        "pool_pre_ping": config.pool_pre_ping,
+        "echo": config.echo,
+    }
+    # SQLite (local runs) keeps SQLAlchemy's default pool for its driver
+    if url.get_backend_name() != "sqlite":
+        options.update(
+            poolclass=TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool,
+            pool_size=config.async_pool_size if is_async else config.pool_size,
+            max_overflow=config.async_max_overflow if is_async else config.max_overflow,
+            pool_recycle=config.pool_recycle,
+            pool_timeout=config.pool_timeout,
+        )
+    return options
+
+
+def _statement_timeout_args(config: DatabaseConfig, url: URL) -> Dict[str, Any]:
+    """Driver connect arguments setting PostgreSQL's statement_timeout."""
+    if not config.statement_timeout_ms or url.get_backend_name() != "postgresql":
+        return {}
+    if url.get_driver_name() == "asyncpg":
+        return {"server_settings": {"statement_timeout": str(config.statement_timeout_ms)}}
+    return {"options": f"-c statement_timeout={config.statement_timeout_ms}"}
+
+
+def async_connection_url(config: DatabaseConfig) -> URL:
+    """The async engine URL: configured explicitly, or the sync URL on asyncpg."""
+    if config.async_sql_connection_string:
+        return make_url(config.async_sql_connection_string)
+    url = make_url(config.sql_connection_string)
+    if url.get_backend_name() == "postgresql":
+        return url.set(drivername="postgresql+asyncpg")
+    return url
 
-engine = create_engine(app_config.database_config.sql_connection_string, pool_pre_ping=True)
+
+sync_url = make_url(db_config.sql_connection_string)
+
+engine = create_engine(
+    sync_url,
+    connect_args=_statement_timeout_args(db_config, sync_url),
+    **_engine_options(db_config, sync_url),
+)
+instrument_engine(engine, "sync", db_config.slow_query_ms)
 
 # SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -14,3 +90,43 @@ SessionLocal = sessionmaker(
     bind=engine,
     expire_on_commit=False,  # Add this line
 )
+
+
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+
+
+def get_async_engine() -> AsyncEngine:
+    """The asyncpg engine, created on first use."""
+    global _async_engine
+    if _async_engine is None:
+        url = async_connection_url(db_config)
+        _async_engine = create_async_engine(
+            url,
+            connect_args=_statement_timeout_args(db_config, url),
+            **_engine_options(db_config, url, is_async=True),
+        )
+        instrument_engine(_async_engine.sync_engine, "async", db_config.slow_query_ms)
+    return _async_engine
+
+
+def get_async_sessionmaker() -> async_sessionmaker:
+    """AsyncSession factory with the same settings as SessionLocal."""
+    global _async_session_factory
+    if _async_session_factory is None:
+        _async_session_factory = async_sessionmaker(
+            bind=get_async_engine(),
+            autoflush=False,
+            expire_on_commit=False,
+        )
+    return _async_session_factory
+
+
+async def dispose_async_engine() -> None:
+    """Close the async engine's pooled connections (application shutdown)."""
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        forget_engine("async")
+        _async_engine = None
+        _async_session_factory = None
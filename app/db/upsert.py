@@ -0,0 +1,16 @@
+# app/db/upsert.py
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+
+def dialect_insert(db: Session, model):
+    """
+    INSERT for the session's database that supports ON CONFLICT
+    (``.on_conflict_do_update`` / ``.on_conflict_do_nothing``).
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model)
+    if dialect == "sqlite":
+        return sqlite.insert(model)
+    raise NotImplementedError(f"Upserts are not supported on {dialect}")
@@ -0,0 +1,65 @@
+# app/models/attendance_counter.py
+from datetime import datetime
+import uuid
+from sqlalchemy import DateTime, Integer, ForeignKey, Uuid, func
+from sqlalchemy.orm import mapped_column, relationship, Mapped
+from app.db.base_class import Base
+from app.db.mixins import TimestampMixin, UUIDMixin
+
+
+class AttendanceCounter(UUIDMixin, TimestampMixin, Base):
+    """
+    Persisted per-enrollment attendance tallies, one column per status.
+
+    Maintained by app.services.attendance_stats_service when attendance is
+    recorded. Per-student totals are the sum of the student's rows, which is
+    indexed by student_id.
+    """
+    __tablename__ = "attendance_counters"
+
+    enrollment_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid(as_uuid=True),
+        ForeignKey('enrollments.id', ondelete='CASCADE'),
+        nullable=False,
+        unique=True,
+        index=True
+    )
+    student_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid(as_uuid=True),
+        ForeignKey('users.id', ondelete='CASCADE'),
+        nullable=False,
+        index=True
+    )
+
+    total: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    present: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    absent: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    late: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    excused: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    holiday: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    refreshed_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+
+    enrollment: Mapped["Enrollment"] = relationship(
+        "Enrollment",
+        back_populates="attendance_counter"
+    )
+
+    @property
+    def attendance_rate(self) -> float:
+        if not self.total:
+            return 0.0
+        return round((self.present / self.total) * 100, 1)
+
+    def get_summary(self) -> dict:
+        return {
+            "enrollment_id": str(self.enrollment_id),
+            "student_id": str(self.student_id),
+            "total": self.total,
+            "present": self.present,
+            "absent": self.absent,
+            "late": self.late,
+            "excused": self.excused,
+            "holiday": self.holiday,
+            "attendance_rate": self.attendance_rate,
+        }
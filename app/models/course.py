@@ -616,7 +616,7 @@
 # v4
 from typing import List, Optional
 
-from sqlalchemy import Boolean, String, Text, Integer
+from sqlalchemy import Boolean, Index, String, Text, Integer
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base_class import Base
@@ -627,6 +627,19 @@ from app.models.user import User
 
 class Course(UUIDMixin, TimestampMixin, Base):
     __tablename__ = "courses"
+    __table_args__ = (
+        # Keyset pagination (list_courses sort keys)
+        Index("ix_courses_created_at_id", "created_at", "id"),
+        Index("ix_courses_title_id", "title", "id"),
+        # Trigram search (app/utils/search.py)
+        *[
+            Index(
+                f"ix_courses_{column}_trgm", column,
+                postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"}
+            )
+            for column in ("title", "code", "description")
+        ],
+    )
 
     # Core fields
     code: Mapped[str] = mapped_column(
@@ -644,12 +657,14 @@ class Course(UUIDMixin, TimestampMixin, Base):
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     is_public: Mapped[bool] = mapped_column(Boolean, default=True)
 
+    # Relations below load on access; detail queries opt into eager
+    # loading explicitly so list queries never fetch them
+
     # Tutor assignments (association object pattern)
     tutors_assigned: Mapped[List["CourseTutor"]] = relationship(
         "CourseTutor",
         back_populates="course",
         cascade="all, delete-orphan",
-        lazy="selectin",
     )
 
     # Modules (Course → Module → Lesson hierarchy)
@@ -658,7 +673,6 @@ class Course(UUIDMixin, TimestampMixin, Base):
         back_populates="course",
         cascade="all, delete-orphan",
         order_by="Module.order",
-        lazy="selectin",
     )
 
     # Enrollments
@@ -692,7 +706,6 @@ class Course(UUIDMixin, TimestampMixin, Base):
         "CourseImage",
         back_populates="course",
         cascade="all, delete-orphan",
-        lazy="selectin",
         order_by="CourseImage.created_at",
     )
 
@@ -723,6 +736,38 @@ class Course(UUIDMixin, TimestampMixin, Base):
         self.tutors_assigned.append(assignment)
 
     # Serializer
+    SUMMARY_FIELDS = (
+        "id", "code", "title", "description", "total_modules", "total_lessons",
+        "duration_weeks", "difficulty_level", "is_active", "is_public",
+        "created_at", "updated_at",
+    )
+
+    @classmethod
+    def summary_columns(cls) -> list:
+        """Columns read by the relation-free summary, for projection queries."""
+        return [getattr(cls, field) for field in cls.SUMMARY_FIELDS]
+
+    @staticmethod
+    def summary_from_row(row) -> dict:
+        """
+        Relation-free course summary from a Course or a row selecting
+        summary_columns().
+        """
+        return {
+            "id": str(row.id),
+            "code": row.code,
+            "title": row.title,
+            "description": row.description,
+            "total_modules": row.total_modules,
+            "total_lessons": row.total_lessons,
+            "duration_weeks": row.duration_weeks,
+            "difficulty_level": row.difficulty_level,
+            "is_active": row.is_active,
+            "is_public": row.is_public,
+            "created_at": row.created_at.isoformat() if row.created_at else None,
+            "updated_at": row.updated_at.isoformat() if row.updated_at else None,
+        }
+
     def get_summary(self, include_relations: bool = False) -> dict:
         """
         Get course summary with optional relations.
@@ -733,20 +778,7 @@ class Course(UUIDMixin, TimestampMixin, Base):
         Returns:
             Dictionary containing course data
         """
-        data = {
-            "id": str(self.id),
-            "code": self.code,
-            "title": self.title,
-            "description": self.description,
-            "total_modules": self.total_modules,
-            "total_lessons": self.total_lessons,
-            "duration_weeks": self.duration_weeks,
-            "difficulty_level": self.difficulty_level,
-            "is_active": self.is_active,
-            "is_public": self.is_public,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-        }
+        data = self.summary_from_row(self)
 
         if not include_relations:
             return data
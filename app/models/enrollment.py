@@ -84,7 +84,7 @@
     
 
 # app/models/enrollment.py
-from sqlalchemy import Column, DateTime, String, Enum, ForeignKey, func
+from sqlalchemy import Column, DateTime, String, Enum, ForeignKey, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy import Uuid
 from typing import List, Optional
@@ -109,6 +109,11 @@ class EnrollmentStatus(enum.Enum):
 
 class Enrollment(UUIDMixin, TimestampMixin, Base):
     __tablename__ = "enrollments"
+    __table_args__ = (
+        # Keyset pagination (list_enrollments sort keys)
+        Index("ix_enrollments_enrolled_at_id", "enrolled_at", "id"),
+        Index("ix_enrollments_created_at_id", "created_at", "id"),
+    )
     
     student_id: Mapped[uuid.UUID] = mapped_column(
         Uuid(as_uuid=True), 
@@ -174,7 +179,23 @@ class Enrollment(UUIDMixin, TimestampMixin, Base):
         uselist=False,
         cascade="all, delete-orphan"
     )
-     
+
+    grade_rollup: Mapped[Optional["EnrollmentGradeRollup"]] = relationship(
+        "EnrollmentGradeRollup",
+        back_populates="enrollment",
+        uselist=False,
+        cascade="all, delete-orphan",
+        passive_deletes=True
+    )
+
+    attendance_counter: Mapped[Optional["AttendanceCounter"]] = relationship(
+        "AttendanceCounter",
+        back_populates="enrollment",
+        uselist=False,
+        cascade="all, delete-orphan",
+        passive_deletes=True
+    )
+
     # def get_summary(self, **args):
     #     data = {
     #         'id': self.id,
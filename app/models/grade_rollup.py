@@ -0,0 +1,68 @@
+# app/models/grade_rollup.py
+from datetime import datetime
+from typing import Optional
+import uuid
+from sqlalchemy import DateTime, Float, Integer, String, ForeignKey, Uuid, func
+from sqlalchemy.orm import mapped_column, relationship, Mapped
+from app.db.base_class import Base
+from app.db.mixins import TimestampMixin, UUIDMixin
+
+
+class EnrollmentGradeRollup(UUIDMixin, TimestampMixin, Base):
+    """
+    Materialized per-enrollment grade summary.
+
+    Maintained by app.services.grade_rollup_service whenever scores are
+    written, so course averages, grades and progress are a single row fetch
+    instead of a scan over the enrollment's Score rows.
+    """
+    __tablename__ = "enrollment_grade_rollups"
+
+    enrollment_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid(as_uuid=True),
+        ForeignKey('enrollments.id', ondelete='CASCADE'),
+        nullable=False,
+        unique=True,
+        index=True
+    )
+
+    # Weighted average over every Score row of the enrollment
+    score_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    weighted_score_sum: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    weight_sum: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    weighted_average: Mapped[Optional[float]] = mapped_column(Float)
+    grade: Mapped[Optional[str]] = mapped_column(String(5))
+
+    # Completion against the course's active score columns and lessons
+    completed_assessments: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_assessments: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    completed_lessons: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_lessons: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    refreshed_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+
+    enrollment: Mapped["Enrollment"] = relationship(
+        "Enrollment",
+        back_populates="grade_rollup"
+    )
+
+    @property
+    def progress(self) -> float:
+        """Percentage of the course's lessons with at least one recorded score."""
+        if not self.total_lessons:
+            return 0.0
+        return round((self.completed_lessons / self.total_lessons) * 100, 1)
+
+    def get_summary(self) -> dict:
+        return {
+            "enrollment_id": str(self.enrollment_id),
+            "score_count": self.score_count,
+            "weighted_average": self.weighted_average,
+            "grade": self.grade,
+            "completed_assessments": self.completed_assessments,
+            "total_assessments": self.total_assessments,
+            "completed_lessons": self.completed_lessons,
+            "total_lessons": self.total_lessons,
+            "progress": self.progress,
+            "refreshed_at": self.refreshed_at.isoformat() if self.refreshed_at else None,
+        }
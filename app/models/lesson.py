@@ -211,32 +211,63 @@ class Lesson(UUIDMixin, TimestampMixin, Base):
 
     # app/models/lesson.py - Updated get_summary method
 
+    SUMMARY_FIELDS = (
+        "id", "module_id", "title", "order", "date", "description",
+        "assessment_max", "assignment_max", "duration_minutes", "status",
+        "is_published", "has_assessment", "has_assignment",
+        "created_at", "updated_at",
+    )
+
+    @classmethod
+    def summary_columns(cls) -> list:
+        """
+        Columns read by get_summary(), for projection queries. Those queries
+        also select attendance_count and present_count (aggregated).
+        """
+        return [getattr(cls, field) for field in cls.SUMMARY_FIELDS]
+
+    @staticmethod
+    def summary_from_row(row) -> dict:
+        """
+        Lesson summary from a Lesson or a row selecting summary_columns()
+        plus attendance_count and present_count.
+        """
+        attendance_count = row.attendance_count or 0
+        present_count = int(row.present_count or 0)
+
+        return {
+            "id": str(row.id),
+            "module_id": str(row.module_id),
+            "title": row.title,
+            "order": row.order,
+            "date": row.date.isoformat() if row.date else None,
+            "description": row.description,
+            "assessment_max": row.assessment_max,
+            "assignment_max": row.assignment_max,
+            "duration": f"{row.duration_minutes} mins" if row.duration_minutes else None,
+            "status": row.status,
+            "is_published": row.is_published,
+            "has_assessment": row.has_assessment,
+            "has_assignment": row.has_assignment,
+            "created_at": row.created_at.isoformat() if row.created_at else None,
+            "updated_at": row.updated_at.isoformat() if row.updated_at else None,
+
+            # Attendance statistics
+            "attendance_count": attendance_count,
+            "present_count": present_count,
+            "attendance_rate": (
+                round((present_count / attendance_count) * 100, 1)
+                if attendance_count > 0 else 0
+            ),
+        }
+
     def get_summary(self, include_module: bool = False) -> dict:
         """
         Return lesson summary with all relevant data including attendance statistics.
+        Statistics come from the hybrid properties, which load the attendance
+        rows unless they were set from an aggregate query.
         """
-        data = {
-            "id": str(self.id),
-            "module_id": str(self.module_id),
-            "title": self.title,
-            "order": self.order,
-            "date": self.date.isoformat() if self.date else None,
-            "description": self.description,
-            "assessment_max": self.assessment_max,
-            "assignment_max": self.assignment_max,
-            "duration": f"{self.duration_minutes} mins" if self.duration_minutes else None,
-            "status": self.status,
-            "is_published": self.is_published,
-            "has_assessment": self.has_assessment,
-            "has_assignment": self.has_assignment,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-            
-            # Attendance statistics (from hybrid properties)
-            "attendance_count": self.attendance_count,
-            "present_count": self.present_count,
-            "attendance_rate": self.attendance_rate,
-        }
+        data = self.summary_from_row(self)
 
         if include_module and self.module:
             data["module"] = {
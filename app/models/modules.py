@@ -58,30 +58,46 @@ class Module(UUIDMixin, TimestampMixin, Base):
         cascade="all, delete-orphan"
     )
     
-    def get_summary(self, include_relations: bool = False):
-        data = {
-            "id": self.id,
-            "title": self.title,
-            "order": self.order,
-            "description": self.description,
-            "course_id": self.course_id,
-            "created_at": self.created_at,
+    SUMMARY_FIELDS = ("id", "title", "order", "description", "course_id", "created_at")
+
+    # Lesson columns read for each entry of the "lessons" relation
+    LESSON_FIELDS = ("id", "title", "description", "order", "date", "duration_minutes", "is_published")
+
+    @classmethod
+    def summary_columns(cls) -> list:
+        """Columns read by the relation-free summary, for projection queries."""
+        return [getattr(cls, field) for field in cls.SUMMARY_FIELDS]
+
+    @staticmethod
+    def summary_from_row(row) -> dict:
+        """Relation-free summary from a Module or a row selecting summary_columns()."""
+        return {
+            "id": row.id,
+            "title": row.title,
+            "order": row.order,
+            "description": row.description,
+            "course_id": row.course_id,
+            "created_at": row.created_at,
         }
 
-        if include_relations:
-            data["lessons"] = [
-                {
-                    "id": str(lesson.id),
-                    "title": lesson.title,
-                    "description": lesson.description,
-                    "order": lesson.order,
-                    "date": lesson.date.isoformat() if lesson.date else None,
-                    "duration_minutes": lesson.duration_minutes,
-                    "is_published": lesson.is_published,
-                }
-                for lesson in self.lessons
-            ]
+    @staticmethod
+    def lesson_entry(lesson) -> dict:
+        """Entry of the "lessons" relation from a Lesson or a row selecting LESSON_FIELDS."""
+        return {
+            "id": str(lesson.id),
+            "title": lesson.title,
+            "description": lesson.description,
+            "order": lesson.order,
+            "date": lesson.date.isoformat() if lesson.date else None,
+            "duration_minutes": lesson.duration_minutes,
+            "is_published": lesson.is_published,
+        }
+
+    def get_summary(self, include_relations: bool = False):
+        data = self.summary_from_row(self)
 
+        if include_relations:
+            data["lessons"] = [self.lesson_entry(lesson) for lesson in self.lessons]
             data["lessons_count"] = len(self.lessons)
 
         return data
@@ -0,0 +1,53 @@
+# app/models/outbound_email.py
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+from sqlalchemy import DateTime, Enum as SQLEnum, Index, Integer, SmallInteger, String, Text, func
+from sqlalchemy.orm import mapped_column, Mapped
+from app.db.base_class import Base
+from app.db.mixins import TimestampMixin, UUIDMixin
+
+
+class OutboundEmailStatus(str, Enum):
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
+class OutboundEmail(UUIDMixin, TimestampMixin, Base):
+    """
+    A message waiting for, or done with, delivery.
+
+    Written by app.services.mail.queue and delivered by the mail worker
+    (app.services.mail.worker). A worker claims due rows with
+    FOR UPDATE SKIP LOCKED, so several processes can share the queue; a
+    claim that is not finished by locked_until (the worker died) is picked
+    up again.
+    """
+    __tablename__ = "outbound_emails"
+
+    recipients: Mapped[str] = mapped_column(Text, nullable=False)  # comma separated
+    subject: Mapped[str] = mapped_column(String(998), nullable=False)
+    html_body: Mapped[str] = mapped_column(Text, nullable=False, default="")
+    text_body: Mapped[str] = mapped_column(Text, nullable=False, default="")
+
+    # Lower is sent first; see app.services.mail.queue.PRIORITY_*
+    priority: Mapped[int] = mapped_column(SmallInteger, nullable=False, default=10)
+    status: Mapped[OutboundEmailStatus] = mapped_column(
+        SQLEnum(OutboundEmailStatus), nullable=False, default=OutboundEmailStatus.PENDING
+    )
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    locked_until: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    provider: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    sent_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # The worker's claim query: due rows by status, oldest first
+        Index("ix_outbound_emails_status_next_attempt_at", "status", "next_attempt_at"),
+    )
@@ -157,6 +157,9 @@ class ParentChildren(UUIDMixin, TimestampMixin, Base):
         ),
         # Prevent duplicate links
         Index('uq_parent_child_pair', parent_id, child_id, unique=True),
+        # Keyset pagination (list_links sort keys)
+        Index('ix_parent_children_created_at_id', 'created_at', 'id'),
+        Index('ix_parent_children_updated_at_id', 'updated_at', 'id'),
     )
 
 
@@ -1,6 +1,6 @@
 from sqlalchemy import (
     Boolean, CheckConstraint, DateTime, String, Float, Text, 
-    ForeignKey, UniqueConstraint, func, Enum as SQLEnum, 
+    ForeignKey, Index, UniqueConstraint, func, Enum as SQLEnum, 
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy import Uuid
@@ -17,6 +17,8 @@ class Score(UUIDMixin, TimestampMixin, Base):
     __table_args__ = (
         UniqueConstraint('enrollment_id', 'lesson_id', name='uq_enrollment_lesson'),
         CheckConstraint('score >= 0 AND score <= 100', name='check_assessment'),
+        # One score per student and column; conflict target of the bulk upserts
+        Index('uq_scores_enrollment_column', 'enrollment_id', 'column_id', unique=True),
     )
     
     enrollment_id: Mapped[UUID] = mapped_column(
@@ -154,6 +154,10 @@ class CourseTutor(UUIDMixin, TimestampMixin, Base):
             unique=True,
             postgresql_where=(is_primary == True)
         ),
+        # Keyset pagination (list_assignments default sort)
+        Index('ix_course_tutors_created_at_id', 'created_at', 'id'),
+        # Tutor authorization checks (is this tutor assigned to this course?)
+        Index('ix_course_tutors_tutor_id_course_id', 'tutor_id', 'course_id'),
     )
     
 
@@ -373,7 +373,7 @@
 
 # v2
 # app/models/user.py
-from sqlalchemy import DateTime, String, Boolean, Text, CheckConstraint, or_
+from sqlalchemy import DateTime, String, Boolean, Text, CheckConstraint, Index, or_
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import Optional, List
 from datetime import datetime
@@ -681,6 +681,16 @@ class User(UUIDMixin, TimestampMixin, Base):
             "names IS NULL OR (names ~ '^[a-zA-Z\\s''\\-]{2,100}$' AND length(trim(names)) >= 2)",
             name='valid_name_format'
         ),
+        # Keyset pagination (list_users)
+        Index('ix_users_created_at_id', 'created_at', 'id'),
+        # Trigram search (app/utils/search.py)
+        *[
+            Index(
+                f'ix_users_{column}_trgm', column,
+                postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'}
+            )
+            for column in ('names', 'email', 'username', 'phone')
+        ],
     )
     
     # ========================================================================
@@ -730,7 +740,14 @@ class User(UUIDMixin, TimestampMixin, Base):
         """
         if not password:
             raise ValueError("Password cannot be empty")
-        self.password = hash_password(password)
+        self.set_password_hash(hash_password(password))
+
+    def set_password_hash(self, password_hash: str) -> None:
+        """
+        Store an already computed hash, e.g. from
+        ``await password_hasher.hash(password)`` (app.core.security.hashing).
+        """
+        self.password = password_hash
         self.password_changed_at = datetime.utcnow()
 
     def check_password(self, password: str) -> bool:
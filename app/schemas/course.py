@@ -54,9 +54,11 @@ class CourseFilters(BaseModel):
     status: Optional[str] = Field(None, pattern="^(active|inactive)$")
     tutor_id: Optional[UUID] = None
 
-    sort_by: Optional[str] = Field("created_at", pattern="^(created_at|title|code)$")
+    sort_by: Optional[str] = Field("created_at", pattern="^(created_at|title|code|relevance)$")
     order: Optional[str] = Field("desc", pattern="^(asc|desc)$")
 
     page: int = Field(1, ge=1)
     page_size: int = Field(10, ge=1, le=100)
+    cursor: Optional[str] = None
+    include_total: bool = False
 
@@ -117,10 +117,12 @@ class EnrollmentFilters(BaseModel):
 
     sort_by: Optional[str] = Field(
         "enrolled_at",
-        pattern="^(enrolled_at|created_at)$"
+        pattern="^(enrolled_at|created_at|relevance)$"
     )
     order: Optional[str] = Field("desc", pattern="^(asc|desc)$")
 
     page: int = Field(1, ge=1)
     page_size: int = Field(10, ge=1, le=100)
+    cursor: Optional[str] = None
+    include_total: bool = False
 
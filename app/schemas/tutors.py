@@ -55,8 +55,10 @@ class TutorCourseUpdate(BaseModel):
 class TutorCourseFilters(BaseModel):
     """Filters for querying tutor assignments"""
     # Pagination
-    page: int = Field(default=1, ge=1, description="Page number")
+    page: int = Field(default=1, ge=1, description="Page number (ignored with a cursor)")
     page_size: int = Field(default=10, ge=1, le=100, description="Items per page")
+    cursor: Optional[str] = Field(None, description="next_cursor/prev_cursor of a previous page")
+    include_total: bool = Field(default=False, description="Also count all matching assignments on cursor pages (numbered pages are always counted)")
     
     # Filtering
     tutor_id: Optional[UUID] = Field(None, description="Filter by tutor ID")
@@ -81,7 +83,7 @@ class TutorCourseFilters(BaseModel):
 
     @field_validator('sort_by')
     def validate_sort_by(cls, v):
-        allowed = ['created_at', 'assigned_at', 'updated_at']
+        allowed = ['created_at', 'assigned_at', 'updated_at', 'relevance']
         if v not in allowed:
             raise ValueError(f'sort_by must be one of: {", ".join(allowed)}')
         return v
@@ -1327,6 +1327,8 @@ class UserFilters(BaseModel):
     role: Optional[str] = None
     is_active: Optional[bool] = None
     search: Optional[str] = None
+    # relevance ranks search matches; without a search it means created_at
+    sort_by: Optional[str] = Field("created_at", pattern="^(created_at|relevance)$")
 
 
 class ParentChildRead(BaseModel):
@@ -4,161 +4,241 @@
 # FILE: app/services/admin_service.py
 # ============================================================================
 
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from fastapi import BackgroundTasks
 from sqlalchemy.orm import Session
-from sqlalchemy import func, distinct, select
+from sqlalchemy import func, distinct, select, text
 from datetime import datetime, timedelta
 
+from app.core.config import get_app_config
+from app.db.metrics import engine_metrics
 from app.schemas.admin import AdminStatsOut, DashboardOverviewOut
 
+from app.models.association_tables import user_roles
 from app.models.course import Course
 from app.models.enrollment import Enrollment
 from app.models.lesson import Lesson
 from app.models.modules import Module
+from app.models.rbac import Role
 from app.models.scores import Score
+from app.models.tutors import CourseTutor
 from app.models.user import User
 from app.models.parents import ParentChildren, LinkStatus
 
-def get_statistics(db: Session) -> AdminStatsOut:
-    """Get comprehensive admin statistics"""
-
-    # ---------------------------
-    # Users
-    # ---------------------------
-    total_users = db.query(User).count()
-    active_users = db.query(User).filter(User.is_active.is_(True)).count()
-
-    # ---------------------------
-    # Roles
-    # ---------------------------
-    total_students = db.query(User).filter(
-        User.roles.any(name="student")
-    ).count()
-
-    total_tutors = db.query(User).filter(
-        User.roles.any(name="tutor")
-    ).count()
+logger = logging.getLogger(__name__)
 
-    total_parents = db.query(User).filter(
-        User.roles.any(name="parent")
-    ).count()
+# Dashboard statistics snapshot. Bump the version when AdminStatsOut changes
+# so snapshots cached by older code are not read back.
+STATS_SNAPSHOT_VERSION = 1
+STATS_FRESH_TTL = 30     # seconds a snapshot is served as-is
+STATS_STALE_TTL = 300    # seconds a stale snapshot is served while refreshing
 
-    total_admins = db.query(User).filter(
-        User.roles.any(name="admin")
-    ).count()
+STATS_ROLES = ("student", "tutor", "parent", "admin")
 
-    # ---------------------------
-    # Active by role
-    # ---------------------------
-    active_students = db.query(User).filter(
-        User.roles.any(name="student"),
-        User.is_active.is_(True)
-    ).count()
-
-    active_tutors = db.query(User).filter(
-        User.roles.any(name="tutor"),
-        User.is_active.is_(True)
-    ).count()
-
-    active_parents = db.query(User).filter(
-        User.roles.any(name="parent"),
-        User.is_active.is_(True)
-    ).count()
-
-    # ---------------------------
-    # Courses
-    # ---------------------------
-    total_courses = db.query(Course).count()
-    active_courses = db.query(Course).filter(Course.is_active.is_(True)).count()
-    inactive_courses = total_courses - active_courses
+def _has_role(user_id_column, role_name: str):
+    """EXISTS (user has role) - correlated to the given user id column"""
+    return select(user_roles.c.user_id).join(
+        Role, Role.id == user_roles.c.role_id
+    ).where(
+        user_roles.c.user_id == user_id_column,
+        Role.name == role_name
+    ).exists()
 
-    courses_without_instructors = db.query(Course).filter(
-        ~Course.tutors_assigned.any()
-    ).count()
 
-    # ---------------------------
-    # Modules / Lessons
-    # ---------------------------
-    total_modules = db.query(Module).count()
-    total_lessons = db.query(Lesson).count()
+def compute_statistics(db: Session) -> AdminStatsOut:
+    """
+    Compute admin statistics from the database in two queries: a role-grouped
+    user count and one row of filtered aggregates.
+    """
+    seven_days_ago = datetime.now() - timedelta(days=7)
 
     # ---------------------------
-    # Enrollments
+    # Users per role (total / active)
     # ---------------------------
-    total_enrollments = db.query(Enrollment).count()
-    seven_days_ago = datetime.now() - timedelta(days=7)
+    role_rows = db.query(
+        Role.name,
+        func.count(distinct(User.id)),
+        func.count(distinct(User.id)).filter(User.is_active.is_(True)),
+    ).select_from(user_roles).join(
+        Role, Role.id == user_roles.c.role_id
+    ).join(
+        User, User.id == user_roles.c.user_id
+    ).filter(
+        Role.name.in_(STATS_ROLES)
+    ).group_by(Role.name).all()
 
-    recent_enrollments = db.query(Enrollment).filter(
-        Enrollment.created_at >= seven_days_ago
-    ).count()
+    by_role = {name: (total, active) for name, total, active in role_rows}
+    total_students, active_students = by_role.get("student", (0, 0))
+    total_tutors, active_tutors = by_role.get("tutor", (0, 0))
+    total_parents, active_parents = by_role.get("parent", (0, 0))
+    total_admins, _ = by_role.get("admin", (0, 0))
 
     # ---------------------------
-    # Assessments
+    # Everything else, one row
     # ---------------------------
-    total_assessments = db.query(Score).count()
+    def scalar(*columns, where=None):
+        query = select(*columns)
+        if where is not None:
+            query = query.where(where)
+        return query.scalar_subquery()
 
-    # ---------------------------
-    # Average class size
-    # ---------------------------
-    avg_subquery = (
-        db.query(
-            Enrollment.course_id,
-            func.count(Enrollment.student_id).label("student_count")
-        )
-        .group_by(Enrollment.course_id)
-        .subquery()
-    )
+    totals = db.execute(select(
+        scalar(func.count(User.id)).label("total_users"),
+        scalar(func.count(User.id).filter(User.is_active.is_(True))).label("active_users"),
+        scalar(func.count(Course.id)).label("total_courses"),
+        scalar(func.count(Course.id).filter(Course.is_active.is_(True))).label("active_courses"),
+        scalar(
+            func.count(Course.id),
+            where=~select(CourseTutor.id).where(CourseTutor.course_id == Course.id).exists()
+        ).label("courses_without_tutors"),
+        scalar(func.count(Module.id)).label("total_modules"),
+        scalar(func.count(Lesson.id)).label("total_lessons"),
+        scalar(func.count(Enrollment.id)).label("total_enrollments"),
+        scalar(
+            func.count(Enrollment.id).filter(Enrollment.created_at >= seven_days_ago)
+        ).label("recent_enrollments"),
+        scalar(func.count(distinct(Enrollment.course_id))).label("courses_with_enrollments"),
+        scalar(func.count(Score.id)).label("total_assessments"),
+        scalar(
+            func.count(distinct(ParentChildren.child_id)),
+            where=(ParentChildren.status == LinkStatus.ACTIVE)
+            & _has_role(ParentChildren.child_id, "student")
+        ).label("students_with_active_parents"),
+    )).one()
 
+    # Mean enrollments per course that has enrollments
     avg_class_size = (
-        db.query(func.avg(avg_subquery.c.student_count))
-        .scalar()
-        or 0
+        totals.total_enrollments / totals.courses_with_enrollments
+        if totals.courses_with_enrollments else 0
     )
 
-    # ---------------------------
-    # Students without parents (FIXED)
-    # ---------------------------
-    students_with_active_parents = (
-        db.query(distinct(ParentChildren.child_id))
-        .join(User, User.id == ParentChildren.child_id)
-        .filter(
-            ParentChildren.status == LinkStatus.ACTIVE,
-            User.roles.any(name="student"),
-        )
-        .count()
-    )
-
-    students_without_parents = max(
-        total_students - students_with_active_parents, 0
-    )
-
-    # ---------------------------
-    # Response
-    # ---------------------------
     return AdminStatsOut(
-        total_users=total_users,
-        active_users=active_users,
-        total_courses=total_courses,
-        total_modules=total_modules,
-        total_lessons=total_lessons,
+        total_users=totals.total_users,
+        active_users=totals.active_users,
+        total_courses=totals.total_courses,
+        total_modules=totals.total_modules,
+        total_lessons=totals.total_lessons,
         total_tutors=total_tutors,
         total_students=total_students,
         total_parents=total_parents,
         total_admins=total_admins,
-        active_courses=active_courses,
-        inactive_courses=inactive_courses,
+        active_courses=totals.active_courses,
+        inactive_courses=totals.total_courses - totals.active_courses,
         active_students=active_students,
         active_tutors=active_tutors,
         active_parents=active_parents,
         inactive_parents=total_parents - active_parents,
-        recent_enrollments=recent_enrollments,
-        total_enrollments=total_enrollments,
-        total_assessments=total_assessments,
+        recent_enrollments=totals.recent_enrollments,
+        total_enrollments=totals.total_enrollments,
+        total_assessments=totals.total_assessments,
         average_class_size=round(avg_class_size, 1),
-        courses_without_tutors=courses_without_instructors,
-        students_without_parents=students_without_parents,
+        courses_without_tutors=totals.courses_without_tutors,
+        students_without_parents=max(
+            total_students - totals.students_with_active_parents, 0
+        ),
     )
 
 
+# ============================================================================
+# CACHED SNAPSHOT
+# ============================================================================
+
+# Last snapshot seen by this process: {"computed_at": epoch, "stats": {...}}
+_local_snapshot: Optional[Dict[str, Any]] = None
+_refresh_lock = threading.Lock()
+
+
+def _redis():
+    # Imported lazily, as in principal_service
+    from app.api.deps.storage import get_redis_instance
+    return get_redis_instance()
+
+
+def _snapshot_key() -> str:
+    return f"admin_stats:v{STATS_SNAPSHOT_VERSION}"
+
+
+def _read_snapshot() -> Optional[Dict[str, Any]]:
+    redis = _redis()
+    snapshot = redis.get(_snapshot_key(), as_json=True) if redis else None
+    if isinstance(snapshot, dict) and "stats" in snapshot:
+        return snapshot
+    return _local_snapshot
+
+
+def _store_snapshot(stats: AdminStatsOut) -> Dict[str, Any]:
+    global _local_snapshot
+    snapshot = {"computed_at": time.time(), "stats": stats.model_dump()}
+    _local_snapshot = snapshot
+
+    redis = _redis()
+    if redis:
+        redis.set(_snapshot_key(), snapshot, expiry=STATS_STALE_TTL)
+    return snapshot
+
+
+def refresh_statistics_snapshot(db: Optional[Session] = None) -> Optional[AdminStatsOut]:
+    """
+    Recompute and store the statistics snapshot.
+
+    Opens its own session when none is given (background refresh). Returns
+    None without querying if another refresh is already running here.
+    """
+    if not _refresh_lock.acquire(blocking=False):
+        return None
+
+    own_session = db is None
+    if own_session:
+        from app.db.session import SessionLocal
+        db = SessionLocal()
+
+    try:
+        stats = compute_statistics(db)
+        _store_snapshot(stats)
+        return stats
+    except Exception as e:
+        logger.error(f"Admin statistics refresh failed: {e}")
+        if not own_session:
+            raise
+        return None
+    finally:
+        _refresh_lock.release()
+        if own_session:
+            db.close()
+
+
+def get_statistics(
+    db: Session,
+    background_tasks: Optional[BackgroundTasks] = None
+) -> AdminStatsOut:
+    """
+    Get comprehensive admin statistics from the cached snapshot.
+
+    Snapshots younger than STATS_FRESH_TTL are returned as-is. Older ones are
+    returned too, and a refresh is scheduled on background_tasks (or run
+    inline without it). Without a snapshot the statistics are computed now.
+    """
+    snapshot = _read_snapshot()
+    if snapshot:
+        age = time.time() - snapshot["computed_at"]
+        if age < STATS_FRESH_TTL:
+            return AdminStatsOut(**snapshot["stats"])
+
+        if age < STATS_STALE_TTL:
+            if background_tasks is not None:
+                background_tasks.add_task(refresh_statistics_snapshot)
+                return AdminStatsOut(**snapshot["stats"])
+            return refresh_statistics_snapshot(db) or AdminStatsOut(**snapshot["stats"])
+
+    stats = refresh_statistics_snapshot(db)
+    # A concurrent refresh holds the lock; compute without storing
+    return stats or compute_statistics(db)
+
+
 def get_recent_activities(db: Session, limit: int = 10) -> list:
     """Get recent system activities"""
     # Assuming you have an Activity model
@@ -174,9 +254,12 @@ def get_recent_activities(db: Session, limit: int = 10) -> list:
     
 #     return activities
 
-def get_dashboard_overview(db: Session) -> DashboardOverviewOut:
+def get_dashboard_overview(
+    db: Session,
+    background_tasks: Optional[BackgroundTasks] = None
+) -> DashboardOverviewOut:
     """Get complete dashboard data"""
-    stats = get_statistics(db)
+    stats = get_statistics(db, background_tasks)
     activities = get_recent_activities(db)
     
     return DashboardOverviewOut(
@@ -185,3 +268,57 @@ def get_dashboard_overview(db: Session) -> DashboardOverviewOut:
     )
 
 
+def _server_connection_limits(db: Session) -> Dict[str, Any]:
+    """max_connections and current connections as reported by PostgreSQL."""
+    if db.get_bind().dialect.name != "postgresql":
+        return {}
+    row = db.execute(text("""
+        SELECT current_setting('max_connections')::int AS max_connections,
+               current_setting('superuser_reserved_connections')::int AS reserved_connections,
+               (SELECT count(*) FROM pg_stat_activity) AS open_connections,
+               (SELECT count(*) FROM pg_stat_activity
+                 WHERE datname = current_database()) AS database_connections
+    """)).mappings().one()
+    return dict(row)
+
+
+def get_database_metrics(db: Session, top: int = 20) -> Dict[str, Any]:
+    """
+    Pool and slow query metrics of this worker's engines, with the server's
+    connection limit and how many workers of this size it can hold.
+    """
+    db_config = get_app_config().database_config
+    engines = {name: metrics.snapshot(top) for name, metrics in engine_metrics().items()}
+    # Connections each engine can open per worker
+    limits = {
+        "sync": db_config.pool_size + db_config.max_overflow,
+        "async": db_config.async_pool_size + db_config.async_max_overflow,
+    }
+    per_worker = sum(limits.get(name, 0) for name in engines)
+
+    server = _server_connection_limits(db)
+    if server and per_worker:
+        available = server["max_connections"] - server["reserved_connections"]
+        server["max_workers_at_full_pool"] = available // per_worker
+
+    return {
+        "settings": {
+            "pool_size": db_config.pool_size,
+            "max_overflow": db_config.max_overflow,
+            "async_pool_size": db_config.async_pool_size,
+            "async_max_overflow": db_config.async_max_overflow,
+            "pool_timeout": db_config.pool_timeout,
+            "pool_recycle": db_config.pool_recycle,
+            "pool_pre_ping": db_config.pool_pre_ping,
+            "statement_timeout_ms": db_config.statement_timeout_ms,
+            "slow_query_ms": db_config.slow_query_ms,
+            "connections_per_worker": per_worker,
+        },
+        "engines": engines,
+        "server": server,
+    }
+
+
+def reset_database_metrics() -> None:
+    for metrics in engine_metrics().values():
+        metrics.reset()
@@ -14,6 +14,7 @@
 # from app.models.lesson import Lesson
 # from app.models.course import Course
 # from app.models.modules import Module
+from app.services import attendance_stats_service
 
 
 # def get_lesson_attendance_with_students(
@@ -376,19 +377,20 @@
 # app/services/attendance_service.py
 # Fixed attendance service with proper enrollment_id mapping
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Set, Tuple
 from uuid import UUID
 from datetime import date
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_
+from sqlalchemy import exists, func, or_
 
+from app.db.upsert import dialect_insert
 from app.models.attendance import Attendance, AttendanceStatus
 from app.models.user import User
 from app.models.enrollment import Enrollment
 from app.models.lesson import Lesson
-from app.models.course import Course
 from app.models.modules import Module
+from app.models.tutors import CourseTutor, CourseTutorStatus
 
 
 def get_lesson_attendance_with_students(
@@ -479,6 +481,93 @@ def get_lesson_attendance_with_students(
     }
 
 
+# ============================================================================
+# BULK ATTENDANCE WRITES
+# ============================================================================
+
+def _ensure_can_record_attendance(db: Session, course_id: UUID, current_user: User) -> None:
+    """Tutors (other than admins) must have an active assignment to the course."""
+    if current_user.is_tutor and not current_user.is_admin:
+        is_assigned = db.query(
+            exists().where(
+                CourseTutor.tutor_id == current_user.id,
+                CourseTutor.course_id == course_id,
+                CourseTutor.status == CourseTutorStatus.ACTIVE
+            )
+        ).scalar()
+
+        if not is_assigned:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to record attendance for this course"
+            )
+
+
+def _course_enrollments(
+    db: Session,
+    course_id: UUID,
+    enrollment_ids: Set[UUID],
+    student_ids: Set[UUID]
+) -> List[Any]:
+    """(id, student_id) of the course enrollments matching either id set, in one query."""
+    if not enrollment_ids and not student_ids:
+        return []
+    return db.query(Enrollment.id, Enrollment.student_id).filter(
+        Enrollment.course_id == course_id,
+        or_(Enrollment.id.in_(enrollment_ids), Enrollment.student_id.in_(student_ids))
+    ).all()
+
+
+def _upsert_lesson_attendance(
+    db: Session,
+    lesson_id: UUID,
+    entries: Dict[UUID, Tuple[UUID, AttendanceStatus, Optional[str]]],
+    current_user: User
+) -> Tuple[int, int]:
+    """
+    Write attendance for a lesson in one multi-row upsert on
+    (lesson_id, student_id), so resubmitting a sheet updates in place.
+
+    ``entries`` maps student_id -> (enrollment_id, status, notes); notes of
+    None keep the stored notes. Returns (created, updated).
+    """
+    if not entries:
+        return 0, 0
+
+    existing = db.query(Attendance.student_id).filter(
+        Attendance.lesson_id == lesson_id,
+        Attendance.student_id.in_(entries.keys())
+    ).count()
+
+    today = date.today()
+    rows = [
+        {
+            "enrollment_id": enrollment_id,
+            "lesson_id": lesson_id,
+            "student_id": student_id,
+            "recorded_by": current_user.id,
+            "status": attendance_status,
+            "notes": notes,
+            "date": today,
+        }
+        for student_id, (enrollment_id, attendance_status, notes) in entries.items()
+    ]
+
+    stmt = dialect_insert(db, Attendance)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Attendance.lesson_id, Attendance.student_id],
+        set_={
+            "status": stmt.excluded.status,
+            "notes": func.coalesce(stmt.excluded.notes, Attendance.notes),
+            "date": stmt.excluded.date,
+            "recorded_by": stmt.excluded.recorded_by,
+            "updated_at": func.now(),
+        }
+    )
+    db.execute(stmt, rows)
+    return len(entries) - existing, existing
+
+
 def bulk_create_or_update_attendance(
     db: Session,
     lesson_id: UUID,
@@ -487,7 +576,7 @@ def bulk_create_or_update_attendance(
 ) -> Dict[str, Any]:
     """
     Create or update attendance records for multiple students.
-    Properly handles enrollment_id mapping from student_id.
+    Students are matched by enrollment_id, or by student_id within the course.
     """
     # Permission check
     if not (current_user.is_tutor or current_user.is_admin):
@@ -497,8 +586,8 @@ def bulk_create_or_update_attendance(
         )
     
     # Verify lesson exists
-    lesson = db.query(Lesson).options(
-        joinedload(Lesson.module)
+    lesson = db.query(Lesson.id, Module.course_id).join(
+        Module, Module.id == Lesson.module_id
     ).filter(Lesson.id == lesson_id).first()
     
     if not lesson:
@@ -507,94 +596,35 @@ def bulk_create_or_update_attendance(
             detail="Lesson not found"
         )
     
-    # For tutors: verify they teach this course, 
-    
-    # This does not work properly:
-    # if current_user.is_tutor and not current_user.is_admin:
-    #     # Check if tutor teaches this course
-    #     course = db.query(Course).filter(Course.id == lesson.module.course_id).first()
-    #     if course and current_user not in course.tutors_assigned:
-    #         raise HTTPException(
-    #             status_code=status.HTTP_403_FORBIDDEN,
-    #             detail=f"Not authorized to record attendance for this course {course.tutors_assigned}"
-    #         )
-    
-    # This also works fine:
-    # Even Better (More Efficient — No Python Object Compare)
-    # Avoid object comparison — check by query:
-
-    """ from app.models.tutors import CourseTutor, CourseTutorStatus
-
-    if current_user.is_tutor and not current_user.is_admin:
-
-        is_assigned = db.query(CourseTutor).filter(
-            CourseTutor.course_id == lesson.module.course_id,
-            CourseTutor.tutor_id == current_user.id,
-            CourseTutor.status == CourseTutorStatus.ACTIVE
-        ).first()
-
-        if not is_assigned:
-            raise HTTPException(
-                status_code=403,
-                detail="Not authorized to record attendance for this course"
-            ) """
-
     # For tutors: verify they teach this course
-    if current_user.is_tutor and not current_user.is_admin:
-
-        course = db.query(Course).filter(
-            Course.id == lesson.module.course_id
-        ).first()
-
-        if not course:
-            raise HTTPException(404, "Course not found")
-
-        if course not in current_user.my_assigned_courses:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to record attendance for this course"
-            )
+    _ensure_can_record_attendance(db, lesson.course_id, current_user)
     
-    created = 0
-    updated = 0
     errors = []
-    today = date.today()
+    requested = []  # (enrollment id or None, student id or None, status, remarks)
     
     for record in attendance_data:
         # Get enrollment_id (prioritize enrollment_id, fallback to student_id)
         enrollment_id = record.get("enrollment_id")
+        student_id = record.get("student_id")
+        enrollment_uuid = student_uuid = None
         
-        if not enrollment_id:
-            # Map from student_id to enrollment_id
-            student_id = record.get("student_id")
-            if not student_id:
-                errors.append("Missing both enrollment_id and student_id")
+        if enrollment_id:
+            try:
+                enrollment_uuid = UUID(enrollment_id)
+            except ValueError:
+                errors.append(f"Invalid enrollment_id: {enrollment_id}")
                 continue
-            
+        elif student_id:
             try:
                 student_uuid = UUID(student_id)
-                enrollment = db.query(Enrollment).filter(
-                    Enrollment.student_id == student_uuid,
-                    Enrollment.course_id == lesson.module.course_id
-                ).first()
-                
-                if enrollment:
-                    enrollment_id = str(enrollment.id)
-                else:
-                    errors.append(f"No enrollment found for student {student_id}")
-                    continue
-            except (ValueError, AttributeError) as e:
+            except (ValueError, AttributeError):
                 errors.append(f"Invalid student_id: {student_id}")
                 continue
-        
-        try:
-            enrollment_uuid = UUID(enrollment_id)
-        except ValueError:
-            errors.append(f"Invalid enrollment_id: {enrollment_id}")
+        else:
+            errors.append("Missing both enrollment_id and student_id")
             continue
         
         status_value = record.get("status", "present")
-        remarks = record.get("remarks", "")
         
         # Validate status
         try:
@@ -603,46 +633,38 @@ def bulk_create_or_update_attendance(
             errors.append(f"Invalid status: {status_value}")
             continue
         
-        # Check if attendance already exists
-        existing = db.query(Attendance).filter(
-            and_(
-                Attendance.enrollment_id == enrollment_uuid,
-                Attendance.lesson_id == lesson_id
-            )
-        ).first()
-        
-        # Get the actual student_id from the enrollment
-        enrollment_record = db.query(Enrollment).filter(
-            Enrollment.id == enrollment_uuid
-        ).first()
-        
-        if not enrollment_record:
-            errors.append(f"Enrollment not found: {enrollment_uuid}")
-            continue
-        
-        actual_student_id = enrollment_record.student_id
-        
-        if existing:
-            # Update existing record
-            existing.status = attendance_status
-            existing.notes = remarks
-            existing.date = today
-            existing.recorded_by = current_user.id
-            updated += 1
+        requested.append((enrollment_uuid, student_uuid, attendance_status, record.get("remarks", "")))
+    
+    enrollments = _course_enrollments(
+        db,
+        lesson.course_id,
+        {e for e, _, _, _ in requested if e is not None},
+        {s for _, s, _, _ in requested if s is not None}
+    )
+    student_by_enrollment = {row.id: row.student_id for row in enrollments}
+    enrollment_by_student = {row.student_id: row.id for row in enrollments}
+    
+    # student_id -> (enrollment_id, status, notes); a repeated student: the last one wins
+    entries: Dict[UUID, Tuple[UUID, AttendanceStatus, Optional[str]]] = {}
+    for enrollment_uuid, student_uuid, attendance_status, remarks in requested:
+        if enrollment_uuid is not None:
+            student_uuid = student_by_enrollment.get(enrollment_uuid)
+            if student_uuid is None:
+                errors.append(f"Enrollment not found: {enrollment_uuid}")
+                continue
         else:
-            # Create new record
-            attendance = Attendance(
-                enrollment_id=enrollment_uuid,
-                lesson_id=lesson_id,
-                student_id=actual_student_id,  # Use actual student_id from enrollment
-                recorded_by=current_user.id,
-                status=attendance_status,
-                notes=remarks,
-                date=today
-            )
-            db.add(attendance)
-            created += 1
+            enrollment_uuid = enrollment_by_student.get(student_uuid)
+            if enrollment_uuid is None:
+                errors.append(f"No enrollment found for student {student_uuid}")
+                continue
+        entries[student_uuid] = (enrollment_uuid, attendance_status, remarks)
     
+    created, updated = _upsert_lesson_attendance(db, lesson.id, entries, current_user)
+    
+    # Keep the per-enrollment attendance counters in the same transaction
+    attendance_stats_service.refresh_enrollment_counters(
+        db, [enrollment_id for enrollment_id, _, _ in entries.values()]
+    )
     db.commit()
     
     result = {
@@ -691,7 +713,9 @@ def record_bulk_attendance(
         )
     
     # Verify lesson exists
-    lesson = db.query(Lesson).filter(Lesson.id == lesson_id).first()
+    lesson = db.query(Lesson.id, Module.course_id).join(
+        Module, Module.id == Lesson.module_id
+    ).filter(Lesson.id == lesson_id).first()
     if not lesson:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -699,66 +723,44 @@ def record_bulk_attendance(
         )
     
     # For tutors: verify they teach this course
-    if current_user.is_tutor and not current_user.is_admin:
-        course = db.query(Course).filter(Course.id == lesson.module.course_id).first()
-        if course and current_user not in course.tutors:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to record attendance for this course"
-            )
-    
-    recorded = []
-    today = date.today()
+    _ensure_can_record_attendance(db, lesson.course_id, current_user)
     
+    presence: Dict[UUID, bool] = {}
     for student_id_str, is_present in attendance_dict.items():
         try:
-            student_id = UUID(student_id_str)
+            presence[UUID(student_id_str)] = bool(is_present)
         except ValueError:
             continue
-        
-        # Find enrollment for this student in the course
-        enrollment = db.query(Enrollment).filter(
-            Enrollment.student_id == student_id,
-            Enrollment.course_id == lesson.module.course_id
-        ).first()
-        
-        if not enrollment:
-            continue
-        
-        # Check if attendance already exists
-        existing = db.query(Attendance).filter(
-            and_(
-                Attendance.enrollment_id == enrollment.id,
-                Attendance.lesson_id == lesson_id,
-                Attendance.date == today
-            )
-        ).first()
-        
-        if existing:
-            # Update existing
-            existing.status = AttendanceStatus.PRESENT if is_present else AttendanceStatus.ABSENT
-            recorded.append(existing)
-        else:
-            # Create new
-            attendance = Attendance(
-                lesson_id=lesson_id,
-                enrollment_id=enrollment.id,
-                student_id=student_id,
-                recorded_by=current_user.id,
-                status=AttendanceStatus.PRESENT if is_present else AttendanceStatus.ABSENT,
-                date=today
-            )
-            db.add(attendance)
-            recorded.append(attendance)
     
+    # Students without an enrollment in the course are skipped
+    enrollment_by_student = {
+        row.student_id: row.id
+        for row in _course_enrollments(db, lesson.course_id, set(), set(presence))
+    }
+    entries = {
+        student_id: (
+            enrollment_by_student[student_id],
+            AttendanceStatus.PRESENT if is_present else AttendanceStatus.ABSENT,
+            None
+        )
+        for student_id, is_present in presence.items()
+        if student_id in enrollment_by_student
+    }
+    
+    _upsert_lesson_attendance(db, lesson.id, entries, current_user)
+    
+    attendance_stats_service.refresh_enrollment_counters(
+        db, [enrollment_id for enrollment_id, _, _ in entries.values()]
+    )
     db.commit()
-    for record in recorded:
-        db.refresh(record)
     
     return {
         "lesson_id": lesson_id,
-        "total_recorded": len(recorded),
-        "present_count": sum(1 for a in recorded if a.status == AttendanceStatus.PRESENT)
+        "total_recorded": len(entries),
+        "present_count": sum(
+            1 for _, attendance_status, _ in entries.values()
+            if attendance_status == AttendanceStatus.PRESENT
+        )
     }
 
 
@@ -0,0 +1,311 @@
+"""
+Attendance Statistics Service
+Single-pass attendance aggregation, persisted per-enrollment counters
+(AttendanceCounter) and paginated/streamed attendance detail rows.
+
+Counters are refreshed by the attendance writers inside their own
+transaction, so attendance rates are read from a handful of indexed rows
+instead of counting Attendance on every performance view. Run this module
+to backfill existing data:
+
+    python -m app.services.attendance_stats_service
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from uuid import UUID
+
+from sqlalchemy import func, desc
+from sqlalchemy.orm import Session, aliased
+
+from app.db.upsert import dialect_insert
+from app.models.attendance import Attendance, AttendanceStatus
+from app.models.attendance_counter import AttendanceCounter
+from app.models.course import Course
+from app.models.enrollment import Enrollment
+from app.models.lesson import Lesson
+from app.models.modules import Module
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# AttendanceCounter column for each status
+STATUS_FIELDS = {
+    AttendanceStatus.PRESENT: "present",
+    AttendanceStatus.ABSENT: "absent",
+    AttendanceStatus.LATE: "late",
+    AttendanceStatus.EXCUSED: "excused",
+    AttendanceStatus.HOLIDAY: "holiday",
+}
+
+COUNTER_FIELDS = ["total"] + list(STATUS_FIELDS.values())
+
+
+def _status_counts():
+    """Aggregate columns: total plus one filtered COUNT per status."""
+    return [func.count(Attendance.id)] + [
+        func.count(Attendance.id).filter(Attendance.status == status_value)
+        for status_value in STATUS_FIELDS
+    ]
+
+
+def _with_rate(counts: Dict[str, int]) -> Dict[str, Any]:
+    total = counts.get("total", 0)
+    present = counts.get("present", 0)
+    counts["attendance_rate"] = round((present / total * 100), 1) if total > 0 else 0.0
+    return counts
+
+
+def aggregate_by_enrollment(db: Session, enrollment_ids: Iterable[UUID]) -> Dict[UUID, Dict[str, int]]:
+    """Status counts for a batch of enrollments in one grouped query."""
+    enrollment_ids = list(set(enrollment_ids))
+    if not enrollment_ids:
+        return {}
+
+    rows = db.query(Attendance.enrollment_id, *_status_counts()).filter(
+        Attendance.enrollment_id.in_(enrollment_ids)
+    ).group_by(Attendance.enrollment_id).all()
+
+    return {row[0]: dict(zip(COUNTER_FIELDS, row[1:])) for row in rows}
+
+
+def enrollment_ids_for_lessons(db: Session, lesson_ids) -> List[UUID]:
+    """
+    Enrollments with attendance on the given lessons (ids or a select of
+    ids); collect them before deleting lessons, to refresh their counters.
+    """
+    return [
+        row[0] for row in db.query(Attendance.enrollment_id).filter(
+            Attendance.lesson_id.in_(lesson_ids)
+        ).distinct().all()
+    ]
+
+
+# ============================================================================
+# PERSISTED COUNTERS
+# ============================================================================
+
+def refresh_enrollment_counters(db: Session, enrollment_ids: Iterable[UUID]) -> int:
+    """
+    Recompute and upsert counters for the given enrollments.
+
+    Does not commit; the attendance writers call this before their own
+    commit. Returns the rows written.
+    """
+    enrollment_ids = list(set(enrollment_ids))
+    if not enrollment_ids:
+        return 0
+
+    # The session does not autoflush; make pending attendance writes visible
+    db.flush()
+
+    students = dict(
+        db.query(Enrollment.id, Enrollment.student_id).filter(
+            Enrollment.id.in_(enrollment_ids)
+        ).all()
+    )
+    if not students:
+        return 0
+    counts = aggregate_by_enrollment(db, students.keys())
+
+    now = datetime.utcnow()
+    rows = []
+    for enrollment_id, student_id in students.items():
+        values = counts.get(enrollment_id, {})
+        row = {field: values.get(field, 0) for field in COUNTER_FIELDS}
+        row.update(enrollment_id=enrollment_id, student_id=student_id, refreshed_at=now)
+        rows.append(row)
+
+    # One multi-row upsert on the unique enrollment_id
+    stmt = dialect_insert(db, AttendanceCounter)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[AttendanceCounter.enrollment_id],
+        set_={
+            **{field: stmt.excluded[field] for field in COUNTER_FIELDS},
+            "refreshed_at": stmt.excluded.refreshed_at,
+            "updated_at": func.now(),
+        }
+    )
+    db.execute(stmt, rows)
+    return len(students)
+
+
+def rebuild_counters(db: Session, batch_size: int = 500) -> int:
+    """Backfill counters for every enrollment, committing per batch."""
+    enrollment_ids: List[UUID] = [
+        row[0] for row in db.query(Enrollment.id).order_by(Enrollment.id).all()
+    ]
+    processed = 0
+
+    for start in range(0, len(enrollment_ids), batch_size):
+        processed += refresh_enrollment_counters(db, enrollment_ids[start:start + batch_size])
+        db.commit()
+
+    logger.info(f"Attendance counters rebuilt for {processed} enrollments")
+    return processed
+
+
+def get_enrollment_summaries(db: Session, enrollment_ids: Iterable[UUID]) -> Dict[UUID, Dict[str, Any]]:
+    """
+    Attendance counts and rate for a batch of enrollments.
+
+    Reads the counter rows; enrollments without counters are aggregated from
+    Attendance in one grouped query.
+    """
+    enrollment_ids = list(set(enrollment_ids))
+    summaries: Dict[UUID, Dict[str, Any]] = {}
+    if not enrollment_ids:
+        return summaries
+
+    for counter in db.query(AttendanceCounter).filter(
+        AttendanceCounter.enrollment_id.in_(enrollment_ids)
+    ).all():
+        summary = counter.get_summary()
+        summaries[counter.enrollment_id] = {
+            field: summary[field] for field in COUNTER_FIELDS + ["attendance_rate"]
+        }
+
+    missing = [eid for eid in enrollment_ids if eid not in summaries]
+    counts = aggregate_by_enrollment(db, missing)
+    for enrollment_id in missing:
+        values = counts.get(enrollment_id, {})
+        summaries[enrollment_id] = _with_rate({field: values.get(field, 0) for field in COUNTER_FIELDS})
+
+    return summaries
+
+
+def get_enrollment_summary(db: Session, enrollment_id: UUID) -> Dict[str, Any]:
+    """Attendance counts and rate for one enrollment (single row fetch)."""
+    return get_enrollment_summaries(db, [enrollment_id])[enrollment_id]
+
+
+def get_student_summary(db: Session, student_id: UUID) -> Dict[str, Any]:
+    """
+    Attendance counts and rate for a student across all enrollments.
+
+    Sums the student's counter rows, plus one aggregate over Attendance for
+    the enrollments that have no counter yet (not backfilled), the same
+    counter-or-aggregate rule as get_enrollment_summaries.
+    """
+    sums = [func.coalesce(func.sum(getattr(AttendanceCounter, f)), 0) for f in COUNTER_FIELDS]
+    counted = db.query(*sums).filter(AttendanceCounter.student_id == student_id).one()
+
+    has_counter = db.query(AttendanceCounter.id).filter(
+        AttendanceCounter.enrollment_id == Attendance.enrollment_id
+    ).exists()
+    uncounted = db.query(*_status_counts()).filter(
+        Attendance.student_id == student_id,
+        ~has_counter
+    ).one()
+
+    return _with_rate({
+        field: int(counted[i]) + int(uncounted[i])
+        for i, field in enumerate(COUNTER_FIELDS)
+    })
+
+
+# ============================================================================
+# DETAIL ROWS
+# ============================================================================
+
+def _details_query(db: Session, *criteria):
+    recorder = aliased(User)
+    return db.query(
+        Attendance.id,
+        Attendance.student_id,
+        Attendance.date,
+        Attendance.status,
+        Attendance.notes,
+        Lesson.title.label("lesson_title"),
+        Lesson.date.label("lesson_date"),
+        Module.title.label("module_title"),
+        Course.title.label("course_title"),
+        Course.code.label("course_code"),
+        recorder.names.label("recorder_names"),
+        recorder.email.label("recorder_email"),
+    ).outerjoin(
+        Lesson, Lesson.id == Attendance.lesson_id
+    ).outerjoin(
+        Module, Module.id == Lesson.module_id
+    ).outerjoin(
+        Course, Course.id == Module.course_id
+    ).outerjoin(
+        recorder, recorder.id == Attendance.recorded_by
+    ).filter(
+        *criteria
+    ).order_by(
+        desc(Attendance.date), Attendance.id
+    )
+
+
+def _format_detail(row) -> Dict[str, Any]:
+    return {
+        "id": str(row.id),
+        "date": row.date.isoformat(),
+        "status": row.status.value,
+        "lesson_title": row.lesson_title or "Unknown",
+        "lesson_date": row.lesson_date.isoformat() if row.lesson_date else None,
+        "module_title": row.module_title or "Unknown",
+        "course_title": row.course_title or "Unknown",
+        "course_code": row.course_code or "N/A",
+        "remarks": row.notes or "",
+        "recorded_by": row.recorder_names or row.recorder_email,
+    }
+
+
+def get_attendance_details(
+    db: Session,
+    student_id: UUID,
+    limit: Optional[int] = None,
+    offset: int = 0
+) -> List[Dict[str, Any]]:
+    """One page of a student's attendance rows, newest first (column projection)."""
+    if limit == 0:
+        return []
+
+    query = _details_query(db, Attendance.student_id == student_id)
+    if offset:
+        query = query.offset(offset)
+    if limit is not None:
+        query = query.limit(limit)
+    return [_format_detail(row) for row in query.all()]
+
+
+def iter_attendance_details(
+    db: Session,
+    student_id: UUID,
+    batch_size: int = 500
+) -> Iterator[Dict[str, Any]]:
+    """Stream all of a student's attendance rows without materializing them."""
+    for row in _details_query(db, Attendance.student_id == student_id).yield_per(batch_size):
+        yield _format_detail(row)
+
+
+def get_details_by_student(
+    db: Session,
+    enrollment_ids: Iterable[UUID],
+    batch_size: int = 500
+) -> Dict[UUID, List[Dict[str, Any]]]:
+    """Attendance rows for a batch of enrollments in one query, grouped by student."""
+    details: Dict[UUID, List[Dict[str, Any]]] = {}
+    enrollment_ids = list(set(enrollment_ids))
+    if not enrollment_ids:
+        return details
+
+    query = _details_query(db, Attendance.enrollment_id.in_(enrollment_ids))
+    for row in query.yield_per(batch_size):
+        details.setdefault(row.student_id, []).append(_format_detail(row))
+    return details
+
+
+if __name__ == "__main__":
+    from app.models import import_all_models
+    from app.db.session import SessionLocal
+
+    import_all_models()
+    session = SessionLocal()
+    try:
+        print(f"Rebuilt {rebuild_counters(session)} attendance counters")
+    finally:
+        session.close()
@@ -1,9 +1,11 @@
 from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import BackgroundTasks, HTTPException
 from app.models.user import User
 from app.schemas.user import UserCreate, UserSignin
-from app.core.security.password import hash_password, verify_password
+from app.core.security.hashing import password_hasher
+from app.core.security.password import hash_password
 from app.utils.email import render_template, send_email
 from app.models.rbac import Role
 from app.utils.helpers import get_client_ip
@@ -63,14 +65,25 @@ def create_user(db: Session, data: UserCreate, current_user: User | None = None)
     return user
 
 
-def authenticate_user(db: Session, data: UserSignin) -> User:
-    user = db.query(User).filter(
-        or_(
-        User.email == data.username, 
-        User.username == data.username,
-        User.phone == data.username
-        )).first()
-    if not user or not verify_password(data.password, user.password):
+async def authenticate_user(db: AsyncSession, data: UserSignin) -> User:
+    user = await db.scalar(
+        select(User).where(
+            or_(
+                User.email == data.username,
+                User.username == data.username,
+                User.phone == data.username
+            )
+        )
+    )
+    if not user:
+        raise HTTPException(401, "Invalid credentials")
+    # Verified in the hashing pool; an outdated hash is replaced while we have the password
+    valid, new_hash = await password_hasher.verify_and_update(data.password, user.password)
+    if not valid:
         raise HTTPException(401, "Invalid credentials")
+    if new_hash:
+        user.password = new_hash
+        await db.commit()
+        await db.refresh(user)  # updated_at is set by the database
     return user
 
@@ -3,10 +3,10 @@
 # v3
 from fastapi import HTTPException
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import case, or_, desc, asc, func
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import case, desc, asc, func
 from uuid import UUID
-from typing import Optional, Tuple, List
+from typing import Optional
 
 from app.models.course import Course
 from app.models.user import User
@@ -15,6 +15,8 @@ from app.models.modules import Module
 from app.models.lesson import Lesson
 from app.schemas.course import CourseCreate, CourseFilters, CourseUpdate
 from app.utils.serializers import serialize_course
+from app.utils.pagination import KeysetPage, paginate_keyset
+from app.utils.search import RELEVANCE, build_search
 from app.models.attendance import Attendance
 from app.schemas.attendance import AttendanceStatus
 
@@ -264,73 +266,77 @@ def get_course_with_optional_attendance(
 ) -> dict:
     """
     Get course by ID, strictly following get_course_by_id behavior,
-    with optional lesson attendance statistics.
-    """
+    with lesson attendance statistics.
 
-    query = db.query(Course).filter(Course.id == course_id)
+    The response has always listed tutors, images and modules with their
+    lessons and attendance statistics whatever the flags (they are kept for
+    the endpoint's signature), so everything is loaded up front: one query
+    per relation and a single aggregate for the statistics instead of the
+    Lesson hybrids loading every attendance row.
+    """
 
-    # ---- STRICTLY mirror original eager loading ----
-    if include_relations:
-        query = query.options(
-            joinedload(Course.tutors_assigned).joinedload(CourseTutor.tutor),
-            joinedload(Course.modules).joinedload(Module.lessons),
-            joinedload(Course.images),
+    course = (
+        db.query(Course)
+        .filter(Course.id == course_id)
+        .options(
+            selectinload(Course.tutors_assigned).joinedload(CourseTutor.tutor),
+            selectinload(Course.modules).selectinload(Module.lessons),
+            selectinload(Course.images),
         )
-
-    course = query.first()
+        .first()
+    )
 
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
 
     # ------------------------------------------------
-    # Attendance aggregation (ONLY if requested)
+    # Attendance aggregation
     # ------------------------------------------------
-    if include_attendance and include_relations:
-        lesson_ids = [
-            lesson.id
-            for module in course.modules or []
-            for lesson in module.lessons or []
-        ]
-
-        if lesson_ids:
-            stats = (
-                db.query(
-                    Attendance.lesson_id,
-                    func.count(Attendance.id).label("total"),
-                    func.sum(
-                        case(
-                            (Attendance.status == AttendanceStatus.PRESENT, 1),
-                            else_=0,
-                        )
-                    ).label("present"),
-                )
-                .filter(Attendance.lesson_id.in_(lesson_ids))
-                .group_by(Attendance.lesson_id)
-                .all()
+    lesson_ids = [
+        lesson.id
+        for module in course.modules or []
+        for lesson in module.lessons or []
+    ]
+
+    if lesson_ids:
+        stats = (
+            db.query(
+                Attendance.lesson_id,
+                func.count(Attendance.id).label("total"),
+                func.sum(
+                    case(
+                        (Attendance.status == AttendanceStatus.PRESENT, 1),
+                        else_=0,
+                    )
+                ).label("present"),
             )
+            .filter(Attendance.lesson_id.in_(lesson_ids))
+            .group_by(Attendance.lesson_id)
+            .all()
+        )
 
-            stats_lookup = {
-                row.lesson_id: {
-                    "total": row.total or 0,
-                    "present": int(row.present or 0),
-                }
-                for row in stats
+        stats_lookup = {
+            row.lesson_id: {
+                "total": row.total or 0,
+                "present": int(row.present or 0),
             }
+            for row in stats
+        }
 
-            # Attach computed stats to lesson instances
-            for module in course.modules or []:
-                for lesson in module.lessons or []:
-                    stat = stats_lookup.get(
-                        lesson.id, {"total": 0, "present": 0}
-                    )
+        # Attach computed stats to lesson instances
+        for module in course.modules or []:
+            for lesson in module.lessons or []:
+                stat = stats_lookup.get(
+                    lesson.id, {"total": 0, "present": 0}
+                )
 
-                    lesson.attendance_count = stat["total"]
-                    lesson.present_count = stat["present"]
-                    lesson.attendance_rate = (
-                        round((stat["present"] / stat["total"]) * 100, 1)
-                        if stat["total"] > 0
-                        else 0
-                    )
+                lesson.attendance_count = stat["total"]
+                lesson.present_count = stat["present"]
+                lesson.attendance_rate = (
+                    round((stat["present"] / stat["total"]) * 100, 1)
+                    if stat["total"] > 0
+                    else 0
+                )
 
     # ------------------------------------------------
     # Serialization (authoritative)
@@ -377,6 +383,32 @@ def get_course_with_optional_attendance(
     }
 
 
+# Trigram-indexed (see migration d7f3a9c2e614)
+COURSE_SEARCH_COLUMNS = (Course.title, Course.code, Course.description)
+
+
+def _filter_courses(query, filters: CourseFilters, search=None):
+    """Apply the search/status/tutor filters to a Course entity or column query."""
+    if search:
+        query = query.filter(search.condition)
+
+    if filters.status:
+        is_active = filters.status.lower() == "active"
+        query = query.filter(Course.is_active == is_active)
+
+    if filters.tutor_id:
+        query = (
+            query
+            .join(Course.tutors_assigned)
+            .filter(
+                CourseTutor.tutor_id == filters.tutor_id,
+                CourseTutor.status == CourseTutorStatus.ACTIVE
+            )
+        )
+
+    return query
+
+
 def get_courses_query(
     db: Session,
     filters: Optional[CourseFilters] = None
@@ -392,32 +424,8 @@ def get_courses_query(
     if not filters:
         return query.order_by(desc(Course.created_at))
     
-    # Apply search filter
-    if filters.search:
-        search_term = f"%{filters.search.lower()}%"
-        query = query.filter(
-            or_(
-                Course.title.ilike(search_term),
-                Course.code.ilike(search_term),
-                Course.description.ilike(search_term)
-            )
-        )
-    
-    # Apply status filter
-    if filters.status:
-        is_active = filters.status.lower() == "active"
-        query = query.filter(Course.is_active == is_active)
-    
-    # Apply tutor filter
-    if filters.tutor_id:
-        query = (
-            query
-            .join(Course.tutors_assigned)
-            .filter(
-                CourseTutor.tutor_id == filters.tutor_id,
-                CourseTutor.status == CourseTutorStatus.ACTIVE
-            )
-        )
+    search = build_search(db, filters.search, COURSE_SEARCH_COLUMNS)
+    query = _filter_courses(query, filters, search)
     
     # Apply sorting
     sort_column = getattr(Course, filters.sort_by, Course.created_at)
@@ -430,29 +438,52 @@ def get_courses_query(
 
 def list_courses(
     db: Session,
-    filters: Optional[CourseFilters] = None
-) -> Tuple[List[Course], int]:
+    filters: Optional[CourseFilters] = None,
+    include_relations: bool = False
+) -> KeysetPage:
     """
-    Get filtered, sorted, and paginated list of courses.
-    Returns (courses, total_count)
+    Get a filtered, sorted, keyset-paginated page of course summaries
+    (Course.get_summary dicts).
+    sort_by=relevance orders search matches best first.
+    The total is only counted when filters.include_total is set.
+
+    Without relations only the summary columns are selected. With relations
+    the page's tutors, modules (with lessons) and images are loaded with one
+    query each.
     """
-    query = get_courses_query(db, filters)
-    
-    # Get total count before pagination
-    total = query.count()
-    
-    # Apply pagination if filters provided
-    if filters:
-        courses = (
-            query
-            .offset((filters.page - 1) * filters.page_size)
-            .limit(filters.page_size)
-            .all()
+    filters = filters or CourseFilters()
+    search = build_search(db, filters.search, COURSE_SEARCH_COLUMNS)
+
+    if include_relations:
+        query = db.query(Course).options(
+            selectinload(Course.tutors_assigned).joinedload(CourseTutor.tutor),
+            selectinload(Course.modules).selectinload(Module.lessons),
+            selectinload(Course.images),
         )
     else:
-        courses = query.all()
-    
-    return courses, total
+        query = db.query(*Course.summary_columns())
+    query = _filter_courses(query, filters, search)
+
+    sort_column = getattr(Course, filters.sort_by, Course.created_at)
+    if search and filters.sort_by == RELEVANCE:
+        sort_column = search.rank
+
+    page = paginate_keyset(
+        query,
+        sort_column,
+        Course.id,
+        order=filters.order,
+        page_size=filters.page_size,
+        cursor=filters.cursor,
+        offset=(filters.page - 1) * filters.page_size,
+        with_total=filters.include_total,
+    )
+
+    if include_relations:
+        page.items = [course.get_summary(include_relations=True) for course in page.items]
+    else:
+        page.items = [Course.summary_from_row(row) for row in page.items]
+    return page
 
 
 def update_course(db: Session, course_id: UUID, data: CourseUpdate) -> Course:
@@ -106,8 +106,7 @@
 
 
 # v3
-from typing import Optional, Tuple, List
-from sqlalchemy import or_, desc, asc, and_
+from typing import Optional
 from sqlalchemy.orm import Session, joinedload
 from pydantic import BaseModel, Field
 from uuid import UUID
@@ -118,6 +117,8 @@ from app.schemas.enrollment import EnrollmentCreate, EnrollmentFilters
 from app.models.course import Course
 from app.models.user import User
 from app.models.rbac import Role
+from app.utils.pagination import KeysetPage, paginate_keyset
+from app.utils.search import RELEVANCE, build_search
 
 # def list_enrollments(
 #     db: Session,
@@ -184,7 +185,7 @@ from app.models.rbac import Role
 def list_enrollments(
     db: Session,
     filters: Optional[EnrollmentFilters] = None
-) -> Tuple[List[Enrollment], int]:
+) -> KeysetPage:
 
     # prevents N + 1 queries when relations are included.
     query = (
@@ -196,22 +197,20 @@ def list_enrollments(
     )
 
     filters = filters or EnrollmentFilters()
+    sort_column = getattr(Enrollment, filters.sort_by, Enrollment.enrolled_at)
 
-    if filters.search:
-        term = f"%{filters.search.lower()}%"
+    search = build_search(
+        db, filters.search, (User.names, User.email, Course.title, Course.code)
+    )
+    if search:
         query = (
             query
             .join(Enrollment.student)
             .join(Enrollment.course)
-            .filter(
-                or_(
-                    User.names.ilike(term),
-                    User.email.ilike(term),
-                    Course.title.ilike(term),
-                    Course.code.ilike(term)
-                )
-            )
+            .filter(search.condition)
         )
+        if filters.sort_by == RELEVANCE:
+            sort_column = search.rank
 
     if filters.status:
         query = query.filter(Enrollment.status == EnrollmentStatus(filters.status))
@@ -222,20 +221,18 @@ def list_enrollments(
     if filters.course_id:
         query = query.filter(Enrollment.course_id == filters.course_id)
 
-    sort_col = getattr(Enrollment, filters.sort_by, Enrollment.enrolled_at)
-    query = query.order_by(desc(sort_col) if filters.order == "desc" else asc(sort_col))
-
-    total = query.count()
-
-    enrollments = (
-        query
-        .offset((filters.page - 1) * filters.page_size)
-        .limit(filters.page_size)
-        .all()
+    # Keyset pagination on (sort column, id); the total is optional
+    return paginate_keyset(
+        query,
+        sort_column,
+        Enrollment.id,
+        order=filters.order,
+        page_size=filters.page_size,
+        cursor=filters.cursor,
+        offset=(filters.page - 1) * filters.page_size,
+        with_total=filters.include_total,
     )
 
-    return enrollments, total
-
 # def create_enrollment(
 #     db: Session,
 #     student_id: UUID,
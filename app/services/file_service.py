@@ -1,11 +1,15 @@
-import hashlib
+import os
+import shutil
 from pathlib import Path
 from uuid import uuid4
 from fastapi import UploadFile, HTTPException, status
 
 from app.core.config import get_app_config
-from app.utils.files.helpers import clean_filename, validate_file_type
+from app.utils.files.helpers import (
+    ALLOWED_DOCUMENT_TYPES, ALLOWED_IMAGE_TYPES, ALLOWED_VIDEO_TYPES, clean_filename
+)
 from app.utils.files.processors import process_image
+from app.utils.files.upload import CHUNK_SIZE, receive_upload
 
 settings = get_app_config()
 
@@ -22,19 +26,15 @@ def upload_file(
     - videos
     - documents
 
+    The upload is read in chunks (type sniffed, size checked, hashed) and
+    then copied from its spool; only images are decoded in memory.
     """
-    
-    if not file:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="No file provided"
-        )
 
-    if not validate_file_type(file):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Unsupported file type"
-        )
+    received = receive_upload(
+        file,
+        ALLOWED_IMAGE_TYPES | ALLOWED_VIDEO_TYPES | ALLOWED_DOCUMENT_TYPES,
+        settings.hosting_config.content_delivery.max_file_size_mb
+    )
 
     media_root = Path(settings.general_config.media_location)
     upload_dir = (media_root / upload_subdir).resolve()
@@ -43,11 +43,7 @@ def upload_file(
     original_filename = clean_filename(file.filename)
     name, ext = Path(original_filename).stem, Path(original_filename).suffix
 
-    contents = file.file.read()
-
-    file_hash = hashlib.md5(contents).hexdigest()
-
-    unique_name = f"{name[:40]}_{file_hash[:8]}{ext.lower()}"
+    unique_name = f"{name[:40]}_{received.md5[:8]}{ext.lower()}"
     save_path = upload_dir / unique_name
 
     if save_path.exists():
@@ -56,21 +52,27 @@ def upload_file(
             "url": f"{settings.general_config.media_location}/{upload_subdir}/{unique_name}"
         }
 
+    partial_path = save_path.with_name(f"{unique_name}.part")
+
     try:
 
-        if file.content_type.startswith("image/"):
+        if received.content_type.startswith("image/"):
 
-            processed = process_image(contents, dimensions)
+            processed = process_image(received.file.read(), dimensions)
 
-            with open(save_path, "wb") as f:
+            with open(partial_path, "wb") as f:
                 f.write(processed)
 
         else:
 
-            with open(save_path, "wb") as f:
-                f.write(contents)
+            with open(partial_path, "wb") as f:
+                shutil.copyfileobj(received.file, f, CHUNK_SIZE)
+
+        # Only complete files get the name that marks them as uploaded
+        os.replace(partial_path, save_path)
 
     except Exception as e:
+        partial_path.unlink(missing_ok=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Upload failed: {str(e)}"
@@ -79,7 +81,7 @@ def upload_file(
     return {
         "file_name": unique_name,
         "url": f"{settings.general_config.media_location}/{upload_subdir}/{unique_name}",
-        "size": len(contents),
-        "type": file.content_type
+        "size": received.size,
+        "type": received.content_type
     }
 
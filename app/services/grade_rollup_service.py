@@ -0,0 +1,249 @@
+"""
+Grade Rollup Service
+Maintains the materialized per-enrollment grade summary
+(EnrollmentGradeRollup) and serves O(1) reads of course averages,
+grades and progress.
+
+Rollups are recomputed set-based for a batch of enrollments in a fixed
+number of grouped queries, so the score writers can refresh a whole
+course after every save. Run this module to backfill existing data:
+
+    python -m app.services.grade_rollup_service [--course-id <uuid>]
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+from uuid import UUID
+
+from sqlalchemy import func, distinct
+from sqlalchemy.orm import Session, aliased
+
+from app.models.enrollment import Enrollment
+from app.models.grade_rollup import EnrollmentGradeRollup
+from app.models.lesson import Lesson
+from app.models.modules import Module
+from app.models.scores import Score, ScoreColumn
+
+logger = logging.getLogger(__name__)
+
+
+def _calculate_grade(percentage: float) -> str:
+    # Imported lazily: score_service imports this module for its write hooks
+    from app.services.score_service import calculate_grade
+    return calculate_grade(percentage)
+
+
+def compute_rollups(db: Session, enrollment_ids: Iterable[UUID]) -> Dict[UUID, Dict[str, Any]]:
+    """
+    Compute rollup values for a batch of enrollments without persisting them.
+
+    Uses four grouped queries regardless of batch size. Enrollment ids that
+    do not exist are ignored.
+    """
+    enrollment_ids = list(set(enrollment_ids))
+    if not enrollment_ids:
+        return {}
+
+    enrollment_courses = dict(
+        db.query(Enrollment.id, Enrollment.course_id).filter(
+            Enrollment.id.in_(enrollment_ids)
+        ).all()
+    )
+    if not enrollment_courses:
+        return {}
+    course_ids = list(set(enrollment_courses.values()))
+
+    # Score aggregates per enrollment (weight defaults to 1.0 like Score.weight)
+    weight = func.coalesce(Score.weight, 1.0)
+    score_rows = db.query(
+        Score.enrollment_id,
+        func.count(Score.id),
+        func.coalesce(func.sum(Score.percentage * weight), 0.0),
+        func.coalesce(func.sum(weight), 0.0),
+        func.count(distinct(Score.column_id)),
+        func.count(distinct(func.coalesce(ScoreColumn.lesson_id, Score.lesson_id))),
+    ).outerjoin(
+        ScoreColumn, ScoreColumn.id == Score.column_id
+    ).filter(
+        Score.enrollment_id.in_(enrollment_courses.keys())
+    ).group_by(Score.enrollment_id).all()
+
+    score_stats = {row[0]: row[1:] for row in score_rows}
+
+    # Lessons per course
+    lesson_totals = dict(
+        db.query(Module.course_id, func.count(Lesson.id)).join(
+            Lesson, Lesson.module_id == Module.id
+        ).filter(
+            Module.course_id.in_(course_ids)
+        ).group_by(Module.course_id).all()
+    )
+
+    # Active score columns per course, whichever scope they are attached to
+    column_module = aliased(Module)
+    lesson_module = aliased(Module)
+    column_course = func.coalesce(
+        lesson_module.course_id, column_module.course_id, ScoreColumn.course_id
+    )
+    column_totals = dict(
+        db.query(column_course, func.count(ScoreColumn.id)).outerjoin(
+            column_module, column_module.id == ScoreColumn.module_id
+        ).outerjoin(
+            Lesson, Lesson.id == ScoreColumn.lesson_id
+        ).outerjoin(
+            lesson_module, lesson_module.id == Lesson.module_id
+        ).filter(
+            ScoreColumn.is_active.is_(True),
+            column_course.in_(course_ids)
+        ).group_by(column_course).all()
+    )
+
+    results: Dict[UUID, Dict[str, Any]] = {}
+    for enrollment_id, course_id in enrollment_courses.items():
+        count, weighted_sum, weight_sum, columns_scored, lessons_scored = score_stats.get(
+            enrollment_id, (0, 0.0, 0.0, 0, 0)
+        )
+        # Graded unrounded, as calculate_course_grade does; only the stored
+        # average is rounded
+        average = weighted_sum / weight_sum if weight_sum else None
+        results[enrollment_id] = {
+            "score_count": count,
+            "weighted_score_sum": float(weighted_sum),
+            "weight_sum": float(weight_sum),
+            "weighted_average": round(average, 2) if average is not None else None,
+            "grade": _calculate_grade(average) if average is not None else None,
+            "completed_assessments": columns_scored,
+            "total_assessments": column_totals.get(course_id, 0),
+            "completed_lessons": lessons_scored,
+            "total_lessons": lesson_totals.get(course_id, 0),
+        }
+
+    return results
+
+
+def refresh_enrollment_rollups(db: Session, enrollment_ids: Iterable[UUID]) -> int:
+    """
+    Recompute and upsert rollups for the given enrollments.
+
+    Does not commit; callers refresh inside their own write transaction so
+    scores and rollups are committed together. Returns the rows written.
+    """
+    # The session does not autoflush; make pending score writes visible
+    db.flush()
+    values = compute_rollups(db, enrollment_ids)
+    if not values:
+        return 0
+
+    existing = {
+        rollup.enrollment_id: rollup
+        for rollup in db.query(EnrollmentGradeRollup).filter(
+            EnrollmentGradeRollup.enrollment_id.in_(values.keys())
+        ).all()
+    }
+
+    now = datetime.utcnow()
+    for enrollment_id, data in values.items():
+        rollup = existing.get(enrollment_id)
+        if rollup is None:
+            rollup = EnrollmentGradeRollup(enrollment_id=enrollment_id)
+            db.add(rollup)
+        for field, value in data.items():
+            setattr(rollup, field, value)
+        rollup.refreshed_at = now
+
+    db.flush()
+    return len(values)
+
+
+def refresh_course_rollups(db: Session, course_id: UUID) -> int:
+    """
+    Recompute rollups for every enrollment in a course.
+
+    Used when the course structure changes (score columns or lessons added or
+    removed), which affects the totals of all enrolled students.
+    """
+    enrollment_ids = [
+        row[0] for row in db.query(Enrollment.id).filter(
+            Enrollment.course_id == course_id
+        ).all()
+    ]
+    return refresh_enrollment_rollups(db, enrollment_ids)
+
+
+def get_enrollment_rollup(
+    db: Session,
+    student_id: UUID,
+    course_id: UUID
+) -> Optional[Dict[str, Any]]:
+    """
+    Fetch the rollup for a student's enrollment in a course.
+
+    Returns None when the student is not enrolled. Enrollments that have not
+    been backfilled yet are computed on the fly (nothing is written).
+    """
+    row = db.query(Enrollment.id, EnrollmentGradeRollup).outerjoin(
+        EnrollmentGradeRollup,
+        EnrollmentGradeRollup.enrollment_id == Enrollment.id
+    ).filter(
+        Enrollment.student_id == student_id,
+        Enrollment.course_id == course_id
+    ).first()
+
+    if row is None:
+        return None
+
+    enrollment_id, rollup = row
+    if rollup is not None:
+        return rollup.get_summary()
+
+    data = compute_rollups(db, [enrollment_id]).get(enrollment_id)
+    if data is None:
+        return None
+    transient = EnrollmentGradeRollup(enrollment_id=enrollment_id, **data)
+    return transient.get_summary()
+
+
+def rebuild_rollups(
+    db: Session,
+    course_id: Optional[UUID] = None,
+    batch_size: int = 500
+) -> int:
+    """
+    Backfill rollups for all enrollments (or one course), committing per batch.
+
+    Returns the number of enrollments processed.
+    """
+    query = db.query(Enrollment.id).order_by(Enrollment.id)
+    if course_id:
+        query = query.filter(Enrollment.course_id == course_id)
+
+    enrollment_ids: List[UUID] = [row[0] for row in query.all()]
+    processed = 0
+
+    for start in range(0, len(enrollment_ids), batch_size):
+        batch = enrollment_ids[start:start + batch_size]
+        processed += refresh_enrollment_rollups(db, batch)
+        db.commit()
+
+    logger.info(f"Grade rollups rebuilt for {processed} enrollments")
+    return processed
+
+
+if __name__ == "__main__":
+    import argparse
+    from app.models import import_all_models
+    from app.db.session import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Rebuild enrollment grade rollups")
+    parser.add_argument("--course-id", type=UUID, default=None)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    import_all_models()
+    session = SessionLocal()
+    try:
+        total = rebuild_rollups(session, course_id=args.course_id, batch_size=args.batch_size)
+        print(f"Rebuilt {total} enrollment grade rollups")
+    finally:
+        session.close()
@@ -0,0 +1,412 @@
+"""
+Grade Sheet Service
+Read model behind the tutor grade sheets: lesson, module and course scores
+for every student enrolled in the course.
+
+A sheet is built from three tuple queries (header, score columns, and the
+enrollments left-joined to their scores) without loading ORM entities. The
+scores are pivoted into enrollment x column matrices and the weighted
+percentages and grades are computed with NumPy.
+
+Nothing is written on read: when a lesson, module or course has no score
+columns yet, the sheet shows the default layout as unsaved columns with
+temporary ids. The bulk score endpoints create them on the first save,
+mapping those ids like any other new column.
+"""
+
+from typing import Any, Dict, List, NamedTuple, Optional
+from uuid import UUID
+
+import numpy as np
+from fastapi import HTTPException, status
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+
+from app.models.course import Course
+from app.models.enrollment import Enrollment
+from app.models.lesson import Lesson
+from app.models.modules import Module
+from app.models.scores import AssessmentType, Score, ScoreColumn
+from app.models.user import User
+
+# Default layouts for entities without score columns
+DEFAULT_LESSON_COLUMNS = [
+    {"type": AssessmentType.HOMEWORK, "title": "Homework", "max_score": 30.0, "weight": 0.3, "order": 1},
+    {"type": AssessmentType.CLASSWORK, "title": "Classwork", "max_score": 20.0, "weight": 0.2, "order": 2},
+    {"type": AssessmentType.QUIZ, "title": "Quiz", "max_score": 50.0, "weight": 0.5, "order": 3},
+]
+
+DEFAULT_COURSE_RUBRIC = [
+    {"type": AssessmentType.PROJECT, "title": "Requirements", "max_score": 25.0, "weight": 0.25, "order": 1},
+    {"type": AssessmentType.PROJECT, "title": "Implementation", "max_score": 35.0, "weight": 0.35, "order": 2},
+    {"type": AssessmentType.PROJECT, "title": "Documentation", "max_score": 20.0, "weight": 0.20, "order": 3},
+    {"type": AssessmentType.PROJECT, "title": "Presentation", "max_score": 20.0, "weight": 0.20, "order": 4},
+]
+
+# Temporary id of the default module exam column (see bulk module scores)
+MODULE_EXAM_TEMP_ID = "module_exam"
+
+# Lower bounds of score_service.calculate_grade's letter grades
+GRADE_BOUNDARIES = np.array([50, 55, 60, 65, 70, 75, 80, 90], dtype=float)
+GRADE_LETTERS = np.array(["F", "D", "D+", "C", "C+", "B", "B+", "A", "A+"], dtype=object)
+
+
+class SheetColumn(NamedTuple):
+    id: str
+    type: AssessmentType
+    title: str
+    description: Optional[str]
+    max_score: float
+    weight: float
+    order: int
+    is_saved: bool = True
+
+
+class ScoreMatrix(NamedTuple):
+    """Scores pivoted to enrollment (row) x column, in sheet order."""
+    students: List[tuple]        # (enrollment_id, student_id, names, email, username)
+    recorded: np.ndarray         # bool: a score exists
+    score: np.ndarray            # Score.score, 0 when missing
+    max_score: np.ndarray        # Score.max_score, 0 when missing
+    percentage: np.ndarray       # Score.percentage as stored, 0 when missing
+    grade: np.ndarray            # Score.grade (object)
+    notes: np.ndarray            # Score.notes (object)
+    score_id: np.ndarray         # str(Score.id) or None (object)
+
+
+def letter_grades(percentages: np.ndarray) -> np.ndarray:
+    """Vectorized score_service.calculate_grade."""
+    return GRADE_LETTERS[np.digitize(percentages, GRADE_BOUNDARIES)]
+
+
+# ============================================================================
+# QUERIES
+# ============================================================================
+
+def _load_columns(db: Session, owner_filter) -> List[SheetColumn]:
+    rows = db.query(
+        ScoreColumn.id,
+        ScoreColumn.type,
+        ScoreColumn.title,
+        ScoreColumn.description,
+        ScoreColumn.max_score,
+        ScoreColumn.weight,
+        ScoreColumn.order,
+    ).filter(
+        owner_filter,
+        ScoreColumn.is_active == True
+    ).order_by(ScoreColumn.order).all()
+
+    return [
+        SheetColumn(str(row.id), row.type, row.title, row.description,
+                    float(row.max_score), float(row.weight), row.order)
+        for row in rows
+    ]
+
+
+def _default_columns(defaults: List[Dict[str, Any]]) -> List[SheetColumn]:
+    return [
+        SheetColumn(
+            f"temp_default_{col['order']}", col["type"], col["title"], None,
+            col["max_score"], col["weight"], col["order"], is_saved=False
+        )
+        for col in defaults
+    ]
+
+
+def _load_matrix(db: Session, course_id: UUID, columns: List[SheetColumn]) -> ScoreMatrix:
+    """
+    One query: every enrollment of the course with its student and its
+    scores for the given (saved) columns, pivoted by column.
+    """
+    column_index = {col.id: i for i, col in enumerate(columns) if col.is_saved}
+    saved_ids = [UUID(col_id) for col_id in column_index]
+
+    rows = db.query(
+        Enrollment.id,
+        User.id,
+        User.names,
+        User.email,
+        User.username,
+        Score.column_id,
+        Score.score,
+        Score.max_score,
+        Score.percentage,
+        Score.grade,
+        Score.notes,
+        Score.id,
+    ).join(
+        User, User.id == Enrollment.student_id
+    ).outerjoin(
+        Score,
+        and_(Score.enrollment_id == Enrollment.id, Score.column_id.in_(saved_ids))
+    ).filter(
+        Enrollment.course_id == course_id
+    ).order_by(User.names, Enrollment.id).all()
+
+    students: List[tuple] = []
+    student_index: Dict[UUID, int] = {}
+    cells = []  # (student row, column, score, max_score, percentage, grade, notes, id)
+
+    for row in rows:
+        i = student_index.get(row[0])
+        if i is None:
+            i = student_index[row[0]] = len(students)
+            students.append((str(row[0]), str(row[1]), row[2], row[3], row[4]))
+        if row[5] is not None:
+            cells.append((i, column_index[str(row[5])], *row[6:11], str(row[11])))
+
+    shape = (len(students), len(columns))
+    matrix = ScoreMatrix(
+        students=students,
+        recorded=np.zeros(shape, dtype=bool),
+        score=np.zeros(shape),
+        max_score=np.zeros(shape),
+        percentage=np.zeros(shape),
+        grade=np.full(shape, None, dtype=object),
+        notes=np.full(shape, None, dtype=object),
+        score_id=np.full(shape, None, dtype=object),
+    )
+    if cells:
+        r, c, score, max_score, percentage, grade, notes, score_id = zip(*cells)
+        at = (np.array(r), np.array(c))
+        matrix.recorded[at] = True
+        matrix.score[at] = score
+        matrix.max_score[at] = max_score
+        matrix.percentage[at] = percentage
+        # Object arrays: assign through a 1-D object array so tuples and
+        # strings are stored as-is
+        matrix.grade[at] = np.array(grade, dtype=object)
+        matrix.notes[at] = np.array(notes, dtype=object)
+        matrix.score_id[at] = np.array(score_id, dtype=object)
+    return matrix
+
+
+def _student_fields(student: tuple) -> Dict[str, Any]:
+    enrollment_id, student_id, names, email, username = student
+    return {
+        "enrollment_id": enrollment_id,
+        "student_id": student_id,
+        "names": names,
+        "email": email,
+        "username": username,
+    }
+
+
+def _column_summary(col: SheetColumn) -> Dict[str, Any]:
+    data = {
+        "id": col.id,
+        "type": col.type.value,
+        "title": col.title,
+        "description": col.description,
+        "max_score": col.max_score,
+        "weight": col.weight,
+        "order": col.order,
+    }
+    if not col.is_saved:
+        data["is_default"] = True
+    return data
+
+
+# ============================================================================
+# GRADE SHEETS
+# ============================================================================
+
+def get_lesson_grade_sheet(db: Session, lesson_id: UUID) -> Dict[str, Any]:
+    """
+    Scores for a lesson with ALL enrolled students. A student's total is
+    the weight-averaged percentage of their recorded columns.
+    """
+    lesson = db.query(
+        Lesson.id, Lesson.title, Module.id.label("module_id"), Module.course_id
+    ).outerjoin(
+        Module, Module.id == Lesson.module_id
+    ).filter(Lesson.id == lesson_id).first()
+
+    if not lesson:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Lesson not found"
+        )
+    if lesson.module_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Module not found"
+        )
+
+    columns = (
+        _load_columns(db, ScoreColumn.lesson_id == lesson_id)
+        or _default_columns(DEFAULT_LESSON_COLUMNS)
+    )
+    matrix = _load_matrix(db, lesson.course_id, columns)
+
+    # Weighted average over recorded columns, each score's percentage taken
+    # against its own max_score (Score.calculate_percentage)
+    weights = np.array([col.weight for col in columns]) * matrix.recorded
+    with np.errstate(divide="ignore", invalid="ignore"):
+        own_percentage = np.where(
+            matrix.max_score > 0, matrix.score / matrix.max_score * 100, 0.0
+        )
+        total_weight = weights.sum(axis=1)
+        totals = np.where(
+            total_weight > 0, (own_percentage * weights).sum(axis=1) / total_weight, 0.0
+        )
+    grades = letter_grades(totals)
+
+    column_ids = [col.id for col in columns]
+    column_max = [col.max_score for col in columns]
+    students_data = []
+    for i, student in enumerate(matrix.students):
+        recorded = matrix.recorded[i]
+        scores = {}
+        for j, column_id in enumerate(column_ids):
+            is_recorded = bool(recorded[j])
+            scores[column_id] = {
+                "score": float(matrix.score[i, j]),
+                "max_score": column_max[j],
+                "percentage": float(matrix.percentage[i, j]),
+                "remarks": matrix.notes[i, j] if is_recorded else "",
+                "score_id": matrix.score_id[i, j],
+                "is_recorded": is_recorded,
+            }
+
+        students_data.append({
+            **_student_fields(student),
+            "scores": scores,
+            "total_percentage": round(float(totals[i]), 2),
+            "grade": grades[i],
+        })
+
+    return {
+        "lesson": {
+            "id": str(lesson.id),
+            "title": lesson.title,
+            "module_id": str(lesson.module_id),
+            "course_id": str(lesson.course_id)
+        },
+        "summary": {
+            "total_students": len(students_data),
+            "recorded_count": int(matrix.recorded.any(axis=1).sum()),
+            "total_columns": len(columns)
+        },
+        "columns": [_column_summary(col) for col in columns],
+        "students": students_data
+    }
+
+
+def get_module_grade_sheet(db: Session, module_id: UUID) -> Dict[str, Any]:
+    """Exam scores for a module (its first column) with ALL enrolled students."""
+    module = db.query(
+        Module.id, Module.title, Module.course_id
+    ).filter(Module.id == module_id).first()
+
+    if not module:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Module not found"
+        )
+
+    columns = _load_columns(db, ScoreColumn.module_id == module_id)[:1] or [
+        SheetColumn(
+            MODULE_EXAM_TEMP_ID, AssessmentType.EXAM, f"{module.title} - Exam",
+            None, 100.0, 1.0, 1, is_saved=False
+        )
+    ]
+    column = columns[0]
+    matrix = _load_matrix(db, module.course_id, columns)
+
+    students_data = []
+    for i, student in enumerate(matrix.students):
+        is_recorded = bool(matrix.recorded[i, 0])
+        students_data.append({
+            **_student_fields(student),
+            "exam_score": float(matrix.score[i, 0]),
+            "max_score": column.max_score,
+            "percentage": float(matrix.percentage[i, 0]),
+            "grade": matrix.grade[i, 0],
+            "remarks": matrix.notes[i, 0] if is_recorded else "",
+            "score_id": matrix.score_id[i, 0],
+            "is_recorded": is_recorded,
+        })
+
+    return {
+        "module": {
+            "id": str(module.id),
+            "title": module.title,
+            "course_id": str(module.course_id)
+        },
+        "summary": {
+            "total_students": len(students_data),
+            "recorded_count": int(matrix.recorded[:, 0].sum()),
+        },
+        "students": students_data
+    }
+
+
+def get_course_grade_sheet(db: Session, course_id: UUID) -> Dict[str, Any]:
+    """
+    Project rubric scores for a course with ALL enrolled students. The
+    percentage is the summed score over the summed rubric maximum.
+    """
+    course = db.query(
+        Course.id, Course.title, Course.code
+    ).filter(Course.id == course_id).first()
+
+    if not course:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Course not found"
+        )
+
+    columns = (
+        _load_columns(db, ScoreColumn.course_id == course_id)
+        or _default_columns(DEFAULT_COURSE_RUBRIC)
+    )
+    matrix = _load_matrix(db, course_id, columns)
+
+    max_total = float(sum(col.max_score for col in columns))
+    total_scores = matrix.score.sum(axis=1)
+    percentages = total_scores / max_total * 100 if max_total > 0 else np.zeros(len(total_scores))
+    grades = letter_grades(percentages)
+    is_recorded = matrix.recorded.any(axis=1)
+
+    column_ids = [col.id for col in columns]
+    students_data = []
+    for i, student in enumerate(matrix.students):
+        students_data.append({
+            **_student_fields(student),
+            "rubric_scores": dict(zip(column_ids, matrix.score[i].tolist())),
+            "total_score": float(total_scores[i]),
+            "max_score": max_total,
+            "percentage": round(float(percentages[i]), 2),
+            "grade": grades[i],
+            "remarks": "",
+            "score_id": None,
+            "is_recorded": bool(is_recorded[i]),
+        })
+
+    rubric_items = []
+    for col in columns:
+        item = {
+            "id": col.id,
+            "title": col.title,
+            "max_score": col.max_score,
+            "weight": col.weight
+        }
+        if not col.is_saved:
+            item["is_default"] = True
+        rubric_items.append(item)
+
+    return {
+        "course": {
+            "id": str(course.id),
+            "title": course.title,
+            "code": course.code
+        },
+        "summary": {
+            "total_students": len(students_data),
+            "recorded_count": int(is_recorded.sum()),
+        },
+        "rubric_items": rubric_items,
+        "students": students_data
+    }
@@ -9,15 +9,19 @@ import logging
 from typing import Optional, List, Tuple
 from uuid import UUID
 from datetime import date, datetime
+from sqlalchemy import case, func
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 from fastapi import HTTPException, status
+from app.models.attendance import Attendance
 from app.models.lesson import Lesson
 from app.models.modules import Module
 from app.models.user import User
+from app.schemas.attendance import AttendanceStatus
 from app.schemas.lesson import LessonCreate, LessonFilters, LessonUpdate, LessonStatus
 from app.models.tutors import CourseTutor, CourseTutorStatus
+from app.services import attendance_stats_service, grade_rollup_service
 
 logger = logging.getLogger(__name__)
 
@@ -147,6 +151,7 @@ def create_lesson(db: Session, data: LessonCreate, user_id: UUID) -> Lesson:
         )
         
         db.add(lesson)
+        grade_rollup_service.refresh_course_rollups(db, module.course_id)
         db.commit()
         db.refresh(lesson)
         
@@ -321,7 +326,12 @@ def delete_lesson(db: Session, lesson_id: UUID, user_id: UUID) -> None:
             db, user_id, lesson.module.course_id, "delete"
         )
         
+        course_id = lesson.module.course_id
+        enrollment_ids = attendance_stats_service.enrollment_ids_for_lessons(db, [lesson_id])
         db.delete(lesson)
+        grade_rollup_service.refresh_course_rollups(db, course_id)
+        # The lesson's attendance is gone with it; keep the counters in step
+        attendance_stats_service.refresh_enrollment_counters(db, enrollment_ids)
         db.commit()
         
         logger.info(f"Lesson deleted: {lesson_id} by user {user_id}")
@@ -364,40 +374,68 @@ def get_lesson(db: Session, lesson_id: UUID) -> Lesson:
     return lesson
 
 
+LESSON_SORT_FIELDS = ("order", "date", "created_at")
+
+
 def list_module_lessons(
     db: Session, 
     module_id: UUID,
     status: Optional[str] = None,
     sort_by: str = "order",
     order: str = "asc"
-) -> List[Lesson]:
+) -> List[dict]:
     """
     List all lessons for a module with optional filtering and sorting.
     
+    Selects only the summary columns, with attendance statistics from one
+    grouped subquery, and builds the Lesson.get_summary() dicts directly.
+    
     Args:
         db: Database session
         module_id: ID of module
         status: Optional status filter
-        sort_by: Field to sort by
+        sort_by: Field to sort by (order, date, created_at)
         order: Sort order (asc/desc)
         
     Returns:
-        List of lessons
+        List of lesson summary dicts
     """
-    query = db.query(Lesson).filter(Lesson.module_id == module_id)
+    attendance = (
+        db.query(
+            Attendance.lesson_id.label("lesson_id"),
+            func.count(Attendance.id).label("attendance_count"),
+            func.sum(
+                case((Attendance.status == AttendanceStatus.PRESENT, 1), else_=0)
+            ).label("present_count"),
+        )
+        .join(Lesson, Lesson.id == Attendance.lesson_id)
+        .filter(Lesson.module_id == module_id)
+        .group_by(Attendance.lesson_id)
+        .subquery()
+    )
+
+    query = (
+        db.query(
+            *Lesson.summary_columns(),
+            attendance.c.attendance_count,
+            attendance.c.present_count,
+        )
+        .outerjoin(attendance, attendance.c.lesson_id == Lesson.id)
+        .filter(Lesson.module_id == module_id)
+    )
     
     # Apply status filter if provided
     if status:
         query = query.filter(Lesson.status == status)
     
     # Apply sorting
-    sort_field = getattr(Lesson, sort_by, Lesson.order)
+    sort_field = getattr(Lesson, sort_by if sort_by in LESSON_SORT_FIELDS else "order")
     if order == "desc":
         query = query.order_by(sort_field.desc())
     else:
         query = query.order_by(sort_field.asc())
     
-    return query.all()
+    return [Lesson.summary_from_row(row) for row in query.all()]
 
 
 def list_lessons(db: Session, filters: LessonFilters) -> Tuple[List[Lesson], int]:
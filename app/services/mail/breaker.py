@@ -0,0 +1,106 @@
+"""
+Per-provider circuit breaker
+
+After `failure_threshold` consecutive failures a provider is skipped
+outright for `reset_seconds` instead of costing every message a full
+connect timeout. Then one message is let through as a trial: success
+closes the breaker, failure opens it for another `reset_seconds`.
+
+State is per process and lives on the event loop; no locking needed.
+"""
+
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from app.core.config import get_app_config
+
+from .types import MailProvider
+
+logger = logging.getLogger(__name__)
+
+app_config = get_app_config()
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int, reset_seconds: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+        self.last_error: Optional[str] = None
+
+    def allow(self) -> bool:
+        """Whether a message may be sent through this provider now."""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_seconds:
+            self.state = HALF_OPEN
+            self.trial_in_flight = False
+        if self.state == HALF_OPEN and not self.trial_in_flight:
+            self.trial_in_flight = True
+            return True
+        return False
+
+    def retry_in(self) -> float:
+        """Seconds until allow() lets a trial through (0 when it would now)."""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.reset_seconds - (time.monotonic() - self.opened_at))
+
+    def record_success(self) -> None:
+        if self.state != CLOSED:
+            logger.info(f" Mail provider {self.name} recovered, circuit closed")
+        self.state = CLOSED
+        self.failures = 0
+        self.trial_in_flight = False
+
+    def record_failure(self, error: str) -> None:
+        self.failures += 1
+        self.last_error = error
+        self.trial_in_flight = False
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != OPEN:
+                logger.warning(
+                    f" Mail provider {self.name} failed {self.failures} time(s), "
+                    f"skipping it for {self.reset_seconds:.0f}s"
+                )
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "retry_in_seconds": round(self.retry_in(), 1),
+            "last_error": self.last_error,
+        }
+
+
+_breakers: Dict[MailProvider, CircuitBreaker] = {}
+
+
+def breaker_for(provider: MailProvider) -> CircuitBreaker:
+    """The provider's breaker, with thresholds from the current mail_config."""
+    mail = app_config.mail_config
+    breaker = _breakers.get(provider)
+    if breaker is None:
+        breaker = _breakers[provider] = CircuitBreaker(
+            provider.value, mail.breaker_failure_threshold, mail.breaker_reset_seconds
+        )
+    else:
+        # mail_config can be reloaded at runtime
+        breaker.failure_threshold = mail.breaker_failure_threshold
+        breaker.reset_seconds = mail.breaker_reset_seconds
+    return breaker
+
+
+def breaker_states() -> Dict[str, Dict[str, Any]]:
+    return {provider.value: breaker.snapshot() for provider, breaker in _breakers.items()}
@@ -1,37 +1,97 @@
-""" 
-Delivery strategy logic 
+"""
+Delivery strategy logic
 
+Providers are tried in order. One whose circuit breaker is open (it failed
+repeatedly just now) is skipped without a connection attempt.
 """
 
 import logging
+from dataclasses import dataclass, field
 from email.message import EmailMessage
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+import aiosmtplib
 
-from .providers.smtp import send_starttls, send_ssl
+from app.core.config import get_app_config
+
+from .breaker import breaker_for
+from .providers.smtp import send_starttls, send_ssl, send_plain
 from .providers.resend import send as send_resend
 from .types import MailProvider
 
 logger = logging.getLogger(__name__)
 
+app_config = get_app_config()
 
-PROVIDERS = [
-    (MailProvider.SMTP_STARTTLS, send_starttls),
-    (MailProvider.SMTP_SSL, send_ssl),
-    (MailProvider.RESEND_API, send_resend),
-]
+Sender = Callable[[EmailMessage], Awaitable[None]]
 
 
-async def send_with_fallback(msg: EmailMessage) -> bool:
-    for provider, sender in PROVIDERS:
+def providers() -> List[Tuple[MailProvider, Sender]]:
+    """The providers to try, in order, for the current mail_config."""
+    mail = app_config.mail_config
+    if not mail.smtp_use_tls and not mail.smtp_use_ssl:
+        # Plain SMTP on smtp_port: a local relay or the fake server (mail/testing.py)
+        chain = [(MailProvider.SMTP_PLAIN, send_plain)]
+    else:
+        chain = [
+            (MailProvider.SMTP_STARTTLS, send_starttls),
+            (MailProvider.SMTP_SSL, send_ssl),
+        ]
+    if mail.resend_api_key:
+        chain.append((MailProvider.RESEND_API, send_resend))
+    return chain
+
+
+@dataclass
+class DeliveryResult:
+    provider: Optional[MailProvider] = None      # set when delivered
+    errors: List[str] = field(default_factory=list)
+    permanent: bool = False                      # the message itself was refused
+    retry_in: Optional[float] = None             # every provider skipped: seconds until one reopens
+
+    @property
+    def delivered(self) -> bool:
+        return self.provider is not None
+
+
+async def deliver(msg: EmailMessage) -> DeliveryResult:
+    result = DeliveryResult()
+    skipped: List[float] = []
+
+    for provider, sender in providers():
+        breaker = breaker_for(provider)
+        if not breaker.allow():
+            skipped.append(breaker.retry_in())
+            logger.debug(f" Skipping {provider}: circuit open")
+            continue
         try:
             logger.info(f" Sending email via {provider}")
             await sender(msg)
-            logger.info(f" Email sent via {provider}")
-            return True
+        except aiosmtplib.SMTPRecipientsRefused as exc:
+            # The server is fine; another provider would refuse these too
+            breaker.record_success()
+            result.errors.append(f"{provider.value}: {exc.__class__.__name__}: {exc}")
+            result.permanent = True
+            logger.warning(f"️ {provider} refused the recipients: {exc}")
+            return result
         except Exception as exc:
-            logger.warning(
-                f"️ {provider} failed: {exc.__class__.__name__}: {exc}"
-            )
+            error = f"{exc.__class__.__name__}: {exc}"
+            breaker.record_failure(error)
+            result.errors.append(f"{provider.value}: {error}")
+            logger.warning(f"️ {provider} failed: {error}")
+        else:
+            breaker.record_success()
+            logger.info(f" Email sent via {provider}")
+            result.provider = provider
+            return result
+
+    if skipped and not result.errors:
+        result.retry_in = max(min(skipped), 1.0)
+        logger.warning(" All email providers are circuit-open, message not attempted")
+    else:
+        logger.error(" All email providers failed")
+    return result
 
-    logger.error(" All email providers failed")
-    return False
 
+async def send_with_fallback(msg: EmailMessage) -> bool:
+    return (await deliver(msg)).delivered
@@ -4,6 +4,7 @@
  Clean
  Replaceable
 """
+import asyncio
 import resend
 from email.message import EmailMessage
 from app.core.config import get_app_config
@@ -12,10 +13,12 @@ app_config = get_app_config()
 
 
 async def send(msg: EmailMessage) -> None:
-    resend.api_key = app_config.mail_config.resend_api_key
+    mail = app_config.mail_config  # one section, even if a reload swaps it meanwhile
+    resend.api_key = mail.resend_api_key
 
-    resend.Emails.send({
-        "from": f"{app_config.mail_config.mail_sender_name} <{app_config.mail_config.mail_sender_email}>",
+    # The SDK call is blocking; keep it off the event loop
+    await asyncio.to_thread(resend.Emails.send, {
+        "from": f"{mail.mail_sender_name} <{mail.mail_sender_email}>",
         "to": msg["To"].split(", "),
         "subject": msg["Subject"],
         "html": msg.get_body(preferencelist=("html",)).get_content(),
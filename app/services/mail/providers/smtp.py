@@ -1,39 +1,181 @@
 # SMTP Providers
 
-""" 
- No logging
+"""
  No fallback logic
  Pure transport layer
+
+ Authenticated sessions are kept open and reused: one TCP + TLS + AUTH
+ handshake serves up to smtp_session_max_messages messages, instead of
+ one handshake per message.
 """
 
-import aiosmtplib
+import asyncio
+import logging
+import time
 from email.message import EmailMessage
+from typing import Dict, List, Optional, Tuple
+
+import aiosmtplib
 from app.core.config import get_app_config
 
+logger = logging.getLogger(__name__)
+
 app_config = get_app_config()
 
+SMTP_TIMEOUT = 15
+
+
+class _Session:
+    __slots__ = ("client", "messages", "last_used")
+
+    def __init__(self, client: aiosmtplib.SMTP):
+        self.client = client
+        self.messages = 0
+        self.last_used = time.monotonic()
+
+
+class SMTPSessionPool:
+    """
+    Open, logged-in sessions to one SMTP server, at most `size` at a time.
+
+    A session goes back to the pool after a successful send and is dropped
+    after any error, after `max_messages` messages or when it sat idle for
+    `idle_seconds` (servers close idle connections on their own). A reused
+    session that turns out to be disconnected is replaced and the message
+    sent once more on a new one.
+    """
+
+    def __init__(
+        self,
+        *,
+        hostname: str,
+        port: int,
+        username: Optional[str],
+        password: Optional[str],
+        use_tls: bool,
+        start_tls: bool,
+        size: int,
+        max_messages: int,
+        idle_seconds: float,
+        timeout: float = SMTP_TIMEOUT,
+    ):
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.start_tls = start_tls
+        self.max_messages = max_messages
+        self.idle_seconds = idle_seconds
+        self.timeout = timeout
+        self._idle: List[_Session] = []
+        self._slots = asyncio.Semaphore(max(1, size))
+
+    async def send(self, msg: EmailMessage) -> None:
+        async with self._slots:
+            session = self._take_idle()
+            reused = session is not None
+            if session is None:
+                session = await self._open()
+            try:
+                await session.client.send_message(msg)
+            except aiosmtplib.SMTPServerDisconnected:
+                await self._discard(session)
+                if not reused:
+                    raise
+                session = await self._open()
+                try:
+                    await session.client.send_message(msg)
+                except BaseException:
+                    await self._discard(session)
+                    raise
+            except BaseException:
+                await self._discard(session)
+                raise
+            session.messages += 1
+            session.last_used = time.monotonic()
+            if session.messages >= self.max_messages:
+                await self._discard(session, quit=True)
+            else:
+                self._idle.append(session)
+
+    def _take_idle(self) -> Optional[_Session]:
+        while self._idle:
+            session = self._idle.pop()
+            if session.client.is_connected and time.monotonic() - session.last_used < self.idle_seconds:
+                return session
+            session.client.close()
+        return None
+
+    async def _open(self) -> _Session:
+        client = aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            username=self.username,
+            password=self.password,
+            use_tls=self.use_tls,
+            start_tls=self.start_tls,
+            timeout=self.timeout,
+        )
+        await client.connect()  # TLS and login happen here
+        return _Session(client)
+
+    async def _discard(self, session: _Session, quit: bool = False) -> None:
+        if quit and session.client.is_connected:
+            try:
+                await session.client.quit()
+                return
+            except Exception:
+                pass
+        session.client.close()
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for session in idle:
+            await self._discard(session, quit=True)
+
+
+# One pool per event loop and server settings; a mail_config reload that
+# changes the server or credentials gets a new pool
+_pools: Dict[Tuple, SMTPSessionPool] = {}
+
+
+def get_pool(*, port: int, use_tls: bool, start_tls: bool) -> SMTPSessionPool:
+    mail = app_config.mail_config  # one section, even if a reload swaps it meanwhile
+    password = mail.smtp_password.strip() if mail.smtp_password else mail.smtp_password
+    key = (id(asyncio.get_running_loop()), mail.smtp_host, port, use_tls, start_tls,
+           mail.smtp_username, password)
+    pool = _pools.get(key)
+    if pool is None:
+        pool = _pools[key] = SMTPSessionPool(
+            hostname=mail.smtp_host,
+            port=port,
+            username=mail.smtp_username,
+            password=password,
+            use_tls=use_tls,
+            start_tls=start_tls,
+            size=mail.smtp_pool_size,
+            max_messages=mail.smtp_session_max_messages,
+            idle_seconds=mail.smtp_session_idle_seconds,
+        )
+    return pool
+
+
+async def close_pools() -> None:
+    """Quit the idle sessions of this event loop's pools (shutdown)."""
+    loop_id = id(asyncio.get_running_loop())
+    for key in [key for key in _pools if key[0] == loop_id]:
+        await _pools.pop(key).close()
+
 
 async def send_starttls(msg: EmailMessage) -> None:
-    await aiosmtplib.send(
-        msg,
-        hostname=app_config.mail_config.smtp_host,
-        port=587,
-        username=app_config.mail_config.smtp_username,
-        password=app_config.mail_config.smtp_password.strip(),
-        start_tls=True,
-        timeout=15,
-    )
+    await get_pool(port=587, use_tls=False, start_tls=True).send(msg)
 
 
 async def send_ssl(msg: EmailMessage) -> None:
-    await aiosmtplib.send(
-        msg,
-        hostname=app_config.mail_config.smtp_host,
-        port=465,
-        username=app_config.mail_config.smtp_username,
-        password=app_config.mail_config.smtp_password.strip(),
-        use_tls=True,
-        start_tls=False,
-        timeout=15,
-    )
+    await get_pool(port=465, use_tls=True, start_tls=False).send(msg)
+
 
+async def send_plain(msg: EmailMessage) -> None:
+    """Unencrypted SMTP on smtp_port, for a local relay or the fake server."""
+    await get_pool(port=app_config.mail_config.smtp_port, use_tls=False, start_tls=False).send(msg)
@@ -0,0 +1,210 @@
+"""
+Durable outbound queue (outbound_emails table)
+
+enqueue() stores a message and returns; the mail worker (worker.py)
+delivers it. Rows are claimed with FOR UPDATE SKIP LOCKED, so every
+application process can run a worker against the same table. A failed
+delivery is retried with exponential backoff up to mail_config.retry_attempts
+times; a claim whose worker died is picked up again once its lease
+(queue_lease_seconds) has run out.
+
+The lease is renewed just before each message of a batch is sent, and
+every write after the claim is conditional on locked_until still holding
+this worker's value: a message whose lease ran out and was claimed by
+another worker is left to that worker instead of being sent twice.
+"""
+
+import logging
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.config import get_app_config
+from app.db.session import get_async_sessionmaker
+from app.models.outbound_email import OutboundEmail, OutboundEmailStatus
+
+logger = logging.getLogger(__name__)
+
+app_config = get_app_config()
+
+PRIORITY_CRITICAL = 0   # verification codes, password resets
+PRIORITY_NORMAL = 10
+
+_ERROR_LENGTH = 2000
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+async def enqueue(
+    *,
+    subject: str,
+    recipients: List[str],
+    html_body: str = "",
+    text_body: str = "",
+    priority: int = PRIORITY_NORMAL,
+) -> UUID:
+    """Store a message for delivery and return its id."""
+    async with get_async_sessionmaker()() as db:
+        email = OutboundEmail(
+            recipients=", ".join(recipients),
+            subject=subject,
+            html_body=html_body,
+            text_body=text_body,
+            priority=priority,
+            status=OutboundEmailStatus.PENDING,
+            attempts=0,
+            next_attempt_at=_now(),
+        )
+        db.add(email)
+        await db.commit()
+        return email.id
+
+
+async def claim_due(db: AsyncSession, limit: int, lease_seconds: int) -> List[OutboundEmail]:
+    """
+    Lock up to ``limit`` due messages for this worker, most urgent first,
+    and mark them as being sent until the lease runs out. Commits.
+    """
+    now = _now()
+    rows = (await db.execute(
+        select(OutboundEmail)
+        .where(or_(
+            and_(OutboundEmail.status == OutboundEmailStatus.PENDING,
+                 OutboundEmail.next_attempt_at <= now),
+            and_(OutboundEmail.status == OutboundEmailStatus.SENDING,
+                 OutboundEmail.locked_until < now),
+        ))
+        .order_by(OutboundEmail.priority, OutboundEmail.next_attempt_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )).scalars().all()
+
+    locked_until = now + timedelta(seconds=lease_seconds)
+    for email in rows:
+        email.status = OutboundEmailStatus.SENDING
+        email.locked_until = locked_until
+        email.attempts += 1
+    await db.commit()
+    return list(rows)
+
+
+async def _update_claimed(db: AsyncSession, email: OutboundEmail, **values) -> bool:
+    """
+    Write ``values`` to a claimed message if this worker still holds the
+    claim (locked_until unchanged since it was set). Commits.
+    """
+    result = await db.execute(
+        update(OutboundEmail)
+        .where(OutboundEmail.id == email.id,
+               OutboundEmail.status == OutboundEmailStatus.SENDING,
+               OutboundEmail.locked_until == email.locked_until)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    if result.rowcount != 1:
+        logger.warning(f" Lost the claim on email {email.id}; leaving it to the worker that holds it")
+        return False
+    for key, value in values.items():
+        set_committed_value(email, key, value)
+    return True
+
+
+async def renew_claim(db: AsyncSession, email: OutboundEmail, lease_seconds: int) -> bool:
+    """
+    Extend the lease on a claimed message right before sending it, so the
+    lease covers this delivery rather than the whole batch. False when the
+    claim was lost (the message must not be sent).
+    """
+    return await _update_claimed(
+        db, email, locked_until=_now() + timedelta(seconds=lease_seconds)
+    )
+
+
+async def mark_sent(db: AsyncSession, email: OutboundEmail, provider: str) -> bool:
+    return await _update_claimed(
+        db, email,
+        status=OutboundEmailStatus.SENT,
+        provider=provider,
+        sent_at=_now(),
+        locked_until=None,
+        last_error=None,
+    )
+
+
+def backoff_seconds(attempts: int) -> float:
+    """Delay before the next try after ``attempts`` failed ones, with jitter."""
+    mail = app_config.mail_config
+    delay = min(mail.retry_backoff_seconds * 2 ** max(attempts - 1, 0), mail.retry_backoff_max_seconds)
+    return delay * random.uniform(0.8, 1.2)
+
+
+async def mark_failed(
+    db: AsyncSession,
+    email: OutboundEmail,
+    error: str,
+    *,
+    permanent: bool = False,
+    retry_in: Optional[float] = None,
+) -> bool:
+    """
+    Record a failed delivery: retry later, or give up when the message was
+    refused or has used its attempts. ``retry_in`` is given when no provider
+    was tried at all (all circuit-open); that does not use up an attempt.
+    """
+    values: Dict[str, Any] = {"last_error": error[:_ERROR_LENGTH], "locked_until": None}
+    if retry_in is not None:
+        values.update(
+            attempts=max(email.attempts - 1, 0),
+            status=OutboundEmailStatus.PENDING,
+            next_attempt_at=_now() + timedelta(seconds=retry_in),
+        )
+    elif permanent or email.attempts >= app_config.mail_config.retry_attempts:
+        values.update(status=OutboundEmailStatus.FAILED)
+    else:
+        values.update(
+            status=OutboundEmailStatus.PENDING,
+            next_attempt_at=_now() + timedelta(seconds=backoff_seconds(email.attempts)),
+        )
+
+    updated = await _update_claimed(db, email, **values)
+    if updated and email.status == OutboundEmailStatus.FAILED:
+        logger.error(f" Giving up on email {email.id} after {email.attempts} attempt(s): {error}")
+    return updated
+
+
+async def queue_stats(db: AsyncSession) -> Dict[str, Any]:
+    """Message counts by status and the age of the oldest due message."""
+    counts = dict((await db.execute(
+        select(OutboundEmail.status, func.count()).group_by(OutboundEmail.status)
+    )).all())
+    oldest_due = (await db.execute(
+        select(func.min(OutboundEmail.next_attempt_at))
+        .where(OutboundEmail.status == OutboundEmailStatus.PENDING,
+               OutboundEmail.next_attempt_at <= _now())
+    )).scalar()
+    return {
+        "counts": {status.value: counts.get(status, 0) for status in OutboundEmailStatus},
+        "oldest_due_seconds": round((_now() - oldest_due).total_seconds(), 1) if oldest_due else 0.0,
+    }
+
+
+async def retry_failed(db: AsyncSession, ids: Optional[List[UUID]] = None) -> int:
+    """Put failed messages (all, or the given ones) back in the queue."""
+    stmt = (
+        update(OutboundEmail)
+        .where(OutboundEmail.status == OutboundEmailStatus.FAILED)
+        .values(status=OutboundEmailStatus.PENDING, attempts=0, next_attempt_at=_now())
+    )
+    if ids:
+        stmt = stmt.where(OutboundEmail.id.in_(ids))
+    result = await db.execute(stmt)
+    await db.commit()
+    return result.rowcount
@@ -9,11 +9,17 @@ The ONLY Public API
 """
 
 
+import logging
+
 from fastapi import BackgroundTasks
 from pydantic import EmailStr
 
+from . import queue
 from .message import build_message
 from .fallback import send_with_fallback
+from .worker import mail_worker
+
+logger = logging.getLogger(__name__)
 
 
 async def send_email(
@@ -55,3 +61,30 @@ def send_email_background(
     background_tasks.add_task(send_with_fallback, msg)
 
 
+async def queue_email(
+    *,
+    subject: str,
+    to: EmailStr | list[EmailStr],
+    html_body: str = "",
+    text_body: str = "",
+    critical: bool = False,
+) -> bool:
+    """
+    Store the message in the outbound queue for the mail worker; critical
+    messages go ahead of the rest. Returns False when it could not be
+    queued (database unavailable), so the caller can send it directly.
+    """
+    recipients = [to] if isinstance(to, str) else list(to)
+    try:
+        await queue.enqueue(
+            subject=subject,
+            recipients=recipients,
+            html_body=html_body,
+            text_body=text_body,
+            priority=queue.PRIORITY_CRITICAL if critical else queue.PRIORITY_NORMAL,
+        )
+    except Exception as exc:
+        logger.error(f" Could not queue email: {exc.__class__.__name__}: {exc}")
+        return False
+    mail_worker.wake()
+    return True
@@ -1,24 +1,249 @@
  # Jinja email rendering
- 
+
+"""
+One Environment per process, built at import:
+
+- compiled templates are kept in memory by Jinja and their bytecode on
+  disk (mail_config.template_cache_path), so a restart skips compilation
+- auto_reload (re-stat every template on each get_template) only in
+  development_mode
+- warm_templates() compiles every email template at startup
+- each .html template has a plain-text twin: its .txt sibling when one
+  exists with content, otherwise a text template derived from the HTML
+  source (html_to_text_source) once, then compiled and rendered like any
+  other template
+- fragment() renders a template that only needs the base context (headers,
+  footers) once per distinct base context
+"""
+
+import logging
+import os
+import re
 from datetime import datetime
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from functools import lru_cache
+from html import unescape
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+
+from jinja2 import (
+    BaseLoader,
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    TemplateNotFound,
+    select_autoescape,
+)
+from markupsafe import Markup
+
 from app.core.config import get_app_config
 
+logger = logging.getLogger(__name__)
+
 app_config = get_app_config()
 
+EMAIL_TEMPLATE_PREFIX = "emails/"
+
+
+# ------------------------------------------------------------------
+# HTML -> plain text, on template source
+# ------------------------------------------------------------------
+
+# {{ ... }}, {% ... %} and {# ... #}, kept verbatim through the HTML parser
+_JINJA = re.compile(r"\{\{.*?\}\}|\{%.*?%\}|\{#.*?#\}", re.DOTALL)
+_PLACEHOLDER = re.compile(r"\x00(\d+)\x00")
+_BLANK_LINES = re.compile(r"\n\s*\n(\s*\n)+")
+_BLOCK_TAGS = {
+    "p", "div", "table", "tr", "ul", "ol", "h1", "h2", "h3", "h4", "h5", "h6",
+    "blockquote", "section", "header", "footer", "hr",
+}
+_SKIP_TAGS = {"head", "style", "script", "title"}
+
+
+class _TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.parts: List[str] = []
+        self.skip_depth = 0
+        self.links: List[Optional[str]] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self.skip_depth += 1
+        elif tag == "br":
+            self.parts.append("\n")
+        elif tag == "li":
+            self.parts.append("\n- ")
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n\n")
+        elif tag == "a":
+            self.links.append(dict(attrs).get("href"))
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n\n")
+        elif tag == "a" and self.links:
+            href = self.links.pop()
+            if href and not href.startswith("#"):
+                self.parts.append(f" ({href})")
+
+    def handle_data(self, data):
+        if not self.skip_depth:
+            self.parts.append(re.sub(r"[ \t\r\n]+", " ", data))
+
+    def handle_entityref(self, name):
+        self.handle_data(unescape(f"&{name};"))
+
+    def handle_charref(self, name):
+        self.handle_data(unescape(f"&#{name};"))
+
+
+def html_to_text_source(source: str) -> str:
+    """
+    Plain-text version of an HTML Jinja template's source: tags dropped,
+    block elements as line breaks, list items as "- ", links as
+    "text (href)", head/style/script removed. Jinja tags, expressions and
+    comments are kept as they are, so the result is itself a template.
+    """
+    jinja_parts: List[str] = []
+
+    def protect(match: re.Match) -> str:
+        jinja_parts.append(match.group(0))
+        return f"\x00{len(jinja_parts) - 1}\x00"
+
+    parser = _TextExtractor()
+    parser.feed(_JINJA.sub(protect, source))
+    parser.close()
+    text = "".join(parser.parts)
+
+    lines = [line.strip() for line in text.split("\n")]
+    text = _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip() + "\n"
+    # Placeholders inside dropped markup (attributes, <style>) go with it
+    return _PLACEHOLDER.sub(lambda m: jinja_parts[int(m.group(1))], text)
+
+
+class _TextLoader(BaseLoader):
+    """Serves "<name>.html" as its .txt sibling or the derived text source."""
+
+    def __init__(self, loader: FileSystemLoader):
+        self.loader = loader
+
+    def get_source(self, environment, template):
+        if template.endswith(".html"):
+            sibling = template[:-len(".html")] + ".txt"
+            try:
+                source, filename, uptodate = self.loader.get_source(environment, sibling)
+                if source.strip():
+                    return source, filename, uptodate
+            except TemplateNotFound:
+                pass
+            source, filename, uptodate = self.loader.get_source(environment, template)
+            return html_to_text_source(source), filename, uptodate
+        return self.loader.get_source(environment, template)
+
+    def list_templates(self):
+        return self.loader.list_templates()
+
+
+# ------------------------------------------------------------------
+# Environments
+# ------------------------------------------------------------------
+
+def _bytecode_cache(kind: str) -> Optional[FileSystemBytecodeCache]:
+    path = app_config.mail_config.template_cache_path
+    if not path:
+        return None
+    directory = os.path.join(path, kind)
+    try:
+        os.makedirs(directory, exist_ok=True)
+    except OSError as e:
+        logger.warning(f" Template bytecode cache disabled ({directory}): {e}")
+        return None
+    return FileSystemBytecodeCache(directory)
+
+
+_auto_reload = app_config.general_config.development_mode
+_file_loader = FileSystemLoader(app_config.general_config.templates_dir)
+
 env = Environment(
-    loader=FileSystemLoader(app_config.general_config.templates_dir),
+    loader=_file_loader,
     autoescape=select_autoescape(["html", "xml"]),
+    auto_reload=_auto_reload,
+    bytecode_cache=_bytecode_cache("html"),
 )
 
+text_env = Environment(
+    loader=_TextLoader(_file_loader),
+    autoescape=False,
+    auto_reload=_auto_reload,
+    bytecode_cache=_bytecode_cache("text"),
+)
 
-def render_email(template: str, **context) -> str:
-    base_context = {
+
+def base_context() -> Dict[str, object]:
+    return {
+        "app_name": app_config.general_config.site_name,
         "company_name": app_config.mail_config.mail_sender_name,
         "year": datetime.now().year,
         "dashboard_url": app_config.general_config.frontend_url,
     }
 
-    return env.get_template(f"emails/{template}").render(
-        base_context | context
+
+@lru_cache(maxsize=64)
+def _render_fragment(kind: str, template: str, context: Tuple[Tuple[str, object], ...]) -> str:
+    environment = env if kind == "html" else text_env
+    return environment.get_template(template).render(dict(context))
+
+
+def fragment(template: str, text: bool = False) -> str:
+    """
+    A template rendered with the base context only (header, footer), once
+    per distinct base context. Also available inside templates as
+    ``{{ fragment("emails/_footer.html") }}``.
+    """
+    key = tuple(sorted(base_context().items()))
+    if text:
+        return _render_fragment("text", template, key)
+    return Markup(_render_fragment("html", template, key))
+
+
+env.globals["fragment"] = fragment
+text_env.globals["fragment"] = lambda template: fragment(template, text=True)
+
+
+def render_email(template: str, **context) -> str:
+    return env.get_template(f"{EMAIL_TEMPLATE_PREFIX}{template}").render(
+        base_context() | context
     )
+
+
+def render_email_text(template: str, **context) -> str:
+    text = text_env.get_template(f"{EMAIL_TEMPLATE_PREFIX}{template}").render(
+        base_context() | context
+    )
+    # Block and include boundaries leave runs of blank lines
+    return _BLANK_LINES.sub("\n\n", text).strip() + "\n"
+
+
+def email_templates() -> List[str]:
+    """Email templates that are sent (not partials starting with "_"), relative to emails/."""
+    return sorted(
+        name[len(EMAIL_TEMPLATE_PREFIX):]
+        for name in env.list_templates(extensions=["html"])
+        if name.startswith(EMAIL_TEMPLATE_PREFIX)
+        and not os.path.basename(name).startswith("_")
+    )
+
+
+def warm_templates() -> int:
+    """Compile every email template and its text twin (startup); returns how many."""
+    compiled = 0
+    for name in email_templates():
+        try:
+            env.get_template(f"{EMAIL_TEMPLATE_PREFIX}{name}")
+            text_env.get_template(f"{EMAIL_TEMPLATE_PREFIX}{name}")
+            compiled += 1
+        except Exception as e:
+            logger.error(f" Email template {name} failed to compile: {e}")
+    return compiled
@@ -0,0 +1,179 @@
+"""
+Local fake SMTP server
+
+Plain (unencrypted) SMTP with AUTH PLAIN/LOGIN that accepts any
+credentials and keeps what it receives in memory. Point the app at it with
+
+    APP_SMTP_HOST=127.0.0.1 APP_SMTP_PORT=1025
+    APP_SMTP_USE_TLS=false APP_SMTP_USE_SSL=false
+
+which selects the plain SMTP provider, and run it standalone with
+
+    python -m app.services.mail.testing --port 1025
+
+In tests, start it in the test's event loop:
+
+    server = FakeSMTPServer()
+    await server.start()            # server.port is the bound port
+    ...
+    server.messages[0]["Subject"]   # email.message.EmailMessage
+    await server.stop()
+
+Failures can be injected: `down` closes new connections with a 421,
+`reject_recipients` refuses those addresses with a 550, `delay` slows
+every reply, and `drop_after` disconnects a session after that many
+messages (a server closing a reused connection).
+"""
+
+import argparse
+import asyncio
+import base64
+import logging
+from email import message_from_bytes, policy
+from email.message import EmailMessage
+from typing import List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class FakeSMTPServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        self.messages: List[EmailMessage] = []
+        self.envelopes: List[dict] = []
+        self.connections = 0
+        self.logins = 0
+        self.down = False
+        self.reject_recipients: Set[str] = set()
+        self.delay = 0.0
+        self.drop_after: Optional[int] = None
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    async def start(self) -> "FakeSMTPServer":
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def reset(self) -> None:
+        self.messages.clear()
+        self.envelopes.clear()
+        self.connections = self.logins = 0
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+
+        async def reply(line: str) -> None:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            writer.write(line.encode("ascii") + b"\r\n")
+            await writer.drain()
+
+        async def read_line() -> Optional[str]:
+            line = await reader.readline()
+            return line.decode("utf-8", "replace").rstrip("\r\n") if line else None
+
+        try:
+            if self.down:
+                await reply("421 Service not available")
+                return
+            await reply("220 fake-smtp ESMTP ready")
+            mail_from, rcpts, sent = None, [], 0
+            while True:
+                line = await read_line()
+                if line is None:
+                    return
+                verb, _, arg = line.partition(" ")
+                verb = verb.upper()
+                if verb == "EHLO":
+                    await reply("250-fake-smtp")
+                    await reply("250-8BITMIME")
+                    await reply("250-SMTPUTF8")
+                    await reply("250 AUTH PLAIN LOGIN")
+                elif verb == "HELO":
+                    await reply("250 fake-smtp")
+                elif verb == "AUTH":
+                    mechanism, _, initial = arg.partition(" ")
+                    if mechanism.upper() == "PLAIN" and not initial:
+                        await reply("334 ")
+                        await read_line()
+                    elif mechanism.upper() == "LOGIN":
+                        await reply("334 " + base64.b64encode(b"Username:").decode())
+                        await read_line()
+                        await reply("334 " + base64.b64encode(b"Password:").decode())
+                        await read_line()
+                    self.logins += 1
+                    await reply("235 Authentication successful")
+                elif verb == "MAIL":
+                    mail_from, rcpts = arg.split(":", 1)[1].strip().split()[0].strip("<>"), []
+                    await reply("250 OK")
+                elif verb == "RCPT":
+                    address = arg.split(":", 1)[1].strip().split()[0].strip("<>")
+                    if address in self.reject_recipients:
+                        await reply("550 No such user")
+                    else:
+                        rcpts.append(address)
+                        await reply("250 OK")
+                elif verb == "DATA":
+                    if not rcpts:
+                        await reply("554 No valid recipients")
+                        continue
+                    await reply("354 End data with <CR><LF>.<CR><LF>")
+                    lines = []
+                    while True:
+                        raw = await reader.readline()
+                        if not raw or raw in (b".\r\n", b".\n"):
+                            break
+                        lines.append(raw[1:] if raw.startswith(b"..") else raw)
+                    message = message_from_bytes(b"".join(lines), policy=policy.default)
+                    self.messages.append(message)
+                    self.envelopes.append({"from": mail_from, "to": rcpts})
+                    sent += 1
+                    await reply("250 OK queued")
+                    if self.drop_after is not None and sent >= self.drop_after:
+                        return
+                elif verb == "RSET":
+                    mail_from, rcpts = None, []
+                    await reply("250 OK")
+                elif verb == "NOOP":
+                    await reply("250 OK")
+                elif verb == "QUIT":
+                    await reply("221 Bye")
+                    return
+                else:
+                    await reply("502 Command not implemented")
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def _serve(host: str, port: int) -> None:
+    server = await FakeSMTPServer(host, port).start()
+    print(f"Fake SMTP server on {server.host}:{server.port}")
+    seen = 0
+    try:
+        while True:
+            await asyncio.sleep(0.5)
+            for message in server.messages[seen:]:
+                print(f"--- {message['Subject']!r} to {message['To']} ({server.connections} connections so far)")
+            seen = len(server.messages)
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local fake SMTP server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1025)
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
@@ -17,5 +17,6 @@ from enum import Enum
 class MailProvider(str, Enum):
     SMTP_STARTTLS = "smtp_starttls"
     SMTP_SSL = "smtp_ssl"
+    SMTP_PLAIN = "smtp_plain"
     RESEND_API = "resend_api"
 
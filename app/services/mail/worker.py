@@ -0,0 +1,102 @@
+"""
+Mail queue worker
+
+One asyncio task per application process, started and stopped by the
+lifespan in main.py. It claims a batch of due messages, delivers them
+through the provider chain (fallback.deliver) and records the outcome
+per message. It wakes up when this process queues a message, and every
+queue_poll_interval_seconds for messages queued elsewhere or due for retry.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+from app.core.config import get_app_config
+from app.db.session import get_async_sessionmaker
+
+from . import queue
+from .fallback import deliver
+from .message import build_message
+from .providers.smtp import close_pools
+
+logger = logging.getLogger(__name__)
+
+app_config = get_app_config()
+
+
+class MailWorker:
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._wake = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run(), name="mail-queue-worker")
+        logger.info(" Mail queue worker started")
+
+    def wake(self) -> None:
+        """Deliver newly queued mail now instead of at the next poll."""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await close_pools()
+
+    async def _run(self) -> None:
+        while True:
+            mail = app_config.mail_config
+            try:
+                claimed = await self.run_once()
+            except Exception as e:
+                logger.error(f" Mail queue worker error: {e}")
+                claimed = 0
+            if claimed >= mail.queue_batch_size:
+                continue  # more may be due
+            try:
+                await asyncio.wait_for(self._wake.wait(), mail.queue_poll_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    async def run_once(self) -> int:
+        """Deliver one batch of due messages; returns how many were claimed."""
+        mail = app_config.mail_config
+        async with get_async_sessionmaker()() as db:
+            emails = await queue.claim_due(db, mail.queue_batch_size, mail.queue_lease_seconds)
+            for email in emails:
+                # The batch's lease may have run out while earlier messages
+                # were sent; skip any message another worker has claimed since
+                if not await queue.renew_claim(db, email, mail.queue_lease_seconds):
+                    continue
+                msg = build_message(
+                    subject=email.subject,
+                    recipients=email.recipients.split(", "),
+                    html_body=email.html_body,
+                    text_body=email.text_body,
+                )
+                result = await deliver(msg)
+                if result.delivered:
+                    await queue.mark_sent(db, email, result.provider.value)
+                else:
+                    await queue.mark_failed(
+                        db, email, "; ".join(result.errors) or "no mail provider available",
+                        permanent=result.permanent, retry_in=result.retry_in,
+                    )
+            return len(emails)
+
+
+mail_worker = MailWorker()
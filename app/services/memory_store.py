@@ -0,0 +1,206 @@
+# app/services/memory_store.py
+# ========================================================================
+# Bounded in-memory key/value store - RedisService fallback
+# ========================================================================
+
+import heapq
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Returned by MemoryStore.get() for missing or expired keys
+MISSING = object()
+
+
+class _Shard:
+    """
+    One lock-protected slice of the store.
+
+    Entries are kept in LRU order (OrderedDict). Expiry times go into a
+    min-heap, so purging expired keys costs O(log n) per expired key instead
+    of a scan over every key. Heap items are not removed when a key is
+    overwritten or deleted; stale items are skipped when popped and the heap
+    is rebuilt if they pile up.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.lock = threading.Lock()
+        self.data: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self.expiry_heap: List[Tuple[float, str]] = []
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    # Callers hold self.lock for everything below
+
+    def purge_expired(self, now: float) -> None:
+        heap = self.expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+            entry = self.data.get(key)
+            if entry is not None and entry[1] == expires_at:
+                del self.data[key]
+                self.expirations += 1
+
+    def lookup(self, key: str, now: float) -> Optional[Tuple[Any, Optional[float]]]:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= now:
+            # Expired but not purged yet (same-instant expiry)
+            del self.data[key]
+            self.expirations += 1
+            return None
+        return entry
+
+    def store(self, key: str, value: Any, expires_at: Optional[float]) -> None:
+        self.data[key] = (value, expires_at)
+        self.data.move_to_end(key)
+        if expires_at is not None:
+            heapq.heappush(self.expiry_heap, (expires_at, key))
+            if len(self.expiry_heap) > 2 * len(self.data) + 64:
+                self._compact_heap()
+
+        while len(self.data) > self.capacity:
+            self.data.popitem(last=False)
+            self.evictions += 1
+
+    def _compact_heap(self) -> None:
+        self.expiry_heap = [
+            (expires_at, key)
+            for key, (_, expires_at) in self.data.items()
+            if expires_at is not None
+        ]
+        heapq.heapify(self.expiry_heap)
+
+
+class MemoryStore:
+    """
+    Thread-safe, size-bounded key/value store with per-key TTLs.
+
+    - Capacity bound with least-recently-used eviction
+    - Expiry via a TTL min-heap (amortized O(log n))
+    - Keys hashed across independently locked shards
+    - Hit/miss/eviction/expiration counters (see stats())
+
+    Values are stored as given; encoding is left to the caller.
+    """
+
+    def __init__(self, max_entries: int = 10000, shards: int = 16):
+        if max_entries < 1 or shards < 1:
+            raise ValueError("max_entries and shards must be positive")
+        shards = min(shards, max_entries)
+        self.max_entries = max_entries
+        # Spread the capacity; the first shards take the remainder
+        base, extra = divmod(max_entries, shards)
+        self._shards = [_Shard(base + (1 if i < extra else 0)) for i in range(shards)]
+
+    def _shard(self, key: str) -> _Shard:
+        # crc32 is stable across processes, unlike hash() for str
+        return self._shards[zlib.crc32(key.encode("utf-8")) % len(self._shards)]
+
+    def get(self, key: str) -> Any:
+        """Value for key, or MISSING."""
+        shard = self._shard(key)
+        now = time.time()
+        with shard.lock:
+            shard.purge_expired(now)
+            entry = shard.lookup(key, now)
+            if entry is None:
+                shard.misses += 1
+                return MISSING
+            shard.data.move_to_end(key)
+            shard.hits += 1
+            return entry[0]
+
+    def set(self, key: str, value: Any, expiry: Optional[int] = None) -> None:
+        """Store value, expiring after ``expiry`` seconds (never when falsy)."""
+        shard = self._shard(key)
+        now = time.time()
+        with shard.lock:
+            shard.purge_expired(now)
+            shard.store(key, value, now + expiry if expiry else None)
+
+    def increment(self, key: str, expiry: Optional[int] = None) -> int:
+        """Add 1 to an integer value (missing counts as 0) and reset its expiry."""
+        shard = self._shard(key)
+        now = time.time()
+        with shard.lock:
+            shard.purge_expired(now)
+            entry = shard.lookup(key, now)
+            count = (entry[0] if entry is not None else 0) + 1
+            shard.store(key, count, now + expiry if expiry else None)
+            return count
+
+    def update(
+        self,
+        key: str,
+        fn: Callable[[Any], Tuple[Any, Any]],
+        expiry: Optional[int] = None
+    ) -> Any:
+        """
+        Replace a value in one step: ``fn(current value or MISSING)`` returns
+        (new value, result), is called under the key's shard lock so no other
+        access to the key interleaves, and must not block. The new value gets
+        a fresh expiry; the result is returned.
+        """
+        shard = self._shard(key)
+        now = time.time()
+        with shard.lock:
+            shard.purge_expired(now)
+            entry = shard.lookup(key, now)
+            value, result = fn(entry[0] if entry is not None else MISSING)
+            shard.store(key, value, now + expiry if expiry else None)
+            return result
+
+    def delete(self, *keys: str) -> int:
+        """Remove keys; returns how many existed."""
+        deleted = 0
+        now = time.time()
+        for key in keys:
+            shard = self._shard(key)
+            with shard.lock:
+                if shard.lookup(key, now) is not None:
+                    del shard.data[key]
+                    deleted += 1
+        return deleted
+
+    def exists(self, *keys: str) -> int:
+        """How many of the keys are present (repeats count, as in Redis)."""
+        found = 0
+        now = time.time()
+        for key in keys:
+            shard = self._shard(key)
+            with shard.lock:
+                if shard.lookup(key, now) is not None:
+                    found += 1
+        return found
+
+    def clear(self) -> None:
+        for shard in self._shards:
+            with shard.lock:
+                shard.data.clear()
+                shard.expiry_heap.clear()
+
+    def __len__(self) -> int:
+        return sum(len(shard.data) for shard in self._shards)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters summed across shards."""
+        totals = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "entries": 0}
+        for shard in self._shards:
+            with shard.lock:
+                totals["hits"] += shard.hits
+                totals["misses"] += shard.misses
+                totals["evictions"] += shard.evictions
+                totals["expirations"] += shard.expirations
+                totals["entries"] += len(shard.data)
+        lookups = totals["hits"] + totals["misses"]
+        totals["hit_rate"] = round(totals["hits"] / lookups * 100, 1) if lookups else 0.0
+        totals["max_entries"] = self.max_entries
+        totals["shards"] = len(self._shards)
+        return totals
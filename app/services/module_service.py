@@ -7,13 +7,15 @@ Uses temporary negative orders to avoid unique constraint violations.
 """
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, select
 from uuid import UUID
 from typing import List
 
 from app.schemas.module import ModuleCreate, ModuleUpdate
 from app.models.course import Course
+from app.models.lesson import Lesson
 from app.models.modules import Module
+from app.services import attendance_stats_service, grade_rollup_service
 from fastapi import HTTPException, status
 
 
@@ -86,6 +88,9 @@ def delete_module(db: Session, module_id: UUID) -> None:
     
     course_id = module.course_id
     deleted_order = module.order
+    enrollment_ids = attendance_stats_service.enrollment_ids_for_lessons(
+        db, select(Lesson.id).where(Lesson.module_id == module_id)
+    )
     
     # Delete the module
     db.delete(module)
@@ -94,6 +99,11 @@ def delete_module(db: Session, module_id: UUID) -> None:
     # Shift modules after the deleted one
     _reorder_modules_on_delete(db, course_id, deleted_order)
     
+    # Its lessons, score columns and attendance went with it; keep the
+    # grade rollups and attendance counters in step
+    grade_rollup_service.refresh_course_rollups(db, course_id)
+    attendance_stats_service.refresh_enrollment_counters(db, enrollment_ids)
+    
     db.commit()
 
 
@@ -104,6 +114,40 @@ def list_course_modules(db: Session, course_id: UUID) -> List[Module]:
     ).order_by(Module.order).all()
 
 
+def list_course_module_summaries(
+    db: Session,
+    course_id: UUID,
+    include_lessons: bool = True
+) -> List[dict]:
+    """
+    Module.get_summary() dicts for a course's modules, ordered by order.
+
+    Built from column projections: one query for the modules and, with
+    lessons, one for the lesson columns of all of them.
+    """
+    modules = db.query(*Module.summary_columns()).filter(
+        Module.course_id == course_id
+    ).order_by(Module.order).all()
+
+    summaries = [Module.summary_from_row(row) for row in modules]
+    if not include_lessons or not summaries:
+        return summaries
+
+    lesson_columns = [getattr(Lesson, field) for field in Module.LESSON_FIELDS]
+    lessons = db.query(Lesson.module_id, *lesson_columns).filter(
+        Lesson.module_id.in_([row.id for row in modules])
+    ).order_by(Lesson.order).all()
+
+    by_module = {summary["id"]: [] for summary in summaries}
+    for lesson in lessons:
+        by_module[lesson.module_id].append(Module.lesson_entry(lesson))
+
+    for summary in summaries:
+        summary["lessons"] = by_module[summary["id"]]
+        summary["lessons_count"] = len(summary["lessons"])
+    return summaries
+
+
 def get_module(db: Session, module_id: UUID) -> Module:
     """Get module by ID."""
     module = db.query(Module).filter(Module.id == module_id).first()
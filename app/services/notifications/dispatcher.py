@@ -5,7 +5,7 @@ Core Dispatcher (Single Source of Truth)
 
 from fastapi import BackgroundTasks
 from typing import Optional
-from app.services.mail.service import send_email, send_email_background
+from app.services.mail.service import queue_email, send_email, send_email_background
 
 from app.core.config import get_app_config
 app_config = get_app_config()
@@ -21,12 +21,23 @@ async def dispatch_email(
 ):
     """
     Unified email dispatcher.
+    - queue enabled  -> outbound queue, delivered by the mail worker
+                        (critical messages first); True once queued
     - critical=True  -> realtime (await)
     - critical=False -> background (fire & forget)
     """
 
     provider = app_config.mail_config.provider
 
+    if app_config.mail_config.queue_enabled and await queue_email(
+        subject=subject,
+        to=to,
+        html_body=html,
+        text_body=text,
+        critical=critical,
+    ):
+        return True
+
     if critical or not background_tasks:
         return await send_email(
             subject=subject,
@@ -2,7 +2,7 @@
 
 from datetime import datetime
 # from app.core.templating import render_template
-from app.services.mail.templates import render_email as render_email_template
+from app.services.mail.templates import render_email as render_email_template, render_email_text
 from app.core.config import app_config
 
 
@@ -16,8 +16,8 @@ def render_email(template: str, **context) -> tuple[str, str]:
     # html = render_template(f"emails/{template}", **context)
     html = render_email_template(f"{template}", **context)
 
-    # Minimal text fallback (can be improved later)
-    text = f"{context.get('subject', '')}\n\n{context.get('names', '')}"
+    # The template's .txt sibling, or a text version derived from the HTML once per template
+    text = render_email_text(f"{template}", **context)
 
     return html, text
 
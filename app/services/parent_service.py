@@ -1,4 +1,4 @@
-from sqlalchemy import desc, asc, or_, func, distinct
+from sqlalchemy import desc, asc, func, distinct
 from sqlalchemy.orm import Session, joinedload, aliased
 from typing import Optional
 from uuid import UUID
@@ -6,6 +6,8 @@ from uuid import UUID
 from app.models.parents import ParentChildren
 from app.models.user import User
 from app.models.rbac import Role
+from app.utils.pagination import KeysetPage, paginate_keyset
+from app.utils.search import build_search
 from app.schemas.parent import (
     LinkStatus,
     ParentChildCreate,
@@ -98,16 +100,11 @@ def get_links_query(
         return query.order_by(desc(ParentChildren.created_at))
 
     # Search (parent OR child / student)
-    if filters.search:
-        term = f"%{filters.search}%"
-        query = query.filter(
-            or_(
-                Parent.names.ilike(term),
-                Parent.email.ilike(term),
-                Child.names.ilike(term),
-                Child.email.ilike(term),
-            )
-        )
+    search = build_search(
+        db, filters.search, (Parent.names, Parent.email, Child.names, Child.email)
+    )
+    if search:
+        query = query.filter(search.condition)
 
     if filters.status:
         query = query.filter(ParentChildren.status == filters.status)
@@ -136,8 +133,24 @@ def get_links_query(
 def list_links(
     db: Session,
     filters: Optional[ParentChildFilters] = None,
-):
-    return get_links_query(db, filters).all()
+    page: int = 1,
+    page_size: int = 10,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+) -> KeysetPage:
+    """Keyset-paginated page of links; ``page`` is only honoured without a cursor"""
+    filters = filters or ParentChildFilters()
+
+    return paginate_keyset(
+        get_links_query(db, filters),
+        getattr(ParentChildren, filters.sort_by, ParentChildren.created_at),
+        ParentChildren.id,
+        order=filters.order,
+        page_size=page_size,
+        cursor=cursor,
+        offset=(page - 1) * page_size,
+        with_total=include_total,
+    )
 
 
 def create_link(
@@ -6,20 +6,20 @@ with PDF/Excel export and comprehensive analytics.
 """
 
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, and_, desc
+from sqlalchemy import func, and_
 from uuid import UUID
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, List, Any, Optional
 from datetime import datetime, timedelta
 from io import BytesIO
 
-from sqlalchemy import func, and_, desc, or_
+from sqlalchemy import func, and_, or_
 from app.models.enrollment import Enrollment
 from app.models.scores import Score, ScoreColumn
-from app.models.attendance import Attendance, AttendanceStatus
 from app.models.modules import Module
 from app.models.lesson import Lesson
 from app.models.course import Course
 from app.models.user import User
+from app.services import attendance_stats_service
 from fastapi import HTTPException, status
 
 # PDF Generation
@@ -46,9 +46,17 @@ GRADUATION_CRITERIA = {
 }
 
 
-def get_student_performance(db: Session, student_id: UUID) -> Dict[str, Any]:
+def get_student_performance(
+    db: Session,
+    student_id: UUID,
+    attendance_limit: Optional[int] = 50,
+    attendance_offset: int = 0
+) -> Dict[str, Any]:
     """
     Get comprehensive performance data for a student across all enrolled courses.
+
+    attendance_details holds one page of records (attendance_limit=None returns
+    all of them); page metadata is returned under attendance_pagination.
     """
     enrollments = db.query(Enrollment).options(
         joinedload(Enrollment.course)
@@ -62,14 +70,16 @@ def get_student_performance(db: Session, student_id: UUID) -> Dict[str, Any]:
             "courses": [],
             "attendance": _get_empty_attendance(),
             "attendance_details": [],
+            "attendance_pagination": _get_attendance_pagination(0, attendance_limit, attendance_offset),
             "trends": [],
             "graduation_status": _get_graduation_status(None, None, 0, 0)
         }
     
-    # Build course performance data
+    # Build course performance data from one bulk-loaded context
+    context = _load_performance_context(db, enrollments)
     courses_performance = []
     for enrollment in enrollments:
-        course_data = _get_course_performance(db, enrollment)
+        course_data = _get_course_performance(db, enrollment, context)
         if course_data:
             courses_performance.append(course_data)
     
@@ -78,7 +88,9 @@ def get_student_performance(db: Session, student_id: UUID) -> Dict[str, Any]:
     
     # Get attendance summary and details
     attendance = _get_attendance_summary(db, student_id)
-    attendance_details = _get_attendance_details(db, student_id)
+    attendance_details = _get_attendance_details(
+        db, student_id, limit=attendance_limit, offset=attendance_offset
+    )
     
     # Get performance trends
     trends = _get_performance_trends(db, student_id, enrollments)
@@ -98,6 +110,9 @@ def get_student_performance(db: Session, student_id: UUID) -> Dict[str, Any]:
         "courses": courses_performance,
         "attendance": attendance,
         "attendance_details": attendance_details,
+        "attendance_pagination": _get_attendance_pagination(
+            attendance['total'], attendance_limit, attendance_offset
+        ),
         "trends": trends,
         "graduation_status": graduation_status
     }
@@ -209,134 +224,190 @@ def get_student_performance(db: Session, student_id: UUID) -> Dict[str, Any]:
 #     }
 
 
-# v2
-def _get_course_performance(db: Session, enrollment: Enrollment) -> Dict[str, Any]:
-    """Calculate performance metrics for a single course with full assessment details."""
-    course = enrollment.course
+# v3 - set-based: all course data for a student is loaded in a fixed number of
+# bulk queries (see _load_performance_context) and assembled in memory.
+def _load_performance_context(db: Session, enrollments: List[Enrollment]) -> Dict[str, Any]:
+    """
+    Bulk-load modules, lessons, score columns, scores and graders for every
+    enrollment of a student.
+
+    Issues at most five queries regardless of how many courses, modules or
+    lessons are involved, and returns lookup tables keyed by course/module/lesson.
+    """
+    course_ids = list({e.course_id for e in enrollments})
+    enrollment_ids = [e.id for e in enrollments]
 
-    # ========================================================================
-    # STEP 1: Get all modules and lessons for this course (ensures ALL show)
-    # ========================================================================
     modules = db.query(Module).filter(
-        Module.course_id == course.id
-    ).order_by(
-        Module.order if hasattr(Module, 'order') else Module.id
-    ).all()
+        Module.course_id.in_(course_ids)
+    ).order_by(Module.course_id, Module.order).all()
+    module_ids = [m.id for m in modules]
+
+    lessons = db.query(Lesson).filter(
+        Lesson.module_id.in_(module_ids)
+    ).order_by(Lesson.module_id, Lesson.order).all() if module_ids else []
+    lesson_ids = [l.id for l in lessons]
+
+    scope_filters = [ScoreColumn.course_id.in_(course_ids)]
+    if module_ids:
+        scope_filters.append(ScoreColumn.module_id.in_(module_ids))
+    if lesson_ids:
+        scope_filters.append(ScoreColumn.lesson_id.in_(lesson_ids))
+
+    columns = db.query(ScoreColumn).filter(
+        or_(*scope_filters)
+    ).order_by(ScoreColumn.order, ScoreColumn.id).all()
+    column_ids = [c.id for c in columns]
+
+    scores = db.query(Score).filter(
+        Score.enrollment_id.in_(enrollment_ids),
+        Score.column_id.in_(column_ids)
+    ).all() if column_ids else []
+
+    # Graders are resolved with a column projection so the User selectin
+    # relationships (addresses, avatar, ...) are never triggered.
+    recorder_ids = list({s.recorder_id for s in scores if s.recorder_id})
+    graders: Dict[UUID, str] = {}
+    if recorder_ids:
+        for user_id, names, email in db.query(User.id, User.names, User.email).filter(
+            User.id.in_(recorder_ids)
+        ).all():
+            graders[user_id] = names or email or "Unknown"
+
+    modules_by_course: Dict[UUID, List[Module]] = {}
+    for module in modules:
+        modules_by_course.setdefault(module.course_id, []).append(module)
 
-    # ========================================================================
-    # STEP 2: Get all score columns and scores for this enrollment
-    # ========================================================================
-    score_columns = db.query(ScoreColumn).outerjoin(
-        Score,
-        and_(Score.column_id == ScoreColumn.id, Score.enrollment_id == enrollment.id)
-    ).options(
-        joinedload(ScoreColumn.scores)
-    ).filter(
-        or_(
-            ScoreColumn.course_id == course.id,
-            ScoreColumn.module_id.in_([m.id for m in modules]),
-            ScoreColumn.lesson_id.in_(
-                db.query(Lesson.id).filter(Lesson.module_id.in_([m.id for m in modules]))
-            )
-        )
-    ).all()
+    lessons_by_module: Dict[UUID, List[Lesson]] = {}
+    for lesson in lessons:
+        lessons_by_module.setdefault(lesson.module_id, []).append(lesson)
 
-    # Build lookup: column_id -> score for this enrollment
-    score_lookup: Dict[str, Any] = {}
-    for col in score_columns:
-        for s in col.scores:
-            if s.enrollment_id == enrollment.id:
-                score_lookup[str(col.id)] = s
-                break
+    module_course = {m.id: m.course_id for m in modules}
+    lesson_course = {l.id: module_course[l.module_id] for l in lessons}
+
+    columns_by_course: Dict[UUID, List[ScoreColumn]] = {}
+    for column in columns:
+        if column.lesson_id:
+            course_id = lesson_course.get(column.lesson_id)
+        elif column.module_id:
+            course_id = module_course.get(column.module_id)
+        else:
+            course_id = column.course_id
+        if course_id:
+            columns_by_course.setdefault(course_id, []).append(column)
+
+    # (enrollment_id, column_id) -> score; first row wins like the per-course loader
+    score_lookup: Dict[tuple, Score] = {}
+    for score in scores:
+        score_lookup.setdefault((score.enrollment_id, score.column_id), score)
+
+    return {
+        "modules_by_course": modules_by_course,
+        "lessons_by_module": lessons_by_module,
+        "modules": {m.id: m for m in modules},
+        "columns_by_course": columns_by_course,
+        "score_lookup": score_lookup,
+        "graders": graders,
+    }
+
+
+def _format_score_entry(
+    column: ScoreColumn,
+    score: Optional[Score],
+    graders: Dict[UUID, str],
+    scope_title: Optional[str],
+    module_name: Optional[str],
+    module_order: Optional[int],
+    lesson_order: Optional[int],
+    lesson_date: Optional[str],
+) -> Dict[str, Any]:
+    """Serialize one assessment column and the student's score for it."""
+    recorded_by = None
+    recorded_date = None
+    if score:
+        if score.recorded_date:
+            recorded_date = score.recorded_date.isoformat()
+        if score.recorder_id:
+            recorded_by = graders.get(score.recorder_id, "Unknown")
+
+    return {
+        "column_id": str(column.id),
+        "type": column.type.value if column.type else "unknown",
+        "title": column.title or "Untitled Assessment",
+        "scope_title": scope_title,
+        "module_name": module_name,
+        "module_order": module_order,
+        "lesson_order": lesson_order,
+        "score": float(score.score) if score and score.score is not None else None,
+        "max_score": float(column.max_score) if column.max_score else (float(score.max_score) if score and score.max_score else 0),
+        "percentage": float(score.percentage) if score and score.percentage is not None else None,
+        "grade": score.grade if score and score.grade else "N/A",
+        "remarks": (score.notes if score and score.notes else "") or column.description or "",
+        "recorded_date": recorded_date,
+        "recorded_by": recorded_by,
+        "lesson_date": lesson_date,
+        "is_completed": score is not None and score.score is not None
+    }
+
+
+def _get_course_performance(
+    db: Session,
+    enrollment: Enrollment,
+    context: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Calculate performance metrics for a single course with full assessment details.
+
+    When ``context`` (from ``_load_performance_context``) is given no queries
+    are issued; otherwise it is loaded for this enrollment alone.
+    """
+    if context is None:
+        context = _load_performance_context(db, [enrollment])
+
+    course = enrollment.course
+    score_lookup = context["score_lookup"]
+    graders = context["graders"]
+    modules_by_id = context["modules"]
+    course_columns = context["columns_by_course"].get(course.id, [])
+
+    lesson_columns: Dict[UUID, List[ScoreColumn]] = {}
+    for column in course_columns:
+        if column.lesson_id:
+            lesson_columns.setdefault(column.lesson_id, []).append(column)
 
-    # ========================================================================
-    # STEP 3: Build lesson_scores - ALL lessons included, with their assessments
-    # ========================================================================
     lesson_scores = []
     module_scores = []
     course_scores = []
 
-    # Process each module and its lessons
-    for module in modules:
-        module_lessons = db.query(Lesson).filter(
-            Lesson.module_id == module.id
-        ).order_by(
-            Lesson.order if hasattr(Lesson, 'order') else Lesson.id
-        ).all()
-
-        for lesson in module_lessons:
-            # Find all ScoreColumns for this lesson
-            lesson_columns = [col for col in score_columns if col.lesson_id == lesson.id]
-
-            # Get lesson date
-            lesson_date = None
-            if hasattr(lesson, 'date') and lesson.date:
-                lesson_date = lesson.date.isoformat()
-            elif hasattr(lesson, 'scheduled_date') and lesson.scheduled_date:
-                lesson_date = lesson.scheduled_date.isoformat()
-
-            # Get module order for sorting
-            module_order = None
-            if hasattr(module, 'order'):
-                module_order = module.order
-
-            # Get lesson order for sorting
-            lesson_order = None
-            if hasattr(lesson, 'order'):
-                lesson_order = lesson.order
-
-            if lesson_columns:
-                # Lesson has assessment columns - emit one score_data per column
-                for column in lesson_columns:
-                    score = score_lookup.get(str(column.id))
-
-                    # Get recorded_by info
-                    recorded_by = None
-                    recorded_date = None
-                    if score:
-                        if score.recorded_date:
-                            recorded_date = score.recorded_date.isoformat()
-                        if hasattr(score, 'recorded_by') and score.recorded_by:
-                            recorded_by = score.recorded_by.names or score.recorded_by.email or "Unknown"
-                        elif hasattr(score, 'grader') and score.grader:
-                            recorded_by = score.grader.names or score.grader.email or "Unknown"
-                        elif hasattr(score, 'recorded_by_id') and score.recorded_by_id:
-                            grader = db.query(User).filter(User.id == score.recorded_by_id).first()
-                            recorded_by = grader.names if grader and grader.names else (grader.email if grader else "Unknown")
-                        elif hasattr(score, 'grader_id') and score.grader_id:
-                            grader = db.query(User).filter(User.id == score.grader_id).first()
-                            recorded_by = grader.names if grader and grader.names else (grader.email if grader else "Unknown")
-
-                    score_data = {
-                        "column_id": str(column.id),
-                        "type": column.type.value if column.type else "unknown",
-                        "title": column.title or "Untitled Assessment",
-                        "scope_title": lesson.title,
-                        "module_name": module.title,
-                        "module_order": module_order,
-                        "lesson_order": lesson_order,
-                        "score": float(score.score) if score and score.score is not None else None,
-                        "max_score": float(column.max_score) if column.max_score else (float(score.max_score) if score and score.max_score else 0),
-                        "percentage": float(score.percentage) if score and score.percentage is not None else None,
-                        "grade": score.grade if score and score.grade else "N/A",
-                        "remarks": (score.notes if score and score.notes else "") or column.description or "",
-                        "recorded_date": recorded_date,
-                        "recorded_by": recorded_by,
-                        "lesson_date": lesson_date,
-                        "is_completed": score is not None and score.score is not None
-                    }
-                    lesson_scores.append(score_data)
+    # ========================================================================
+    # Lesson assessments - ALL lessons included, placeholders for lessons
+    # without assessment columns so they still appear in the table
+    # ========================================================================
+    for module in context["modules_by_course"].get(course.id, []):
+        for lesson in context["lessons_by_module"].get(module.id, []):
+            lesson_date = lesson.date.isoformat() if lesson.date else None
+            columns = lesson_columns.get(lesson.id)
+
+            if columns:
+                for column in columns:
+                    lesson_scores.append(_format_score_entry(
+                        column,
+                        score_lookup.get((enrollment.id, column.id)),
+                        graders,
+                        scope_title=lesson.title,
+                        module_name=module.title,
+                        module_order=module.order,
+                        lesson_order=lesson.order,
+                        lesson_date=lesson_date,
+                    ))
             else:
-                # Lesson has NO assessment columns - emit a placeholder row
-                # so the lesson still appears in the table
-                placeholder = {
+                lesson_scores.append({
                     "column_id": f"placeholder-{lesson.id}",
                     "type": "none",
                     "title": "No assessments",
                     "scope_title": lesson.title,
                     "module_name": module.title,
-                    "module_order": module_order,
-                    "lesson_order": lesson_order,
+                    "module_order": module.order,
+                    "lesson_order": lesson.order,
                     "score": None,
                     "max_score": 0,
                     "percentage": None,
@@ -346,94 +417,41 @@ def _get_course_performance(db: Session, enrollment: Enrollment) -> Dict[str, An
                     "recorded_by": None,
                     "lesson_date": lesson_date,
                     "is_completed": False
-                }
-                lesson_scores.append(placeholder)
+                })
 
     # ========================================================================
-    # STEP 4: Process module-level and course-level assessments (unchanged logic)
+    # Module-level and course-level assessments
     # ========================================================================
-    for column in score_columns:
+    for column in course_columns:
+        score = score_lookup.get((enrollment.id, column.id))
+
         if column.module_id and not column.lesson_id:
-            score = score_lookup.get(str(column.id))
-            module = db.query(Module).filter(Module.id == column.module_id).first()
-
-            recorded_by = None
-            recorded_date = None
-            if score:
-                if score.recorded_date:
-                    recorded_date = score.recorded_date.isoformat()
-                if hasattr(score, 'recorded_by') and score.recorded_by:
-                    recorded_by = score.recorded_by.names or score.recorded_by.email or "Unknown"
-                elif hasattr(score, 'grader') and score.grader:
-                    recorded_by = score.grader.names or score.grader.email or "Unknown"
-                elif hasattr(score, 'recorded_by_id') and score.recorded_by_id:
-                    grader = db.query(User).filter(User.id == score.recorded_by_id).first()
-                    recorded_by = grader.names if grader and grader.names else (grader.email if grader else "Unknown")
-                elif hasattr(score, 'grader_id') and score.grader_id:
-                    grader = db.query(User).filter(User.id == score.grader_id).first()
-                    recorded_by = grader.names if grader and grader.names else (grader.email if grader else "Unknown")
-
-            score_data = {
-                "column_id": str(column.id),
-                "type": column.type.value if column.type else "unknown",
-                "title": column.title or "Untitled Assessment",
-                "scope_title": module.title if module else "Unknown Module",
-                "module_name": module.title if module else "Unknown",
-                "module_order": module.order if module and hasattr(module, 'order') else None,
-                "lesson_order": None,
-                "score": float(score.score) if score and score.score is not None else None,
-                "max_score": float(column.max_score) if column.max_score else (float(score.max_score) if score and score.max_score else 0),
-                "percentage": float(score.percentage) if score and score.percentage is not None else None,
-                "grade": score.grade if score and score.grade else "N/A",
-                "remarks": (score.notes if score and score.notes else "") or column.description or "",
-                "recorded_date": recorded_date,
-                "recorded_by": recorded_by,
-                "lesson_date": None,
-                "is_completed": score is not None and score.score is not None
-            }
-            module_scores.append(score_data)
+            module = modules_by_id.get(column.module_id)
+            module_scores.append(_format_score_entry(
+                column,
+                score,
+                graders,
+                scope_title=module.title if module else "Unknown Module",
+                module_name=module.title if module else "Unknown",
+                module_order=module.order if module else None,
+                lesson_order=None,
+                lesson_date=None,
+            ))
 
         elif column.course_id and not column.module_id and not column.lesson_id:
-            score = score_lookup.get(str(column.id))
-
-            recorded_by = None
-            recorded_date = None
-            if score:
-                if score.recorded_date:
-                    recorded_date = score.recorded_date.isoformat()
-                if hasattr(score, 'recorded_by') and score.recorded_by:
-                    recorded_by = score.recorded_by.names or score.recorded_by.email or "Unknown"
-                elif hasattr(score, 'grader') and score.grader:
-                    recorded_by = score.grader.names or score.grader.email or "Unknown"
-                elif hasattr(score, 'recorded_by_id') and score.recorded_by_id:
-                    grader = db.query(User).filter(User.id == score.recorded_by_id).first()
-                    recorded_by = grader.names if grader and grader.names else (grader.email if grader else "Unknown")
-                elif hasattr(score, 'grader_id') and score.grader_id:
-                    grader = db.query(User).filter(User.id == score.grader_id).first()
-                    recorded_by = grader.names if grader and grader.names else (grader.email if grader else "Unknown")
-
-            score_data = {
-                "column_id": str(column.id),
-                "type": column.type.value if column.type else "unknown",
-                "title": column.title or "Untitled Assessment",
-                "scope_title": course.title,
-                "module_name": None,
-                "module_order": None,
-                "lesson_order": None,
-                "score": float(score.score) if score and score.score is not None else None,
-                "max_score": float(column.max_score) if column.max_score else (float(score.max_score) if score and score.max_score else 0),
-                "percentage": float(score.percentage) if score and score.percentage is not None else None,
-                "grade": score.grade if score and score.grade else "N/A",
-                "remarks": (score.notes if score and score.notes else "") or column.description or "",
-                "recorded_date": recorded_date,
-                "recorded_by": recorded_by,
-                "lesson_date": None,
-                "is_completed": score is not None and score.score is not None
-            }
-            course_scores.append(score_data)
+            course_scores.append(_format_score_entry(
+                column,
+                score,
+                graders,
+                scope_title=course.title,
+                module_name=None,
+                module_order=None,
+                lesson_order=None,
+                lesson_date=None,
+            ))
 
     # ========================================================================
-    # STEP 5: Sort and calculate metrics
+    # Sort and calculate metrics
     # ========================================================================
     lesson_scores.sort(key=lambda x: (x.get('module_order') or 0, x.get('lesson_order') or 0, x.get('column_id') or ''))
     module_scores.sort(key=lambda x: x.get('module_order') or 0)
@@ -465,49 +483,16 @@ def _get_course_performance(db: Session, enrollment: Enrollment) -> Dict[str, An
         "enrolled_date": enrollment.enrolled_at.isoformat() if enrollment.enrolled_at else None
     }
 
-def _get_attendance_details(db: Session, student_id: UUID) -> List[Dict[str, Any]]:
-    """Get detailed attendance records for student."""
-    records = db.query(Attendance).options(
-        joinedload(Attendance.lesson).joinedload(Lesson.module).joinedload(Module.course)
-    ).filter(
-        Attendance.student_id == student_id
-    ).order_by(
-        desc(Attendance.date)
-    ).all()
-    
-    details = []
-    for record in records:
-        lesson = record.lesson
-        module = lesson.module if lesson else None
-        course = module.course if module else None
-        
-        # Resolve lesson date (scheduled or actual)
-        lesson_date = None
-        if lesson:
-            if hasattr(lesson, "date") and lesson.date:
-                lesson_date = lesson.date.isoformat()
-            elif hasattr(lesson, "date") and lesson.date:
-                lesson_date = lesson.date.isoformat()
-
-        # Resolve who recorded this attendance entry
-        recorded_by = None
-        if hasattr(record, "created_by") and record.created_by:
-            recorded_by = record.created_by.names or record.created_by.email
-
-        details.append({
-            "id": str(record.id),
-            "date": record.date.isoformat(),
-            "status": record.status.value,
-            "lesson_title": lesson.title if lesson else "Unknown",
-            "lesson_date": lesson_date,
-            "module_title": module.title if module else "Unknown",
-            "course_title": course.title if course else "Unknown",
-            "course_code": course.code if course else "N/A",
-            "remarks": record.notes or "",
-            "recorded_by": recorded_by,
-        })
-    
-    return details
+def _get_attendance_details(
+    db: Session,
+    student_id: UUID,
+    limit: Optional[int] = None,
+    offset: int = 0
+) -> List[Dict[str, Any]]:
+    """Get one page of detailed attendance records for student (newest first)."""
+    return attendance_stats_service.get_attendance_details(
+        db, student_id, limit=limit, offset=offset
+    )
 
 
 def _get_graduation_status(
@@ -581,12 +566,107 @@ def _get_graduation_status(
 # PDF EXPORT
 # ============================================================================
 
+def build_performance_report(
+    db: Session,
+    student_id: UUID,
+    include_attendance_details: bool = False
+) -> Dict[str, Any]:
+    """
+    Collect everything the PDF/Excel renderers need as plain data.
+
+    The result is picklable, so rendering can happen outside the request
+    (see report_export_service).
+    """
+    performance = get_student_performance(db, student_id, attendance_limit=0)
+    student = db.query(User.names, User.email).filter(User.id == student_id).first()
+    
+    report = {
+        "student": {"names": student.names, "email": student.email} if student else None,
+        "performance": performance,
+    }
+    if include_attendance_details:
+        report["attendance_details"] = list(
+            attendance_stats_service.iter_attendance_details(db, student_id)
+        )
+    return report
+
+
+def build_course_performance_reports(
+    db: Session,
+    course_id: UUID,
+    include_attendance_details: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Build the report data of every student enrolled in a course, scoped to
+    that course.
+
+    Scores, attendance and trends are loaded once for the whole cohort (a
+    fixed number of queries), not once per student.
+    """
+    enrollments = db.query(Enrollment).options(
+        joinedload(Enrollment.course)
+    ).filter(
+        Enrollment.course_id == course_id
+    ).all()
+    
+    if not enrollments:
+        return []
+    
+    enrollment_ids = [e.id for e in enrollments]
+    context = _load_performance_context(db, enrollments)
+    attendance_by_enrollment = attendance_stats_service.get_enrollment_summaries(db, enrollment_ids)
+    trends_by_enrollment = _get_trends_by_enrollment(db, enrollment_ids)
+    details_by_student = (
+        attendance_stats_service.get_details_by_student(db, enrollment_ids)
+        if include_attendance_details else {}
+    )
+    students = {
+        row.id: {"names": row.names, "email": row.email}
+        for row in db.query(User.id, User.names, User.email).filter(
+            User.id.in_([e.student_id for e in enrollments])
+        ).all()
+    }
+    
+    reports = []
+    for enrollment in enrollments:
+        course_data = _get_course_performance(db, enrollment, context)
+        courses_performance = [course_data] if course_data else []
+        summary = _calculate_overall_summary(courses_performance)
+        attendance = attendance_by_enrollment[enrollment.id]
+        
+        report = {
+            "student_id": str(enrollment.student_id),
+            "student": students.get(enrollment.student_id),
+            "performance": {
+                "summary": summary,
+                "courses": courses_performance,
+                "attendance": attendance,
+                "attendance_details": [],
+                "trends": trends_by_enrollment.get(enrollment.id, []),
+                "graduation_status": _get_graduation_status(
+                    summary['overall_average'],
+                    attendance['attendance_rate'],
+                    sum(c['completed_assessments'] for c in courses_performance),
+                    sum(c['total_assessments'] for c in courses_performance)
+                )
+            },
+        }
+        if include_attendance_details:
+            report["attendance_details"] = details_by_student.get(enrollment.student_id, [])
+        reports.append(report)
+    
+    return reports
+
+
 def export_performance_pdf(db: Session, student_id: UUID) -> bytes:
     """Generate professional PDF performance report."""
-    from app.models.user import User
-    
-    performance = get_student_performance(db, student_id)
-    student = db.query(User).filter(User.id == student_id).first()
+    return render_performance_pdf(build_performance_report(db, student_id))
+
+
+def render_performance_pdf(report: Dict[str, Any]) -> bytes:
+    """Render a report built by build_performance_report as PDF."""
+    performance = report['performance']
+    student = report['student']
     
     buffer = BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=72, leftMargin=72,
@@ -603,8 +683,8 @@ def export_performance_pdf(db: Session, student_id: UUID) -> bytes:
     story.append(Spacer(1, 12))
     
     # Student Info
-    story.append(Paragraph(f"<b>Student:</b> {student.names if student else 'Unknown'}", styles['Normal']))
-    story.append(Paragraph(f"<b>Email:</b> {student.email if student else 'N/A'}", styles['Normal']))
+    story.append(Paragraph(f"<b>Student:</b> {student['names'] if student else 'Unknown'}", styles['Normal']))
+    story.append(Paragraph(f"<b>Email:</b> {student['email'] if student else 'N/A'}", styles['Normal']))
     story.append(Paragraph(f"<b>Generated:</b> {datetime.now().strftime('%B %d, %Y')}", styles['Normal']))
     story.append(Spacer(1, 20))
     
@@ -658,10 +738,24 @@ def export_performance_pdf(db: Session, student_id: UUID) -> bytes:
 
 def export_performance_excel(db: Session, student_id: UUID) -> bytes:
     """Generate professional Excel performance report."""
-    from app.models.user import User
-    
-    performance = get_student_performance(db, student_id)
-    student = db.query(User).filter(User.id == student_id).first()
+    return render_performance_excel(
+        build_performance_report(db, student_id),
+        attendance_stats_service.iter_attendance_details(db, student_id)
+    )
+
+
+def render_performance_excel(
+    report: Dict[str, Any],
+    attendance_details: Optional[Iterable[Dict[str, Any]]] = None
+) -> bytes:
+    """
+    Render a report built by build_performance_report as an Excel workbook.
+    Attendance rows default to report['attendance_details'].
+    """
+    performance = report['performance']
+    student = report['student']
+    if attendance_details is None:
+        attendance_details = report.get('attendance_details', [])
     
     wb = Workbook()
     
@@ -678,7 +772,7 @@ def export_performance_excel(db: Session, student_id: UUID) -> bytes:
     
     # Attendance Sheet
     ws_attendance = wb.create_sheet("Attendance")
-    _create_attendance_sheet(ws_attendance, performance['attendance_details'])
+    _create_attendance_sheet(ws_attendance, attendance_details)
     
     # Save to buffer
     buffer = BytesIO()
@@ -695,9 +789,9 @@ def _create_summary_sheet(ws, student, performance):
     
     # Student info
     ws['A3'] = 'Student Name:'
-    ws['B3'] = student.names if student else 'Unknown'
+    ws['B3'] = student['names'] if student else 'Unknown'
     ws['A4'] = 'Email:'
-    ws['B4'] = student.email if student else 'N/A'
+    ws['B4'] = student['email'] if student else 'N/A'
     ws['A5'] = 'Report Date:'
     ws['B5'] = datetime.now().strftime('%B %d, %Y')
     
@@ -864,41 +958,8 @@ def _calculate_overall_summary(courses: List[Dict]) -> Dict[str, Any]:
 
 
 def _get_attendance_summary(db: Session, student_id: UUID) -> Dict[str, Any]:
-    """Get attendance summary for student."""
-    total = db.query(func.count(Attendance.id)).filter(
-        Attendance.student_id == student_id
-    ).scalar() or 0
-    
-    present = db.query(func.count(Attendance.id)).filter(
-        and_(
-            Attendance.student_id == student_id,
-            Attendance.status == AttendanceStatus.PRESENT
-        )
-    ).scalar() or 0
-    
-    absent = db.query(func.count(Attendance.id)).filter(
-        and_(
-            Attendance.student_id == student_id,
-            Attendance.status == AttendanceStatus.ABSENT
-        )
-    ).scalar() or 0
-    
-    late = db.query(func.count(Attendance.id)).filter(
-        and_(
-            Attendance.student_id == student_id,
-            Attendance.status == AttendanceStatus.LATE
-        )
-    ).scalar() or 0
-    
-    attendance_rate = round((present / total * 100), 1) if total > 0 else 0.0
-    
-    return {
-        "total": total,
-        "present": present,
-        "absent": absent,
-        "late": late,
-        "attendance_rate": attendance_rate
-    }
+    """Get attendance summary for student from the persisted counters."""
+    return attendance_stats_service.get_student_summary(db, student_id)
 
 
 def _get_performance_trends(
@@ -939,6 +1000,43 @@ def _get_performance_trends(
     ]
 
 
+def _get_trends_by_enrollment(
+    db: Session,
+    enrollment_ids: List[UUID]
+) -> Dict[UUID, List[Dict]]:
+    """Monthly score averages over the last six months, per enrollment (one query)."""
+    if not enrollment_ids:
+        return {}
+    
+    six_months_ago = datetime.utcnow() - timedelta(days=180)
+    month = func.date_trunc('month', Score.recorded_date)
+    
+    rows = db.query(
+        Score.enrollment_id,
+        month.label('month'),
+        func.avg(Score.percentage).label('avg_percentage')
+    ).filter(
+        and_(
+            Score.enrollment_id.in_(enrollment_ids),
+            Score.recorded_date >= six_months_ago,
+            Score.recorded_date.isnot(None),
+            Score.percentage.isnot(None)
+        )
+    ).group_by(
+        Score.enrollment_id, month
+    ).order_by(
+        Score.enrollment_id, month
+    ).all()
+    
+    trends: Dict[UUID, List[Dict]] = {}
+    for row in rows:
+        trends.setdefault(row.enrollment_id, []).append({
+            "month": row.month.strftime("%B %Y") if row.month else "Unknown",
+            "average": round(row.avg_percentage, 1) if row.avg_percentage else 0
+        })
+    return trends
+
+
 def _get_empty_summary() -> Dict[str, Any]:
     """Return empty summary structure."""
     return {
@@ -953,6 +1051,20 @@ def _get_empty_summary() -> Dict[str, Any]:
     }
 
 
+def _get_attendance_pagination(
+    total: int,
+    limit: Optional[int],
+    offset: int
+) -> Dict[str, Any]:
+    """Page metadata for attendance_details."""
+    return {
+        "total": total,
+        "limit": limit,
+        "offset": offset,
+        "has_more": limit is not None and offset + limit < total
+    }
+
+
 def _get_empty_attendance() -> Dict[str, Any]:
     """Return empty attendance structure."""
     return {
@@ -960,6 +1072,8 @@ def _get_empty_attendance() -> Dict[str, Any]:
         "present": 0,
         "absent": 0,
         "late": 0,
+        "excused": 0,
+        "holiday": 0,
         "attendance_rate": 0.0
     }
 
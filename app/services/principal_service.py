@@ -0,0 +1,289 @@
+"""
+Principal Service
+Cached, immutable snapshots of an authenticated user's identity and access
+(roles, permissions, active flag, assigned course ids).
+
+Lookups go through a small in-process LRU, then Redis, then the database.
+Redis entries are keyed by a per-user principal version, which
+invalidate_principal() bumps whenever a user's roles or status change, and
+by a shared roles version, which invalidate_all_principals() bumps when a
+role or its permissions change, so stale snapshots are never read back from
+Redis. In-process entries live for PRINCIPAL_LOCAL_TTL seconds, which bounds
+staleness in other workers.
+
+Tutor course assignments are written from several services, so CourseTutor
+changes are tracked with ORM events and invalidated after commit; so are
+changes to a Role and its permissions collection.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.association_tables import role_permissions, user_roles
+from app.models.rbac import Permission, Role
+from app.models.tutors import CourseTutor
+from app.models.user import User
+from app.schemas.tutors import CourseTutorStatus
+
+logger = logging.getLogger(__name__)
+
+PRINCIPAL_REDIS_TTL = 300
+PRINCIPAL_VERSION_TTL = 86400
+PRINCIPAL_LOCAL_TTL = 5
+PRINCIPAL_LOCAL_MAX_ENTRIES = 2048
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Authenticated user snapshot. Mirrors the role helpers on User."""
+    id: UUID
+    username: Optional[str]
+    email: Optional[str]
+    is_active: bool
+    roles: FrozenSet[str] = field(default_factory=frozenset)
+    permissions: FrozenSet[str] = field(default_factory=frozenset)
+    assigned_course_ids: FrozenSet[UUID] = field(default_factory=frozenset)
+
+    @property
+    def is_admin(self) -> bool:
+        return "admin" in self.roles
+
+    @property
+    def is_superuser(self) -> bool:
+        return "superuser" in self.roles
+
+    @property
+    def is_tutor(self) -> bool:
+        return "tutor" in self.roles
+
+    @property
+    def is_student(self) -> bool:
+        return not self.roles or "student" in self.roles
+
+    @property
+    def is_parent(self) -> bool:
+        return "parent" in self.roles
+
+    def has_role(self, *role_names: str) -> bool:
+        if not self.roles:
+            return any(r.lower() in ["user", "student"] for r in role_names)
+        return any(r.lower() in self.roles for r in role_names)
+
+    def has_permission(self, permission_name: str) -> bool:
+        return permission_name in self.permissions
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": str(self.id),
+            "username": self.username,
+            "email": self.email,
+            "is_active": self.is_active,
+            "roles": sorted(self.roles),
+            "permissions": sorted(self.permissions),
+            "assigned_course_ids": sorted(str(c) for c in self.assigned_course_ids),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Principal":
+        return cls(
+            id=UUID(data["id"]),
+            username=data.get("username"),
+            email=data.get("email"),
+            is_active=bool(data.get("is_active")),
+            roles=frozenset(data.get("roles", [])),
+            permissions=frozenset(data.get("permissions", [])),
+            assigned_course_ids=frozenset(UUID(c) for c in data.get("assigned_course_ids", [])),
+        )
+
+
+# user id -> (principal, expires at)
+_local: "OrderedDict[UUID, Tuple[Principal, float]]" = OrderedDict()
+_local_lock = threading.Lock()
+
+
+def _local_get(user_id: UUID) -> Optional[Principal]:
+    with _local_lock:
+        entry = _local.get(user_id)
+        if entry is None:
+            return None
+        principal, expires_at = entry
+        if expires_at <= time.monotonic():
+            del _local[user_id]
+            return None
+        _local.move_to_end(user_id)
+        return principal
+
+
+def _local_set(principal: Principal) -> None:
+    with _local_lock:
+        _local[principal.id] = (principal, time.monotonic() + PRINCIPAL_LOCAL_TTL)
+        _local.move_to_end(principal.id)
+        while len(_local) > PRINCIPAL_LOCAL_MAX_ENTRIES:
+            _local.popitem(last=False)
+
+
+def _redis():
+    # Imported lazily: the deps package imports this module
+    from app.api.deps.storage import get_redis_instance
+    return get_redis_instance()
+
+
+def _version_key(user_id: UUID) -> str:
+    return f"principal_version:{user_id}"
+
+
+def _snapshot_key(user_id: UUID, version: str, roles_version: str) -> str:
+    return f"principal:{user_id}:{roles_version}:{version}"
+
+
+_ROLES_VERSION_KEY = "principal_version:roles"
+
+
+def load_principal(db: Session, user_id: UUID) -> Optional[Principal]:
+    """Build a principal from the database (three narrow queries, no ORM entities)."""
+    user = db.query(
+        User.id, User.username, User.email, User.is_active
+    ).filter(User.id == user_id).first()
+    if user is None:
+        return None
+
+    access_rows = db.query(Role.name, Permission.name).select_from(user_roles).join(
+        Role, Role.id == user_roles.c.role_id
+    ).outerjoin(
+        role_permissions, role_permissions.c.role_id == Role.id
+    ).outerjoin(
+        Permission, Permission.id == role_permissions.c.permission_id
+    ).filter(user_roles.c.user_id == user_id).all()
+
+    course_ids = db.query(CourseTutor.course_id).filter(
+        CourseTutor.tutor_id == user_id,
+        CourseTutor.status == CourseTutorStatus.ACTIVE
+    ).all()
+
+    return Principal(
+        id=user.id,
+        username=user.username,
+        email=user.email,
+        is_active=bool(user.is_active),
+        roles=frozenset(role.lower() for role, _ in access_rows),
+        permissions=frozenset(permission for _, permission in access_rows if permission),
+        assigned_course_ids=frozenset(row[0] for row in course_ids),
+    )
+
+
+def get_principal(db: Session, user_id: UUID) -> Optional[Principal]:
+    """Return the cached principal for a user, loading it on a miss."""
+    if not isinstance(user_id, UUID):
+        user_id = UUID(str(user_id))
+
+    principal = _local_get(user_id)
+    if principal is not None:
+        return principal
+
+    redis = _redis()
+    version = roles_version = "0"
+    if redis:
+        # Read the versions before loading so a concurrent invalidation wins
+        version, roles_version = (
+            value or "0" for value in redis.mget([_version_key(user_id), _ROLES_VERSION_KEY])
+        )
+        cached = redis.get(_snapshot_key(user_id, version, roles_version), as_json=True)
+        if isinstance(cached, dict):
+            principal = Principal.from_dict(cached)
+            _local_set(principal)
+            return principal
+
+    principal = load_principal(db, user_id)
+    if principal is None:
+        return None
+
+    if redis:
+        redis.set(
+            _snapshot_key(user_id, version, roles_version),
+            principal.to_dict(),
+            expiry=PRINCIPAL_REDIS_TTL
+        )
+    _local_set(principal)
+    return principal
+
+
+def invalidate_principal(user_id: UUID) -> None:
+    """Drop a user's cached principal after their roles, status or profile change."""
+    if not isinstance(user_id, UUID):
+        user_id = UUID(str(user_id))
+
+    with _local_lock:
+        _local.pop(user_id, None)
+
+    redis = _redis()
+    if redis:
+        redis.set(_version_key(user_id), uuid.uuid4().hex, expiry=PRINCIPAL_VERSION_TTL)
+    logger.debug(f"Principal cache invalidated for user {user_id}")
+
+
+def invalidate_all_principals() -> None:
+    """Drop every cached principal after a role or its permissions change."""
+    with _local_lock:
+        _local.clear()
+
+    redis = _redis()
+    if redis:
+        redis.set(_ROLES_VERSION_KEY, uuid.uuid4().hex, expiry=PRINCIPAL_VERSION_TTL)
+    logger.debug("Principal cache invalidated for all users")
+
+
+# ============================================================================
+# TUTOR ASSIGNMENT AND ROLE TRACKING
+# ============================================================================
+
+_PENDING_KEY = "principal_invalidations"
+_PENDING_ALL_KEY = "principal_invalidate_all"
+
+
+@event.listens_for(CourseTutor, "after_insert")
+@event.listens_for(CourseTutor, "after_update")
+@event.listens_for(CourseTutor, "after_delete")
+def _track_assignment_change(mapper, connection, target):
+    session = Session.object_session(target)
+    if session is not None and target.tutor_id:
+        session.info.setdefault(_PENDING_KEY, set()).add(target.tutor_id)
+
+
+@event.listens_for(Role, "after_update")
+@event.listens_for(Role, "after_delete")
+def _track_role_change(mapper, connection, target):
+    session = Session.object_session(target)
+    if session is not None:
+        session.info[_PENDING_ALL_KEY] = True
+
+
+@event.listens_for(Role.permissions, "append")
+@event.listens_for(Role.permissions, "remove")
+def _track_role_permissions_change(target, value, initiator):
+    session = Session.object_session(target)
+    if session is not None:
+        session.info[_PENDING_ALL_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    if session.info.pop(_PENDING_ALL_KEY, False):
+        session.info.pop(_PENDING_KEY, None)
+        invalidate_all_principals()
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        invalidate_principal(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_PENDING_ALL_KEY, None)
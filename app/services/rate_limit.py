@@ -0,0 +1,245 @@
+# app/services/rate_limit.py
+"""
+Rate limiting algorithms, for Redis and for the in-memory fallback.
+
+Each algorithm exists twice with the same arithmetic: as a Lua script,
+run by Redis atomically in one round trip (RedisService.hit_rate_limit),
+and as a Python step applied to a MemoryStore entry under its shard lock
+(memory_hit). Times are milliseconds from the application's clock, passed
+in so both behave the same; app servers are expected to be NTP-synced.
+
+- sliding_window: counts of the current and previous fixed window, the
+  previous one weighted by how much of it still overlaps the trailing
+  window. Two numbers per key whatever the limit, unlike a request log.
+- token_bucket: a bucket of ``limit`` tokens refilled continuously at
+  ``limit`` per ``window``; allows bursts, smooths sustained traffic.
+
+Both return (allowed, remaining, retry_after_ms, reset_ms).
+"""
+
+import hashlib
+import math
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+from app.services.memory_store import MISSING, MemoryStore
+
+Reply = Tuple[int, int, int, int]
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    window: int           # seconds
+    retry_after: float    # seconds until a denied request would pass
+    reset_after: float    # seconds until the full quota is back
+
+    @classmethod
+    def from_reply(cls, reply, rule) -> "RateLimitResult":
+        allowed, remaining, retry_ms, reset_ms = (int(value) for value in reply)
+        return cls(
+            allowed=bool(allowed),
+            limit=rule.limit,
+            remaining=remaining,
+            window=rule.window,
+            retry_after=retry_ms / 1000,
+            reset_after=reset_ms / 1000,
+        )
+
+    @classmethod
+    def unlimited(cls, rule) -> "RateLimitResult":
+        """What to answer when the limit cannot be checked (fail open)."""
+        return cls(True, rule.limit, rule.limit, rule.window, 0.0, 0.0)
+
+
+def now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+# ------------------------------------------------------------------
+# Sliding window
+# ------------------------------------------------------------------
+
+SLIDING_WINDOW_LUA = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+
+local start = now - (now % window)
+local state = redis.call('HMGET', KEYS[1], 's', 'c', 'p')
+local current, previous = 0, 0
+if state[1] then
+    local saved = tonumber(state[1])
+    if saved == start then
+        current, previous = tonumber(state[2]), tonumber(state[3])
+    elseif saved == start - window then
+        previous = tonumber(state[2])
+    end
+end
+
+local elapsed = now - start
+local used = previous * (window - elapsed) / window + current
+local allowed = 0
+local retry = 0
+if used + cost <= limit then
+    allowed = 1
+    current = current + cost
+    used = used + cost
+else
+    local room = limit - cost - current
+    if room >= 0 and previous > 0 then
+        retry = (window - elapsed) - room * window / previous
+    elseif cost <= limit and current > 0 then
+        retry = (window - elapsed) + math.max(0, window - (limit - cost) * window / current)
+    else
+        retry = (window - elapsed) + window
+    end
+end
+
+local reset = 0
+if current > 0 then
+    reset = (window - elapsed) + window
+elseif previous > 0 then
+    reset = window - elapsed
+end
+
+redis.call('HSET', KEYS[1], 's', start, 'c', current, 'p', previous)
+redis.call('PEXPIRE', KEYS[1], 2 * window)
+return {allowed, math.max(0, math.floor(limit - used)), math.ceil(retry), reset}
+"""
+
+
+def sliding_window_step(state, now: int, limit: int, window: int, cost: int) -> Tuple[Any, Reply]:
+    start = now - now % window
+    current = previous = 0
+    if state is not None:
+        saved, saved_current, saved_previous = state
+        if saved == start:
+            current, previous = saved_current, saved_previous
+        elif saved == start - window:
+            previous = saved_current
+
+    elapsed = now - start
+    used = previous * (window - elapsed) / window + current
+    allowed, retry = 0, 0.0
+    if used + cost <= limit:
+        allowed = 1
+        current += cost
+        used += cost
+    else:
+        room = limit - cost - current
+        if room >= 0 and previous > 0:
+            retry = (window - elapsed) - room * window / previous
+        elif cost <= limit and current > 0:
+            retry = (window - elapsed) + max(0, window - (limit - cost) * window / current)
+        else:
+            retry = (window - elapsed) + window
+
+    reset = 0
+    if current > 0:
+        reset = (window - elapsed) + window
+    elif previous > 0:
+        reset = window - elapsed
+
+    reply = (allowed, max(0, math.floor(limit - used)), math.ceil(retry), reset)
+    return (start, current, previous), reply
+
+
+# ------------------------------------------------------------------
+# Token bucket
+# ------------------------------------------------------------------
+
+TOKEN_BUCKET_LUA = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+
+local state = redis.call('HMGET', KEYS[1], 't', 'ts')
+local tokens = limit
+if state[1] then
+    local elapsed = math.max(0, now - tonumber(state[2]))
+    tokens = math.min(limit, tonumber(state[1]) + elapsed * limit / window)
+end
+
+local allowed = 0
+local retry = 0
+if tokens >= cost then
+    allowed = 1
+    tokens = tokens - cost
+else
+    retry = (cost - tokens) * window / limit
+end
+
+redis.call('HSET', KEYS[1], 't', string.format('%.17g', tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], window)
+return {allowed, math.floor(tokens), math.ceil(retry), math.ceil((limit - tokens) * window / limit)}
+"""
+
+
+def token_bucket_step(state, now: int, limit: int, window: int, cost: int) -> Tuple[Any, Reply]:
+    tokens = limit
+    if state is not None:
+        saved_tokens, saved_at = state
+        tokens = min(limit, saved_tokens + max(0, now - saved_at) * limit / window)
+
+    allowed, retry = 0, 0.0
+    if tokens >= cost:
+        allowed = 1
+        tokens -= cost
+    else:
+        retry = (cost - tokens) * window / limit
+
+    reply = (allowed, math.floor(tokens), math.ceil(retry), math.ceil((limit - tokens) * window / limit))
+    return (tokens, now), reply
+
+
+# ------------------------------------------------------------------
+
+class Algorithm(NamedTuple):
+    lua: str
+    sha: str
+    step: Callable[..., Tuple[Any, Reply]]
+    ttl_windows: int  # state is kept this many windows after the last hit
+
+
+def _algorithm(lua: str, step, ttl_windows: int) -> Algorithm:
+    return Algorithm(lua, hashlib.sha1(lua.encode("utf-8")).hexdigest(), step, ttl_windows)
+
+
+ALGORITHMS: Dict[str, Algorithm] = {
+    "sliding_window": _algorithm(SLIDING_WINDOW_LUA, sliding_window_step, 2),
+    "token_bucket": _algorithm(TOKEN_BUCKET_LUA, token_bucket_step, 1),
+}
+
+
+def script_args(rule, cost: int = 1, now: Optional[int] = None) -> Tuple[int, int, int, int]:
+    return rule.limit, rule.window * 1000, now_ms() if now is None else now, cost
+
+
+def load_scripts(client) -> None:
+    """SCRIPT LOAD every algorithm (after NOSCRIPT: Redis restarted or failed over)."""
+    for algorithm in ALGORITHMS.values():
+        client.script_load(algorithm.lua)
+
+
+def memory_hit(store: MemoryStore, key: str, rule, cost: int = 1) -> RateLimitResult:
+    """One hit against ``key`` kept in ``store``; same results as the Lua scripts."""
+    algorithm = ALGORITHMS[rule.algorithm]
+    limit, window, now, cost = script_args(rule, cost)
+
+    def step(entry):
+        # Stored as (algorithm, state); a rule switched to the other
+        # algorithm starts afresh, as the scripts do on foreign hash fields
+        state = None
+        if entry is not MISSING and entry[0] == rule.algorithm:
+            state = entry[1]
+        state, reply = algorithm.step(state, now, limit, window, cost)
+        return (rule.algorithm, state), reply
+
+    reply = store.update(key, step, expiry=rule.window * algorithm.ttl_windows)
+    return RateLimitResult.from_reply(reply, rule)
@@ -7,16 +7,26 @@
 
 import json
 import logging
-import threading
-import time
-from typing import Optional, Any
+from contextlib import contextmanager
+from typing import Optional, Any, Callable, Dict, Iterable, Iterator, List
 from urllib.parse import urlparse
 from redis import Redis
 from redis.connection import ConnectionPool
-from redis.exceptions import RedisError, ConnectionError as RedisConnectionError
+from app.services import rate_limit
+from app.services.memory_store import MISSING, MemoryStore
+from app.services.rate_limit import RateLimitResult
+from redis.exceptions import (
+    NoScriptError,
+    RedisError,
+    ConnectionError as RedisConnectionError,
+    TimeoutError as RedisTimeoutError,
+)
 
 logger = logging.getLogger(__name__)
 
+# Errors worth one retry on a fresh pooled connection
+_RETRYABLE_ERRORS = (RedisConnectionError, RedisTimeoutError, ConnectionError, BrokenPipeError)
+
 
 class RedisService:
     """
@@ -24,25 +34,30 @@ class RedisService:
 
     Key features for Upstash:
     - TCP keepalive to prevent idle disconnections
-    - Health check interval to detect stale connections
-    - Auto-reconnect on connection errors
+    - Health check interval to detect stale connections (the pool pings a
+      connection only after it has been idle, never before every command)
+    - Auto-reconnect: one retry on connection errors
     - Connection pool management
+    - Batched round trips: mget/mset and pipeline()
+    - Rate limits as one atomic Lua script call (hit_rate_limit)
     - IN-MEMORY FALLBACK when Redis is unavailable (sessions, rate limits,
-      and temporary data continue to work across the app)
+      and temporary data continue to work across the app), bounded by
+      memory_max_entries with LRU eviction; see memory_stats()
     """
 
     def __init__(
         self,
         connection_string: Optional[str] = None,
-        fallback_to_memory: bool = True
+        fallback_to_memory: bool = True,
+        memory_max_entries: int = 10000,
+        memory_shards: int = 16
     ):
         self.connection_string = connection_string
         self.fallback_to_memory = fallback_to_memory
         self.client: Optional[Redis] = None
         self.pool: Optional[ConnectionPool] = None
         self._memory_mode = False
-        self._memory_store: dict[str, tuple[Any, Optional[float]]] = {}
-        self._memory_lock = threading.Lock()
+        self._memory = MemoryStore(max_entries=memory_max_entries, shards=memory_shards)
 
         if connection_string:
             try:
@@ -70,15 +85,14 @@ class RedisService:
         self.pool = None
         logger.info("RedisService operating in IN-MEMORY mode")
 
-    def _memory_cleanup_expired(self):
-        """Remove expired keys from in-memory store."""
-        now = time.time()
-        expired = [
-            k for k, (_, exp) in self._memory_store.items()
-            if exp is not None and exp <= now
-        ]
-        for k in expired:
-            del self._memory_store[k]
+    @property
+    def memory_mode(self) -> bool:
+        """True while serving from the in-memory fallback (no network I/O)."""
+        return self._memory_mode
+
+    def memory_stats(self) -> dict:
+        """Hit/miss/eviction counters and size of the in-memory fallback."""
+        return {"memory_mode": self._memory_mode, **self._memory.stats()}
 
     def _initialize_connection(self, connection_string: str):
         """Initialize Redis from connection string - Upstash-compatible."""
@@ -88,6 +102,8 @@ class RedisService:
                 decode_responses=True,
                 socket_timeout=10,
                 socket_connect_timeout=10,
+                socket_keepalive=True,
+                health_check_interval=30,
                 retry_on_timeout=True,
                 max_connections=10,
             )
@@ -102,42 +118,67 @@ class RedisService:
             logger.error(f"Redis init failed: {e}")
             raise
 
-    def _get_healthy_client(self) -> Redis:
+    def _run(
+        self,
+        operation: str,
+        command: Callable[[Redis], Any],
+        fallback: Callable[[], Any],
+        default: Any = None
+    ) -> Any:
         """
-        Get Redis client with automatic reconnection on stale connections.
-        If reconnection fails and fallback is enabled, switches to memory mode.
+        Run a command against Redis, or against the in-memory store in memory
+        mode. Connection errors are retried once on a fresh pooled connection;
+        if that fails too the service falls back to memory (when enabled).
+        Other Redis errors are logged and return ``default``.
         """
         if self._memory_mode:
-            raise RuntimeError("In memory mode - no Redis client available")
+            return fallback()
 
         if not self.client:
             raise RuntimeError("Redis client not initialized")
 
-        try:
-            self.client.ping()
-            return self.client
-
-        except (RedisConnectionError, ConnectionError, BrokenPipeError) as e:
-            logger.warning(f"Redis connection stale ({e}), reconnecting...")
+        for attempt in (1, 2):
             try:
-                self.client = Redis(connection_pool=self.pool)
-                self.client.ping()
-                logger.info("Redis reconnected successfully")
-                return self.client
-            except Exception as reconnect_err:
+                return command(self.client)
+            except _RETRYABLE_ERRORS as e:
+                if attempt == 1:
+                    logger.warning(f"Redis {operation} connection error ({e}), retrying")
+                    continue
                 if self.fallback_to_memory:
-                    logger.warning(
-                        f"Redis reconnection failed ({reconnect_err}), "
-                        f"falling back to in-memory"
-                    )
+                    logger.warning(f"Redis unavailable ({e}), falling back to in-memory")
                     self._enable_memory_mode()
-                    raise RuntimeError("Switched to memory mode")
-                logger.error(f"Redis reconnection failed: {reconnect_err}")
-                raise
+                    return fallback()
+                logger.error(f"Redis {operation} failed: {e}")
+                return default
+            except RedisError as e:
+                logger.error(f"Redis {operation} error: {e}")
+                return default
 
     def get_client(self) -> Redis:
         """Get Redis client (backward compatibility)"""
-        return self._get_healthy_client()
+        if self._memory_mode:
+            raise RuntimeError("In memory mode - no Redis client available")
+        if not self.client:
+            raise RuntimeError("Redis client not initialized")
+        return self.client
+
+    @staticmethod
+    def _encode(value: Any, as_json: bool) -> Any:
+        if as_json and isinstance(value, (dict, list)):
+            return json.dumps(value)
+        return value
+
+    @staticmethod
+    def _decode(key: str, value: Any, as_json: bool, default: Any) -> Any:
+        if value is None:
+            return default
+        if as_json:
+            try:
+                return json.loads(value)
+            except (json.JSONDecodeError, TypeError) as je:
+                logger.warning(f"JSON decode failed for key '{key}': {je}")
+                return value
+        return value
 
     def set(
         self,
@@ -150,21 +191,12 @@ class RedisService:
         Set a key with optional expiry.
         Falls back to in-memory storage if Redis becomes unavailable.
         """
-        if self._memory_mode:
-            return self._memory_set(key, value, expiry, as_json)
-
-        try:
-            client = self._get_healthy_client()
-            if as_json and isinstance(value, (dict, list)):
-                value = json.dumps(value)
-            if expiry:
-                return bool(client.setex(key, expiry, value))
-            return bool(client.set(key, value))
-        except RedisError as e:
-            logger.error(f"Redis SET error for key '{key}': {e}")
-            return False
-        except RuntimeError:
-            return self._memory_set(key, value, expiry, as_json)
+        return self._run(
+            f"SET '{key}'",
+            lambda client: bool(client.set(key, self._encode(value, as_json), ex=expiry or None)),
+            lambda: self._memory_set(key, value, expiry, as_json),
+            default=False
+        )
 
     def _memory_set(
         self,
@@ -173,13 +205,8 @@ class RedisService:
         expiry: Optional[int],
         as_json: bool
     ) -> bool:
-        with self._memory_lock:
-            self._memory_cleanup_expired()
-            if as_json and isinstance(value, (dict, list)):
-                value = json.dumps(value)
-            exp_time = time.time() + expiry if expiry else None
-            self._memory_store[key] = (value, exp_time)
-            return True
+        self._memory.set(key, self._encode(value, as_json), expiry)
+        return True
 
     def get(
         self,
@@ -191,26 +218,12 @@ class RedisService:
         Get value by key.
         Falls back to in-memory store if Redis becomes unavailable.
         """
-        if self._memory_mode:
-            return self._memory_get(key, as_json, default)
-
-        try:
-            client = self._get_healthy_client()
-            value = client.get(key)
-            if value is None:
-                return default
-            if as_json:
-                try:
-                    return json.loads(value)
-                except json.JSONDecodeError as je:
-                    logger.warning(f"JSON decode failed for key '{key}': {je}")
-                    return value
-            return value
-        except RedisError as e:
-            logger.error(f"Redis GET error for key '{key}': {e}")
-            return default
-        except RuntimeError:
-            return self._memory_get(key, as_json, default)
+        return self._run(
+            f"GET '{key}'",
+            lambda client: self._decode(key, client.get(key), as_json, default),
+            lambda: self._memory_get(key, as_json, default),
+            default=default
+        )
 
     def _memory_get(
         self,
@@ -218,106 +231,117 @@ class RedisService:
         as_json: bool,
         default: Any
     ) -> Optional[Any]:
-        with self._memory_lock:
-            self._memory_cleanup_expired()
-            if key not in self._memory_store:
-                return default
-            value, _ = self._memory_store[key]
-            if as_json:
-                try:
-                    return json.loads(value)
-                except (json.JSONDecodeError, TypeError):
-                    return value
-            return value
+        value = self._memory.get(key)
+        if value is MISSING:
+            return default
+        return self._decode(key, value, as_json, default)
 
     def delete(self, *keys: str) -> int:
         """Delete one or more keys."""
-        if self._memory_mode:
-            return self._memory_delete(*keys)
-
-        try:
-            client = self._get_healthy_client()
-            return client.delete(*keys)
-        except RedisError as e:
-            logger.error(f"Redis DELETE error: {e}")
-            return 0
-        except RuntimeError:
-            return self._memory_delete(*keys)
+        return self._run(
+            "DELETE",
+            lambda client: client.delete(*keys),
+            lambda: self._memory_delete(*keys),
+            default=0
+        )
 
     def _memory_delete(self, *keys: str) -> int:
-        with self._memory_lock:
-            count = 0
-            for k in keys:
-                if k in self._memory_store:
-                    del self._memory_store[k]
-                    count += 1
-            return count
+        return self._memory.delete(*keys)
 
     def exists(self, *keys: str) -> int:
         """Check if keys exist."""
-        if self._memory_mode:
-            return self._memory_exists(*keys)
-
-        try:
-            client = self._get_healthy_client()
-            return client.exists(*keys)
-        except RedisError as e:
-            logger.error(f"Redis EXISTS error: {e}")
-            return 0
-        except RuntimeError:
-            return self._memory_exists(*keys)
+        return self._run(
+            "EXISTS",
+            lambda client: client.exists(*keys),
+            lambda: self._memory_exists(*keys),
+            default=0
+        )
 
     def _memory_exists(self, *keys: str) -> int:
-        with self._memory_lock:
-            self._memory_cleanup_expired()
-            return sum(1 for k in keys if k in self._memory_store)
+        return self._memory.exists(*keys)
 
-    def increment_rate_limit(
-        self,
-        key: str,
-        window: int = 60,
-        limit: int = 50
-    ) -> tuple[int, bool]:
+    def hit_rate_limit(self, key: str, rule, cost: int = 1) -> RateLimitResult:
         """
-        Increment rate limit counter with sliding window.
-        Works identically in Redis or in-memory mode.
+        Count one request (``cost`` units) against ``key`` under ``rule``
+        (a RateLimitRule) in one round trip; see app.services.rate_limit.
+        Works identically in Redis or in-memory mode. Lets the request
+        through if Redis answers with an error.
         """
-        if self._memory_mode:
-            return self._memory_increment_rate_limit(key, window, limit)
+        algorithm = rate_limit.ALGORITHMS[rule.algorithm]
+        args = rate_limit.script_args(rule, cost)
 
-        try:
-            client = self._get_healthy_client()
-            pipe = client.pipeline()
-            pipe.incr(key)
-            pipe.expire(key, window)
-            results = pipe.execute()
-            current_count = results[0]
-            is_allowed = current_count <= limit
-            return current_count, is_allowed
-        except RedisError as e:
-            logger.error(f"Redis rate limit error for key '{key}': {e}")
-            return 0, True
-        except RuntimeError:
-            return self._memory_increment_rate_limit(key, window, limit)
-
-    def _memory_increment_rate_limit(
+        def command(client: Redis) -> RateLimitResult:
+            try:
+                reply = client.evalsha(algorithm.sha, 1, key, *args)
+            except NoScriptError:
+                # Script cache empty (first use, Redis restarted or failed over)
+                rate_limit.load_scripts(client)
+                reply = client.evalsha(algorithm.sha, 1, key, *args)
+            return RateLimitResult.from_reply(reply, rule)
+
+        return self._run(
+            f"RATE LIMIT '{key}'",
+            command,
+            lambda: self._memory_hit_rate_limit(key, rule, cost),
+            default=RateLimitResult.unlimited(rule)
+        )
+
+    def _memory_hit_rate_limit(self, key: str, rule, cost: int) -> RateLimitResult:
+        return rate_limit.memory_hit(self._memory, key, rule, cost)
+
+    # ------------------------------------------------------------------
+    # BATCH OPERATIONS (one round trip)
+    # ------------------------------------------------------------------
+
+    def mget(
         self,
-        key: str,
-        window: int,
-        limit: int
-    ) -> tuple[int, bool]:
-        with self._memory_lock:
-            self._memory_cleanup_expired()
-            now = time.time()
-            current = self._memory_store.get(key)
-            if current is None:
-                count = 1
-                self._memory_store[key] = (count, now + window)
-            else:
-                count, _ = current
-                count += 1
-                self._memory_store[key] = (count, now + window)
-            return count, count <= limit
+        keys: Iterable[str],
+        as_json: bool = False,
+        default: Any = None
+    ) -> List[Any]:
+        """Get several keys in one round trip, in the order given."""
+        keys = list(keys)
+        if not keys:
+            return []
+        return self._run(
+            "MGET",
+            lambda client: [
+                self._decode(key, value, as_json, default)
+                for key, value in zip(keys, client.mget(keys))
+            ],
+            lambda: [self._memory_get(key, as_json, default) for key in keys],
+            default=[default] * len(keys)
+        )
+
+    def mset(
+        self,
+        mapping: Dict[str, Any],
+        expiry: Optional[int] = None,
+        as_json: bool = True
+    ) -> bool:
+        """Set several keys, each with the same optional expiry, in one round trip."""
+        if not mapping:
+            return True
+        with self.pipeline() as batch:
+            for key, value in mapping.items():
+                batch.set(key, value, expiry=expiry, as_json=as_json)
+        return all(batch.results)
+
+    @contextmanager
+    def pipeline(self) -> Iterator["RedisBatch"]:
+        """
+        Queue operations and send them in one round trip on exit.
+
+            with redis.pipeline() as batch:
+                batch.hit_rate_limit(f"rl:verify_signup:ip:{ip}", rule)
+                batch.get(f"signup_pending:{token}", as_json=True)
+            limited, signup_data = batch.results
+
+        Nothing is sent if the block raises.
+        """
+        batch = RedisBatch(self)
+        yield batch
+        batch.execute()
 
     def ping(self) -> bool:
         """Test Redis connection. Always True in memory mode."""
@@ -325,8 +349,7 @@ class RedisService:
             return True
 
         try:
-            client = self._get_healthy_client()
-            return bool(client.ping())
+            return bool(self.get_client().ping())
         except Exception as e:
             logger.error(f"Redis PING failed: {e}")
             return False
@@ -334,8 +357,7 @@ class RedisService:
     def close(self):
         """Close Redis connection pool or clear in-memory store."""
         if self._memory_mode:
-            with self._memory_lock:
-                self._memory_store.clear()
+            self._memory.clear()
             logger.info("In-memory store cleared")
             return
 
@@ -345,4 +367,106 @@ class RedisService:
                 logger.info("Redis connection pool closed")
         except Exception as e:
             logger.error(f"Error closing Redis pool: {e}")
-            
\ No newline at end of file
+            
+
+class RedisBatch:
+    """
+    Operations queued by RedisService.pipeline().
+
+    Sent as one non-transactional pipeline, or applied to the in-memory store
+    in memory mode. ``results`` holds one value per queued call, shaped like
+    the return value of the matching RedisService method.
+    """
+
+    def __init__(self, service: RedisService):
+        self._service = service
+        # (queue on pipeline, reply count, reply -> result, memory call, default)
+        self._ops: List[tuple] = []
+        self.results: Optional[List[Any]] = None
+
+    def _add(self, queue, replies, convert, memory, default) -> "RedisBatch":
+        self._ops.append((queue, replies, convert, memory, default))
+        return self
+
+    def get(self, key: str, as_json: bool = False, default: Any = None) -> "RedisBatch":
+        return self._add(
+            lambda pipe: pipe.get(key), 1,
+            lambda replies: RedisService._decode(key, replies[0], as_json, default),
+            lambda: self._service._memory_get(key, as_json, default),
+            default
+        )
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        expiry: Optional[int] = None,
+        as_json: bool = True
+    ) -> "RedisBatch":
+        return self._add(
+            lambda pipe: pipe.set(key, RedisService._encode(value, as_json), ex=expiry or None), 1,
+            lambda replies: bool(replies[0]),
+            lambda: self._service._memory_set(key, value, expiry, as_json),
+            False
+        )
+
+    def delete(self, *keys: str) -> "RedisBatch":
+        return self._add(
+            lambda pipe: pipe.delete(*keys), 1,
+            lambda replies: replies[0],
+            lambda: self._service._memory_delete(*keys),
+            0
+        )
+
+    def exists(self, *keys: str) -> "RedisBatch":
+        return self._add(
+            lambda pipe: pipe.exists(*keys), 1,
+            lambda replies: replies[0],
+            lambda: self._service._memory_exists(*keys),
+            0
+        )
+
+    def hit_rate_limit(self, key: str, rule, cost: int = 1) -> "RedisBatch":
+        algorithm = rate_limit.ALGORITHMS[rule.algorithm]
+        args = rate_limit.script_args(rule, cost)
+        return self._add(
+            lambda pipe: pipe.evalsha(algorithm.sha, 1, key, *args), 1,
+            lambda replies: RateLimitResult.from_reply(replies[0], rule),
+            lambda: self._service._memory_hit_rate_limit(key, rule, cost),
+            RateLimitResult.unlimited(rule)
+        )
+
+    def execute(self) -> List[Any]:
+        """Send the queued operations (once) and return their results."""
+        if self.results is not None:
+            return self.results
+        if not self._ops:
+            self.results = []
+            return self.results
+
+        def send(client: Redis) -> List[Any]:
+            pipe = client.pipeline(transaction=False)
+            for queue, *_ in self._ops:
+                queue(pipe)
+            return pipe.execute()
+
+        def command(client: Redis) -> List[Any]:
+            try:
+                replies = send(client)
+            except NoScriptError:
+                # Script cache empty (first use, Redis restarted or failed over)
+                rate_limit.load_scripts(client)
+                replies = send(client)
+            results, position = [], 0
+            for _, count, convert, _, _ in self._ops:
+                results.append(convert(replies[position:position + count]))
+                position += count
+            return results
+
+        self.results = self._service._run(
+            f"PIPELINE ({len(self._ops)} ops)",
+            command,
+            lambda: [memory() for _, _, _, memory, _ in self._ops],
+            default=[default for *_, default in self._ops]
+        )
+        return self.results
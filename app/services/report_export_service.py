@@ -0,0 +1,567 @@
+"""
+Report Export Service
+Background rendering and caching of PDF/Excel performance reports.
+
+Documents are rendered in a bounded process pool so reportlab/openpyxl work
+never blocks an API worker. Results are stored on disk under a content
+address derived from the student's score/attendance version, so repeat
+downloads of an unchanged report are served straight from the cache.
+
+Job records are small JSON files next to the cache, which lets any API
+worker answer status/download requests for a job submitted elsewhere.
+Both are pruned on submit: entries untouched for export_cache_ttl_hours
+go, then the least recently used documents while the cache is over
+export_cache_max_mb. A job still pending after export_job_timeout_minutes
+(its process died) is reported as failed.
+
+Course-wide exports render every enrolled student's report in the same
+pool and stream them to the client as a ZIP archive.
+"""
+
+import hashlib
+import itertools
+import json
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_app_config
+from app.core.processes import process_pool
+from app.models.attendance import Attendance
+from app.models.course import Course
+from app.models.enrollment import Enrollment
+from app.models.grade_rollup import EnrollmentGradeRollup
+from app.models.lesson import Lesson
+from app.models.modules import Module
+from app.models.scores import Score, ScoreColumn
+from app.models.user import User
+from app.services import performance_service
+
+logger = logging.getLogger(__name__)
+
+# Bump when the report layout changes so cached documents are not reused
+RENDER_VERSION = "1"
+
+EXPORT_FORMATS = {
+    "pdf": {
+        "media_type": "application/pdf",
+        "extension": "pdf",
+    },
+    "excel": {
+        "media_type": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        "extension": "xlsx",
+    },
+}
+
+
+class ExportJobStatus:
+    PENDING = "pending"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+_lock = threading.Lock()
+# cache key -> job id, for renders running in this process
+_in_flight: Dict[str, str] = {}
+
+# Cache pruning scans the directory; at most once per interval per process
+PRUNE_INTERVAL_SECONDS = 300
+_last_prune = 0.0
+
+
+# ============================================================================
+# CACHE
+# ============================================================================
+
+def _cache_dir() -> str:
+    path = get_app_config().background_tasks_config.export_cache_path
+    os.makedirs(os.path.join(path, "jobs"), exist_ok=True)
+    return path
+
+
+def _result_path(cache_key: str, format: str) -> str:
+    return os.path.join(_cache_dir(), f"{cache_key}.{EXPORT_FORMATS[format]['extension']}")
+
+
+def _job_path(job_id: str) -> str:
+    return os.path.join(_cache_dir(), "jobs", f"{job_id}.json")
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def prune_cache() -> int:
+    """
+    Delete expired documents, job records and stray temp files, then the
+    least recently used documents while the cache is over its size limit.
+    Returns the files deleted.
+    """
+    config = get_app_config().background_tasks_config
+    cache_dir = _cache_dir()
+    expires = time.time() - config.export_cache_ttl_hours * 3600
+    deleted = 0
+    documents = []
+
+    for directory in (cache_dir, os.path.join(cache_dir, "jobs")):
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                try:
+                    info = entry.stat()
+                    if info.st_mtime < expires:
+                        os.remove(entry.path)
+                        deleted += 1
+                    elif directory == cache_dir and not entry.name.endswith(".tmp"):
+                        documents.append((info.st_mtime, info.st_size, entry.path))
+                except FileNotFoundError:
+                    # Pruned concurrently by another worker
+                    continue
+
+    # Cache hits touch their document, so mtime order is least recently used first
+    excess = sum(size for _, size, _ in documents) - config.export_cache_max_mb * 1024 * 1024
+    for _, size, path in sorted(documents):
+        if excess <= 0:
+            break
+        try:
+            os.remove(path)
+            deleted += 1
+        except FileNotFoundError:
+            pass
+        excess -= size
+
+    if deleted:
+        logger.info(f"Export cache pruned: {deleted} files deleted")
+    return deleted
+
+
+def _maybe_prune_cache() -> None:
+    global _last_prune
+    now = time.monotonic()
+    with _lock:
+        if _last_prune and now - _last_prune < PRUNE_INTERVAL_SECONDS:
+            return
+        _last_prune = now
+    try:
+        prune_cache()
+    except OSError as e:
+        logger.error(f"Export cache pruning failed: {e}")
+
+
+def _touch(path: str) -> bool:
+    """Mark a cached document as used; False if it is not (or no longer) cached."""
+    try:
+        os.utime(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def get_report_version(db: Session, student_id: UUID) -> str:
+    """
+    Fingerprint of everything a student's report is built from.
+
+    Row counts catch deletes and max(updated_at) catches edits, including
+    renamed courses, modules, lessons and score columns of the student's
+    courses. Grade rollups are refreshed on course structure changes, so
+    their refresh time covers added and removed lessons. One round trip.
+    """
+    enrollment_ids = select(Enrollment.id).where(Enrollment.student_id == student_id)
+    scores = Score.enrollment_id.in_(enrollment_ids)
+    attendance = Attendance.student_id == student_id
+    enrollments = Enrollment.student_id == student_id
+    course_ids = select(Enrollment.course_id).where(enrollments)
+    module_ids = select(Module.id).where(Module.course_id.in_(course_ids))
+    lesson_ids = select(Lesson.id).where(Lesson.module_id.in_(module_ids))
+    columns = or_(
+        ScoreColumn.course_id.in_(course_ids),
+        ScoreColumn.module_id.in_(module_ids),
+        ScoreColumn.lesson_id.in_(lesson_ids),
+    )
+
+    row = db.execute(select(
+        select(func.count(Score.id)).where(scores).scalar_subquery(),
+        select(func.max(Score.updated_at)).where(scores).scalar_subquery(),
+        select(func.count(Attendance.id)).where(attendance).scalar_subquery(),
+        select(func.max(Attendance.updated_at)).where(attendance).scalar_subquery(),
+        select(func.count(Enrollment.id)).where(enrollments).scalar_subquery(),
+        select(func.max(Enrollment.updated_at)).where(enrollments).scalar_subquery(),
+        select(func.max(EnrollmentGradeRollup.refreshed_at)).where(
+            EnrollmentGradeRollup.enrollment_id.in_(enrollment_ids)
+        ).scalar_subquery(),
+        select(User.updated_at).where(User.id == student_id).scalar_subquery(),
+        select(func.max(Course.updated_at)).where(Course.id.in_(course_ids)).scalar_subquery(),
+        select(func.max(Module.updated_at)).where(Module.id.in_(module_ids)).scalar_subquery(),
+        select(func.max(Lesson.updated_at)).where(Lesson.id.in_(lesson_ids)).scalar_subquery(),
+        select(func.count(ScoreColumn.id)).where(columns).scalar_subquery(),
+        select(func.max(ScoreColumn.updated_at)).where(columns).scalar_subquery(),
+    )).one()
+
+    return hashlib.sha256(
+        "|".join(str(value) for value in row).encode()
+    ).hexdigest()
+
+
+def get_cache_key(db: Session, student_id: UUID, format: str) -> str:
+    """Content address of a rendered report (reports carry today's date)."""
+    parts = [RENDER_VERSION, str(student_id), format, date.today().isoformat(),
+             get_report_version(db, student_id)]
+    return hashlib.sha256(":".join(parts).encode()).hexdigest()
+
+
+def _safe_name(value: Optional[str]) -> str:
+    return re.sub(r"[^A-Za-z0-9_]", "", value or "")
+
+
+def get_report_filename(db: Session, student_id: UUID, format: str) -> str:
+    names = db.query(User.names).filter(User.id == student_id).scalar()
+    extension = EXPORT_FORMATS[format]["extension"]
+    return f"Performance_Report_{_safe_name(names)}_{date.today().isoformat()}.{extension}"
+
+
+# ============================================================================
+# RENDERING
+# ============================================================================
+
+def _render(format: str, report: Dict[str, Any]) -> bytes:
+    """Process pool entry point: render a report to bytes."""
+    if format == "pdf":
+        return performance_service.render_performance_pdf(report)
+    return performance_service.render_performance_excel(report)
+
+
+def _render_to_file(format: str, report: Dict[str, Any], path: str) -> str:
+    """Process pool entry point: render a report and store it in the cache."""
+    _write_atomic(path, _render(format, report))
+    return path
+
+
+def _build_report(db: Session, student_id: UUID, format: str) -> Dict[str, Any]:
+    return performance_service.build_performance_report(
+        db, student_id, include_attendance_details=(format == "excel")
+    )
+
+
+def get_or_render_report(db: Session, student_id: UUID, format: str) -> str:
+    """
+    Return the path of a rendered report. On a cache miss the report data is
+    loaded here and rendered in the process pool while this thread waits.
+    Used by the synchronous download endpoint.
+    """
+    path = _result_path(get_cache_key(db, student_id, format), format)
+    if not _touch(path):
+        report = _build_report(db, student_id, format)
+        if get_app_config().background_tasks_config.enabled:
+            _submit(_render_to_file, format, report, path).result()
+        else:
+            _render_to_file(format, report, path)
+    return path
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            max_workers = get_app_config().background_tasks_config.max_workers
+            _executor = process_pool(max_workers)
+            logger.info(f"Report export pool started with {max_workers} workers")
+        return _executor
+
+
+def _submit(fn, *args) -> Future:
+    """Submit a render to the pool, restarting the pool once if it is broken."""
+    executor = _get_executor()
+    try:
+        return executor.submit(fn, *args)
+    except BrokenProcessPool:
+        # A worker died (OOM kill); start a new pool and try once more
+        logger.error("Report export pool broke, restarting it")
+        _discard_executor(executor)
+        return _get_executor().submit(fn, *args)
+
+
+def _discard_executor(executor: ProcessPoolExecutor) -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_executor() -> None:
+    """Stop the render pool (called on application shutdown)."""
+    if _executor is not None:
+        _discard_executor(_executor)
+
+
+# ============================================================================
+# JOBS
+# ============================================================================
+
+def _save_job(job: Dict[str, Any]) -> None:
+    _write_atomic(_job_path(job["id"]), json.dumps(job).encode())
+
+
+def get_export_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """Load a job record, or None if the id is unknown."""
+    try:
+        UUID(job_id)
+        with open(_job_path(job_id), "rb") as f:
+            job = json.loads(f.read())
+    except (ValueError, FileNotFoundError):
+        return None
+
+    timeout = get_app_config().background_tasks_config.export_job_timeout_minutes
+    if (
+        job["status"] == ExportJobStatus.PENDING
+        and datetime.fromisoformat(job["created_at"]) < datetime.utcnow() - timedelta(minutes=timeout)
+    ):
+        # The process rendering it died before recording the outcome
+        job.update(status=ExportJobStatus.FAILED, error="Export timed out",
+                   completed_at=datetime.utcnow().isoformat())
+        _save_job(job)
+    return job
+
+
+def get_job_result_path(job: Dict[str, Any]) -> Optional[str]:
+    """Path of a completed job's document, if it is still in the cache."""
+    if job["status"] != ExportJobStatus.COMPLETED:
+        return None
+    path = _result_path(job["cache_key"], job["format"])
+    return path if os.path.exists(path) else None
+
+
+def _start_render(job: Dict[str, Any], report: Dict[str, Any], path: str, retries: int = 1) -> None:
+    future = _submit(_render_to_file, job["format"], report, path)
+    future.add_done_callback(lambda f: _on_render_done(job, report, path, retries, f))
+
+
+def _on_render_done(
+    job: Dict[str, Any],
+    report: Dict[str, Any],
+    path: str,
+    retries: int,
+    future: Future
+) -> None:
+    error = RuntimeError("Export was cancelled") if future.cancelled() else future.exception()
+    if isinstance(error, BrokenProcessPool) and retries > 0:
+        # The worker died mid-render; render once more in a fresh pool
+        try:
+            _start_render(job, report, path, retries - 1)
+            return
+        except Exception as e:
+            error = e
+
+    with _lock:
+        _in_flight.pop(job["cache_key"], None)
+
+    if error is not None:
+        logger.error(f"Report export job {job['id']} failed: {error}")
+        job["status"] = ExportJobStatus.FAILED
+        job["error"] = str(error)
+    else:
+        job["status"] = ExportJobStatus.COMPLETED
+    job["completed_at"] = datetime.utcnow().isoformat()
+    _save_job(job)
+
+
+def submit_export_job(
+    db: Session,
+    student_id: UUID,
+    format: str,
+    requested_by: UUID
+) -> Dict[str, Any]:
+    """
+    Queue a report render and return its job record.
+
+    Cache hits complete immediately, and an identical render already in
+    progress in this process is shared instead of queued twice.
+    """
+    student_exists = db.query(User.id).filter(User.id == student_id).first()
+    if not student_exists:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Student not found"
+        )
+
+    config = get_app_config().background_tasks_config
+    _maybe_prune_cache()
+    cache_key = get_cache_key(db, student_id, format)
+    path = _result_path(cache_key, format)
+
+    job = {
+        "id": str(uuid.uuid4()),
+        "student_id": str(student_id),
+        "format": format,
+        "cache_key": cache_key,
+        "filename": get_report_filename(db, student_id, format),
+        "requested_by": str(requested_by),
+        "status": ExportJobStatus.PENDING,
+        "cached": False,
+        "error": None,
+        "created_at": datetime.utcnow().isoformat(),
+        "completed_at": None,
+    }
+
+    if _touch(path):
+        job.update(status=ExportJobStatus.COMPLETED, cached=True,
+                   completed_at=job["created_at"])
+        _save_job(job)
+        return job
+
+    with _lock:
+        running_id = _in_flight.get(cache_key)
+        if running_id:
+            running = get_export_job(running_id)
+            if running:
+                return running
+        if len(_in_flight) >= config.queue_max_size:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many reports are being generated, please retry shortly"
+            )
+
+    # Database work happens here; the pool only renders plain data
+    report = _build_report(db, student_id, format)
+
+    if not config.enabled:
+        _render_to_file(format, report, path)
+        job.update(status=ExportJobStatus.COMPLETED,
+                   completed_at=datetime.utcnow().isoformat())
+        _save_job(job)
+        return job
+
+    with _lock:
+        _save_job(job)
+        _in_flight[cache_key] = job["id"]
+    try:
+        _start_render(job, report, path)
+    except Exception:
+        with _lock:
+            _in_flight.pop(cache_key, None)
+        raise
+    return job
+
+
+def serialize_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Public view of a job record."""
+    return {
+        "id": job["id"],
+        "student_id": job["student_id"],
+        "format": job["format"],
+        "status": job["status"],
+        "cached": job.get("cached", False),
+        "filename": job["filename"],
+        "error": job.get("error"),
+        "created_at": job["created_at"],
+        "completed_at": job.get("completed_at"),
+    }
+
+
+# ============================================================================
+# COURSE (COHORT) EXPORTS
+# ============================================================================
+
+class _ZipSink:
+    """Write-only, unseekable file object collecting ZIP output for streaming."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def get_course_export_filename(db: Session, course_id: UUID, format: str) -> str:
+    code = db.query(Course.code).filter(Course.id == course_id).scalar()
+    return f"Performance_Reports_{_safe_name(code)}_{format}_{date.today().isoformat()}.zip"
+
+
+def _entry_name(report: Dict[str, Any], format: str) -> str:
+    student = report.get("student") or {}
+    extension = EXPORT_FORMATS[format]["extension"]
+    return f"{_safe_name(student.get('names')) or 'Student'}_{report['student_id'][:8]}.{extension}"
+
+
+def stream_course_reports(reports: List[Dict[str, Any]], format: str) -> Iterator[bytes]:
+    """
+    Render a cohort's reports in the process pool and yield a ZIP archive.
+
+    Entries are written as soon as each render finishes, and at most
+    2 x max_workers rendered documents are held at once. Renders lost to a
+    dead worker are retried once in a fresh pool; failed renders are listed
+    in errors.txt instead of aborting the download.
+    """
+    config = get_app_config().background_tasks_config
+    sink = _ZipSink()
+    errors: List[str] = []
+    pending: Dict[Future, Dict[str, Any]] = {}
+
+    # Documents are already compressed (PDF streams, XLSX is itself a ZIP)
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED) as archive:
+        if not config.enabled:
+            for report in reports:
+                archive.writestr(_entry_name(report, format), _render(format, report))
+                yield sink.drain()
+        else:
+            queue = iter(reports)
+            window = max(config.max_workers, 1) * 2
+            retried = set()
+            try:
+                for report in itertools.islice(queue, window):
+                    pending[_submit(_render, format, report)] = report
+
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        report = pending.pop(future)
+                        if isinstance(future.exception(), BrokenProcessPool) and report["student_id"] not in retried:
+                            retried.add(report["student_id"])
+                            pending[_submit(_render, format, report)] = report
+                            continue
+                        try:
+                            archive.writestr(_entry_name(report, format), future.result())
+                        except Exception as e:
+                            logger.error(f"Report render failed for student {report['student_id']}: {e}")
+                            errors.append(f"{report['student_id']}: {e}")
+                        yield sink.drain()
+
+                        for next_report in itertools.islice(queue, 1):
+                            pending[_submit(_render, format, next_report)] = next_report
+            finally:
+                # Client went away mid-stream
+                for future in pending:
+                    future.cancel()
+
+        if errors:
+            archive.writestr("errors.txt", "\n".join(errors))
+
+    yield sink.drain()
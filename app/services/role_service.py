@@ -10,6 +10,7 @@ from app.models.rbac import Permission, Role
 from app.models.association_tables import role_permissions
 from app.schemas.rbac import RoleCreate, RoleUpdate, PermissionAssign
 from app.core.data.const import SYSTEM_ROLES
+from app.services.principal_service import invalidate_all_principals
 
 class RoleService:
     SYSTEM_ROLES = SYSTEM_ROLES
@@ -165,6 +166,7 @@ class RoleService:
                 db.add(role_permissions)
         
         db.commit()
+        invalidate_all_principals()
         db.refresh(role)
         
         return role
@@ -190,6 +192,7 @@ class RoleService:
         
         db.delete(role_permissions)
         db.commit()
+        invalidate_all_principals()
 
     @staticmethod
     def get_role_permissions(db: Session, role_id: UUID, current_user: User) -> List[Permission]:
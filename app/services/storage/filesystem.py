@@ -1,5 +1,8 @@
+import os
+import shutil
 from pathlib import Path
 from typing import BinaryIO, Optional
+from app.utils.files.upload import CHUNK_SIZE
 from .base import StorageProvider
 
 
@@ -21,9 +24,12 @@ class FileSystemStorage(StorageProvider):
         directory.mkdir(parents=True, exist_ok=True)
 
         filepath = directory / filename
+        partial = filepath.with_name(f"{filename}.part")
 
-        with open(filepath, "wb") as f:
-            f.write(file.read())
+        # Streamed in chunks; renamed into place only once complete
+        with open(partial, "wb") as f:
+            shutil.copyfileobj(file, f, CHUNK_SIZE)
+        os.replace(partial, filepath)
 
         relative = filepath.relative_to(self.base_path)
 
@@ -1,6 +1,8 @@
 from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
 from app.services.storage.manager import StorageManager
-from app.utils.files.utils import validate_file, generate_unique_filename
+from app.utils.files.upload import receive_upload
+from app.utils.files.utils import generate_unique_filename
 from app.core.config import get_app_config
 
 settings = get_app_config()
@@ -14,26 +16,28 @@ class MediaService:
 
         config = settings.hosting_config.content_delivery
 
-        content, content_type = validate_file(
+        # Chunked pass over the spooled upload, then the same file object
+        # goes to the driver; both block, so off the event loop
+        received = await run_in_threadpool(
+            receive_upload,
             file,
             config.allowed_file_types,
             config.max_file_size_mb
         )
 
-        filename = generate_unique_filename(file.filename, content)
+        filename = generate_unique_filename(file.filename, received.md5)
 
-        from io import BytesIO
-
-        url = self.storage.upload(
-            file=BytesIO(content),
+        url = await run_in_threadpool(
+            self.storage.upload,
+            file=received.file,
             filename=filename,
-            content_type=content_type,
+            content_type=received.content_type,
             subdir=subdir
         )
 
         return {
             "filename": filename,
             "url": url,
-            "content_type": content_type,
-            "size": len(content)
+            "content_type": received.content_type,
+            "size": received.size
         }
@@ -15,6 +15,7 @@ from app.models.course import Course
 from app.models.modules import Module
 from app.models.lesson import Lesson
 from app.models.scores import Score
+from app.services import grade_rollup_service
 
 def calculate_grade(percentage: float) -> str:
     """Calculate grade from percentage"""
@@ -229,65 +230,22 @@ def get_id_card_data(db: Session, student_id: UUID) -> Dict[str, Any]:
     }
 
 def calculate_course_progress(db: Session, student_id: UUID, course_id: UUID) -> float:
-    """Calculate student's progress in a course"""
-    # Get enrollment
-    enrollment = db.query(Enrollment).filter(
-        Enrollment.student_id == student_id,
-        Enrollment.course_id == course_id
-    ).first()
+    """Calculate student's progress in a course (from the enrollment grade rollup)"""
+    rollup = grade_rollup_service.get_enrollment_rollup(db, student_id, course_id)
     
-    if not enrollment:
+    if not rollup:
         return 0.0
     
-    # Get total lessons in course
-    total_lessons = db.query(Lesson).join(Module).filter(
-        Module.course_id == course_id
-    ).count()
-    
-    if total_lessons == 0:
-        return 0.0
-    
-    # Get completed lessons (where score exists)
-    completed = db.query(Score).join(Lesson).join(Module).filter(
-        Module.course_id == course_id,
-        Score.enrollment_id == enrollment.id
-    ).count()
-    
-    return round((completed / total_lessons) * 100, 1)
+    return rollup["progress"]
 
 def calculate_course_grade(db: Session, student_id: UUID, course_id: UUID) -> str:
-    """Calculate student's overall grade in a course"""
-    # Get enrollment
-    enrollment = db.query(Enrollment).filter(
-        Enrollment.student_id == student_id,
-        Enrollment.course_id == course_id
-    ).first()
-    
-    if not enrollment:
-        return "N/A"
-    
-    # Get all scores for this enrollment
-    scores = db.query(Score).filter(
-        Score.enrollment_id == enrollment.id
-    ).all()
-    
-    if not scores:
-        return "N/A"
-    
-    # Calculate weighted average
-    total_weighted_score = 0
-    total_weight = 0
-    
-    for score in scores:
-        weight = getattr(score, 'weight', 1.0)
-        total_weighted_score += score.percentage * weight
-        total_weight += weight
+    """Calculate student's overall grade in a course (from the enrollment grade rollup)"""
+    rollup = grade_rollup_service.get_enrollment_rollup(db, student_id, course_id)
     
-    if total_weight == 0:
+    if not rollup or rollup["weighted_average"] is None:
         return "N/A"
     
-    avg_percentage = total_weighted_score / total_weight
-    return calculate_grade(avg_percentage)
+    return calculate_grade(rollup["weighted_average"])
 
 
 # more--- v2
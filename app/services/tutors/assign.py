@@ -3,8 +3,7 @@
 # FILE: app/services/tutor_assignment_service.py
 # ============================================================================
 
-from typing import Optional, Tuple, List
-from sqlalchemy import or_, desc, asc, and_, func
+from typing import Optional, List
 from sqlalchemy.orm import Session, joinedload
 from uuid import UUID
 from datetime import datetime
@@ -18,14 +17,16 @@ from app.schemas.tutors import (
 from app.models.course import Course
 from app.models.user import User
 from app.models.rbac import Role
+from app.utils.pagination import KeysetPage, paginate_keyset
+from app.utils.search import RELEVANCE, build_search
 
 
 def list_assignments(
     db: Session,
     filters: Optional[TutorCourseFilters] = None
-) -> Tuple[List[CourseTutor], int]:
+) -> KeysetPage:
     """
-    Get filtered, sorted, and paginated list of tutor assignments.
+    Get filtered, sorted, keyset-paginated page of tutor assignments.
     Prevents N+1 queries when relations are included.
     """
     query = (
@@ -37,23 +38,21 @@ def list_assignments(
     )
 
     filters = filters or TutorCourseFilters()
+    sort_column = getattr(CourseTutor, filters.sort_by, CourseTutor.created_at)
 
     # Apply search filter
-    if filters.search:
-        term = f"%{filters.search.lower()}%"
+    search = build_search(
+        db, filters.search, (User.names, User.email, Course.title, Course.code)
+    )
+    if search:
         query = (
             query
             .join(CourseTutor.tutor)
             .join(CourseTutor.course)
-            .filter(
-                or_(
-                    User.names.ilike(term),
-                    User.email.ilike(term),
-                    Course.title.ilike(term),
-                    Course.code.ilike(term)
-                )
-            )
+            .filter(search.condition)
         )
+        if filters.sort_by == RELEVANCE:
+            sort_column = search.rank
 
     # Apply status filter
     if filters.status and filters.status != 'all':
@@ -67,23 +66,18 @@ def list_assignments(
     if filters.course_id:
         query = query.filter(CourseTutor.course_id == filters.course_id)
 
-    # Apply sorting
-    sort_col = getattr(CourseTutor, filters.sort_by, CourseTutor.created_at)
-    query = query.order_by(desc(sort_col) if filters.order == "desc" else asc(sort_col))
-
-    # Get total count
-    total = query.count()
-
-    # Apply pagination
-    assignments = (
-        query
-        .offset((filters.page - 1) * filters.page_size)
-        .limit(filters.page_size)
-        .all()
+    # Apply sorting and keyset pagination (total only on request)
+    return paginate_keyset(
+        query,
+        sort_column,
+        CourseTutor.id,
+        order=filters.order,
+        page_size=filters.page_size,
+        cursor=filters.cursor,
+        offset=(filters.page - 1) * filters.page_size,
+        with_total=filters.include_total,
     )
 
-    return assignments, total
-
 
 def create_assignment(
     db: Session,
@@ -716,7 +716,7 @@ User service layer providing user management operations.
 Uses functional programming style instead of class-based approach.
 """
 
-from typing import Optional, List
+from typing import Optional
 from uuid import UUID
 import logging
 
@@ -737,9 +737,13 @@ from app.schemas.user import (
     UserRead,
 )
 
+from app.core.security.hashing import password_hasher
 from app.core.security.password import hash_password, verify_password
 from app.services.notifications.email import send_welcome_email
 from app.services.storage.media import MediaService
+from app.services.principal_service import invalidate_principal
+from app.utils.pagination import KeysetPage, paginate_keyset
+from app.utils.search import RELEVANCE, build_search
 
 _media_service = MediaService()
 
@@ -797,28 +801,33 @@ def get_user_by_phone(db: Session, phone: str) -> Optional[User]:
 # LIST & FILTER OPERATIONS
 # ============================================================================
 
+# Trigram-indexed (see migration d7f3a9c2e614)
+USER_SEARCH_COLUMNS = (User.names, User.email, User.username, User.phone)
+
+
 def list_users(
     db: Session,
     filters: Optional[UserFilters] = None,
     page: int = 1,
-    page_size: int = 20
-) -> List[User]:
+    page_size: int = 20,
+    cursor: Optional[str] = None,
+    include_total: bool = False
+) -> KeysetPage:
     """
-    Get paginated list of users with optional filtering.
+    Get a keyset-paginated list of users (newest first, or best search match
+    first with sort_by=relevance) with optional filtering.
+    Pass the previous page's next_cursor/prev_cursor as ``cursor``; ``page``
+    is only honoured without a cursor.
     """
     query = db.query(User)
+    sort_column = User.created_at
 
     if filters:
-        if filters.search:
-            term = f"%{filters.search}%"
-            query = query.filter(
-                or_(
-                    User.names.ilike(term),
-                    User.email.ilike(term),
-                    User.username.ilike(term),
-                    User.phone.ilike(term),
-                )
-            )
+        search = build_search(db, filters.search, USER_SEARCH_COLUMNS)
+        if search:
+            query = query.filter(search.condition)
+            if filters.sort_by == RELEVANCE:
+                sort_column = search.rank
 
         if filters.is_active is not None:
             query = query.filter(User.is_active == filters.is_active)
@@ -826,16 +835,17 @@ def list_users(
         if filters.role:
             query = query.join(User.roles).filter(Role.name == filters.role)
 
-    users = (
-        query
-        .order_by(User.created_at.desc())
-        .offset((page - 1) * page_size)
-        .limit(page_size)
-        .all()
+    return paginate_keyset(
+        query,
+        sort_column,
+        User.id,
+        order="desc",
+        page_size=page_size,
+        cursor=cursor,
+        offset=(page - 1) * page_size,
+        with_total=include_total,
     )
 
-    return users
-
 
 # ============================================================================
 # CREATE OPERATIONS
@@ -872,7 +882,7 @@ async def create_user(
         username=data.username,
         names=data.names,
         phone=data.phone,
-        password=hash_password(data.password),
+        password=await password_hasher.hash(data.password),
         is_active=True,
         is_verified=False,
     )
@@ -1028,6 +1038,7 @@ def update_user(
 
     db.commit()
     db.refresh(user)
+    invalidate_principal(user.id)
 
     action = "password updated" if password_updated else "updated"
     logger.info(f"User {user.id} {action} by {current_user.id} (admin={current_user.is_admin})")
@@ -1131,13 +1142,13 @@ def update_password(
             detail="Not authorized to change this password"
         )
 
-    if not verify_password(data.current_password, user.password):
+    if not password_hasher.verify_from_thread(data.current_password, user.password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect"
         )
 
-    user.password = hash_password(data.new_password)
+    user.password = password_hasher.hash_from_thread(data.new_password)
 
     db.commit()
     db.refresh(user)
@@ -1175,6 +1186,7 @@ def toggle_user_status(db: Session, user_id: UUID, current_user: User) -> User:
 
     db.commit()
     db.refresh(user)
+    invalidate_principal(user.id)
 
     logger.info(f"User {user.id} status toggled to {user.is_active} by {current_user.id}")
 
@@ -1214,6 +1226,7 @@ def delete_user(
         logger.info(f"User {user.id} soft deleted by {current_user.id}")
 
     db.commit()
+    invalidate_principal(user_id)
 
 
 # ============================================================================
@@ -1256,6 +1269,7 @@ def assign_role(
         user.roles.append(role)
         db.commit()
         db.refresh(user)
+        invalidate_principal(user.id)
         logger.info(f"Role '{role_name}' assigned to user {user.id} by {current_user.id}")
 
     return user
@@ -1291,6 +1305,7 @@ def remove_role(
         user.roles.remove(role)
         db.commit()
         db.refresh(user)
+        invalidate_principal(user.id)
         logger.info(f"Role '{role_name}' removed from user {user.id} by {current_user.id}")
 
     return user
@@ -0,0 +1,137 @@
+"""
+Streaming upload validation.
+
+By the time an endpoint runs, Starlette has spooled each uploaded file to
+UploadFile.file (kept in memory up to 1 MB, on disk past that).
+receive_upload() reads that spool once in fixed-size chunks. It sniffs
+the content type from the first bytes, updates the hash incrementally,
+and stops with 413 as soon as the size limit is passed. It then rewinds
+the same file object for the storage driver, so the upload is never
+held whole in memory or copied into another buffer.
+
+Oversized request bodies are refused even earlier, while they are being
+received, by app.core.uploads.UploadSizeLimitMiddleware.
+"""
+
+import hashlib
+from dataclasses import dataclass
+from typing import BinaryIO, Iterable, Optional
+
+from fastapi import HTTPException, UploadFile, status
+
+CHUNK_SIZE = 256 * 1024
+
+# (offset, magic bytes, content type)
+_SIGNATURES = (
+    (0, b"\xff\xd8\xff", "image/jpeg"),
+    (0, b"\x89PNG\r\n\x1a\n", "image/png"),
+    (0, b"GIF87a", "image/gif"),
+    (0, b"GIF89a", "image/gif"),
+    (0, b"BM", "image/bmp"),
+    (8, b"WEBP", "image/webp"),
+    (0, b"%PDF-", "application/pdf"),
+    (0, b"\x1a\x45\xdf\xa3", "video/webm"),
+    (4, b"ftypqt  ", "video/quicktime"),
+    (4, b"ftyp", "video/mp4"),
+    (0, b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", "application/msword"),
+    (0, b"PK\x03\x04", "application/zip"),
+)
+
+SNIFFABLE_TYPES = {content_type for _, _, content_type in _SIGNATURES}
+
+# Container formats: a declared type starting with one of these prefixes is
+# kept when the content sniffs as the container (a .docx is a zip file)
+_CONTAINER_TYPES = {
+    "application/zip": ("application/vnd.openxmlformats-officedocument.",),
+    "application/msword": ("application/vnd.ms-",),
+}
+
+
+@dataclass
+class ReceivedUpload:
+    file: BinaryIO       # the upload's own spool, rewound
+    filename: str
+    content_type: str
+    size: int
+    md5: str
+
+
+def sniff_content_type(head: bytes) -> Optional[str]:
+    """Content type recognised from a file's first bytes, or None."""
+    for offset, magic, content_type in _SIGNATURES:
+        if head[offset:offset + len(magic)] == magic:
+            if content_type == "image/webp" and not head.startswith(b"RIFF"):
+                continue
+            return content_type
+    return None
+
+
+def resolve_content_type(head: bytes, declared: Optional[str]) -> str:
+    """
+    The sniffed type when the first bytes are recognised (whatever the
+    client declared), else the declared one. A declared type that would
+    have been recognised but was not is refused.
+    """
+    declared = (declared or "").split(";")[0].strip().lower()
+    sniffed = sniff_content_type(head)
+    if sniffed is None:
+        if declared in SNIFFABLE_TYPES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"File content does not match its type ({declared})"
+            )
+        return declared or "application/octet-stream"
+    if declared.startswith(_CONTAINER_TYPES.get(sniffed, ())):
+        return declared
+    return sniffed
+
+
+def receive_upload(
+    upload: UploadFile,
+    allowed_types: Optional[Iterable[str]],
+    max_size_mb: float
+) -> ReceivedUpload:
+    """
+    Validate an upload in one chunked pass: content type (sniffed, must be
+    in ``allowed_types`` unless that is None), size (413 past
+    ``max_size_mb``) and MD5. Blocking file I/O; run it in a thread from
+    async code.
+    """
+    if not upload or not upload.filename:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No file provided"
+        )
+
+    max_size = int(max_size_mb * 1024 * 1024)
+    source = upload.file
+    source.seek(0)
+
+    chunk = source.read(CHUNK_SIZE)
+    content_type = resolve_content_type(chunk, upload.content_type)
+    if allowed_types is not None and content_type not in allowed_types:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Invalid file type: {content_type}"
+        )
+
+    digest = hashlib.md5(usedforsecurity=False)
+    size = 0
+    while chunk:
+        size += len(chunk)
+        if size > max_size:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"File exceeds {max_size_mb:g}MB limit"
+            )
+        digest.update(chunk)
+        chunk = source.read(CHUNK_SIZE)
+
+    source.seek(0)
+    return ReceivedUpload(
+        file=source,
+        filename=upload.filename,
+        content_type=content_type,
+        size=size,
+        md5=digest.hexdigest(),
+    )
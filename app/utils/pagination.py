@@ -0,0 +1,212 @@
+"""
+Keyset (cursor) pagination.
+
+Pages are selected with a row-value comparison on (sort column, id) instead
+of OFFSET, so every page costs the same index range scan however deep it
+is. Cursors are opaque URL-safe strings holding the boundary row's sort
+value and id, plus the sort they were issued for.
+
+    page = paginate_keyset(query, Course.created_at, Course.id, order="desc",
+                           page_size=20, cursor=cursor)
+    page.items, page.next_cursor, page.prev_cursor
+
+Sort columns must be NOT NULL (rows with NULL sort values never match the
+comparison). A labelled SQL expression (e.g. a search relevance rank) can be
+used as the sort key; it is selected alongside the entity.
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, List, Optional, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+from sqlalchemy.sql.elements import Label
+
+NEXT = "next"
+PREV = "prev"
+
+
+class CursorError(HTTPException):
+    """Malformed cursor, or a cursor issued for another sort (400)."""
+
+    def __init__(self, detail: str = "Invalid pagination cursor"):
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+@dataclass
+class KeysetPage:
+    """One page of keyset-paginated results."""
+    items: List[Any]
+    page_size: int
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    total: Optional[int] = None
+    page: Optional[int] = None  # numbered page requested (no cursor)
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self) -> bool:
+        return self.prev_cursor is not None
+
+
+# ============================================================================
+# CURSOR ENCODING
+# ============================================================================
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, UUID):
+        return {"u": str(value)}
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _load_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        if "u" in value:
+            return UUID(value["u"])
+    return value
+
+
+def encode_cursor(sort_key: str, order: str, direction: str, values: Tuple[Any, Any]) -> str:
+    payload = {
+        "k": sort_key,
+        "o": order,
+        "d": direction,
+        "v": [_dump_value(v) for v in values],
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_key: str, order: str) -> Tuple[str, Tuple[Any, Any]]:
+    """Return (direction, (sort value, id)); the cursor must match the sort."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        direction = payload["d"]
+        sort_value, row_id = (_load_value(v) for v in payload["v"])
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise CursorError() from e
+
+    if payload.get("k") != sort_key or payload.get("o") != order:
+        raise CursorError("Cursor does not match the requested sort order")
+    if direction not in (NEXT, PREV):
+        raise CursorError()
+    return direction, (sort_value, row_id)
+
+
+# ============================================================================
+# PAGINATION
+# ============================================================================
+
+def paginate_keyset(
+    query: Query,
+    sort_column,
+    id_column,
+    order: str = "desc",
+    page_size: int = 20,
+    cursor: Optional[str] = None,
+    offset: int = 0,
+    with_total: bool = False,
+) -> KeysetPage:
+    """
+    Fetch one page of an ORM query ordered by (sort_column, id_column).
+
+    Any existing ORDER BY on the query is replaced. The query may select an
+    entity or named columns (including id_column); ``sort_column`` is a mapped
+    column or a labelled expression computed per row. ``offset`` is only used
+    without a cursor, for clients still requesting numbered pages; such a
+    page is always counted and records its page number, so it can be
+    described as before (total pages, current page), and it carries cursors
+    to continue from. ``with_total`` adds an exact COUNT of the filtered
+    query (one extra query) to cursor pages as well.
+    """
+    sort_key = sort_column.key
+    descending = order == "desc"
+    computed = isinstance(sort_column, Label)
+
+    total = None
+    if with_total or not cursor:
+        total = query.order_by(None).count()
+
+    direction, boundary = NEXT, None
+    if cursor:
+        direction, boundary = decode_cursor(cursor, sort_key, order)
+
+    # Walking backwards flips both the comparison and the scan order
+    scan_descending = descending != (direction == PREV)
+
+    sort_expression = sort_column.element if computed else sort_column
+    # Entity queries yield the entity; column projections yield their rows
+    single_entity = len(query.column_descriptions) == 1
+    if computed:
+        query = query.add_columns(sort_column)
+
+    if boundary is not None:
+        keys, bound = tuple_(sort_expression, id_column), tuple_(*boundary)
+        query = query.filter(keys < bound if scan_descending else keys > bound)
+
+    if scan_descending:
+        query = query.order_by(None).order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(None).order_by(sort_column.asc(), id_column.asc())
+
+    if not cursor and offset:
+        query = query.offset(offset)
+
+    rows = query.limit(page_size + 1).all()
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if direction == PREV:
+        rows.reverse()
+
+    if computed:
+        items = [row[0] for row in rows] if single_entity else rows
+        sort_values = [row[-1] for row in rows]
+    else:
+        items = rows
+        sort_values = [getattr(item, sort_key) for item in items]
+
+    def cursor_for(index, cursor_direction):
+        values = (sort_values[index], getattr(items[index], id_column.key))
+        return encode_cursor(sort_key, order, cursor_direction, values)
+
+    page = KeysetPage(
+        items=items,
+        page_size=page_size,
+        total=total,
+        page=None if cursor else offset // page_size + 1,
+    )
+    if not items:
+        return page
+
+    if direction == NEXT:
+        if has_more:
+            page.next_cursor = cursor_for(-1, NEXT)
+        if cursor or offset:
+            page.prev_cursor = cursor_for(0, PREV)
+    else:
+        if has_more:
+            page.prev_cursor = cursor_for(0, PREV)
+        page.next_cursor = cursor_for(-1, NEXT)
+
+    return page
@@ -3,8 +3,11 @@ from datetime import datetime
 from pydantic import BaseModel
 from fastapi.encoders import jsonable_encoder
 from typing import Any, Callable, List, Optional, Union
+from urllib.parse import urlencode
 from fastapi import Request
 
+from app.core.profiling import serialization_timer
+
 
 # ============================================================================
 # API RESPONSE HELPER
@@ -25,26 +28,38 @@ def api_response(
     if status_code is None:
         status_code = 200 if success else 400
 
-    # Handle both Pydantic models and lists of them
-    if isinstance(data, BaseModel):
-        data = data.model_dump()
-    elif isinstance(data, list) and data and isinstance(data[0], BaseModel):
-        data = [d.model_dump() for d in data]
+    with serialization_timer():
+        # Handle both Pydantic models and lists of them
+        if isinstance(data, BaseModel):
+            data = data.model_dump()
+        elif isinstance(data, list) and data and isinstance(data[0], BaseModel):
+            data = [d.model_dump() for d in data]
+
+        payload = {
+            "success": success,
+            "message": message,
+            "timestamp": datetime.now().isoformat() + "Z",
+        }
 
-    payload = {
-        "success": success,
-        "message": message,
-        "timestamp": datetime.now().isoformat() + "Z",
-    }
+        if path:
+            payload["path"] = path
+        if data is not None:
+            payload["data"] = jsonable_encoder(data)
+        if errors is not None:
+            payload["errors"] = errors
 
-    if path:
-        payload["path"] = path
-    if data is not None:
-        payload["data"] = jsonable_encoder(data)
-    if errors is not None:
-        payload["errors"] = errors
+        return JSONResponse(content=payload, status_code=status_code)
 
-    return JSONResponse(content=payload, status_code=status_code)
+
+class TimedJSONResponse(JSONResponse):
+    """
+    JSONResponse counting its rendering as serialization time of the request.
+    The app's default response class, used for routes returning dicts or models.
+    """
+
+    def render(self, content: Any) -> bytes:
+        with serialization_timer():
+            return super().render(content)
 
 
 # ============================================================================
@@ -64,6 +79,24 @@ class PageMeta(BaseModel):
     prev_page_url: Optional[str] = None
 
 
+class NumberedKeysetPageMeta(PageMeta):
+    """PageMeta of a keyset page requested by number, with cursors to continue from."""
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+
+class CursorPageMeta(BaseModel):
+    """Metadata for keyset (cursor) paginated responses."""
+    total_items_count: Optional[int] = None
+    requested_page_size: int
+    has_next_page: bool
+    has_prev_page: bool
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    next_page_url: Optional[str] = None
+    prev_page_url: Optional[str] = None
+
+
 class PageSerializer:
     """
     Universal FastAPI PageSerializer with automatic summary detection.
@@ -91,12 +124,15 @@ class PageSerializer:
         if obj is None:
             obj = []
 
-        if self._is_paginated(obj):
-            self._serialize_pagination(obj)
-        elif isinstance(obj, list):
-            self._serialize_items(obj, page=page, page_size=page_size)
-        else:
-            self._serialize_items([obj], page=page, page_size=page_size)
+        with serialization_timer():
+            if self._is_keyset_page(obj):
+                self._serialize_keyset_page(obj)
+            elif self._is_paginated(obj):
+                self._serialize_pagination(obj)
+            elif isinstance(obj, list):
+                self._serialize_items(obj, page=page, page_size=page_size)
+            else:
+                self._serialize_items([obj], page=page, page_size=page_size)
 
     def _auto_summary(self, item: Any) -> dict:
         """
@@ -126,6 +162,61 @@ class PageSerializer:
             for attr in ["items", "page", "per_page", "total", "pages", "has_next", "has_prev"]
         )
 
+    @staticmethod
+    def _is_keyset_page(obj: Any) -> bool:
+        """
+        Detects KeysetPage results (app.utils.pagination)
+        """
+        return all(
+            hasattr(obj, attr)
+            for attr in ["items", "page_size", "next_cursor", "prev_cursor"]
+        )
+
+    def _serialize_keyset_page(self, page: Any):
+        """
+        Serialize a keyset page. Pages requested by number keep the PageMeta
+        fields (and page URLs); cursor pages link by cursor.
+        """
+        self.items = [self.summary_func(i) for i in page.items]
+
+        def build_url(**changes):
+            params = {
+                k: v for k, v in self.request.query_params.items()
+                if k not in ("cursor", "page")
+            }
+            params.update(changes)
+            return f"{self.request.url.path}?{urlencode(params)}"
+
+        if page.page is not None:
+            total_pages = max(1, (page.total + page.page_size - 1) // page.page_size)
+            has_next = page.page < total_pages
+            has_prev = page.page > 1
+            self.data = NumberedKeysetPageMeta(
+                total_items_count=page.total,
+                offset=(page.page - 1) * page.page_size,
+                requested_page_size=page.page_size,
+                current_page_number=page.page,
+                total_pages_count=total_pages,
+                has_next_page=has_next,
+                has_prev_page=has_prev,
+                next_page_url=build_url(page=page.page + 1) if has_next else None,
+                prev_page_url=build_url(page=page.page - 1) if has_prev else None,
+                next_cursor=page.next_cursor,
+                prev_cursor=page.prev_cursor,
+            ).model_dump()
+            return
+
+        self.data = CursorPageMeta(
+            total_items_count=page.total,
+            requested_page_size=page.page_size,
+            has_next_page=page.next_cursor is not None,
+            has_prev_page=page.prev_cursor is not None,
+            next_cursor=page.next_cursor,
+            prev_cursor=page.prev_cursor,
+            next_page_url=build_url(cursor=page.next_cursor) if page.next_cursor else None,
+            prev_page_url=build_url(cursor=page.prev_cursor) if page.prev_cursor else None,
+        ).model_dump()
+
     def _serialize_pagination(self, pagination_obj: Any):
         """Serialize SQLAlchemy pagination object."""
         self.items = [self.summary_func(i) for i in pagination_obj.items]
@@ -0,0 +1,124 @@
+"""
+Text search for the list endpoints.
+
+Services describe which columns a search term should match and get back a
+filter condition plus a relevance expression usable as a keyset sort key:
+
+    search = build_search(db, filters.search, [Course.title, Course.code])
+    if search:
+        query = query.filter(search.condition)
+    paginate_keyset(query, search.rank, Course.id)  # sort_by=relevance
+
+On PostgreSQL with the pg_trgm extension (migration d7f3a9c2e614) the
+substring match is served by GIN trigram indexes, near-misses ("jon" for
+"john") also match, and results are ranked by trigram similarity. Other
+databases (SQLite for local runs, or PostgreSQL without the extension) fall
+back to a plain case-insensitive LIKE ranked exact > prefix > substring.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence
+
+from sqlalchemy import Double, case, cast, func, literal, or_, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement, Label
+
+logger = logging.getLogger(__name__)
+
+# sort_by value selecting relevance order when a search term is given
+RELEVANCE = "relevance"
+
+_LIKE_ESCAPE = "\\"
+
+# Engine -> whether pg_trgm is installed, probed once per engine
+_trigram_support: Dict[Engine, bool] = {}
+
+
+@dataclass
+class SearchClause:
+    """Filter condition and relevance (higher is better) for one search term."""
+    condition: ColumnElement
+    rank: Label
+
+
+def _escape_like(term: str) -> str:
+    return (
+        term.replace(_LIKE_ESCAPE, _LIKE_ESCAPE * 2)
+        .replace("%", _LIKE_ESCAPE + "%")
+        .replace("_", _LIKE_ESCAPE + "_")
+    )
+
+
+def trigram_search_available(db: Session) -> bool:
+    """True when the session's database is PostgreSQL with pg_trgm installed."""
+    engine = db.get_bind()
+    if engine.dialect.name != "postgresql":
+        return False
+
+    available = _trigram_support.get(engine)
+    if available is None:
+        try:
+            with engine.connect() as conn:
+                available = conn.execute(
+                    text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+                ).first() is not None
+        except Exception as e:
+            logger.warning(f"Could not check for pg_trgm, using LIKE search: {e}")
+            available = False
+        _trigram_support[engine] = available
+    return available
+
+
+def _trigram_search(term: str, pattern: str, columns: Sequence) -> SearchClause:
+    term_value = literal(term)
+    condition = or_(*[
+        or_(column.ilike(pattern, escape=_LIKE_ESCAPE), term_value.op("<%")(column))
+        for column in columns
+    ])
+    # word_similarity scores the best-matching word, similarity favours
+    # values close to the whole term; NULL columns are ignored by GREATEST
+    rank = func.greatest(*[
+        func.word_similarity(term_value, column) + func.similarity(column, term_value)
+        for column in columns
+    ])
+    # real -> double so the value round-trips exactly through a cursor
+    return SearchClause(condition=condition, rank=cast(rank, Double).label(RELEVANCE))
+
+
+def _like_search(term: str, pattern: str, columns: Sequence, dialect: str) -> SearchClause:
+    escaped = _escape_like(term)
+    condition = or_(*[column.ilike(pattern, escape=_LIKE_ESCAPE) for column in columns])
+
+    scores = [
+        case(
+            (func.lower(column) == term.lower(), 3),
+            (column.ilike(escaped + "%", escape=_LIKE_ESCAPE), 2),
+            (column.ilike(pattern, escape=_LIKE_ESCAPE), 1),
+            else_=0,
+        )
+        for column in columns
+    ]
+    if len(scores) == 1:
+        rank = scores[0]
+    else:
+        # SQLite spells GREATEST as the multi-argument scalar max()
+        greatest = func.max if dialect == "sqlite" else func.greatest
+        rank = greatest(*scores)
+    return SearchClause(condition=condition, rank=rank.label(RELEVANCE))
+
+
+def build_search(db: Session, term: Optional[str], columns: Sequence) -> Optional[SearchClause]:
+    """
+    Build the match condition and relevance rank of ``term`` over ``columns``.
+    Returns None for a missing or blank term.
+    """
+    term = (term or "").strip()
+    if not term:
+        return None
+
+    pattern = f"%{_escape_like(term)}%"
+    if trigram_search_available(db):
+        return _trigram_search(term, pattern, columns)
+    return _like_search(term, pattern, columns, db.get_bind().dialect.name)
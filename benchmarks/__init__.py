@@ -0,0 +1,10 @@
+"""
+Benchmarks, run against the configured database (APP_SQL_CONNECTION_STRING).
+
+    python -m benchmarks.dataset --students 200     # synthetic academy data
+    python -m benchmarks.suite                      # hot paths -> JSON results
+    python -m benchmarks.suite --compare benchmarks/results/<commit>.json
+    python -m benchmarks.query_counts               # fails if SQL grows with the data
+
+The other modules are one-off before/after comparisons of specific changes.
+"""
@@ -0,0 +1,155 @@
+"""
+Bulk score submission benchmark: statements and time per grade sheet.
+
+Compares the previous per-row loop (a SELECT per column, per student and per
+score, plus a flush per new column) against the set-based upserts now used
+by bulk_create_or_update_lesson_scores. Submits a sheet for every student
+of the first lesson's course; each run happens in a transaction that is
+rolled back, so nothing is written. Needs a lesson, enrolled students and a
+tutor or admin user in the configured database.
+
+    python -m benchmarks.bulk_scores --columns 5 -n 10
+"""
+
+import argparse
+import random
+import time
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.db.session import engine
+from app.models import import_all_models
+
+import_all_models()
+
+from app.models.enrollment import Enrollment  # noqa: E402
+from app.models.lesson import Lesson  # noqa: E402
+from app.models.modules import Module  # noqa: E402
+from app.models.rbac import Role  # noqa: E402
+from app.models.scores import AssessmentScope, AssessmentType, Score, ScoreColumn  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services import grade_rollup_service, score_service  # noqa: E402
+from benchmarks.common import count_statements, rolled_back_session  # noqa: E402
+
+
+def loop_submit(db, lesson_id, columns_config, scores_data, current_user):
+    """Previous behaviour: one round trip per column, student and score."""
+    lesson = db.query(Lesson).filter(Lesson.id == lesson_id).first()
+    course_id = lesson.module.course_id
+
+    column_id_map = {}
+    for col_config in columns_config:
+        column = None
+        try:
+            column = db.query(ScoreColumn).filter(
+                ScoreColumn.id == UUID(col_config["id"]), ScoreColumn.lesson_id == lesson_id
+            ).first()
+        except ValueError:
+            pass
+        if column is None:
+            column = ScoreColumn(lesson_id=lesson_id, scope=AssessmentScope.LESSON)
+            db.add(column)
+        column.type = AssessmentType(col_config["type"])
+        column.title = col_config["title"]
+        column.max_score = col_config["max_score"]
+        column.weight = col_config["weight"]
+        column.order = col_config["order"]
+        db.flush()
+        column_id_map[col_config["id"]] = column.id
+
+    for student_data in scores_data:
+        enrollment = db.query(Enrollment).filter(
+            Enrollment.student_id == student_data["student_id"],
+            Enrollment.course_id == course_id
+        ).first()
+        for col_score in student_data["column_scores"]:
+            column = db.query(ScoreColumn).filter(
+                ScoreColumn.id == column_id_map[col_score["column_id"]]
+            ).first()
+            percentage = col_score["score"] / column.max_score * 100
+            existing = db.query(Score).filter(
+                Score.enrollment_id == enrollment.id, Score.column_id == column.id
+            ).first()
+            if existing is None:
+                existing = Score(enrollment_id=enrollment.id, column_id=column.id,
+                                 recorder_id=current_user.id, score=0, max_score=1)
+                db.add(existing)
+            existing.score = col_score["score"]
+            existing.max_score = column.max_score
+            existing.percentage = percentage
+            existing.grade = score_service.calculate_grade(percentage)
+            existing.notes = col_score["remarks"]
+
+    grade_rollup_service.refresh_course_rollups(db, course_id)
+    db.commit()
+
+
+CASES = {
+    "loop": loop_submit,
+    "upsert": score_service.bulk_create_or_update_lesson_scores,
+}
+
+
+def build_sheet(db, course_id, n_columns):
+    """A sheet addressing students by student_id, with new columns only."""
+    rnd = random.Random(0)
+    columns = [
+        {"id": f"temp_{i}", "type": AssessmentType.QUIZ.value, "title": f"Quiz {i}",
+         "max_score": 20.0, "weight": round(1 / n_columns, 4), "order": i}
+        for i in range(n_columns)
+    ]
+    students = db.query(Enrollment.student_id).filter(Enrollment.course_id == course_id).all()
+    scores = [
+        {
+            "student_id": str(student_id),
+            "column_scores": [
+                {"column_id": col["id"], "score": float(rnd.randint(0, 20)), "remarks": ""}
+                for col in columns
+            ],
+        }
+        for (student_id,) in students
+    ]
+    return columns, scores
+
+
+def run(n_columns: int, iterations: int) -> None:
+    with Session(engine) as db:
+        lesson = db.query(Lesson.id, Module.course_id).join(
+            Module, Module.id == Lesson.module_id
+        ).first()
+        if lesson is None:
+            raise SystemExit("No lesson found")
+        columns, scores = build_sheet(db, lesson.course_id, n_columns)
+        user_id = db.query(User.id).join(User.roles).filter(
+            Role.name.in_(["tutor", "admin"])
+        ).limit(1).scalar()
+        if user_id is None:
+            raise SystemExit("No tutor or admin user found")
+
+    print(f"{len(scores)} students x {n_columns} columns")
+    print(f"{'case':<10}{'statements':>12}{'ms/sheet':>10}")
+    for name, case in CASES.items():
+        statements, elapsed = 0, 0.0
+        for _ in range(iterations):
+            with rolled_back_session() as db:
+                user = db.get(User, user_id)
+                user.roles  # loaded up front, outside the measurement
+                with count_statements() as counts:
+                    started = time.perf_counter()
+                    case(db, lesson.id, columns, scores, user)
+                    elapsed += time.perf_counter() - started
+                statements += counts["statements"]
+
+        print(
+            f"{name:<10}{statements / iterations:>12.1f}"
+            f"{elapsed / iterations * 1000:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--columns", type=int, default=5)
+    parser.add_argument("-n", "--iterations", type=int, default=10)
+    args = parser.parse_args()
+    run(args.columns, args.iterations)
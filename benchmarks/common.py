@@ -0,0 +1,38 @@
+"""Helpers shared by the benchmarks."""
+
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.db.session import engine
+
+
+@contextmanager
+def count_statements():
+    """Count statements and rows returned by the database."""
+    counts = {"statements": 0, "rows": 0}
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        counts["statements"] += 1
+        counts["rows"] += max(cursor.rowcount, 0)
+
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+    try:
+        yield counts
+    finally:
+        event.remove(engine, "after_cursor_execute", after_cursor_execute)
+
+
+@contextmanager
+def rolled_back_session():
+    """Session whose commits end in savepoints of an outer, rolled back transaction."""
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        db = Session(bind=conn, join_transaction_mode="create_savepoint",
+                     autoflush=False, expire_on_commit=False)
+        try:
+            yield db
+        finally:
+            db.close()
+            transaction.rollback()
@@ -0,0 +1,341 @@
+"""
+Deterministic synthetic academy data for the benchmarks.
+
+Fills the configured database with an admin, tutors, students, courses,
+modules, lessons, enrollments, score columns, scores and attendance, plus
+the grade rollups and attendance counters derived from them. The same spec
+and seed always produce the same rows, ids included, so results of
+different commits are measured on identical data.
+
+Rows are tagged (usernames ``<tag>_...``, course codes ``<TAG>-...``) and
+can be removed with --drop. The schema must already exist
+(``alembic upgrade head``); the models use PostgreSQL-only DDL (regex
+CHECK constraints, trigram indexes), so SQLite cannot hold it.
+
+    python -m benchmarks.dataset --students 200 --courses 4
+    python -m benchmarks.dataset --drop
+"""
+
+import argparse
+import random
+import re
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.models import import_all_models
+
+import_all_models()
+
+from app.core.security.password import hash_password  # noqa: E402
+from app.models.association_tables import user_roles  # noqa: E402
+from app.models.attendance import Attendance  # noqa: E402
+from app.models.course import Course  # noqa: E402
+from app.models.enrollment import Enrollment, EnrollmentStatus  # noqa: E402
+from app.models.enums import AssessmentScope, AssessmentType  # noqa: E402
+from app.models.lesson import Lesson  # noqa: E402
+from app.models.modules import Module  # noqa: E402
+from app.models.rbac import Role  # noqa: E402
+from app.models.scores import Score, ScoreColumn  # noqa: E402
+from app.models.tutors import CourseTutor, CourseTutorStatus  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.schemas.attendance import AttendanceStatus  # noqa: E402
+from app.services import attendance_stats_service, grade_rollup_service, score_service  # noqa: E402
+
+DEFAULT_TAG = "bench"
+PASSWORD = "Benchmark123!"
+
+_FIRST_NAMES = ["Ada", "Bola", "Chidi", "Dayo", "Emeka", "Funke", "Gbenga", "Hauwa",
+                "Ife", "Jide", "Kemi", "Lola", "Musa", "Ngozi", "Ola", "Tunde"]
+_LAST_NAMES = ["Adeyemi", "Bello", "Chukwu", "Danjuma", "Eze", "Fashola", "Garba",
+               "Ibrahim", "Nwosu", "Okafor", "Okonkwo", "Suleiman", "Usman", "Yusuf"]
+_LESSON_COLUMNS = [AssessmentType.HOMEWORK, AssessmentType.QUIZ, AssessmentType.CLASSWORK]
+_ATTENDANCE_WEIGHTS = {
+    AttendanceStatus.PRESENT: 0.8,
+    AttendanceStatus.LATE: 0.08,
+    AttendanceStatus.ABSENT: 0.08,
+    AttendanceStatus.EXCUSED: 0.04,
+}
+_BATCH_SIZE = 5000
+
+
+@dataclass
+class DatasetSpec:
+    students: int = 200
+    tutors: int = 4
+    courses: int = 4
+    modules_per_course: int = 4
+    lessons_per_module: int = 6
+    columns_per_lesson: int = 2
+    courses_per_student: int = 2
+    score_fill: float = 0.9
+    seed: int = 42
+    tag: str = DEFAULT_TAG
+
+
+@dataclass
+class Dataset:
+    """Ids of a generated dataset, as used by the benchmark suite."""
+    tag: str
+    admin_id: uuid.UUID
+    tutor_ids: List[uuid.UUID]
+    student_ids: List[uuid.UUID]
+    course_ids: List[uuid.UUID]
+    counts: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "tag": self.tag,
+            "users": 1 + len(self.tutor_ids) + len(self.student_ids),
+            "courses": len(self.course_ids),
+            **self.counts,
+        }
+
+
+def _check_tag(tag: str) -> None:
+    if not re.fullmatch(r"[a-z0-9]{1,12}", tag):
+        raise ValueError("tag must be 1-12 lowercase letters or digits")
+
+
+def _insert(db: Session, model, rows: List[Dict[str, Any]]) -> int:
+    for start in range(0, len(rows), _BATCH_SIZE):
+        db.execute(insert(model), rows[start:start + _BATCH_SIZE])
+    return len(rows)
+
+
+def _role_ids(db: Session, names: Iterable[str]) -> Dict[str, uuid.UUID]:
+    role_ids = dict(db.execute(select(Role.name, Role.id).where(Role.name.in_(names))).all())
+    for name in names:
+        if name not in role_ids:
+            role = Role(name=name)
+            db.add(role)
+            db.flush()
+            role_ids[name] = role.id
+    return role_ids
+
+
+def generate(db: Session, spec: DatasetSpec) -> Dataset:
+    """Insert the dataset described by spec and commit."""
+    _check_tag(spec.tag)
+    if load(db, spec.tag) is not None:
+        raise ValueError(f"A dataset tagged {spec.tag!r} exists; drop it first")
+
+    rnd = random.Random(spec.seed)
+
+    def new_id() -> uuid.UUID:
+        return uuid.UUID(int=rnd.getrandbits(128), version=4)
+
+    def person_name() -> str:
+        return f"{rnd.choice(_FIRST_NAMES)} {rnd.choice(_LAST_NAMES)}"
+
+    password = hash_password(PASSWORD)
+    role_ids = _role_ids(db, ("admin", "tutor", "student"))
+    tag = spec.tag
+
+    def user_row(kind: str, index: int) -> Dict[str, Any]:
+        return {
+            "id": new_id(),
+            "username": f"{tag}_{kind}_{index}",
+            "email": f"{tag}.{kind}{index}@bench.example.com",
+            "password": password,
+            "names": person_name(),
+            "is_active": True,
+            "is_verified": True,
+        }
+
+    admin = user_row("admin", 0)
+    tutors = [user_row("tutor", i) for i in range(spec.tutors)]
+    students = [user_row("student", i) for i in range(spec.students)]
+    users = [admin, *tutors, *students]
+    counts = {"users": _insert(db, User, users)}
+    _insert(db, user_roles, [
+        {"user_id": admin["id"], "role_id": role_ids["admin"]},
+        *({"user_id": t["id"], "role_id": role_ids["tutor"]} for t in tutors),
+        *({"user_id": s["id"], "role_id": role_ids["student"]} for s in students),
+    ])
+
+    courses, course_tutors, modules, lessons, columns = [], [], [], [], []
+    lesson_columns: Dict[uuid.UUID, List[Dict[str, Any]]] = {}  # course id -> columns
+    course_lessons: Dict[uuid.UUID, List[Dict[str, Any]]] = {}
+    start_date = date(2026, 1, 5)
+
+    for c in range(spec.courses):
+        course_id = new_id()
+        courses.append({
+            "id": course_id,
+            "code": f"{tag.upper()}-{c:03d}",
+            "title": f"Benchmark Course {c + 1}",
+            "total_modules": spec.modules_per_course,
+            "total_lessons": spec.modules_per_course * spec.lessons_per_module,
+        })
+        if tutors:
+            tutor = tutors[c % len(tutors)]
+            course_tutors.append({
+                "tutor_id": tutor["id"], "course_id": course_id,
+                "status": CourseTutorStatus.ACTIVE, "is_primary": True,
+            })
+        course_columns = [{
+            "id": new_id(), "course_id": course_id, "scope": AssessmentScope.COURSE,
+            "type": AssessmentType.PROJECT, "title": "Final Project",
+            "max_score": 100.0, "weight": 1.0, "order": 0,
+        }]
+        course_lessons[course_id] = []
+
+        for m in range(spec.modules_per_course):
+            module_id = new_id()
+            modules.append({
+                "id": module_id, "course_id": course_id,
+                "title": f"Module {m + 1}", "order": m + 1,
+            })
+            course_columns.append({
+                "id": new_id(), "module_id": module_id, "scope": AssessmentScope.MODULE,
+                "type": AssessmentType.EXAM, "title": "Module Exam",
+                "max_score": 100.0, "weight": 1.0, "order": 0,
+            })
+            for l in range(spec.lessons_per_module):
+                lesson = {
+                    "id": new_id(), "module_id": module_id,
+                    "title": f"Lesson {m + 1}.{l + 1}", "order": l + 1,
+                    "date": start_date + timedelta(days=7 * m + l),
+                    "is_published": True,
+                }
+                lessons.append(lesson)
+                course_lessons[course_id].append(lesson)
+                for k in range(spec.columns_per_lesson):
+                    course_columns.append({
+                        "id": new_id(), "lesson_id": lesson["id"], "scope": AssessmentScope.LESSON,
+                        "type": _LESSON_COLUMNS[k % len(_LESSON_COLUMNS)],
+                        "title": _LESSON_COLUMNS[k % len(_LESSON_COLUMNS)].value.title(),
+                        "max_score": 20.0, "weight": round(1 / spec.columns_per_lesson, 4),
+                        "order": k,
+                    })
+        lesson_columns[course_id] = course_columns
+        columns.extend(course_columns)
+
+    counts["courses"] = _insert(db, Course, courses)
+    _insert(db, CourseTutor, course_tutors)
+    counts["modules"] = _insert(db, Module, modules)
+    counts["lessons"] = _insert(db, Lesson, lessons)
+    counts["score_columns"] = _insert(db, ScoreColumn, columns)
+
+    enrollments, scores, attendance = [], [], []
+    statuses, weights = zip(*_ATTENDANCE_WEIGHTS.items())
+    per_student = min(spec.courses_per_student, len(courses))
+    for student in students:
+        for course in rnd.sample(courses, per_student):
+            enrollment_id = new_id()
+            enrollments.append({
+                "id": enrollment_id, "student_id": student["id"], "course_id": course["id"],
+                "status": EnrollmentStatus.ACTIVE,
+            })
+            # Each student has an ability level, so grades spread realistically
+            ability = rnd.uniform(0.35, 0.95)
+            recorder_id = next(
+                (ct["tutor_id"] for ct in course_tutors if ct["course_id"] == course["id"]),
+                admin["id"],
+            )
+            for column in lesson_columns[course["id"]]:
+                if rnd.random() > spec.score_fill:
+                    continue
+                value = round(min(1.0, max(0.0, rnd.gauss(ability, 0.12))) * column["max_score"], 1)
+                percentage = round(value / column["max_score"] * 100, 2)
+                scores.append({
+                    "id": new_id(), "enrollment_id": enrollment_id, "column_id": column["id"],
+                    "recorder_id": recorder_id, "type": column["type"],
+                    "score": value, "max_score": column["max_score"], "percentage": percentage,
+                    "grade": score_service.calculate_grade(percentage),
+                })
+            for lesson in course_lessons[course["id"]]:
+                attendance.append({
+                    "id": new_id(), "enrollment_id": enrollment_id, "lesson_id": lesson["id"],
+                    "student_id": student["id"], "recorded_by": recorder_id,
+                    "status": rnd.choices(statuses, weights)[0], "date": lesson["date"],
+                })
+
+    counts["enrollments"] = _insert(db, Enrollment, enrollments)
+    counts["scores"] = _insert(db, Score, scores)
+    counts["attendance"] = _insert(db, Attendance, attendance)
+    db.commit()
+
+    # Derived tables, as the write paths would have maintained them
+    for course in courses:
+        grade_rollup_service.rebuild_rollups(db, course_id=course["id"])
+    attendance_stats_service.rebuild_counters(db)
+
+    return Dataset(
+        tag=tag,
+        admin_id=admin["id"],
+        tutor_ids=[t["id"] for t in tutors],
+        student_ids=[s["id"] for s in students],
+        course_ids=[c["id"] for c in courses],
+        counts=counts,
+    )
+
+
+def load(db: Session, tag: str = DEFAULT_TAG) -> Optional[Dataset]:
+    """The ids of an existing dataset, or None."""
+    _check_tag(tag)
+    users = db.execute(
+        select(User.username, User.id).where(User.username.like(f"{tag}\\_%"))
+    ).all()
+    if not users:
+        return None
+    by_kind: Dict[str, List[tuple]] = {}
+    for username, user_id in users:
+        _, kind, index = username.rsplit("_", 2)
+        by_kind.setdefault(kind, []).append((int(index), user_id))
+    ordered = {kind: [user_id for _, user_id in sorted(rows)] for kind, rows in by_kind.items()}
+    course_ids = db.execute(
+        select(Course.id).where(Course.code.like(f"{tag.upper()}-%")).order_by(Course.code)
+    ).scalars().all()
+    return Dataset(
+        tag=tag,
+        admin_id=ordered["admin"][0],
+        tutor_ids=ordered.get("tutor", []),
+        student_ids=ordered.get("student", []),
+        course_ids=list(course_ids),
+    )
+
+
+def drop(db: Session, tag: str = DEFAULT_TAG) -> None:
+    """Delete a dataset; courses cascade to everything below them."""
+    _check_tag(tag)
+    db.execute(delete(Course).where(Course.code.like(f"{tag.upper()}-%")))
+    user_ids = select(User.id).where(User.username.like(f"{tag}\\_%"))
+    db.execute(delete(user_roles).where(user_roles.c.user_id.in_(user_ids)))
+    db.execute(delete(User).where(User.username.like(f"{tag}\\_%")))
+    db.commit()
+
+
+def main() -> None:
+    defaults = DatasetSpec()
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    for name, value in asdict(defaults).items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=type(value), default=value)
+    parser.add_argument("--drop", action="store_true", help="Delete the tagged dataset")
+    parser.add_argument("--replace", action="store_true", help="Drop an existing dataset first")
+    args = vars(parser.parse_args())
+    drop_only, replace = args.pop("drop"), args.pop("replace")
+    spec = DatasetSpec(**args)
+
+    with SessionLocal() as db:
+        if drop_only or replace:
+            drop(db, spec.tag)
+            if drop_only:
+                print(f"Dropped dataset {spec.tag!r}")
+                return
+        started = time.perf_counter()
+        dataset = generate(db, spec)
+        elapsed = time.perf_counter() - started
+    print(f"Generated dataset {spec.tag!r} in {elapsed:.1f}s: " +
+          ", ".join(f"{count} {name}" for name, count in dataset.counts.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+List serialization benchmark: rows fetched per page.
+
+Compares the previous course/lesson listing (full entities, with the course
+relations loaded eagerly and lesson attendance counted through the Lesson
+hybrids) against the column projections now used by list_courses and
+list_module_lessons. Runs against the configured database; it needs some
+courses, modules, lessons and attendance to be meaningful.
+
+    python -m benchmarks.list_projection --page-size 20 -n 20
+"""
+
+import argparse
+import time
+
+from sqlalchemy.orm import selectinload
+
+from app.db.session import SessionLocal
+from app.models import import_all_models
+
+import_all_models()
+
+from app.models.course import Course  # noqa: E402
+from app.models.lesson import Lesson  # noqa: E402
+from app.models.modules import Module  # noqa: E402
+from app.schemas.course import CourseFilters  # noqa: E402
+from app.services import course_service, lesson_service  # noqa: E402
+from benchmarks.common import count_statements  # noqa: E402
+
+
+def courses_entities(db, page_size, module_id):
+    """Previous behaviour: Course rows plus their selectin-loaded relations."""
+    courses = (
+        db.query(Course)
+        .options(
+            selectinload(Course.tutors_assigned),
+            selectinload(Course.modules),
+            selectinload(Course.images),
+        )
+        .order_by(Course.created_at.desc(), Course.id.desc())
+        .limit(page_size + 1)
+        .all()
+    )
+    return [course.get_summary() for course in courses[:page_size]]
+
+
+def courses_projection(db, page_size, module_id):
+    return course_service.list_courses(db, CourseFilters(page_size=page_size)).items
+
+
+def lessons_entities(db, page_size, module_id):
+    """Previous behaviour: Lesson rows, attendance counted by the hybrids."""
+    lessons = db.query(Lesson).filter(Lesson.module_id == module_id).order_by(Lesson.order).all()
+    return [lesson.get_summary() for lesson in lessons]
+
+
+def lessons_projection(db, page_size, module_id):
+    return lesson_service.list_module_lessons(db, module_id)
+
+
+CASES = {
+    "courses/entities": courses_entities,
+    "courses/projection": courses_projection,
+    "lessons/entities": lessons_entities,
+    "lessons/projection": lessons_projection,
+}
+
+
+def run(page_size: int, iterations: int) -> None:
+    with SessionLocal() as db:
+        module_id = db.query(Module.id).order_by(Module.created_at).limit(1).scalar()
+
+    print(f"{'case':<22}{'statements':>12}{'rows/page':>12}{'ms/page':>10}")
+    for name, case in CASES.items():
+        if module_id is None and name.startswith("lessons"):
+            continue
+
+        with count_statements() as counts:
+            started = time.perf_counter()
+            for _ in range(iterations):
+                # Fresh session per page, as in a request
+                with SessionLocal() as db:
+                    case(db, page_size, module_id)
+            elapsed = time.perf_counter() - started
+
+        print(
+            f"{name:<22}{counts['statements'] / iterations:>12.1f}"
+            f"{counts['rows'] / iterations:>12.1f}"
+            f"{elapsed / iterations * 1000:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("-n", "--iterations", type=int, default=20)
+    args = parser.parse_args()
+    run(args.page_size, args.iterations)
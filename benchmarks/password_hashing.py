@@ -0,0 +1,95 @@
+"""
+Password hashing benchmark: hashes per second at the configured cost.
+
+Measures scrypt hash and verify inline (one core) and through
+app.core.security.hashing's process pool with --concurrency requests in
+flight, then times one hash at the costs around the configured one and
+suggests the highest cost that stays under --target-ms. No database
+needed.
+
+    python -m benchmarks.password_hashing -n 40 --concurrency 16 --target-ms 100
+"""
+
+import argparse
+import asyncio
+import time
+
+from passlib.context import CryptContext
+
+from app.core.config import get_app_config
+from app.core.security.hashing import password_hasher
+from app.core.security.password import hash_password, verify_password
+
+security_config = get_app_config().security_config
+
+PASSWORD = "correct horse battery staple"
+
+
+def inline_rate(fn, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return iterations / (time.perf_counter() - started)
+
+
+async def pool_rate(make_call, iterations: int, concurrency: int) -> float:
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with gate:
+            await make_call()
+
+    await make_call()  # start the pool's processes outside the measurement
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(iterations)))
+    return iterations / (time.perf_counter() - started)
+
+
+def cost_ms(rounds: int) -> float:
+    context = CryptContext(schemes=["scrypt"], scrypt__rounds=rounds)
+    context.hash(PASSWORD)
+    started = time.perf_counter()
+    context.hash(PASSWORD)
+    return (time.perf_counter() - started) * 1000
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", "--iterations", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=16, help="Requests in flight against the pool")
+    parser.add_argument("--target-ms", type=float, default=100.0, help="Hash time to size the cost for")
+    args = parser.parse_args()
+
+    hashed = hash_password(PASSWORD)
+    rounds = security_config.scrypt_rounds
+    print(f"scrypt rounds={rounds} (N=2^{rounds}), pool workers={password_hasher.workers}\n")
+
+    print(f"{'':<10}{'inline/s':>12}{'pool/s':>12}")
+    hash_inline = inline_rate(lambda: hash_password(PASSWORD), args.iterations)
+    hash_pool = await pool_rate(lambda: password_hasher.hash(PASSWORD), args.iterations, args.concurrency)
+    print(f"{'hash':<10}{hash_inline:>12.1f}{hash_pool:>12.1f}")
+    verify_inline = inline_rate(lambda: verify_password(PASSWORD, hashed), args.iterations)
+    verify_pool = await pool_rate(lambda: password_hasher.verify(PASSWORD, hashed), args.iterations, args.concurrency)
+    print(f"{'verify':<10}{verify_inline:>12.1f}{verify_pool:>12.1f}")
+
+    stats = password_hasher.stats()
+    print(f"\npool: wait avg {stats['wait_avg_ms']} ms, max {stats['wait_max_ms']} ms, "
+          f"hash avg {stats['hash_avg_ms']} ms, waiting peak {stats['waiting_peak']}")
+    password_hasher.shutdown()
+
+    print(f"\n{'rounds':<10}{'ms/hash':>10}")
+    suggested = None
+    for candidate in range(max(rounds - 2, 10), rounds + 3):
+        ms = cost_ms(candidate)
+        marker = " (configured)" if candidate == rounds else ""
+        print(f"{candidate:<10}{ms:>10.1f}{marker}")
+        if ms <= args.target_ms:
+            suggested = candidate
+    if suggested is not None:
+        print(f"\nHighest cost under {args.target_ms:.0f} ms: APP_SCRYPT_ROUNDS={suggested}")
+    else:
+        print(f"\nEvery cost tried takes over {args.target_ms:.0f} ms on this machine")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,60 @@
+"""
+Statement count check: read paths must not issue more SQL as data grows.
+
+Generates a small and a large synthetic dataset (more courses per student,
+modules and lessons) in a transaction that is rolled back, so nothing is
+written, runs each check for a student of both and compares the statements
+issued. Exits with status 1 when a count differs, for use in CI. Needs the
+schema (``alembic upgrade head``).
+
+    python -m benchmarks.query_counts
+"""
+
+import argparse
+import sys
+from typing import Callable, Dict
+
+from app.services import performance_service
+from benchmarks.common import count_statements, rolled_back_session
+from benchmarks.dataset import DatasetSpec, generate
+
+SMALL = DatasetSpec(students=2, tutors=1, courses=2, modules_per_course=1, lessons_per_module=2,
+                    courses_per_student=1, tag="qcsmall")
+LARGE = DatasetSpec(students=2, tutors=1, courses=4, modules_per_course=4, lessons_per_module=8,
+                    courses_per_student=3, seed=43, tag="qclarge")
+
+CHECKS: Dict[str, Callable] = {
+    "performance.get_student_performance":
+        lambda db, student_id: performance_service.get_student_performance(db, student_id),
+}
+
+
+def statements(db, check: Callable, student_id) -> int:
+    check(db, student_id)  # warm up
+    with count_statements() as counts:
+        check(db, student_id)
+    return counts["statements"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--filter", help="Only checks whose name contains this")
+    args = parser.parse_args()
+
+    failed = False
+    with rolled_back_session() as db:
+        small, large = generate(db, SMALL), generate(db, LARGE)
+        print(f"{'check':<44}{'small':>7}{'large':>7}")
+        for name, check in CHECKS.items():
+            if args.filter and args.filter not in name:
+                continue
+            counts = [statements(db, check, data.student_ids[0]) for data in (small, large)]
+            failed |= counts[0] != counts[1]
+            flag = "" if counts[0] == counts[1] else "  <- grows with the data"
+            print(f"{name:<44}{counts[0]:>7}{counts[1]:>7}{flag}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Rate limiting overhead benchmark: cost per request of app.core.ratelimit.
+
+Drives a minimal FastAPI app in-process (httpx over ASGI, --concurrency
+requests in flight) with no rate limiting, then with a route policy per
+algorithm, on the in-memory store and, with --url, on Redis. Limits are
+set high enough that every request is allowed, so the difference is the
+check itself plus the RateLimit-* headers; each variant is run --rounds
+times and the best round kept. Also times a bare hit_rate_limit call per
+backend. No database needed.
+
+    python -m benchmarks.rate_limit -n 5000 --concurrency 50 --url redis://localhost:6379/0
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+import httpx
+from fastapi import FastAPI
+
+from app.api.deps import storage
+from app.core.config import get_app_config
+from app.core.config.models import RateLimitConfig, RateLimitRule
+from app.core.ratelimit import setup_rate_limiting
+from app.services.redis_service import RedisService
+
+app_config = get_app_config()
+
+ALGORITHMS = ("sliding_window", "token_bucket")
+
+
+def build_app(limited: bool) -> FastAPI:
+    app = FastAPI()
+    if limited:
+        setup_rate_limiting(app)
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+async def request_rate(app: FastAPI, iterations: int, concurrency: int, rounds: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        gate = asyncio.Semaphore(concurrency)
+
+        async def one():
+            async with gate:
+                response = await client.get("/ping")
+                assert response.status_code == 200, response.status_code
+
+        await asyncio.gather(*(one() for _ in range(min(iterations, 500))))  # warm up
+        best = 0.0
+        for _ in range(rounds):
+            started = time.perf_counter()
+            await asyncio.gather(*(one() for _ in range(iterations)))
+            best = max(best, iterations / (time.perf_counter() - started))
+        return best
+
+
+def hit_us(redis: RedisService, rule: RateLimitRule, iterations: int) -> float:
+    key = f"rl:bench:{uuid.uuid4().hex[:8]}"
+    redis.hit_rate_limit(key, rule)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        redis.hit_rate_limit(key, rule)
+    elapsed = time.perf_counter() - started
+    redis.delete(key)
+    return elapsed / iterations * 1_000_000
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", "--iterations", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--url", help="Redis URL; in-memory store only when omitted")
+    args = parser.parse_args()
+
+    backends = {"memory": RedisService(None)}
+    if args.url:
+        backends["redis"] = RedisService(args.url, fallback_to_memory=False)
+
+    baseline = await request_rate(build_app(limited=False), args.iterations, args.concurrency, args.rounds)
+    print(f"{'variant':<32}{'req/s':>10}{'us/req':>10}{'overhead us':>13}{'hit us':>10}")
+    print(f"{'no rate limiting':<32}{baseline:>10.0f}{1e6 / baseline:>10.1f}{'':>13}{'':>10}")
+
+    limited_app = build_app(limited=True)
+    for backend, redis in backends.items():
+        storage._redis_instance = redis
+        for algorithm in ALGORITHMS:
+            rule = RateLimitRule(limit=10 ** 9, window=60, algorithm=algorithm)
+            app_config.rate_limit_config = RateLimitConfig(routes={"GET /ping": rule})
+            rate = await request_rate(limited_app, args.iterations, args.concurrency, args.rounds)
+            overhead = 1e6 / rate - 1e6 / baseline
+            single = hit_us(redis, rule, min(args.iterations, 2000))
+            print(f"{f'{algorithm} ({backend})':<32}{rate:>10.0f}{1e6 / rate:>10.1f}"
+                  f"{overhead:>13.1f}{single:>10.1f}")
+
+    storage._redis_instance = None
+    for redis in backends.values():
+        redis.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,111 @@
+"""
+Redis round-trip micro-benchmark.
+
+Counts the network round trips and wall time of the signup verification
+flow (rate-limit hit + pending signup read + delete), comparing the
+previous client behaviour (a PING before every command) with the current
+RedisService (no pre-flight PING, batched through pipeline()).
+
+    python -m benchmarks.redis_round_trips --url redis://localhost:6379/0 -n 1000
+"""
+
+import argparse
+import time
+import uuid
+from contextlib import contextmanager
+
+from redis.connection import Connection
+
+from app.core.config.models import RateLimitRule
+from app.services.redis_service import RedisService
+
+RULE = RateLimitRule(limit=10, window=300)
+
+_round_trips = 0
+
+
+@contextmanager
+def count_round_trips():
+    """Count packed sends on any connection (one per command or pipeline)."""
+    global _round_trips
+    original = Connection.send_packed_command
+
+    def send_packed_command(self, command, check_health=True):
+        global _round_trips
+        _round_trips += 1
+        return original(self, command, check_health)
+
+    Connection.send_packed_command = send_packed_command
+    _round_trips = 0
+    try:
+        yield lambda: _round_trips
+    finally:
+        Connection.send_packed_command = original
+
+
+def flow_ping_per_command(redis: RedisService, token: str, client_ip: str) -> None:
+    """Previous behaviour: each call pinged before running its command."""
+    client = redis.get_client()
+    client.ping()
+    pipe = client.pipeline()
+    pipe.incr(f"verify_signup:{client_ip}")
+    pipe.expire(f"verify_signup:{client_ip}", 300)
+    pipe.execute()
+    client.ping()
+    client.get(f"signup_pending:{token}")
+    client.ping()
+    client.delete(f"signup_pending:{token}")
+
+
+def flow_unbatched(redis: RedisService, token: str, client_ip: str) -> None:
+    """One command per call, no pre-flight PING."""
+    redis.hit_rate_limit(f"rl:verify_signup:ip:{client_ip}", RULE)
+    redis.get(f"signup_pending:{token}", as_json=True)
+    redis.delete(f"signup_pending:{token}")
+
+
+def flow_pipelined(redis: RedisService, token: str, client_ip: str) -> None:
+    """Rate limit and read batched; delete after the codes are checked."""
+    with redis.pipeline() as batch:
+        batch.hit_rate_limit(f"rl:verify_signup:ip:{client_ip}", RULE)
+        batch.get(f"signup_pending:{token}", as_json=True)
+    redis.delete(f"signup_pending:{token}")
+
+
+FLOWS = {
+    "ping_per_command": flow_ping_per_command,
+    "unbatched": flow_unbatched,
+    "pipelined": flow_pipelined,
+}
+
+
+def run(url: str, iterations: int) -> None:
+    redis = RedisService(url, fallback_to_memory=False)
+    client_ip = f"bench-{uuid.uuid4().hex[:8]}"
+
+    print(f"{'flow':<20}{'round trips/op':>16}{'ms/op':>10}")
+    for name, flow in FLOWS.items():
+        tokens = [uuid.uuid4().hex for _ in range(iterations)]
+        redis.mset({f"signup_pending:{t}": {"email": "bench@example.com"} for t in tokens}, expiry=60)
+
+        with count_round_trips() as round_trips:
+            started = time.perf_counter()
+            for token in tokens:
+                flow(redis, token, client_ip)
+            elapsed = time.perf_counter() - started
+
+        print(
+            f"{name:<20}{round_trips() / iterations:>16.1f}"
+            f"{elapsed / iterations * 1000:>10.3f}"
+        )
+
+    redis.delete(f"verify_signup:{client_ip}", f"rl:verify_signup:ip:{client_ip}")
+    redis.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="redis://localhost:6379/0")
+    parser.add_argument("-n", "--iterations", type=int, default=1000)
+    args = parser.parse_args()
+    run(args.url, args.iterations)
@@ -0,0 +1,305 @@
+"""
+Hot path benchmark suite with JSON results.
+
+Runs each benchmark against a dataset from benchmarks.dataset (generated
+first if missing), in a transaction that is rolled back, so writers can be
+repeated on the same data. For every benchmark it records wall time
+statistics over the iterations and the statements each call runs. Results
+go to benchmarks/results/<commit>.json; --compare prints the change
+against an earlier results file and exits with status 1 when a benchmark
+got slower than --threshold or runs more statements.
+
+    python -m benchmarks.suite -n 20
+    python -m benchmarks.suite --filter scores --compare benchmarks/results/abc1234.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+from uuid import UUID
+
+import sqlalchemy
+from sqlalchemy import select, text
+
+from app.db.session import SessionLocal, engine
+from benchmarks import dataset as dataset_module
+from benchmarks.common import count_statements, rolled_back_session
+from benchmarks.dataset import Dataset, DatasetSpec
+from app.models.enrollment import Enrollment
+from app.models.lesson import Lesson
+from app.models.modules import Module
+from app.models.scores import ScoreColumn
+from app.models.user import User
+from app.schemas.attendance import AttendanceStatus
+from app.schemas.course import CourseFilters
+from app.services import (
+    admin_service,
+    attendance_service,
+    course_service,
+    performance_service,
+    score_service,
+)
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+@dataclass
+class Context:
+    """What the benchmarks operate on, picked from the dataset up front."""
+    dataset: Dataset
+    student_id: UUID
+    course_id: UUID
+    lesson_id: UUID
+    admin_id: UUID
+    score_columns: List[Dict[str, Any]]
+    score_sheet: List[Dict[str, Any]]
+    attendance_sheet: List[Dict[str, Any]]
+
+
+# name -> fn(db, ctx, user); user is the dataset's admin, for the writers
+BENCHMARKS: Dict[str, Callable[[Any, Context, User], Any]] = {}
+
+
+def benchmark(name: str):
+    def register(fn: Callable[[Any, Context, User], Any]):
+        BENCHMARKS[name] = fn
+        return fn
+    return register
+
+
+@benchmark("performance.get_student_performance")
+def bench_student_performance(db, ctx: Context, user: User):
+    return performance_service.get_student_performance(db, ctx.student_id)
+
+
+@benchmark("scores.get_lesson_scores_with_students")
+def bench_lesson_grade_sheet(db, ctx: Context, user: User):
+    return score_service.get_lesson_scores_with_students(db, ctx.lesson_id)
+
+
+@benchmark("scores.bulk_create_or_update_lesson_scores")
+def bench_bulk_lesson_scores(db, ctx: Context, user: User):
+    return score_service.bulk_create_or_update_lesson_scores(
+        db, ctx.lesson_id, ctx.score_columns, ctx.score_sheet, user
+    )
+
+
+@benchmark("attendance.bulk_create_or_update_attendance")
+def bench_bulk_attendance(db, ctx: Context, user: User):
+    return attendance_service.bulk_create_or_update_attendance(
+        db, ctx.lesson_id, ctx.attendance_sheet, user
+    )
+
+
+@benchmark("admin.compute_statistics")
+def bench_compute_statistics(db, ctx: Context, user: User):
+    return admin_service.compute_statistics(db)
+
+
+@benchmark("admin.get_statistics")
+def bench_get_statistics(db, ctx: Context, user: User):
+    # Served from the snapshot after the warm-up call
+    return admin_service.get_statistics(db)
+
+
+@benchmark("courses.list_courses")
+def bench_list_courses(db, ctx: Context, user: User):
+    return course_service.list_courses(db, CourseFilters(page_size=20, include_total=True))
+
+
+@benchmark("exports.performance_pdf")
+def bench_performance_pdf(db, ctx: Context, user: User):
+    return performance_service.export_performance_pdf(db, ctx.student_id)
+
+
+@benchmark("exports.performance_excel")
+def bench_performance_excel(db, ctx: Context, user: User):
+    return performance_service.export_performance_excel(db, ctx.student_id)
+
+
+def build_context(db, data: Dataset) -> Context:
+    course_id = data.course_ids[0]
+    lesson_id = db.execute(
+        select(Lesson.id).join(Module, Module.id == Lesson.module_id)
+        .where(Module.course_id == course_id)
+        .order_by(Module.order, Lesson.order).limit(1)
+    ).scalar_one()
+    # The student with the most enrollments has the largest reports
+    student_id = db.execute(
+        select(Enrollment.student_id).join(User, User.id == Enrollment.student_id)
+        .where(Enrollment.student_id.in_(data.student_ids))
+        .group_by(Enrollment.student_id, User.username)
+        .order_by(sqlalchemy.func.count().desc(), User.username).limit(1)
+    ).scalar_one()
+
+    columns = db.execute(
+        select(ScoreColumn).where(ScoreColumn.lesson_id == lesson_id).order_by(ScoreColumn.order)
+    ).scalars().all()
+    score_columns = [
+        {"id": str(c.id), "type": c.type.value, "title": c.title, "max_score": c.max_score,
+         "weight": c.weight, "order": c.order}
+        for c in columns
+    ]
+    enrollments = db.execute(
+        select(Enrollment.id, Enrollment.student_id)
+        .where(Enrollment.course_id == course_id).order_by(Enrollment.id)
+    ).all()
+    rnd = random.Random(7)
+    score_sheet = [
+        {
+            "enrollment_id": str(enrollment_id),
+            "column_scores": [
+                {"column_id": c["id"], "score": float(rnd.randint(0, int(c["max_score"]))), "remarks": ""}
+                for c in score_columns
+            ],
+        }
+        for enrollment_id, _ in enrollments
+    ]
+    attendance_sheet = [
+        {"enrollment_id": str(enrollment_id),
+         "status": rnd.choice([AttendanceStatus.PRESENT, AttendanceStatus.LATE]).value}
+        for enrollment_id, _ in enrollments
+    ]
+    return Context(
+        dataset=data, student_id=student_id, course_id=course_id, lesson_id=lesson_id,
+        admin_id=data.admin_id, score_columns=score_columns,
+        score_sheet=score_sheet, attendance_sheet=attendance_sheet,
+    )
+
+
+def run_benchmark(fn, ctx: Context, iterations: int, warmup: int) -> Dict[str, Any]:
+    timings: List[float] = []
+    statements: List[int] = []
+    with rolled_back_session() as db:
+        for i in range(warmup + iterations):
+            # Objects loaded by one call must not turn the next into cache hits
+            db.expunge_all()
+            user = db.get(User, ctx.admin_id)
+            user.roles  # loaded outside the measurement
+            with count_statements() as counts:
+                started = time.perf_counter()
+                fn(db, ctx, user)
+                elapsed = time.perf_counter() - started
+            if i >= warmup:
+                timings.append(elapsed * 1000)
+                statements.append(counts["statements"])
+
+    ordered = sorted(timings)
+    return {
+        "iterations": iterations,
+        "min_ms": round(ordered[0], 3),
+        "median_ms": round(statistics.median(ordered), 3),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        "max_ms": round(ordered[-1], 3),
+        "stdev_ms": round(statistics.stdev(ordered), 3) if len(ordered) > 1 else 0.0,
+        "statements": max(statements),
+    }
+
+
+def _git(*args: str) -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", *args], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment(data: Dataset) -> Dict[str, Any]:
+    with engine.connect() as conn:
+        server = conn.execute(text("SELECT version()")).scalar() \
+            if engine.dialect.name == "postgresql" else engine.dialect.name
+    return {
+        "commit": _git("rev-parse", "--short", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "sqlalchemy": sqlalchemy.__version__,
+        "platform": platform.platform(),
+        "database": server,
+        "dataset": data.to_dict(),
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> bool:
+    """Print the change per benchmark; True when something regressed."""
+    regressed = False
+    print(f"\nvs {baseline['environment'].get('commit')}")
+    print(f"{'benchmark':<48}{'median ms':>22}{'change':>9}{'statements':>14}")
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            print(f"{name:<48}{'new':>22}")
+            continue
+        change = result["median_ms"] / before["median_ms"] - 1 if before["median_ms"] else 0.0
+        slower = change > threshold
+        more_statements = result["statements"] > before["statements"]
+        regressed |= slower or more_statements
+        flag = " !" if slower or more_statements else ""
+        print(
+            f"{name:<48}{before['median_ms']:>10.2f} -> {result['median_ms']:>8.2f}"
+            f"{change:>+9.1%}{before['statements']:>6} -> {result['statements']:<5}{flag}"
+        )
+    return regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", "--iterations", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--filter", help="Only benchmarks whose name contains this")
+    parser.add_argument("--tag", default=dataset_module.DEFAULT_TAG, help="Dataset tag")
+    parser.add_argument("--output", help="Results file (default benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Median slowdown reported as a regression (default 0.10)")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        data = dataset_module.load(db, args.tag)
+        if data is None:
+            print(f"Generating dataset {args.tag!r}...")
+            data = dataset_module.generate(db, DatasetSpec(tag=args.tag))
+        ctx = build_context(db, data)
+
+    selected = {
+        name: fn for name, fn in BENCHMARKS.items()
+        if not args.filter or args.filter in name
+    }
+    results = {}
+    print(f"{'benchmark':<48}{'median ms':>10}{'p95 ms':>10}{'statements':>12}")
+    for name, fn in selected.items():
+        result = results[name] = run_benchmark(fn, ctx, args.iterations, args.warmup)
+        print(f"{name:<48}{result['median_ms']:>10.2f}{result['p95_ms']:>10.2f}{result['statements']:>12}")
+
+    report = {"environment": environment(data), "results": results}
+    output = args.output
+    if output is None:
+        env = report["environment"]
+        name = f"{env['commit'] or 'unknown'}{'-dirty' if env['dirty'] else ''}.json"
+        output = os.path.join(RESULTS_DIR, name)
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(baseline, report, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
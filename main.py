@@ -12,6 +12,10 @@ from contextlib import asynccontextmanager
 
 from app.core.config import get_app_config
 from app.core.exceptions import setup_exception_handlers
+from app.core.profiling import setup_request_profiling
+from app.core.ratelimit import setup_rate_limiting
+from app.core.uploads import UploadSizeLimitMiddleware
+from app.utils.responses import TimedJSONResponse
 from app.api.v1.router import v1_router
 from app.api.root import root_router
 
@@ -62,6 +66,39 @@ async def lifespan(app: FastAPI):
         logger.error(f" Redis startup failed: {e}")
         logger.info("App will continue - Redis will auto-connect on first use")
     
+    # Reload mail, rate limit and upload settings on SIGHUP (per worker:
+    # signal each worker process, not only the master)
+    try:
+        import asyncio
+        import signal
+        from app.core.config import refresh_config
+        asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, refresh_config)
+    except Exception as e:
+        logger.error(f" Configuration reload on SIGHUP unavailable: {e}")
+    
+    # Compile the email templates now rather than on the first send
+    try:
+        from app.services.mail.templates import warm_templates
+        logger.info(f"Email templates compiled: {warm_templates()}")
+    except Exception as e:
+        logger.error(f" Email template warm-up failed: {e}")
+    
+    # Deliver queued mail (outbound_emails) from this process. The queue
+    # needs the async engine (asyncpg); without one mail is sent directly
+    try:
+        if app_config.mail_config.queue_enabled:
+            from app.db.session import get_async_sessionmaker
+            try:
+                get_async_sessionmaker()
+            except Exception as e:
+                app_config.mail_config.queue_enabled = False
+                logger.warning(f" Mail queue disabled, no async database engine: {e}")
+            else:
+                from app.services.mail.worker import mail_worker
+                mail_worker.start()
+    except Exception as e:
+        logger.error(f" Mail queue worker failed to start: {e}")
+    
     # App is ready
     yield
     
@@ -77,6 +114,34 @@ async def lifespan(app: FastAPI):
         logger.info(" Redis connections closed")
     except Exception as e:
         logger.error(f" Error during Redis shutdown: {e}")
+
+    # Stop the mail queue worker; undelivered mail stays queued
+    try:
+        from app.services.mail.worker import mail_worker
+        await mail_worker.stop()
+    except Exception as e:
+        logger.error(f" Error stopping mail queue worker: {e}")
+
+    # Stop the password hashing pool
+    try:
+        from app.core.security.hashing import password_hasher
+        password_hasher.shutdown()
+    except Exception as e:
+        logger.error(f" Error stopping password hashing pool: {e}")
+
+    # Stop the report export render pool
+    try:
+        from app.services.report_export_service import shutdown_executor
+        shutdown_executor()
+    except Exception as e:
+        logger.error(f" Error stopping report export pool: {e}")
+
+    # Close the async database engine's connections
+    try:
+        from app.db.session import dispose_async_engine
+        await dispose_async_engine()
+    except Exception as e:
+        logger.error(f" Error closing async database engine: {e}")
     
     logger.info("Shutdown complete")
 
@@ -92,7 +157,8 @@ app = FastAPI(
     lifespan=lifespan,
     docs_url="/docs",
     redoc_url="/redoc",
-    openapi_url="/openapi.json"
+    openapi_url="/openapi.json",
+    default_response_class=TimedJSONResponse,
 )
 
 
@@ -202,6 +268,15 @@ app.openapi = custom_openapi
 # MIDDLEWARE
 # ------------------------------------------------------------------
 
+# Innermost middleware: times the routes themselves, not CORS or gzip
+setup_request_profiling(app, app_config)
+
+# RateLimit-* headers, and the per-route limits (before the routers below)
+setup_rate_limiting(app)
+
+# Oversized uploads refused while still being received
+app.add_middleware(UploadSizeLimitMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"] 
@@ -217,6 +292,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        "RateLimit-Limit", "RateLimit-Remaining", "RateLimit-Reset",
+        "RateLimit-Policy", "Retry-After",
+    ],
 )
 
 app.add_middleware(GZipMiddleware, minimum_size=1000)